@@ -385,6 +385,8 @@ def main(args):
             if step == args.train_steps + 1:
                 break
 
+    if rank_id == 0:
+        record.close()
     logger.info(f"Finished training. check results in {args.output_path}")
     reset_op_id()
     logger.info("End")
@@ -950,6 +950,8 @@ def main(args):
             if end_train:
                 break
 
+        if rank_id == 0:
+            record.close()
         logger.info("Finished training. Ending process...")
         reset_op_id()
         time.sleep(60)
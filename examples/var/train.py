@@ -302,6 +302,9 @@ def main(args):
                 if ema is not None:
                     ema.swap_after_eval()
 
+    if rank_id == 0:
+        record.close()
+
 
 if __name__ == "__main__":
     args = parse_args()
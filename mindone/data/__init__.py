@@ -1,3 +1,5 @@
+from .cache import SampleCache
 from .dataset import BaseDataset
 from .loader import create_dataloader
+from .sampler import BucketBatchSampler
 from .video_reader import VideoReader
@@ -0,0 +1,173 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import uuid
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from .dataset import BaseDataset
+
+_logger = logging.getLogger(__name__)
+
+__all__ = ["SampleCache", "CachedDataset"]
+
+
+class SampleCache:
+    """
+    A node-local, file-backed cache of decoded samples shared by all workers and processes on a node.
+
+    Each sample is stored as a directory of `.npy` files (one per column) that is read back with memory mapping, so a
+    cache hit costs a page-cache read instead of decoding the sample again. Entries are keyed by the sample index and
+    a hash of the configuration that produced them, written atomically, and evicted in least-recently-used order once
+    the cache exceeds `max_size_gb`.
+
+    Args:
+        cache_dir: Directory of the cache, preferably on a local NVMe drive.
+        max_size_gb: Maximum size of the cache in GB. Default: 100.
+        config: Any JSON-serializable configuration that affects the cached samples (e.g. resolution, number of
+            frames). Samples cached with a different configuration are never returned. Default: None.
+
+    Examples:
+        >>> cache = SampleCache("/local_nvme/cache", max_size_gb=200, config={"size": 256, "frames": 16})
+        >>> dataloader = create_dataloader(dataset, batch_size=4, transforms=transforms, cache=cache)
+        >>> ...
+        >>> print(cache.stats())
+    """
+
+    def __init__(self, cache_dir: str, max_size_gb: float = 100, config: Optional[Dict[str, Any]] = None):
+        self.cache_dir = cache_dir
+        self.max_size = int(max_size_gb * 1024**3)
+        self.config_hash = hashlib.sha1(json.dumps(config, sort_keys=True, default=str).encode()).hexdigest()[:16]
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._size = self._scan()[1]
+
+    def _key_dir(self, idx: int) -> str:
+        return os.path.join(self.cache_dir, f"{self.config_hash}_{idx}")
+
+    def _scan(self):
+        entries, total = [], 0
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            if name.startswith(".") or not os.path.isdir(path):
+                continue
+            try:
+                size = sum(e.stat().st_size for e in os.scandir(path))
+                entries.append((os.stat(path).st_mtime, size, path))
+            except FileNotFoundError:  # evicted by another process
+                continue
+            total += size
+        return entries, total
+
+    def get(self, idx: int, num_columns: Optional[int] = None) -> Optional[Tuple[np.ndarray, ...]]:
+        """
+        Returns the cached columns of sample `idx` as memory-mapped arrays, or `None` on a miss. If `num_columns` is
+        given, an entry with a different number of columns is a miss as well.
+        """
+        path = self._key_dir(idx)
+        try:
+            # entries are evicted by renaming them first, so `path` is either complete or missing, and arrays that are
+            # already mapped stay valid while the evicted files are deleted
+            found = len(os.listdir(path))
+            if num_columns is not None and found != num_columns:
+                raise ValueError(f"Expected {num_columns} columns in {path}, but got {found}.")
+            columns = tuple(np.load(os.path.join(path, f"{i}.npy"), mmap_mode="r") for i in range(found))
+            os.utime(path)  # mark as recently used for every process sharing the cache
+        except (FileNotFoundError, ValueError):
+            with self._lock:
+                self._misses += 1
+            return None
+        with self._lock:
+            self._hits += 1
+        return columns
+
+    def put(self, idx: int, columns: Tuple[Any, ...]):
+        """Stores the columns of sample `idx`. Columns that cannot be saved without pickling are not cached."""
+        arrays = [np.asarray(column) for column in columns]
+        if any(array.dtype == object for array in arrays):
+            return
+        tmp_path = os.path.join(self.cache_dir, f".tmp_{uuid.uuid4().hex}")
+        os.makedirs(tmp_path)
+        size = 0
+        for i, array in enumerate(arrays):
+            np.save(os.path.join(tmp_path, f"{i}.npy"), array)
+            size += os.path.getsize(os.path.join(tmp_path, f"{i}.npy"))
+        try:
+            os.rename(tmp_path, self._key_dir(idx))
+        except OSError:  # already cached by another worker
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            return
+
+        with self._lock:
+            self._size += size
+            need_evict = self._size > self.max_size
+        if need_evict:
+            self._evict()
+
+    def _evict(self):
+        # rescan, as other processes write to and evict from the same directory
+        entries, total = self._scan()
+        target = int(self.max_size * 0.9)
+        for _, size, path in sorted(entries):
+            if total <= target:
+                break
+            # take the entry out of the cache atomically, so that readers never see a partially deleted sample
+            evict_path = os.path.join(self.cache_dir, f".evict_{uuid.uuid4().hex}")
+            try:
+                os.rename(path, evict_path)
+            except FileNotFoundError:  # evicted by another process
+                continue
+            shutil.rmtree(evict_path, ignore_errors=True)
+            total -= size
+            with self._lock:
+                self._evictions += 1
+        with self._lock:
+            self._size = total
+
+    def stats(self) -> Dict[str, float]:
+        """Hit/miss counters of this process."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "evictions": self._evictions,
+                "size_gb": self._size / 1024**3,
+            }
+
+
+class CachedDataset:
+    """
+    Wraps a dataset so that its samples are read from a `SampleCache` when available. Transformations passed to the
+    dataloader are applied after the cache, so random augmentations stay random across epochs.
+
+    Args:
+        dataset: The dataset to cache.
+        cache: The cache to read from and write to.
+    """
+
+    def __init__(self, dataset: BaseDataset, cache: SampleCache):
+        self.dataset = dataset
+        self.cache = cache
+        self.output_columns = dataset.output_columns
+
+    def __getitem__(self, idx):
+        columns = self.cache.get(idx, num_columns=len(self.output_columns))
+        if columns is None:
+            columns = self.dataset[idx]
+            if not isinstance(columns, tuple):
+                columns = (columns,)
+            self.cache.put(idx, columns)
+        return columns
+
+    def __len__(self):
+        return len(self.dataset)
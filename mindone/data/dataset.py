@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional, Sequence, Tuple
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
 
 
 class BaseDataset(ABC):
@@ -11,6 +11,13 @@ class BaseDataset(ABC):
         pad_info: When it is not None, that dataloader will call `padded_batch` instead of `pad` in the final step, and
             `pad_info` will be passed as an argument in `padded_batch` method. For detail usage, please check
             https://www.mindspore.cn/docs/en/master/api_python/dataset/dataset_method/batch/mindspore.dataset.Dataset.padded_batch.html
+
+    Optional methods:
+        get_bucket_key: Required by bucketed batching in `create_dataloader`. Returns the bucket of a sample (e.g.
+            aspect ratio, number of frames or token length), all samples of a bucket must have the same shape after
+            transformations. Must be cheap, i.e. rely on metadata instead of decoding the sample.
+        get_bucket_cost: Required by bucketed batching with a batch budget. Returns the cost (e.g. number of tokens or
+            pixels) of one sample of a bucket.
     """
 
     output_columns: List[str]
@@ -24,6 +31,12 @@ class BaseDataset(ABC):
     def __len__(self):
         ...
 
+    def get_bucket_key(self, idx: int) -> Hashable:
+        raise NotImplementedError(f"{type(self).__name__} does not support bucketing.")
+
+    def get_bucket_cost(self, key: Hashable) -> int:
+        raise NotImplementedError(f"{type(self).__name__} does not support bucketing with a batch budget.")
+
     @staticmethod
     @abstractmethod
     def train_transforms(**kwargs) -> List[dict]:
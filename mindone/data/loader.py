@@ -5,7 +5,9 @@ import mindspore as ms
 from mindspore.communication import get_local_rank, get_local_rank_size
 
 from ..utils.version_control import MS_VERSION
+from .cache import CachedDataset, SampleCache
 from .dataset import BaseDataset
+from .sampler import BucketBatchSampler
 
 _logger = logging.getLogger(__name__)
 
@@ -28,6 +30,10 @@ def create_dataloader(
     rank_id: int = 0,
     debug: bool = False,
     enable_modelarts: bool = False,
+    cache: Optional[SampleCache] = None,
+    bucketing: bool = False,
+    batch_budget: Optional[int] = None,
+    seed: int = 42,
 ) -> ms.dataset.BatchDataset:
     """
     Builds and returns a DataLoader for the given dataset.
@@ -67,6 +73,15 @@ def create_dataloader(
         rank_id: The rank ID of the current device. Default is 0.
         debug: Whether to enable debug mode. Default is False.
         enable_modelarts: Whether to enable modelarts (OpenI) support. Default is False.
+        cache: Optional node-local cache of the samples returned by the dataset, shared by all workers on a node.
+               `transforms` are applied after the cache. Default is None (no caching).
+        bucketing: Whether to group samples into fixed-shape batches by the key returned by
+                   `dataset.get_bucket_key()` (see `BucketBatchSampler`). Static shapes per bucket also avoid graph
+                   recompilation. Default is False.
+        batch_budget: Only used with `bucketing`. Maximum total cost (e.g. tokens or pixels, see
+                      `dataset.get_bucket_cost()`) of a batch, `batch_size` is then the maximum number of samples per
+                      batch. Default is None (fixed batch size).
+        seed: Only used with `bucketing`. Seed of the shuffling, must be the same on all devices. Default is 42.
 
     Returns:
         ms.dataset.BatchDataset: The DataLoader for the given dataset.
@@ -82,15 +97,32 @@ def create_dataloader(
         device_num = get_local_rank_size()
         rank_id = get_local_rank() % 8
 
+    source = CachedDataset(dataset, cache) if cache is not None else dataset
+    if bucketing:
+        if batch_size <= 0:
+            raise ValueError("Bucketing requires batching, but `batch_size` is 0.")
+        sampler = BucketBatchSampler(
+            dataset,
+            batch_size,
+            batch_budget=batch_budget,
+            shuffle=shuffle,
+            drop_remainder=drop_remainder,
+            num_shards=device_num,
+            shard_id=rank_id,
+            seed=seed,
+        )
+        # the sampler shards and shuffles the batches itself
+        sampler_kwargs = {"sampler": sampler}
+    else:
+        sampler_kwargs = {"num_shards": device_num, "shard_id": rank_id, "shuffle": shuffle}
+
     dataloader = ms.dataset.GeneratorDataset(
-        dataset,
+        source,
         column_names=dataset.output_columns,
         num_parallel_workers=num_workers_dataset,
-        num_shards=device_num,
-        shard_id=rank_id,
         # file reading is not CPU bounded => use multithreading for reading images and labels
         python_multiprocessing=False,
-        shuffle=shuffle,
+        **sampler_kwargs,
     )
 
     map_kwargs = {}
@@ -111,7 +143,12 @@ def create_dataloader(
                 **map_kwargs,
             )
 
-    if getattr(dataset, "pad_info", None):
+    if bucketing:
+        # batches are already complete in the sampler's order, only their size varies between buckets
+        dataloader = dataloader.batch(
+            sampler.get_batch_size, drop_remainder=False, num_parallel_workers=num_workers_batch
+        )
+    elif getattr(dataset, "pad_info", None):
         if batch_size > 0:
             dataloader = dataloader.padded_batch(
                 batch_size,
@@ -119,22 +156,20 @@ def create_dataloader(
                 num_parallel_workers=num_workers_batch,
                 pad_info=dataset.pad_info,
             )
-    else:
-        if batch_size > 0:
-            dataloader = dataloader.batch(
-                batch_size, drop_remainder=drop_remainder, num_parallel_workers=num_workers_batch
+    elif batch_size > 0:
+        dataloader = dataloader.batch(batch_size, drop_remainder=drop_remainder, num_parallel_workers=num_workers_batch)
+
+    if batch_transforms is not None and (bucketing or (batch_size > 0 and not getattr(dataset, "pad_info", None))):
+        if isinstance(batch_transforms, dict):
+            batch_transforms = [batch_transforms]
+
+        for batch_transform in batch_transforms:
+            dataloader = dataloader.map(
+                **batch_transform,
+                python_multiprocessing=python_multiprocessing,
+                num_parallel_workers=num_workers,
+                max_rowsize=max_rowsize,
             )
-            if batch_transforms is not None:
-                if isinstance(batch_transforms, dict):
-                    batch_transforms = [batch_transforms]
-
-                for batch_transform in batch_transforms:
-                    dataloader = dataloader.map(
-                        **batch_transform,
-                        python_multiprocessing=python_multiprocessing,
-                        num_parallel_workers=num_workers,
-                        max_rowsize=max_rowsize,
-                    )
 
     if project_columns:
         dataloader = dataloader.project(project_columns)
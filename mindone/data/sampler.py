@@ -0,0 +1,100 @@
+import random
+from collections import defaultdict
+from typing import Hashable, Iterator, List, Optional
+
+from .dataset import BaseDataset
+
+__all__ = ["BucketBatchSampler"]
+
+
+class BucketBatchSampler:
+    """
+    Groups samples into buckets by the key returned by `dataset.get_bucket_key(idx)` (e.g. aspect ratio, number of
+    frames, token length) and yields sample indices so that every batch comes from a single bucket and thus has a
+    fixed shape. The batch size of a bucket is either fixed or derived from a per-batch budget of tokens / pixels and
+    the cost of one sample of the bucket, given by `dataset.get_bucket_cost(key)`.
+
+    The batches of an epoch only depend on `seed` and the epoch number, so all shards build the same plan and take
+    every `num_shards`-th batch of it, with the same number of batches per shard.
+
+    Args:
+        dataset: The dataset to sample from. Must implement `get_bucket_key()`, and `get_bucket_cost()` if
+            `batch_budget` is set.
+        batch_size: Number of samples per batch, or the maximum number of samples per batch if `batch_budget` is set.
+        batch_budget: Maximum total cost (e.g. tokens or pixels) of a batch. Default: None (fixed batch size).
+        shuffle: Whether to shuffle samples within buckets and the order of batches. Default: True.
+        drop_remainder: Whether to drop incomplete batches of each bucket. Default: True.
+        num_shards: The number of devices to distribute the batches across. Default: 1.
+        shard_id: The rank ID of the current device. Default: 0.
+        seed: Seed of the shuffling. Default: 42.
+    """
+
+    def __init__(
+        self,
+        dataset: BaseDataset,
+        batch_size: int,
+        batch_budget: Optional[int] = None,
+        shuffle: bool = True,
+        drop_remainder: bool = True,
+        num_shards: int = 1,
+        shard_id: int = 0,
+        seed: int = 42,
+    ):
+        self.batch_size = batch_size
+        self.batch_budget = batch_budget
+        self.shuffle = shuffle
+        self.drop_remainder = drop_remainder
+        self.num_shards = num_shards
+        self.shard_id = shard_id
+        self.seed = seed
+
+        buckets = defaultdict(list)
+        for idx in range(len(dataset)):
+            buckets[dataset.get_bucket_key(idx)].append(idx)
+        # sort for a plan that doesn't depend on the iteration order of the dataset metadata
+        self._buckets = sorted(buckets.items(), key=lambda x: str(x[0]))
+        self._bucket_batch_sizes = {key: self._get_bucket_batch_size(dataset, key) for key, _ in self._buckets}
+
+        self._epoch = 0
+        self._plans = {}
+
+    def _get_bucket_batch_size(self, dataset: BaseDataset, key: Hashable) -> int:
+        if self.batch_budget is None:
+            return self.batch_size
+        return max(1, min(self.batch_size, self.batch_budget // dataset.get_bucket_cost(key)))
+
+    def get_batches(self, epoch: int) -> List[List[int]]:
+        """Returns the batches of sample indices of this shard for `epoch`."""
+        if epoch not in self._plans:
+            rng = random.Random(self.seed + epoch)
+            batches = []
+            for key, indices in self._buckets:
+                if self.shuffle:
+                    indices = indices.copy()
+                    rng.shuffle(indices)
+                bs = self._bucket_batch_sizes[key]
+                for i in range(0, len(indices), bs):
+                    batch = indices[i : i + bs]
+                    if len(batch) < bs and self.drop_remainder:
+                        continue
+                    batches.append(batch)
+            if self.shuffle:
+                rng.shuffle(batches)
+            num_batches = len(batches) // self.num_shards * self.num_shards
+            # keep only the current and the next epochs, the pipeline may prefetch into the next one
+            self._plans = {e: p for e, p in self._plans.items() if e >= epoch - 1}
+            self._plans[epoch] = batches[self.shard_id : num_batches : self.num_shards]
+        return self._plans[epoch]
+
+    def get_batch_size(self, batch_info) -> int:
+        """Batch size callable for `mindspore.dataset.Dataset.batch()`."""
+        return len(self.get_batches(batch_info.get_epoch_num())[batch_info.get_batch_num()])
+
+    def __iter__(self) -> Iterator[int]:
+        batches = self.get_batches(self._epoch)
+        self._epoch += 1
+        for batch in batches:
+            yield from batch
+
+    def __len__(self) -> int:
+        return sum(len(batch) for batch in self.get_batches(0))
@@ -1,3 +1,5 @@
+from typing import Optional, Sequence, Tuple
+
 import cv2
 import numpy as np
 
@@ -23,11 +25,13 @@ class VideoReader:
         ...     fps = reader.fps
         ...     total_frames = len(reader)
         ...     frames = reader.fetch_frames(num=10, start_pos=10, step=2)
+        ...     frames = reader.fetch_indices([0, 4, 5, 12], size=(256, 256))
     """
 
     def __init__(self, video_path: str):
         self._video_path = video_path
         self._cap = None
+        self._pos = 0  # index of the next frame to be decoded
         self.shape = (0, 0)
         self.fps = 0
 
@@ -35,6 +39,7 @@ class VideoReader:
         self._cap = cv2.VideoCapture(self._video_path, apiPreference=cv2.CAP_FFMPEG)
         if not self._cap.isOpened():
             raise IOError(f"Video {self._video_path} cannot be opened.")
+        self._pos = 0
         self.shape = int(self._cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(self._cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
         self.fps = self._cap.get(cv2.CAP_PROP_FPS)
         return self
@@ -45,7 +50,14 @@ class VideoReader:
     def __len__(self) -> int:
         return int(self._cap.get(cv2.CAP_PROP_FRAME_COUNT))
 
-    def fetch_frames(self, num: int = 0, start_pos: int = 0, step: int = 1) -> np.ndarray:
+    def fetch_frames(
+        self,
+        num: int = 0,
+        start_pos: int = 0,
+        step: int = 1,
+        size: Optional[Tuple[int, int]] = None,
+        crop: Optional[Tuple[int, int, int, int]] = None,
+    ) -> np.ndarray:
         """
         Fetches a sequence of frames from the video starting at a specified position with a specified step.
 
@@ -54,6 +66,9 @@ class VideoReader:
             start_pos: The frame index to start fetching from. Default: 0.
             step: The interval at which frames are fetched from the video: a step of N returns every Nth frame.
                   Default: 1 (no frame skipping).
+            size: Output (width, height) to resize frames to during decoding. Default: None (no resizing).
+            crop: Region (x, y, width, height) to crop from frames during decoding, applied before resizing.
+                  Default: None (no cropping).
 
         Returns:
             np.ndarray: An array containing the fetched frames.
@@ -68,19 +83,71 @@ class VideoReader:
 
         if start_pos:
             start_pos = min(start_pos, len(self) - min_len)
-            self._cap.set(cv2.CAP_PROP_POS_FRAMES, start_pos)
-
-        frames = []
-        i = start_pos
-        ret, frame = self._cap.read()
-        while ret and len(frames) < num:
-            frames.append(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
-            if step > 1:
-                i += step
-                self._cap.set(cv2.CAP_PROP_POS_FRAMES, i)
-            ret, frame = self._cap.read()
+        else:
+            start_pos = self._pos  # continue from the current position
+
+        return self.fetch_indices(range(start_pos, start_pos + min_len, step), size=size, crop=crop)
 
-        if len(frames) != num:
-            raise RuntimeError(f"Failed to read {num} frames from {self._video_path}.")
+    def fetch_indices(
+        self,
+        indices: Sequence[int],
+        size: Optional[Tuple[int, int]] = None,
+        crop: Optional[Tuple[int, int, int, int]] = None,
+    ) -> np.ndarray:
+        """
+        Fetches frames at arbitrary indices. The stream is walked sequentially from the smallest index: skipped frames
+        are only grabbed, without seeking or color conversion, and requested frames are written directly into a
+        preallocated array.
+
+        Parameters:
+            indices: Frame indices to fetch, in any order and possibly repeated.
+            size: Output (width, height) to resize frames to during decoding. Default: None (no resizing).
+            crop: Region (x, y, width, height) to crop from frames during decoding, applied before resizing.
+                  Default: None (no cropping).
 
-        return np.stack(frames)
+        Returns:
+            np.ndarray: An array of shape (len(indices), H, W, 3) of RGB uint8 frames, in the order of `indices`.
+
+        Raises:
+            RuntimeError: If the requested frames cannot be fetched.
+        """
+        indices = list(indices)
+        targets = sorted(set(indices))
+        if not targets:
+            raise ValueError("No frame indices to fetch.")
+        if targets[0] < 0:
+            raise ValueError(f"Frame indices must be non-negative, but got {targets[0]}.")
+        slot = {idx: i for i, idx in enumerate(targets)}
+
+        # a single seek to the first frame, the rest is decoded sequentially
+        if targets[0] != self._pos:
+            self._cap.set(cv2.CAP_PROP_POS_FRAMES, targets[0])
+            self._pos = targets[0]
+
+        frames = None
+        for idx in targets:
+            while self._pos < idx:
+                if not self._cap.grab():
+                    raise RuntimeError(f"Failed to read frame {idx} from {self._video_path}.")
+                self._pos += 1
+            ret, frame = self._cap.read()
+            if not ret:
+                raise RuntimeError(f"Failed to read frame {idx} from {self._video_path}.")
+            self._pos += 1
+
+            if crop is not None:
+                x, y, w, h = crop
+                frame = frame[y : y + h, x : x + w]
+            if frames is None:
+                h, w = (size[1], size[0]) if size is not None else frame.shape[:2]
+                frames = np.empty((len(targets), h, w, 3), dtype=np.uint8)
+            out = frames[slot[idx]]
+            if size is not None:
+                cv2.resize(frame, size, dst=out, interpolation=cv2.INTER_AREA)
+                cv2.cvtColor(out, cv2.COLOR_BGR2RGB, dst=out)
+            else:
+                cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=out)
+
+        if len(indices) == len(targets) and indices == targets:
+            return frames
+        return frames[[slot[idx] for idx in indices]]
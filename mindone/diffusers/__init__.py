@@ -31,13 +31,20 @@ _import_structure = {
         "FirstBlockCacheConfig",
         "HookRegistry",
         "LayerSkipConfig",
+        "MagCacheConfig",
+        "PromptEmbedsCacheConfig",
         "PyramidAttentionBroadcastConfig",
         "SmoothedEnergyGuidanceConfig",
+        "TeaCacheConfig",
         "apply_faster_cache",
         "apply_first_block_cache",
+        "apply_group_offloading",
         "apply_layer_skip",
         "apply_layerwise_casting",
+        "apply_magcache",
+        "apply_prompt_embeds_cache",
         "apply_pyramid_attention_broadcast",
+        "apply_teacache",
     ],
     "loaders": ["FromOriginalModelMixin"],
     "modular_pipelines": [
@@ -198,6 +205,7 @@ _import_structure = {
         "DDIMPipeline",
         "DDPMPipeline",
         "DiffusionPipeline",
+        "DiffusionServingEngine",
         "DiTPipeline",
         "EasyAnimateControlPipeline",
         "EasyAnimateInpaintPipeline",
@@ -446,13 +454,20 @@ if TYPE_CHECKING:
         FirstBlockCacheConfig,
         HookRegistry,
         LayerSkipConfig,
+        MagCacheConfig,
+        PromptEmbedsCacheConfig,
         PyramidAttentionBroadcastConfig,
         SmoothedEnergyGuidanceConfig,
+        TeaCacheConfig,
         apply_faster_cache,
         apply_first_block_cache,
+        apply_group_offloading,
         apply_layer_skip,
         apply_layerwise_casting,
+        apply_magcache,
+        apply_prompt_embeds_cache,
         apply_pyramid_attention_broadcast,
+        apply_teacache,
     )
     from .models import (
         AllegroTransformer3DModel,
@@ -611,6 +626,7 @@ if TYPE_CHECKING:
         DDIMPipeline,
         DDPMPipeline,
         DiffusionPipeline,
+        DiffusionServingEngine,
         DiTPipeline,
         EasyAnimateControlPipeline,
         EasyAnimateInpaintPipeline,
@@ -14,9 +14,19 @@
 
 from .context_parallel import apply_context_parallel
 from .faster_cache import FasterCacheConfig, apply_faster_cache
-from .first_block_cache import FirstBlockCacheConfig, apply_first_block_cache
+from .first_block_cache import FirstBlockCacheConfig, allocate_first_block_cache, apply_first_block_cache
+from .group_offloading import apply_group_offloading
 from .hooks import HookRegistry, ModelHook
 from .layer_skip import LayerSkipConfig, apply_layer_skip
 from .layerwise_casting import apply_layerwise_casting, apply_layerwise_casting_hook
+from .prompt_embeds_cache import PromptEmbedsCacheConfig, apply_prompt_embeds_cache
 from .pyramid_attention_broadcast import PyramidAttentionBroadcastConfig, apply_pyramid_attention_broadcast
 from .smoothed_energy_guidance_utils import SmoothedEnergyGuidanceConfig
+from .teacache import (
+    MagCacheConfig,
+    TeaCacheConfig,
+    apply_magcache,
+    apply_teacache,
+    fit_magcache_ratios,
+    fit_teacache_coefficients,
+)
@@ -12,10 +12,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import inspect
+import types
 from dataclasses import dataclass
-from typing import Tuple, Union
+from typing import Optional, Tuple, Union
 
 import mindspore as ms
+from mindspore import mint, ops
 
 from ..utils import get_logger
 from ..utils.mindspore_utils import unwrap_module
@@ -43,9 +46,17 @@ class FirstBlockCacheConfig:
             speedup. The threshold is compared against the absmean difference of the residuals between the current and
             cached outputs from the first transformer block. If the difference is below the threshold, the forward pass
             is skipped.
+        graph_mode (`bool`, defaults to `False`):
+            If `True`, the `construct` of the blocks is patched in place instead of registering python hooks, and the
+            cached tensors are kept in parameters registered in the blocks, so that caching and graph compilation can
+            be combined. The cache parameters have static shapes: in `GRAPH_MODE` or under `ms.jit`, allocate them
+            with [`~hooks.first_block_cache.allocate_first_block_cache`] before the first call. The skip decision then
+            stays on device as a boolean tensor and is compiled as control flow. A single cache state is shared by all
+            the calls, so unbatched classifier-free guidance is not supported in this mode.
     """
 
     threshold: float = 0.05
+    graph_mode: bool = False
 
 
 class FBCSharedBlockState(BaseState):
@@ -187,6 +198,172 @@ class FBCBlockHook(ModelHook):
         return return_output
 
 
+class FBCGraphState(ms.nn.Cell):
+    r"""
+    The cache of the graph-mode First Block Cache. Its parameters are registered in every patched block, so that the
+    compiled blocks update them in place.
+    """
+
+    _PARAMETER_NAMES = (
+        "fbc_should_compute",
+        "fbc_is_initialized",
+        "fbc_head_block_residual",
+        "fbc_head_block_output",
+        "fbc_head_block_encoder_output",
+        "fbc_tail_block_residual",
+        "fbc_tail_block_encoder_residual",
+    )
+
+    def __init__(self, threshold: float) -> None:
+        super().__init__()
+        self.threshold = threshold
+        # `True` once the cache has been allocated with static shapes, the decision then stays on device
+        self.is_static = False
+        self.compute_remaining = True
+        # the patched blocks, they are not child cells of the state
+        object.__setattr__(self, "blocks", [])
+        self.fbc_should_compute = ms.Parameter(ms.Tensor(True), name="fbc_should_compute", requires_grad=False)
+        self.fbc_is_initialized = ms.Parameter(ms.Tensor(False), name="fbc_is_initialized", requires_grad=False)
+        self.fbc_head_block_residual = None
+        self.fbc_head_block_output = None
+        self.fbc_head_block_encoder_output = None
+        self.fbc_tail_block_residual = None
+        self.fbc_tail_block_encoder_residual = None
+
+    def allocate(
+        self,
+        hidden_states_shape: Tuple[int, ...],
+        encoder_hidden_states_shape: Optional[Tuple[int, ...]] = None,
+        dtype: ms.Type = ms.bfloat16,
+    ) -> None:
+        def _zeros(shape, name):
+            return ms.Parameter(mint.zeros(shape, dtype=dtype), name=name, requires_grad=False)
+
+        self.fbc_head_block_residual = _zeros(hidden_states_shape, "fbc_head_block_residual")
+        self.fbc_head_block_output = _zeros(hidden_states_shape, "fbc_head_block_output")
+        self.fbc_tail_block_residual = _zeros(hidden_states_shape, "fbc_tail_block_residual")
+        if encoder_hidden_states_shape is not None:
+            self.fbc_head_block_encoder_output = _zeros(encoder_hidden_states_shape, "fbc_head_block_encoder_output")
+            self.fbc_tail_block_encoder_residual = _zeros(
+                encoder_hidden_states_shape, "fbc_tail_block_encoder_residual"
+            )
+        for block in self.blocks:
+            self.register_parameters(block)
+        self.reset()
+
+    def register_parameters(self, block: ms.nn.Cell) -> None:
+        for name in self._PARAMETER_NAMES:
+            parameter = getattr(self, name)
+            if parameter is not None:
+                setattr(block, name, parameter)
+
+    def reset(self) -> None:
+        self.compute_remaining = True
+        self.fbc_should_compute.set_data(ms.Tensor(True))
+        self.fbc_is_initialized.set_data(ms.Tensor(False))
+
+
+def _get_fbc_graph_input(name, index, args, kwargs):
+    if name in kwargs:
+        return kwargs[name]
+    return args[index]
+
+
+def _split_fbc_graph_output(block, output):
+    if block._fbc_return_encoder_hidden_states_index is None:
+        return output, None
+    return output[block._fbc_return_hidden_states_index], output[block._fbc_return_encoder_hidden_states_index]
+
+
+def _pack_fbc_graph_output(block, hidden_states, encoder_hidden_states):
+    if block._fbc_return_encoder_hidden_states_index is None:
+        return hidden_states
+    if block._fbc_return_hidden_states_index == 0:
+        return hidden_states, encoder_hidden_states
+    return encoder_hidden_states, hidden_states
+
+
+def _fbc_graph_head_construct(self, *args, **kwargs):
+    r"""
+    Runs the first block and decides whether the remaining blocks are computed. When they are not, the cached residual
+    of the remaining blocks is added to the output of the first block. The decision is not read back to the host, the
+    cache is updated with `mint.where` on it.
+    """
+    state = self._fbc_state
+    hidden_states = _get_fbc_graph_input("hidden_states", self._fbc_hidden_states_arg_index, args, kwargs)
+    output = self._fbc_construct(*args, **kwargs)
+    head_hidden_states, head_encoder_hidden_states = _split_fbc_graph_output(self, output)
+
+    if not state.is_static:
+        if state.fbc_head_block_residual is None or state.fbc_head_block_residual.shape != head_hidden_states.shape:
+            # pynative mode, the cache is (re)allocated from the first call with new shapes
+            state.allocate(
+                head_hidden_states.shape,
+                None if head_encoder_hidden_states is None else head_encoder_hidden_states.shape,
+                head_hidden_states.dtype,
+            )
+
+    residual = head_hidden_states - hidden_states
+    prev_residual = self.fbc_head_block_residual
+    diff = (residual - prev_residual).abs().mean() / prev_residual.abs().mean()
+    should_compute = mint.logical_or(diff > self._fbc_threshold, mint.logical_not(self.fbc_is_initialized))
+    ops.assign(self.fbc_should_compute, should_compute)
+    ops.assign(self.fbc_head_block_residual, mint.where(should_compute, residual, prev_residual))
+    ops.assign(self.fbc_head_block_output, mint.where(should_compute, head_hidden_states, self.fbc_head_block_output))
+    if head_encoder_hidden_states is not None:
+        ops.assign(
+            self.fbc_head_block_encoder_output,
+            mint.where(should_compute, head_encoder_hidden_states, self.fbc_head_block_encoder_output),
+        )
+
+    head_hidden_states = mint.where(
+        should_compute, head_hidden_states, head_hidden_states + self.fbc_tail_block_residual
+    )
+    if head_encoder_hidden_states is not None:
+        head_encoder_hidden_states = mint.where(
+            should_compute,
+            head_encoder_hidden_states,
+            head_encoder_hidden_states + self.fbc_tail_block_encoder_residual,
+        )
+    return _pack_fbc_graph_output(self, head_hidden_states, head_encoder_hidden_states)
+
+
+def _fbc_graph_block_construct(self, *args, **kwargs):
+    r"""
+    Runs the block if the head block decided to compute the remaining blocks, passes its inputs through otherwise. The
+    tail block also caches the residual of the remaining blocks.
+    """
+    state = self._fbc_state
+    if state.is_static:
+        # compiled as control flow on the decision of the head block
+        should_compute = self.fbc_should_compute
+    else:
+        if self._fbc_reads_decision:
+            # pynative mode, the first of the remaining blocks reads the decision once per step
+            state.compute_remaining = bool(self.fbc_should_compute)
+        should_compute = state.compute_remaining
+
+    if should_compute:
+        output = self._fbc_construct(*args, **kwargs)
+        if self._fbc_is_tail:
+            hidden_states, encoder_hidden_states = _split_fbc_graph_output(self, output)
+            ops.assign(self.fbc_tail_block_residual, hidden_states - self.fbc_head_block_output)
+            if encoder_hidden_states is not None:
+                ops.assign(
+                    self.fbc_tail_block_encoder_residual, encoder_hidden_states - self.fbc_head_block_encoder_output
+                )
+            ops.assign(self.fbc_is_initialized, ms.Tensor(True))
+        return output
+
+    hidden_states = _get_fbc_graph_input("hidden_states", self._fbc_hidden_states_arg_index, args, kwargs)
+    if self._fbc_return_encoder_hidden_states_index is None:
+        return hidden_states
+    encoder_hidden_states = _get_fbc_graph_input(
+        "encoder_hidden_states", self._fbc_encoder_hidden_states_arg_index, args, kwargs
+    )
+    return _pack_fbc_graph_output(self, hidden_states, encoder_hidden_states)
+
+
 def apply_first_block_cache(module: ms.nn.Cell, config: FirstBlockCacheConfig) -> None:
     """
     Applies [First Block
@@ -220,6 +397,10 @@ def apply_first_block_cache(module: ms.nn.Cell, config: FirstBlockCacheConfig) -
         ```
     """
 
+    if config.graph_mode:
+        _apply_first_block_cache_graph(module, config)
+        return
+
     state_manager = StateManager(FBCSharedBlockState, (), {})
     remaining_blocks = []
 
@@ -253,3 +434,111 @@ def _apply_fbc_block_hook(block: ms.nn.Cell, state_manager: StateManager, is_tai
     registry = HookRegistry.check_if_exists_or_initialize(block)
     hook = FBCBlockHook(state_manager, is_tail)
     registry.register_hook(hook, _FBC_BLOCK_HOOK)
+
+
+def _get_block_lists(module: ms.nn.Cell):
+    return [
+        (name, submodule)
+        for name, submodule in module.cells_and_names()
+        if name in _ALL_TRANSFORMER_BLOCK_IDENTIFIERS and isinstance(submodule, ms.nn.CellList)
+    ]
+
+
+def _patch_fbc_graph_block(
+    block: ms.nn.Cell, state: FBCGraphState, construct, is_tail: bool = False, reads_decision: bool = False
+) -> None:
+    # The `construct` of the block is replaced in place, so that the block stays in its `CellList` and keeps its
+    # parameter names. Unlike hooks, the patched `construct` is a method of the block and can be compiled.
+    block_cls = unwrap_module(block).__class__
+    metadata = TransformerBlockRegistry.get(block_cls)
+    parameters = list(inspect.signature(block_cls.construct).parameters.keys())[1:]
+
+    # the state is shared by all the blocks, it is not registered as a child cell of any of them, but its parameters
+    # are registered in each of them so that the compiled blocks can update them
+    object.__setattr__(block, "_fbc_state", state)
+    object.__setattr__(block, "_fbc_previous_construct", block.__dict__.get("construct"))
+    state.blocks.append(block)
+    state.register_parameters(block)
+    block._fbc_construct = block.construct
+    block._fbc_threshold = state.threshold
+    block._fbc_is_tail = is_tail
+    block._fbc_reads_decision = reads_decision
+    block._fbc_return_hidden_states_index = metadata.return_hidden_states_index
+    block._fbc_return_encoder_hidden_states_index = metadata.return_encoder_hidden_states_index
+    block._fbc_hidden_states_arg_index = parameters.index("hidden_states")
+    block._fbc_encoder_hidden_states_arg_index = (
+        parameters.index("encoder_hidden_states") if "encoder_hidden_states" in parameters else None
+    )
+    block.construct = types.MethodType(construct, block)
+
+
+def _apply_first_block_cache_graph(module: ms.nn.Cell, config: FirstBlockCacheConfig) -> None:
+    state = FBCGraphState(config.threshold)
+    blocks = [
+        (f"{name}.{index}", block)
+        for name, block_list in _get_block_lists(module)
+        for index, block in enumerate(block_list)
+    ]
+
+    for i, (name, block) in enumerate(blocks):
+        if i == 0:
+            logger.debug(f"Patching '{name}' as the head block of the graph-mode First Block Cache")
+            _patch_fbc_graph_block(block, state, _fbc_graph_head_construct)
+        else:
+            logger.debug(f"Patching '{name}' as a block of the graph-mode First Block Cache")
+            _patch_fbc_graph_block(
+                block, state, _fbc_graph_block_construct, is_tail=i == len(blocks) - 1, reads_decision=i == 1
+            )
+
+
+def _remove_first_block_cache_graph(module: ms.nn.Cell) -> None:
+    for _, block_list in _get_block_lists(module):
+        for block in block_list:
+            if "_fbc_state" not in block.__dict__:
+                continue
+            previous_construct = block.__dict__["_fbc_previous_construct"]
+            for name in FBCGraphState._PARAMETER_NAMES:
+                if name in block._params:
+                    delattr(block, name)
+            for name in [name for name in block.__dict__ if name.startswith("_fbc_")]:
+                del block.__dict__[name]
+            if previous_construct is None:
+                del block.__dict__["construct"]
+            else:
+                block.construct = previous_construct
+
+
+def _get_first_block_cache_graph_state(module: ms.nn.Cell) -> Optional[FBCGraphState]:
+    for _, block_list in _get_block_lists(module):
+        for block in block_list:
+            if "_fbc_state" in block.__dict__:
+                return block.__dict__["_fbc_state"]
+    return None
+
+
+def allocate_first_block_cache(
+    module: ms.nn.Cell,
+    hidden_states_shape: Tuple[int, ...],
+    encoder_hidden_states_shape: Optional[Tuple[int, ...]] = None,
+    dtype: ms.Type = ms.bfloat16,
+) -> None:
+    r"""
+    Allocates the static-shape cache of a First Block Cache applied with `graph_mode=True`. Required before the first
+    call in `GRAPH_MODE` or under `ms.jit`: the skip decision then stays on device and the remaining blocks branch on
+    it. Without it, in PyNative mode, the cache is allocated from the first call and the decision is read once per step.
+
+    Args:
+        module (`ms.nn.Cell`):
+            The module First Block Cache has been applied to.
+        hidden_states_shape (`Tuple[int, ...]`):
+            The shape of the `hidden_states` output of the transformer blocks, e.g. `(batch_size, seq_len, inner_dim)`.
+        encoder_hidden_states_shape (`Tuple[int, ...]`, *optional*):
+            The shape of the `encoder_hidden_states` output of the transformer blocks, for blocks which return it.
+        dtype (`ms.Type`, defaults to `ms.bfloat16`):
+            The dtype of the hidden states.
+    """
+    state = _get_first_block_cache_graph_state(module)
+    if state is None:
+        raise ValueError("First Block Cache has not been applied with `graph_mode=True` to this module.")
+    state.allocate(hidden_states_shape, encoder_hidden_states_shape, dtype)
+    state.is_static = True
@@ -0,0 +1,459 @@
+# Copyright 2025 The HuggingFace Team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import functools
+from contextlib import nullcontext
+from enum import Enum
+from typing import Callable, Dict, List, Optional
+
+import mindspore as ms
+from mindspore import nn
+
+from ..utils import get_logger
+from ._common import _GO_LC_SUPPORTED_PYTORCH_LAYERS
+from .hooks import HookRegistry, ModelHook
+
+logger = get_logger(__name__)  # pylint: disable=invalid-name
+
+
+# fmt: off
+_GROUP_OFFLOADING = "group_offloading"
+_MODEL_OFFLOADING = "model_offloading"
+# fmt: on
+
+# methods which pipelines call directly instead of `construct`, e.g. `vae.decode(latents)`. The offloading hooks apply
+# to them as well, as `apply_forward_hook` does for the accelerate hooks in diffusers.
+_ENTRY_METHODS = ("encode", "decode", "tiled_encode", "tiled_decode")
+
+
+class GroupOffloadingType(str, Enum):
+    BLOCK_LEVEL = "block_level"
+    LEAF_LEVEL = "leaf_level"
+
+
+class ModuleGroup:
+    r"""
+    A group of parameters which are moved between the offload (host) and the onload (device) memory together.
+
+    The host copy of each parameter is created once and kept, so offloading a group only drops the device copy, and
+    onloading it is a single host-to-device copy per parameter. With `low_cpu_mem_usage=True`, no host copy is kept
+    while the group is on device, and offloading copies the parameters back to host instead.
+
+    Args:
+        modules (`List[nn.Cell]`):
+            The modules whose parameters belong to the group.
+        onload_device (`str`):
+            The device the parameters are moved to for computation, e.g. `"Ascend"`.
+        offload_device (`str`):
+            The device the parameters are stored on between computations, e.g. `"CPU"`.
+        offload_leader (`nn.Cell`):
+            The module after whose forward pass the group is offloaded.
+        onload_leader (`nn.Cell`, *optional*):
+            The module before whose forward pass the group is onloaded. Defaults to `offload_leader`.
+        parameters (`List[ms.Parameter]`, *optional*):
+            Extra parameters of the group, not owned by `modules`.
+        non_blocking (`bool`, defaults to `False`):
+            Whether the host-to-device copies are asynchronous.
+        stream (`ms.runtime.Stream`, *optional*):
+            If set, onloading is issued on this stream, so it overlaps with the computation on the current stream.
+        low_cpu_mem_usage (`bool`, defaults to `False`):
+            Whether to avoid keeping the host copy of the parameters while they are on device.
+    """
+
+    def __init__(
+        self,
+        modules: List[nn.Cell],
+        onload_device: str,
+        offload_device: str,
+        offload_leader: nn.Cell,
+        onload_leader: Optional[nn.Cell] = None,
+        parameters: Optional[List[ms.Parameter]] = None,
+        non_blocking: bool = False,
+        stream=None,
+        low_cpu_mem_usage: bool = False,
+    ) -> None:
+        self.modules = modules
+        self.onload_device = onload_device
+        self.offload_device = offload_device
+        self.offload_leader = offload_leader
+        self.onload_leader = onload_leader if onload_leader is not None else offload_leader
+        self.non_blocking = non_blocking or stream is not None
+        self.stream = stream
+        self.low_cpu_mem_usage = low_cpu_mem_usage
+
+        self.parameters = []
+        seen = set()
+        all_parameters = [p for module in modules for p in module.get_parameters()] + list(parameters or [])
+        for param in all_parameters:
+            if id(param) not in seen:
+                seen.add(id(param))
+                self.parameters.append(param)
+        self._host_data = None
+        self.onloaded = True
+
+    def onload_(self) -> None:
+        r"""Moves the parameters of the group to the onload device, no-op if they are already there."""
+        if self.onloaded:
+            return
+        context = nullcontext() if self.stream is None else ms.runtime.StreamCtx(self.stream)
+        with context:
+            for param, data in zip(self.parameters, self._host_data):
+                param.set_data(data.move_to(self.onload_device, blocking=not self.non_blocking))
+        if self.low_cpu_mem_usage:
+            self._host_data = None
+        self.onloaded = True
+
+    def offload_(self) -> None:
+        r"""Moves the parameters of the group to the offload device, no-op if they are already there."""
+        if not self.onloaded:
+            return
+        if self._host_data is None:
+            self._host_data = [param.move_to(self.offload_device, blocking=True) for param in self.parameters]
+        for param, data in zip(self.parameters, self._host_data):
+            param.set_data(data)
+        self.onloaded = False
+
+    def wait_(self) -> None:
+        r"""Makes the current stream wait for the pending onloading of the group."""
+        if self.stream is not None:
+            ms.runtime.current_stream().wait_stream(self.stream)
+
+
+class GroupOffloadingHook(ModelHook):
+    r"""
+    A hook that onloads a group of parameters before the forward pass of its onload leader, and offloads it after the
+    forward pass of its offload leader. The next group in execution order, if any, is prefetched as soon as the current
+    one starts computing.
+    """
+
+    _is_stateful = False
+
+    def __init__(self, group: ModuleGroup, next_group: Optional[ModuleGroup] = None) -> None:
+        self.group = group
+        self.next_group = next_group
+
+    def initialize_hook(self, module: nn.Cell) -> nn.Cell:
+        if self.group.offload_leader is module:
+            self.group.offload_()
+        if self.group.onload_leader is module and self.group.offload_leader is module:
+            self._wrapped_methods = _wrap_entry_methods(module, self)
+        return module
+
+    def deinitalize_hook(self, module: nn.Cell) -> nn.Cell:
+        _unwrap_entry_methods(module, getattr(self, "_wrapped_methods", {}))
+        self.group.onload_()
+        self.group.wait_()
+        return module
+
+    def call_entry_method(self, module: nn.Cell, method, *args, **kwargs):
+        if self.group.onloaded:  # e.g. `encode` called by the forward pass of `module`
+            return method(*args, **kwargs)
+        self.pre_construct(module)
+        return self.post_construct(module, method(*args, **kwargs))
+
+    def pre_construct(self, module: nn.Cell, *args, **kwargs):
+        if self.group.onload_leader is module:
+            self.group.onload_()
+            self.group.wait_()
+            if self.next_group is not None:
+                self.next_group.onload_()
+        return args, kwargs
+
+    def post_construct(self, module: nn.Cell, output):
+        if self.group.offload_leader is module:
+            self.group.offload_()
+        return output
+
+
+class ModelOffloadHook(ModelHook):
+    r"""
+    A hook that keeps one model of a set on device at a time: before the forward pass of its module, every other model
+    of the set is offloaded and the module is onloaded. The module stays on device until another model of the set runs.
+    """
+
+    _is_stateful = False
+
+    def __init__(self, group: ModuleGroup, peers: List["ModelOffloadHook"]) -> None:
+        self.group = group
+        # shared by all the hooks of the set
+        self.peers = peers
+
+    def initialize_hook(self, module: nn.Cell) -> nn.Cell:
+        self.group.offload_()
+        self._wrapped_methods = _wrap_entry_methods(module, self)
+        return module
+
+    def deinitalize_hook(self, module: nn.Cell) -> nn.Cell:
+        _unwrap_entry_methods(module, self._wrapped_methods)
+        self.group.onload_()
+        if self in self.peers:
+            self.peers.remove(self)
+        return module
+
+    def call_entry_method(self, module: nn.Cell, method, *args, **kwargs):
+        self.pre_construct(module)
+        return method(*args, **kwargs)
+
+    def pre_construct(self, module: nn.Cell, *args, **kwargs):
+        if not self.group.onloaded:
+            for hook in self.peers:
+                if hook is not self:
+                    hook.offload()
+            self.group.onload_()
+        return args, kwargs
+
+    def offload(self) -> None:
+        self.group.offload_()
+
+
+def _wrap_entry_methods(module: nn.Cell, hook: ModelHook) -> Dict[str, Optional[Callable]]:
+    # returns the previous instance attributes of the wrapped methods, to restore them when the hook is removed
+    wrapped = {}
+    for name in _ENTRY_METHODS:
+        method = getattr(module, name, None)
+        if not callable(method):
+            continue
+        wrapped[name] = module.__dict__.get(name)
+        entry = functools.partial(hook.call_entry_method, module, method)
+        setattr(module, name, functools.update_wrapper(entry, method))
+    return wrapped
+
+
+def _unwrap_entry_methods(module: nn.Cell, wrapped: Dict[str, Optional[Callable]]) -> None:
+    for name, method in wrapped.items():
+        if method is None:
+            delattr(module, name)
+        else:
+            setattr(module, name, method)
+
+
+def apply_group_offloading(
+    module: nn.Cell,
+    onload_device: str = "Ascend",
+    offload_device: str = "CPU",
+    offload_type: str = "block_level",
+    num_blocks_per_group: Optional[int] = None,
+    non_blocking: bool = False,
+    use_stream: bool = False,
+    record_stream: bool = False,
+    low_cpu_mem_usage: bool = False,
+) -> None:
+    r"""
+    Applies group offloading to the internal layers of a mindspore cell. Groups of layers are kept on the offload
+    device and moved to the onload device only for their own forward pass, which bounds the device memory used by the
+    weights to a few groups at a time.
+
+    - `"block_level"` offloading groups `num_blocks_per_group` consecutive blocks of each `nn.CellList` or
+      `nn.SequentialCell` child of `module`. The remaining layers and parameters of `module` form one more group,
+      onloaded for the whole forward pass of `module`.
+    - `"leaf_level"` offloading makes one group of each leaf layer (linear and convolution layers), the remaining
+      parameters of `module` form one more group, onloaded for the whole forward pass of `module`.
+
+    With `use_stream=True`, the next group is prefetched on a side stream while the current one computes. Groups are
+    prefetched in declaration order, which is the execution order of the blocks of most diffusion transformers; a
+    mismatch only costs the overlap, never correctness, since every group is onloaded before it runs.
+
+    Example:
+
+    ```python
+    >>> from mindone.diffusers import CogVideoXTransformer3DModel
+    >>> from mindone.diffusers.hooks import apply_group_offloading
+
+    >>> transformer = CogVideoXTransformer3DModel.from_pretrained(
+    ...     "THUDM/CogVideoX-5b", subfolder="transformer", mindspore_dtype=ms.bfloat16
+    ... )
+
+    >>> apply_group_offloading(
+    ...     transformer,
+    ...     onload_device="Ascend",
+    ...     offload_device="CPU",
+    ...     offload_type="block_level",
+    ...     num_blocks_per_group=2,
+    ...     use_stream=True,
+    ... )
+    ```
+
+    Args:
+        module (`nn.Cell`):
+            The module to which group offloading is applied.
+        onload_device (`str`, defaults to `"Ascend"`):
+            The device to which the group of modules are onloaded.
+        offload_device (`str`, defaults to `"CPU"`):
+            The device to which the group of modules are offloaded.
+        offload_type (`str`, defaults to `"block_level"`):
+            The type of offloading to be applied. Can be one of `"block_level"` or `"leaf_level"`.
+        num_blocks_per_group (`int`, *optional*):
+            The number of blocks per group when using `offload_type="block_level"`. This is required when using
+            `offload_type="block_level"`.
+        non_blocking (`bool`, defaults to `False`):
+            If `True`, onloading and offloading are asynchronous host-device copies.
+        use_stream (`bool`, defaults to `False`):
+            If `True`, onloading is done on a side stream and the next group is prefetched while the current one
+            computes.
+        record_stream (`bool`, defaults to `False`):
+            Unused, mindspore keeps the memory of a tensor alive until the streams using it are done.
+        low_cpu_mem_usage (`bool`, defaults to `False`):
+            If `True`, the host copy of the weights is not kept while they are on device. This reduces the host memory
+            usage at the cost of a device-to-host copy at each offloading.
+    """
+    offload_type = GroupOffloadingType(offload_type)
+    if record_stream:
+        logger.warning("`record_stream` has no effect with mindspore and is ignored.")
+
+    stream = None
+    if use_stream:
+        stream = ms.runtime.Stream()
+
+    if offload_type == GroupOffloadingType.BLOCK_LEVEL:
+        if num_blocks_per_group is None:
+            raise ValueError("`num_blocks_per_group` must be provided when using `offload_type='block_level'.")
+        _apply_group_offloading_block_level(
+            module, num_blocks_per_group, onload_device, offload_device, non_blocking, stream, low_cpu_mem_usage
+        )
+    else:
+        _apply_group_offloading_leaf_level(
+            module, onload_device, offload_device, non_blocking, stream, low_cpu_mem_usage
+        )
+
+
+def _apply_group_offloading_block_level(
+    module: nn.Cell,
+    num_blocks_per_group: int,
+    onload_device: str,
+    offload_device: str,
+    non_blocking: bool,
+    stream=None,
+    low_cpu_mem_usage: bool = False,
+) -> None:
+    groups = []
+    for submodule in module.name_cells().values():
+        if not isinstance(submodule, (nn.CellList, nn.SequentialCell)):
+            continue
+        blocks = list(submodule.cells())
+        for i in range(0, len(blocks), num_blocks_per_group):
+            current_modules = blocks[i : i + num_blocks_per_group]
+            groups.append(
+                ModuleGroup(
+                    modules=current_modules,
+                    onload_device=onload_device,
+                    offload_device=offload_device,
+                    offload_leader=current_modules[-1],
+                    onload_leader=current_modules[0],
+                    non_blocking=non_blocking,
+                    stream=stream,
+                    low_cpu_mem_usage=low_cpu_mem_usage,
+                )
+            )
+
+    _apply_group_chain(module, groups, onload_device, offload_device, non_blocking, stream)
+
+
+def _apply_group_offloading_leaf_level(
+    module: nn.Cell,
+    onload_device: str,
+    offload_device: str,
+    non_blocking: bool,
+    stream=None,
+    low_cpu_mem_usage: bool = False,
+) -> None:
+    groups = []
+    for _, submodule in module.cells_and_names():
+        if submodule is module or not isinstance(submodule, _GO_LC_SUPPORTED_PYTORCH_LAYERS):
+            continue
+        groups.append(
+            ModuleGroup(
+                modules=[submodule],
+                onload_device=onload_device,
+                offload_device=offload_device,
+                offload_leader=submodule,
+                non_blocking=non_blocking,
+                stream=stream,
+                low_cpu_mem_usage=low_cpu_mem_usage,
+            )
+        )
+
+    _apply_group_chain(module, groups, onload_device, offload_device, non_blocking, stream)
+
+
+def _apply_group_chain(
+    module: nn.Cell,
+    groups: List[ModuleGroup],
+    onload_device: str,
+    offload_device: str,
+    non_blocking: bool,
+    stream=None,
+) -> None:
+    # parameters not owned by any group, e.g. embeddings, norms and parameters registered on `module` directly, are
+    # gathered in a group which lives on device for the whole forward pass of `module`
+    grouped = {id(p) for group in groups for p in group.parameters}
+    remaining = [p for p in module.get_parameters() if id(p) not in grouped]
+    root_group = ModuleGroup(
+        modules=[],
+        onload_device=onload_device,
+        offload_device=offload_device,
+        offload_leader=module,
+        parameters=remaining,
+        non_blocking=non_blocking,
+        stream=None,
+    )
+    for i, group in enumerate(groups):
+        next_group = groups[i + 1] if i + 1 < len(groups) and stream is not None else None
+        leaders = {id(group.onload_leader): group.onload_leader, id(group.offload_leader): group.offload_leader}
+        for leader in leaders.values():
+            registry = HookRegistry.check_if_exists_or_initialize(leader)
+            registry.register_hook(GroupOffloadingHook(group, next_group), _GROUP_OFFLOADING)
+
+    # the root group also prefetches the first group, so its onloading overlaps with the first layers of `module`
+    first_group = groups[0] if groups and stream is not None else None
+    registry = HookRegistry.check_if_exists_or_initialize(module)
+    registry.register_hook(GroupOffloadingHook(root_group, first_group), _GROUP_OFFLOADING)
+
+
+def apply_model_offloading(
+    modules: List[nn.Cell],
+    onload_device: str = "Ascend",
+    offload_device: str = "CPU",
+) -> List[ModelOffloadHook]:
+    r"""
+    Applies model offloading to a set of models, so that at most one of them is on device at a time. A model is
+    onloaded as a whole when its forward pass is called, and the other models of the set are offloaded.
+
+    Args:
+        modules (`List[nn.Cell]`):
+            The models to offload, typically the components of a pipeline.
+        onload_device (`str`, defaults to `"Ascend"`):
+            The device to which the models are onloaded.
+        offload_device (`str`, defaults to `"CPU"`):
+            The device to which the models are offloaded.
+
+    Returns:
+        `List[ModelOffloadHook]`: The hooks of the models, `hook.offload()` moves a model back to the offload device.
+    """
+    peers = []
+    for module in modules:
+        group = ModuleGroup(
+            modules=[module], onload_device=onload_device, offload_device=offload_device, offload_leader=module
+        )
+        hook = ModelOffloadHook(group, peers)
+        registry = HookRegistry.check_if_exists_or_initialize(module)
+        registry.register_hook(hook, _MODEL_OFFLOADING)
+        peers.append(hook)
+    return list(peers)
+
+
+def _is_group_offload_enabled(module: nn.Cell) -> bool:
+    for _, submodule in module.cells_and_names():
+        if hasattr(submodule, "_diffusers_hook") and submodule._diffusers_hook.get_hook(_GROUP_OFFLOADING) is not None:
+            return True
+    return False
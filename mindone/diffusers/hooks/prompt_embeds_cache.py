@@ -0,0 +1,330 @@
+# Copyright 2025 The HuggingFace Team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import hashlib
+import importlib
+import json
+import os
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+import mindspore as ms
+
+from ..utils import get_logger
+from .hooks import HookRegistry, ModelHook
+
+logger = get_logger(__name__)  # pylint: disable=invalid-name
+
+_PROMPT_EMBEDS_CACHE_HOOK = "prompt_embeds_cache"
+
+_DTYPES = {
+    str(dtype): dtype for dtype in (ms.float16, ms.bfloat16, ms.float32, ms.float64, ms.int32, ms.int64, ms.bool_)
+}
+
+
+@dataclass
+class PromptEmbedsCacheConfig:
+    r"""
+    Configuration for caching the outputs of text encoders across pipeline calls.
+
+    Args:
+        max_size (`int`, defaults to `64`):
+            The number of encoder outputs kept in memory. The least recently used ones are evicted first.
+        cache_dir (`str`, *optional*):
+            A directory for a second, persistent tier. Every computed output is also written there, and outputs
+            evicted from memory, or computed by a previous process, are read back from it. Only encoders loaded with a
+            name or path (`config._name_or_path`) are cached on disk, since the others have no stable identity.
+    """
+
+    max_size: int = 64
+    cache_dir: Optional[str] = None
+
+
+class PromptEmbedsCache:
+    r"""
+    LRU cache of text encoder outputs, shared by the [`PromptEmbedsCacheHook`] of the encoders of a pipeline.
+
+    The cache counts its hits and misses, see `stats`.
+    """
+
+    def __init__(self, max_size: int = 64, cache_dir: Optional[str] = None):
+        if max_size < 1:
+            raise ValueError(f"`max_size` must be at least 1, but got {max_size}.")
+        self.max_size = max_size
+        self.cache_dir = cache_dir
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.disk_hits + self.misses
+        return (self.hits + self.disk_hits) / total if total else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+            "size": len(self._entries),
+        }
+
+    def get(self, key: str, persistent: bool = False) -> Optional[Any]:
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key]
+        if persistent and self.cache_dir is not None:
+            output = self._load(key)
+            if output is not None:
+                self.disk_hits += 1
+                self._insert(key, output)
+                return output
+        self.misses += 1
+        return None
+
+    def put(self, key: str, output: Any, persistent: bool = False) -> None:
+        self._insert(key, output)
+        if persistent and self.cache_dir is not None:
+            self._save(key, output)
+
+    def clear(self) -> None:
+        """Empties the memory tier and resets the counters, the disk tier is kept."""
+        self._entries.clear()
+        self.hits = self.disk_hits = self.misses = 0
+
+    def invalidate(self) -> None:
+        """Empties the memory tier after the weights of an encoder changed, the counters are kept."""
+        self._entries.clear()
+
+    def _insert(self, key: str, output: Any) -> None:
+        self._entries[key] = output
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.npz")
+
+    def _save(self, key: str, output: Any) -> None:
+        arrays: List[np.ndarray] = []
+        try:
+            spec = _flatten(output, arrays)
+        except TypeError as e:
+            logger.debug(f"Not caching the encoder output on disk: {e}")
+            return
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(f, *arrays, __spec__=np.array(json.dumps(spec)))
+        # atomic, concurrent processes sharing the directory never read a partial file
+        os.replace(tmp_path, path)
+
+    def _load(self, key: str) -> Optional[Any]:
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                spec = json.loads(str(data["__spec__"]))
+                arrays = [data[f"arr_{i}"] for i in range(len(data.files) - 1)]
+            return _unflatten(spec, arrays)
+        except (OSError, ValueError, KeyError, ImportError, AttributeError) as e:
+            logger.warning(f"Ignoring the unreadable prompt embeddings cache entry {path}: {e}")
+            return None
+
+
+def _flatten(output: Any, arrays: List[np.ndarray]) -> Dict[str, Any]:
+    # json spec of a nested encoder output, whose tensors are appended to `arrays`
+    if output is None or isinstance(output, (bool, int, float, str)):
+        return {"type": "value", "value": output}
+    if isinstance(output, ms.Tensor):
+        arrays.append(output.float().asnumpy() if output.dtype == ms.bfloat16 else output.asnumpy())
+        return {"type": "tensor", "dtype": str(output.dtype)}
+    if isinstance(output, OrderedDict):  # `ModelOutput`
+        cls = f"{output.__class__.__module__}:{output.__class__.__qualname__}"
+        return {"type": "dict", "cls": cls, "items": [[k, _flatten(v, arrays)] for k, v in output.items()]}
+    if isinstance(output, (tuple, list)):
+        return {"type": type(output).__name__, "items": [_flatten(v, arrays) for v in output]}
+    raise TypeError(f"unsupported output type {type(output)}")
+
+
+def _unflatten(spec: Dict[str, Any], arrays: List[np.ndarray], offset: Optional[List[int]] = None) -> Any:
+    offset = [0] if offset is None else offset
+    if spec["type"] == "value":
+        return spec["value"]
+    if spec["type"] == "tensor":
+        array = arrays[offset[0]]
+        offset[0] += 1
+        return ms.tensor(array).to(_DTYPES[spec["dtype"]])
+    if spec["type"] == "dict":
+        module_name, qualname = spec["cls"].split(":")
+        # only rebuild model outputs, never import arbitrary modules named by a cache file
+        if module_name.split(".")[0] not in ("mindone", "transformers"):
+            raise ValueError(f"unexpected output class {spec['cls']}")
+        cls = importlib.import_module(module_name)
+        for name in qualname.split("."):
+            cls = getattr(cls, name)
+        return cls(**{k: _unflatten(v, arrays, offset) for k, v in spec["items"]})
+    items = [_unflatten(v, arrays, offset) for v in spec["items"]]
+    return tuple(items) if spec["type"] == "tuple" else items
+
+
+def _adapter_state(module: ms.nn.Cell) -> Tuple[Any, ...]:
+    # the adapters of the LoRA layers, which change the encoder outputs without changing its name or dtype
+    if not getattr(module, "peft_config", None):
+        return ()
+    from mindone.peft.tuners.tuners_utils import BaseTunerLayer
+
+    return tuple(
+        (
+            name,
+            tuple(cell.active_adapters),
+            tuple(cell.merged_adapters),
+            cell.disable_adapters,
+            tuple(sorted(getattr(cell, "scaling", {}).items())),
+        )
+        for name, cell in module.cells_and_names()
+        if isinstance(cell, BaseTunerLayer)
+    )
+
+
+def _weights_fingerprint(module: ms.nn.Cell, adapter_state: Tuple[Any, ...]) -> str:
+    if not adapter_state:
+        return ""
+    digest = hashlib.sha256(repr(adapter_state).encode())
+    for name, param in module.parameters_and_names():
+        if "lora_" in name:
+            digest.update(name.encode())
+            digest.update((param.float() if param.dtype == ms.bfloat16 else param).asnumpy().tobytes())
+    return digest.hexdigest()
+
+
+class PromptEmbedsCacheHook(ModelHook):
+    r"""
+    Returns the cached output of a text encoder when it is called with the same inputs again.
+
+    The key of an output is the identity of the encoder, a fingerprint of its LoRA adapters and their weights, a hash
+    of its tokenized inputs (which also covers the `max_sequence_length` they are padded to), its other arguments and
+    its dtype. Loading, fusing, activating or deleting adapters changes the fingerprint and empties the memory tier of
+    the cache.
+    """
+
+    def __init__(self, cache: PromptEmbedsCache, encoder_id: Optional[str] = None):
+        super().__init__()
+        self.cache = cache
+        self.encoder_id = encoder_id
+        self.persistent = encoder_id is not None
+        self.adapter_state = None
+        self.weights_fingerprint = ""
+
+    def initialize_hook(self, module):
+        if self.encoder_id is None:
+            name_or_path = getattr(getattr(module, "config", None), "_name_or_path", "")
+            # encoders loaded from a name or path are identified across processes, the others only in this one
+            self.persistent = bool(name_or_path)
+            self.encoder_id = f"{module.__class__.__name__}:{name_or_path or id(module)}"
+        return module
+
+    def _update_weights_fingerprint(self, module: ms.nn.Cell) -> None:
+        # the adapter state is cheap to compare on every call, the weights are only hashed when it changes
+        adapter_state = _adapter_state(module)
+        if adapter_state == self.adapter_state:
+            return
+        if self.adapter_state is not None:
+            self.cache.invalidate()
+        self.adapter_state = adapter_state
+        self.weights_fingerprint = _weights_fingerprint(module, adapter_state)
+
+    def _key(self, module: ms.nn.Cell, args: Tuple[Any], kwargs: Dict[str, Any]) -> str:
+        digest = hashlib.sha256()
+        digest.update(f"{self.encoder_id}|{self.weights_fingerprint}|{getattr(module, 'dtype', None)}".encode())
+        for name, value in [(i, v) for i, v in enumerate(args)] + sorted(kwargs.items()):
+            digest.update(f"|{name}=".encode())
+            if isinstance(value, (ms.Tensor, np.ndarray)):
+                value = value.asnumpy() if isinstance(value, ms.Tensor) else value
+                digest.update(f"{value.dtype}{value.shape}".encode())
+                digest.update(np.ascontiguousarray(value).tobytes())
+            else:
+                digest.update(repr(value).encode())
+        return digest.hexdigest()
+
+    def new_construct(self, module: ms.nn.Cell, *args, **kwargs):
+        self._update_weights_fingerprint(module)
+        key = self._key(module, args, kwargs)
+        output = self.cache.get(key, self.persistent)
+        if output is None:
+            output = self.fn_ref.original_construct(*args, **kwargs)
+            self.cache.put(key, output, self.persistent)
+        return output
+
+
+def apply_prompt_embeds_cache(
+    module: ms.nn.Cell, config: PromptEmbedsCacheConfig, cache: Optional[PromptEmbedsCache] = None
+) -> PromptEmbedsCache:
+    r"""
+    Caches the outputs of the text encoder `module` across calls.
+
+    Args:
+        module (`ms.nn.Cell`):
+            The text encoder to cache the outputs of.
+        config (`PromptEmbedsCacheConfig`):
+            The configuration of the cache.
+        cache (`PromptEmbedsCache`, *optional*):
+            An existing cache, to share one LRU and its statistics between several encoders.
+
+    Returns:
+        `PromptEmbedsCache`: The cache of the encoder outputs.
+
+    Example:
+
+    ```python
+    >>> from mindone.diffusers.hooks import PromptEmbedsCacheConfig, apply_prompt_embeds_cache
+
+    >>> cache = apply_prompt_embeds_cache(pipe.text_encoder_2, PromptEmbedsCacheConfig(max_size=128))
+    >>> image = pipe("A cat holding a sign")[0][0]
+    >>> print(cache.stats())
+    ```
+    """
+    cache = cache if cache is not None else PromptEmbedsCache(config.max_size, config.cache_dir)
+    registry = HookRegistry.check_if_exists_or_initialize(module)
+    registry.register_hook(PromptEmbedsCacheHook(cache), _PROMPT_EMBEDS_CACHE_HOOK)
+    return cache
+
+
+def _apply_prompt_embeds_cache_to_text_encoders(
+    components: Dict[str, Any], config: PromptEmbedsCacheConfig
+) -> Optional[PromptEmbedsCache]:
+    # one cache shared by the `text_encoder*` components of a pipeline, `None` if there are none
+    cache = None
+    for name, component in components.items():
+        if name.startswith("text_encoder") and isinstance(component, ms.nn.Cell):
+            cache = apply_prompt_embeds_cache(component, config, cache)
+    return cache
+
+
+def _remove_prompt_embeds_cache_from_text_encoders(components: Dict[str, Any]) -> None:
+    for name, component in components.items():
+        if name.startswith("text_encoder") and hasattr(component, "_diffusers_hook"):
+            component._diffusers_hook.remove_hook(_PROMPT_EMBEDS_CACHE_HOOK, recurse=False)
@@ -0,0 +1,485 @@
+# Copyright 2025 The HuggingFace Team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import inspect
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+import mindspore as ms
+from mindspore import mint
+
+from ..utils import get_logger
+from ..utils.mindspore_utils import unwrap_module
+from ._common import _ALL_TRANSFORMER_BLOCK_IDENTIFIERS
+from ._helpers import TransformerBlockRegistry
+from .hooks import BaseState, HookRegistry, ModelHook, StateManager
+
+logger = get_logger(__name__)  # pylint: disable=invalid-name
+
+_TEACACHE_LEADER_BLOCK_HOOK = "teacache_leader_block_hook"
+_TEACACHE_BLOCK_HOOK = "teacache_block_hook"
+_MAGCACHE_LEADER_BLOCK_HOOK = "magcache_leader_block_hook"
+_MAGCACHE_BLOCK_HOOK = "magcache_block_hook"
+
+
+@dataclass
+class TeaCacheConfig:
+    r"""
+    Configuration for [TeaCache](https://huggingface.co/papers/2411.19108).
+
+    TeaCache skips the whole forward pass through the transformer blocks at a denoising step, and reuses the residual
+    of the last computed step, when the accumulated relative L1 distance between the timestep-embedding-aware inputs
+    of consecutive steps is below a threshold. The raw distance is rescaled with a polynomial, calibrated per model, to
+    estimate the distance between the outputs.
+
+    Args:
+        num_inference_steps (`int`):
+            The number of denoising steps of the pipeline. The cache state is reset after this many forward passes.
+        threshold (`float`, defaults to `0.1`):
+            The threshold on the accumulated rescaled distance. A higher threshold skips more steps, which is faster
+            but may lower the generation quality.
+        coefficients (`List[float]`, *optional*):
+            The coefficients of the rescaling polynomial, highest degree first, as returned by
+            [`~hooks.teacache.fit_teacache_coefficients`]. Defaults to the identity.
+        retention_ratio (`float`, defaults to `0.1`):
+            The fraction of the first steps which are always computed.
+        indicator_fn (`Callable`, *optional*):
+            A function `(head_block, args, kwargs) -> ms.Tensor` returning the indicator tensor from the inputs of the
+            first transformer block. Defaults to the `temb` input of the block if it has one, or to its
+            `hidden_states` input otherwise.
+        calibrate (`bool`, defaults to `False`):
+            If `True`, every step is computed and the pairs of input and output distances are recorded, so that
+            [`~hooks.teacache.fit_teacache_coefficients`] can fit the coefficients after a few reference runs.
+    """
+
+    num_inference_steps: int
+    threshold: float = 0.1
+    coefficients: Optional[List[float]] = None
+    retention_ratio: float = 0.1
+    indicator_fn: Optional[Callable[[ms.nn.Cell, Tuple[Any], Dict[str, Any]], ms.Tensor]] = None
+    calibrate: bool = False
+
+
+@dataclass
+class MagCacheConfig:
+    r"""
+    Configuration for [MagCache](https://huggingface.co/papers/2506.09045).
+
+    MagCache skips the whole forward pass through the transformer blocks at a denoising step, and reuses the residual
+    of the last computed step, based on the calibrated ratio between the magnitudes of the residuals of consecutive
+    steps. The ratios only depend on the step index, so the decision is taken on host without reading any tensor.
+
+    Args:
+        num_inference_steps (`int`):
+            The number of denoising steps of the pipeline. The cache state is reset after this many forward passes.
+        mag_ratios (`List[float]`, *optional*):
+            The magnitude ratio of each step, as returned by [`~hooks.teacache.fit_magcache_ratios`]. It is linearly
+            resampled when calibrated with a different number of steps. Required unless `calibrate=True`.
+        threshold (`float`, defaults to `0.06`):
+            The threshold on the accumulated error of the skipped steps.
+        max_skip_steps (`int`, defaults to `3`):
+            The maximum number of consecutive skipped steps.
+        retention_ratio (`float`, defaults to `0.2`):
+            The fraction of the first steps which are always computed.
+        calibrate (`bool`, defaults to `False`):
+            If `True`, every step is computed and the magnitude ratios are recorded, so that
+            [`~hooks.teacache.fit_magcache_ratios`] can average them after a few reference runs.
+    """
+
+    num_inference_steps: int
+    mag_ratios: Optional[List[float]] = None
+    threshold: float = 0.06
+    max_skip_steps: int = 3
+    retention_ratio: float = 0.2
+    calibrate: bool = False
+
+
+class TimestepCacheState(BaseState):
+    def __init__(self) -> None:
+        super().__init__()
+        self.reset()
+
+    def reset(self):
+        self.step_index: int = 0
+        self.should_compute: bool = True
+        self.head_hidden_states: ms.Tensor = None
+        self.head_encoder_hidden_states: ms.Tensor = None
+        self.residuals: Tuple[ms.Tensor, Optional[ms.Tensor]] = None
+        # TeaCache
+        self.previous_indicator: ms.Tensor = None
+        self.accumulated_distance: float = 0.0
+        self.indicator_distance: float = None
+        # MagCache
+        self.accumulated_ratio: float = 1.0
+        self.accumulated_error: float = 0.0
+        self.accumulated_steps: int = 0
+
+
+class TimestepCacheCalibration:
+    r"""Records the statistics of the reference runs, shared by all the hooks of a module."""
+
+    def __init__(self) -> None:
+        # TeaCache: (input distance, output distance) pairs
+        self.distances: List[Tuple[float, float]] = []
+        # MagCache: magnitude ratios of each step, over all the runs
+        self.mag_ratios: Dict[int, List[float]] = {}
+
+
+def _relative_l1_distance(x: ms.Tensor, y: ms.Tensor) -> float:
+    return ((x - y).abs().mean() / y.abs().mean()).item()
+
+
+def _pack_block_output(metadata, hidden_states: ms.Tensor, encoder_hidden_states: Optional[ms.Tensor]):
+    if metadata.return_encoder_hidden_states_index is None:
+        return hidden_states
+    output = [None, None]
+    output[metadata.return_hidden_states_index] = hidden_states
+    output[metadata.return_encoder_hidden_states_index] = encoder_hidden_states
+    return tuple(output)
+
+
+class TimestepCacheHeadBlockHook(ModelHook):
+    r"""
+    Decides, before the first transformer block, whether the current step is computed. Skipped steps return the
+    inputs of the first block plus the residual of the last computed step, and the other blocks pass their inputs
+    through.
+    """
+
+    _is_stateful = True
+
+    def __init__(self, state_manager: StateManager, num_inference_steps: int, retention_ratio: float, calibration):
+        self.state_manager = state_manager
+        self.num_inference_steps = num_inference_steps
+        self.retention_steps = int(retention_ratio * num_inference_steps)
+        self.calibration: TimestepCacheCalibration = calibration
+        self._metadata = None
+
+    def initialize_hook(self, module):
+        unwrapped_module = unwrap_module(module)
+        self._metadata = TransformerBlockRegistry.get(unwrapped_module.__class__)
+        return module
+
+    def new_construct(self, module: ms.nn.Cell, *args, **kwargs):
+        hidden_states = self._metadata._get_parameter_from_args_kwargs("hidden_states", args, kwargs)
+        encoder_hidden_states = None
+        if self._metadata.return_encoder_hidden_states_index is not None:
+            encoder_hidden_states = self._metadata._get_parameter_from_args_kwargs(
+                "encoder_hidden_states", args, kwargs
+            )
+
+        state: TimestepCacheState = self.state_manager.get_state()
+        if state.step_index >= self.num_inference_steps:
+            # the previous generation is over
+            state.reset()
+        step_index = state.step_index
+        force_compute = (
+            state.residuals is None or step_index < self.retention_steps or step_index >= self.num_inference_steps - 1
+        )
+        state.should_compute = self._should_compute(module, state, force_compute, args, kwargs)
+        state.step_index += 1
+
+        if not state.should_compute:
+            hidden_states = hidden_states + state.residuals[0]
+            if encoder_hidden_states is not None and state.residuals[1] is not None:
+                encoder_hidden_states = encoder_hidden_states + state.residuals[1]
+            return _pack_block_output(self._metadata, hidden_states, encoder_hidden_states)
+
+        state.head_hidden_states = hidden_states
+        state.head_encoder_hidden_states = encoder_hidden_states
+        return self.fn_ref.original_construct(*args, **kwargs)
+
+    def _should_compute(self, module, state: TimestepCacheState, force_compute: bool, args, kwargs) -> bool:
+        raise NotImplementedError
+
+    def record_residuals(self, state: TimestepCacheState, residuals: Tuple[ms.Tensor, Optional[ms.Tensor]]) -> None:
+        state.residuals = residuals
+
+    def reset_state(self, module):
+        self.state_manager.reset()
+        return module
+
+
+class TeaCacheHeadBlockHook(TimestepCacheHeadBlockHook):
+    def __init__(self, state_manager: StateManager, config: TeaCacheConfig, calibration: TimestepCacheCalibration):
+        super().__init__(state_manager, config.num_inference_steps, config.retention_ratio, calibration)
+        self.threshold = config.threshold
+        self.rescale_fn = np.poly1d(config.coefficients if config.coefficients is not None else [1.0, 0.0])
+        self.indicator_fn = config.indicator_fn
+        self.calibrate = config.calibrate
+
+    def initialize_hook(self, module):
+        module = super().initialize_hook(module)
+        if self.indicator_fn is None:
+            parameters = inspect.signature(unwrap_module(module).__class__.construct).parameters
+            identifier = "temb" if "temb" in parameters else "hidden_states"
+            self.indicator_fn = lambda block, args, kwargs: self._metadata._get_parameter_from_args_kwargs(
+                identifier, args, kwargs
+            )
+        return module
+
+    def _should_compute(self, module, state: TimestepCacheState, force_compute: bool, args, kwargs) -> bool:
+        indicator = self.indicator_fn(module, args, kwargs)
+        previous_indicator, state.previous_indicator = state.previous_indicator, indicator
+        if previous_indicator is None:
+            return True
+
+        if self.calibrate:
+            state.indicator_distance = _relative_l1_distance(indicator, previous_indicator)
+            return True
+        if force_compute:
+            state.accumulated_distance = 0.0
+            return True
+
+        state.accumulated_distance += float(self.rescale_fn(_relative_l1_distance(indicator, previous_indicator)))
+        if state.accumulated_distance < self.threshold:
+            return False
+        state.accumulated_distance = 0.0
+        return True
+
+    def record_residuals(self, state: TimestepCacheState, residuals: Tuple[ms.Tensor, Optional[ms.Tensor]]) -> None:
+        if self.calibrate and state.residuals is not None and state.indicator_distance is not None:
+            self.calibration.distances.append(
+                (state.indicator_distance, _relative_l1_distance(residuals[0], state.residuals[0]))
+            )
+        state.residuals = residuals
+
+
+class MagCacheHeadBlockHook(TimestepCacheHeadBlockHook):
+    def __init__(self, state_manager: StateManager, config: MagCacheConfig, calibration: TimestepCacheCalibration):
+        super().__init__(state_manager, config.num_inference_steps, config.retention_ratio, calibration)
+        self.threshold = config.threshold
+        self.max_skip_steps = config.max_skip_steps
+        self.calibrate = config.calibrate
+        self.mag_ratios = None
+        if not self.calibrate:
+            if config.mag_ratios is None:
+                raise ValueError("`mag_ratios` must be provided when `calibrate=False`.")
+            self.mag_ratios = _resample(config.mag_ratios, config.num_inference_steps)
+
+    def _should_compute(self, module, state: TimestepCacheState, force_compute: bool, args, kwargs) -> bool:
+        if self.calibrate:
+            return True
+
+        state.accumulated_ratio *= self.mag_ratios[state.step_index]
+        state.accumulated_error += abs(1.0 - state.accumulated_ratio)
+        state.accumulated_steps += 1
+        if (
+            not force_compute
+            and state.accumulated_error <= self.threshold
+            and state.accumulated_steps <= self.max_skip_steps
+        ):
+            return False
+        state.accumulated_ratio = 1.0
+        state.accumulated_error = 0.0
+        state.accumulated_steps = 0
+        return True
+
+    def record_residuals(self, state: TimestepCacheState, residuals: Tuple[ms.Tensor, Optional[ms.Tensor]]) -> None:
+        if self.calibrate and state.residuals is not None:
+            ratio = (mint.norm(residuals[0], dim=-1).mean() / mint.norm(state.residuals[0], dim=-1).mean()).item()
+            # the step index has already been advanced by the head block
+            self.calibration.mag_ratios.setdefault(state.step_index - 1, []).append(ratio)
+        state.residuals = residuals
+
+
+class TimestepCacheBlockHook(ModelHook):
+    def __init__(self, state_manager: StateManager, head_hook: TimestepCacheHeadBlockHook, is_tail: bool = False):
+        super().__init__()
+        self.state_manager = state_manager
+        self.head_hook = head_hook
+        self.is_tail = is_tail
+        self._metadata = None
+
+    def initialize_hook(self, module):
+        unwrapped_module = unwrap_module(module)
+        self._metadata = TransformerBlockRegistry.get(unwrapped_module.__class__)
+        return module
+
+    def new_construct(self, module: ms.nn.Cell, *args, **kwargs):
+        state: TimestepCacheState = self.state_manager.get_state()
+
+        if state.should_compute:
+            output = self.fn_ref.original_construct(*args, **kwargs)
+            if self.is_tail:
+                if isinstance(output, tuple):
+                    hidden_states_residual = (
+                        output[self._metadata.return_hidden_states_index] - state.head_hidden_states
+                    )
+                    encoder_hidden_states_residual = None
+                    if (
+                        self._metadata.return_encoder_hidden_states_index is not None
+                        and state.head_encoder_hidden_states is not None
+                    ):
+                        encoder_hidden_states_residual = (
+                            output[self._metadata.return_encoder_hidden_states_index] - state.head_encoder_hidden_states
+                        )
+                else:
+                    hidden_states_residual = output - state.head_hidden_states
+                    encoder_hidden_states_residual = None
+                self.head_hook.record_residuals(state, (hidden_states_residual, encoder_hidden_states_residual))
+            return output
+
+        hidden_states = self._metadata._get_parameter_from_args_kwargs("hidden_states", args, kwargs)
+        encoder_hidden_states = None
+        if self._metadata.return_encoder_hidden_states_index is not None:
+            encoder_hidden_states = self._metadata._get_parameter_from_args_kwargs(
+                "encoder_hidden_states", args, kwargs
+            )
+        return _pack_block_output(self._metadata, hidden_states, encoder_hidden_states)
+
+
+def _resample(values: List[float], num_steps: int) -> np.ndarray:
+    values = np.asarray(values, dtype=np.float64)
+    if len(values) == num_steps:
+        return values
+    return np.interp(np.linspace(0, 1, num_steps), np.linspace(0, 1, len(values)), values)
+
+
+def apply_teacache(module: ms.nn.Cell, config: TeaCacheConfig) -> None:
+    r"""
+    Applies [TeaCache](https://huggingface.co/papers/2411.19108) to a given module.
+
+    Args:
+        module (`ms.nn.Cell`):
+            The mindspore module to apply TeaCache to. Typically, this should be a transformer architecture supported
+            in Diffusers, such as `WanTransformer3DModel`, but external implementations may also work.
+        config (`TeaCacheConfig`):
+            The configuration to use for applying the TeaCache method.
+
+    Example:
+        ```python
+        >>> import mindspore as ms
+        >>> from mindone.diffusers import WanPipeline
+        >>> from mindone.diffusers.hooks import TeaCacheConfig, apply_teacache, fit_teacache_coefficients
+
+        >>> pipe = WanPipeline.from_pretrained("Wan-AI/Wan2.1-T2V-1.3B-Diffusers", mindspore_dtype=ms.bfloat16)
+
+        >>> # calibrate with a few reference prompts, then apply the fitted coefficients
+        >>> apply_teacache(pipe.transformer, TeaCacheConfig(num_inference_steps=50, calibrate=True))
+        >>> for prompt in reference_prompts:
+        ...     pipe(prompt, num_inference_steps=50)
+        >>> coefficients = fit_teacache_coefficients(pipe.transformer)
+
+        >>> pipe.transformer.disable_cache()
+        >>> pipe.transformer.enable_cache(
+        ...     TeaCacheConfig(num_inference_steps=50, threshold=0.08, coefficients=coefficients)
+        ... )
+        ```
+    """
+    calibration = TimestepCacheCalibration()
+    state_manager = StateManager(TimestepCacheState, (), {})
+    head_hook = TeaCacheHeadBlockHook(state_manager, config, calibration)
+    _apply_timestep_cache_hooks(module, state_manager, head_hook, _TEACACHE_LEADER_BLOCK_HOOK, _TEACACHE_BLOCK_HOOK)
+
+
+def apply_magcache(module: ms.nn.Cell, config: MagCacheConfig) -> None:
+    r"""
+    Applies [MagCache](https://huggingface.co/papers/2506.09045) to a given module.
+
+    Args:
+        module (`ms.nn.Cell`):
+            The mindspore module to apply MagCache to. Typically, this should be a transformer architecture supported
+            in Diffusers, such as `WanTransformer3DModel`, but external implementations may also work.
+        config (`MagCacheConfig`):
+            The configuration to use for applying the MagCache method.
+
+    Example:
+        ```python
+        >>> apply_magcache(pipe.transformer, MagCacheConfig(num_inference_steps=50, calibrate=True))
+        >>> for prompt in reference_prompts:
+        ...     pipe(prompt, num_inference_steps=50)
+        >>> mag_ratios = fit_magcache_ratios(pipe.transformer)
+
+        >>> pipe.transformer.disable_cache()
+        >>> pipe.transformer.enable_cache(MagCacheConfig(num_inference_steps=50, mag_ratios=mag_ratios))
+        ```
+    """
+    calibration = TimestepCacheCalibration()
+    state_manager = StateManager(TimestepCacheState, (), {})
+    head_hook = MagCacheHeadBlockHook(state_manager, config, calibration)
+    _apply_timestep_cache_hooks(module, state_manager, head_hook, _MAGCACHE_LEADER_BLOCK_HOOK, _MAGCACHE_BLOCK_HOOK)
+
+
+def _apply_timestep_cache_hooks(
+    module: ms.nn.Cell,
+    state_manager: StateManager,
+    head_hook: TimestepCacheHeadBlockHook,
+    leader_hook_name: str,
+    block_hook_name: str,
+) -> None:
+    remaining_blocks = []
+    for name, submodule in module.cells_and_names():
+        if name not in _ALL_TRANSFORMER_BLOCK_IDENTIFIERS or not isinstance(submodule, ms.nn.CellList):
+            continue
+        for index, block in enumerate(submodule):
+            remaining_blocks.append((f"{name}.{index}", block))
+
+    head_block_name, head_block = remaining_blocks.pop(0)
+    logger.debug(f"Applying {head_hook.__class__.__name__} to '{head_block_name}'")
+    HookRegistry.check_if_exists_or_initialize(head_block).register_hook(head_hook, leader_hook_name)
+
+    for i, (name, block) in enumerate(remaining_blocks):
+        is_tail = i == len(remaining_blocks) - 1
+        logger.debug(f"Applying TimestepCacheBlockHook to '{name}'")
+        hook = TimestepCacheBlockHook(state_manager, head_hook, is_tail=is_tail)
+        HookRegistry.check_if_exists_or_initialize(block).register_hook(hook, block_hook_name)
+
+
+def _get_head_hook(module: ms.nn.Cell, hook_name: str) -> TimestepCacheHeadBlockHook:
+    for _, submodule in module.cells_and_names():
+        if hasattr(submodule, "_diffusers_hook") and submodule._diffusers_hook.get_hook(hook_name) is not None:
+            return submodule._diffusers_hook.get_hook(hook_name)
+    raise ValueError(f"No `{hook_name}` found in {module.__class__.__name__}, the cache has not been applied.")
+
+
+def fit_teacache_coefficients(module: ms.nn.Cell, degree: int = 4) -> List[float]:
+    r"""
+    Fits the TeaCache rescaling polynomial on the distances recorded by the calibration runs of `module`.
+
+    Args:
+        module (`ms.nn.Cell`):
+            A module to which TeaCache has been applied with `calibrate=True`, after a few pipeline runs.
+        degree (`int`, defaults to `4`):
+            The degree of the polynomial.
+
+    Returns:
+        `List[float]`: The coefficients to pass to [`TeaCacheConfig`], highest degree first.
+    """
+    head_hook = _get_head_hook(module, _TEACACHE_LEADER_BLOCK_HOOK)
+    distances = head_hook.calibration.distances
+    if len(distances) <= degree:
+        raise ValueError(f"Only {len(distances)} calibration samples are recorded, run more calibration steps.")
+    x, y = np.asarray(distances, dtype=np.float64).T
+    return np.polyfit(x, y, degree).tolist()
+
+
+def fit_magcache_ratios(module: ms.nn.Cell) -> List[float]:
+    r"""
+    Averages the magnitude ratios recorded by the calibration runs of `module`.
+
+    Args:
+        module (`ms.nn.Cell`):
+            A module to which MagCache has been applied with `calibrate=True`, after a few pipeline runs.
+
+    Returns:
+        `List[float]`: The magnitude ratio of each step to pass to [`MagCacheConfig`].
+    """
+    head_hook = _get_head_hook(module, _MAGCACHE_LEADER_BLOCK_HOOK)
+    ratios = head_hook.calibration.mag_ratios
+    if not ratios:
+        raise ValueError("No calibration sample is recorded, run the pipeline with `calibrate=True` first.")
+    # the first step has no previous residual, its ratio is 1 by definition
+    return [float(np.mean(ratios[i])) if i in ratios else 1.0 for i in range(head_hook.num_inference_steps)]
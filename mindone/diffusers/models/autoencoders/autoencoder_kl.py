@@ -134,6 +134,8 @@ class AutoencoderKL(ModelMixin, AutoencoderMixin, ConfigMixin, FromOriginalModel
         )
         self.tile_latent_min_size = int(sample_size / (2 ** (len(self.config.block_out_channels) - 1)))
         self.tile_overlap_factor = 0.25
+        # number of tiles per encoder/decoder call when batched tiling is enabled, see `enable_batched_tiling`
+        self.tile_batch_size = None
 
     @property
     # Copied from diffusers.models.unets.unet_2d_condition.UNet2DConditionModel.attn_processors
@@ -300,6 +302,17 @@ class AutoencoderKL(ModelMixin, AutoencoderMixin, ConfigMixin, FromOriginalModel
             b[:, :, :, x] = a[:, :, :, -blend_extent + x] * (1 - x / blend_extent) + b[:, :, :, x] * (x / blend_extent)
         return b
 
+    def _encode_tile(self, tile: ms.Tensor) -> ms.Tensor:
+        tile = self.encoder(tile)
+        if self.config.use_quant_conv:
+            tile = self.quant_conv(tile)
+        return tile
+
+    def _decode_tile(self, tile: ms.Tensor) -> ms.Tensor:
+        if self.config.use_post_quant_conv:
+            tile = self.post_quant_conv(tile)
+        return self.decoder(tile)
+
     def _tiled_encode(self, x: ms.Tensor) -> ms.Tensor:
         r"""Encode a batch of images using a tiled encoder.
 
@@ -321,15 +334,25 @@ class AutoencoderKL(ModelMixin, AutoencoderMixin, ConfigMixin, FromOriginalModel
         blend_extent = int(self.tile_latent_min_size * self.tile_overlap_factor)
         row_limit = self.tile_latent_min_size - blend_extent
 
+        if self.tile_batch_size is not None:
+            row_starts = range(0, x.shape[2], overlap_size)
+            col_starts = range(0, x.shape[3], overlap_size)
+            tiles = [
+                x[:, :, i : i + self.tile_sample_min_size, j : j + self.tile_sample_min_size]
+                for i in row_starts
+                for j in col_starts
+            ]
+            tiles = self._map_tiles(self._encode_tile, tiles)
+            offsets = [[k * row_limit for k in range(len(row_starts))], [k * row_limit for k in range(len(col_starts))]]
+            return self._blend_tiles(tiles, offsets, (blend_extent, blend_extent), dims=(2, 3))
+
         # Split the image into 512x512 tiles and encode them separately.
         rows = []
         for i in range(0, x.shape[2], overlap_size):
             row = []
             for j in range(0, x.shape[3], overlap_size):
                 tile = x[:, :, i : i + self.tile_sample_min_size, j : j + self.tile_sample_min_size]
-                tile = self.encoder(tile)
-                if self.config.use_quant_conv:
-                    tile = self.quant_conv(tile)
+                tile = self._encode_tile(tile)
                 row.append(tile)
             rows.append(row)
         result_rows = []
@@ -427,6 +450,21 @@ class AutoencoderKL(ModelMixin, AutoencoderMixin, ConfigMixin, FromOriginalModel
         blend_extent = int(self.tile_sample_min_size * self.tile_overlap_factor)
         row_limit = self.tile_sample_min_size - blend_extent
 
+        if self.tile_batch_size is not None:
+            row_starts = range(0, z.shape[2], overlap_size)
+            col_starts = range(0, z.shape[3], overlap_size)
+            tiles = [
+                z[:, :, i : i + self.tile_latent_min_size, j : j + self.tile_latent_min_size]
+                for i in row_starts
+                for j in col_starts
+            ]
+            tiles = self._map_tiles(self._decode_tile, tiles)
+            offsets = [[k * row_limit for k in range(len(row_starts))], [k * row_limit for k in range(len(col_starts))]]
+            dec = self._blend_tiles(tiles, offsets, (blend_extent, blend_extent), dims=(2, 3))
+            if not return_dict:
+                return (dec,)
+            return DecoderOutput(sample=dec)
+
         # Split z into overlapping 64x64 tiles and decode them separately.
         # The tiles have an overlap to avoid seams between tiles.
         rows = []
@@ -434,9 +472,7 @@ class AutoencoderKL(ModelMixin, AutoencoderMixin, ConfigMixin, FromOriginalModel
             row = []
             for j in range(0, z.shape[3], overlap_size):
                 tile = z[:, :, i : i + self.tile_latent_min_size, j : j + self.tile_latent_min_size]
-                if self.config["use_post_quant_conv"]:
-                    tile = self.post_quant_conv(tile)
-                decoded = self.decoder(tile)
+                decoded = self._decode_tile(tile)
                 row.append(decoded)
             rows.append(row)
         result_rows = []
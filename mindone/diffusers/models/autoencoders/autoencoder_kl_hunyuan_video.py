@@ -696,6 +696,9 @@ class AutoencoderKLHunyuanVideo(ModelMixin, AutoencoderMixin, ConfigMixin):
         self.tile_sample_stride_width = 192
         self.tile_sample_stride_num_frames = 12
 
+        # The number of tiles encoded or decoded together when batched tiling is enabled
+        self.tile_batch_size = None
+
     def enable_tiling(
         self,
         tile_sample_min_height: Optional[int] = None,
@@ -846,6 +849,12 @@ class AutoencoderKLHunyuanVideo(ModelMixin, AutoencoderMixin, ConfigMixin):
             )
         return b
 
+    def _encode_tile(self, tile: ms.Tensor) -> ms.Tensor:
+        return self.quant_conv(self.encoder(tile))
+
+    def _decode_tile(self, tile: ms.Tensor) -> ms.Tensor:
+        return self.decoder(self.post_quant_conv(tile))
+
     def tiled_encode(self, x: ms.Tensor) -> AutoencoderKLOutput:
         r"""Encode a batch of images using a tiled encoder.
 
@@ -868,6 +877,22 @@ class AutoencoderKLHunyuanVideo(ModelMixin, AutoencoderMixin, ConfigMixin):
         blend_height = tile_latent_min_height - tile_latent_stride_height
         blend_width = tile_latent_min_width - tile_latent_stride_width
 
+        if self.tile_batch_size is not None:
+            row_starts = range(0, height, self.tile_sample_stride_height)
+            col_starts = range(0, width, self.tile_sample_stride_width)
+            tiles = [
+                x[:, :, :, i : i + self.tile_sample_min_height, j : j + self.tile_sample_min_width]
+                for i in row_starts
+                for j in col_starts
+            ]
+            tiles = self._map_tiles(self._encode_tile, tiles)
+            offsets = [
+                [k * tile_latent_stride_height for k in range(len(row_starts))],
+                [k * tile_latent_stride_width for k in range(len(col_starts))],
+            ]
+            enc = self._blend_tiles(tiles, offsets, (blend_height, blend_width), dims=(3, 4))
+            return enc[:, :, :, :latent_height, :latent_width]
+
         # Split x into overlapping tiles and encode them separately.
         # The tiles have an overlap to avoid seams between tiles.
         rows = []
@@ -875,9 +900,7 @@ class AutoencoderKLHunyuanVideo(ModelMixin, AutoencoderMixin, ConfigMixin):
             row = []
             for j in range(0, width, self.tile_sample_stride_width):
                 tile = x[:, :, :, i : i + self.tile_sample_min_height, j : j + self.tile_sample_min_width]
-                tile = self.encoder(tile)
-                tile = self.quant_conv(tile)
-                row.append(tile)
+                row.append(self._encode_tile(tile))
             rows.append(row)
 
         result_rows = []
@@ -923,6 +946,25 @@ class AutoencoderKLHunyuanVideo(ModelMixin, AutoencoderMixin, ConfigMixin):
         blend_height = self.tile_sample_min_height - self.tile_sample_stride_height
         blend_width = self.tile_sample_min_width - self.tile_sample_stride_width
 
+        if self.tile_batch_size is not None:
+            row_starts = range(0, height, tile_latent_stride_height)
+            col_starts = range(0, width, tile_latent_stride_width)
+            tiles = [
+                z[:, :, :, i : i + tile_latent_min_height, j : j + tile_latent_min_width]
+                for i in row_starts
+                for j in col_starts
+            ]
+            tiles = self._map_tiles(self._decode_tile, tiles)
+            offsets = [
+                [k * self.tile_sample_stride_height for k in range(len(row_starts))],
+                [k * self.tile_sample_stride_width for k in range(len(col_starts))],
+            ]
+            dec = self._blend_tiles(tiles, offsets, (blend_height, blend_width), dims=(3, 4))
+            dec = dec[:, :, :, :sample_height, :sample_width]
+            if not return_dict:
+                return (dec,)
+            return DecoderOutput(sample=dec)
+
         # Split z into overlapping tiles and decode them separately.
         # The tiles have an overlap to avoid seams between tiles.
         rows = []
@@ -930,9 +972,7 @@ class AutoencoderKLHunyuanVideo(ModelMixin, AutoencoderMixin, ConfigMixin):
             row = []
             for j in range(0, width, tile_latent_stride_width):
                 tile = z[:, :, :, i : i + tile_latent_min_height, j : j + tile_latent_min_width]
-                tile = self.post_quant_conv(tile)
-                decoded = self.decoder(tile)
-                row.append(decoded)
+                row.append(self._decode_tile(tile))
             rows.append(row)
 
         result_rows = []
@@ -962,14 +1002,29 @@ class AutoencoderKLHunyuanVideo(ModelMixin, AutoencoderMixin, ConfigMixin):
         tile_latent_stride_num_frames = self.tile_sample_stride_num_frames // self.temporal_compression_ratio
         blend_num_frames = tile_latent_min_num_frames - tile_latent_stride_num_frames
 
+        spatial_tiling = self.use_tiling and (
+            height > self.tile_sample_min_height or width > self.tile_sample_min_width
+        )
+        if self.tile_batch_size is not None:
+            starts = range(0, num_frames, self.tile_sample_stride_num_frames)
+            tiles = [x[:, :, i : i + self.tile_sample_min_num_frames + 1, :, :] for i in starts]
+            if spatial_tiling:
+                # the spatial tiles of each frame tile are batched instead
+                tiles = [self.tiled_encode(tile) for tile in tiles]
+            else:
+                tiles = self._map_tiles(self._encode_tile, tiles)
+            tiles = [tile if k == 0 else tile[:, :, 1:, :, :] for k, tile in enumerate(tiles)]
+            offsets = [[0] + [1 + k * tile_latent_stride_num_frames for k in range(1, len(tiles))]]
+            enc = self._blend_tiles(tiles, offsets, (blend_num_frames,), dims=(2,))
+            return enc[:, :, :latent_num_frames]
+
         row = []
         for i in range(0, num_frames, self.tile_sample_stride_num_frames):
             tile = x[:, :, i : i + self.tile_sample_min_num_frames + 1, :, :]
-            if self.use_tiling and (height > self.tile_sample_min_height or width > self.tile_sample_min_width):
+            if spatial_tiling:
                 tile = self.tiled_encode(tile)
             else:
-                tile = self.encoder(tile)
-                tile = self.quant_conv(tile)
+                tile = self._encode_tile(tile)
             if i > 0:
                 tile = tile[:, :, 1:, :, :]
             row.append(tile)
@@ -995,14 +1050,29 @@ class AutoencoderKLHunyuanVideo(ModelMixin, AutoencoderMixin, ConfigMixin):
         tile_latent_stride_num_frames = self.tile_sample_stride_num_frames // self.temporal_compression_ratio
         blend_num_frames = self.tile_sample_min_num_frames - self.tile_sample_stride_num_frames
 
+        spatial_tiling = self.use_tiling and (width > tile_latent_min_width or height > tile_latent_min_height)
+        if self.tile_batch_size is not None:
+            starts = range(0, num_frames, tile_latent_stride_num_frames)
+            tiles = [z[:, :, i : i + tile_latent_min_num_frames + 1, :, :] for i in starts]
+            if spatial_tiling:
+                # the spatial tiles of each frame tile are batched instead
+                tiles = [self.tiled_decode(tile, return_dict=True)[0] for tile in tiles]
+            else:
+                tiles = self._map_tiles(self._decode_tile, tiles)
+            tiles = [tile if k == 0 else tile[:, :, 1:, :, :] for k, tile in enumerate(tiles)]
+            offsets = [[0] + [1 + k * self.tile_sample_stride_num_frames for k in range(1, len(tiles))]]
+            dec = self._blend_tiles(tiles, offsets, (blend_num_frames,), dims=(2,))[:, :, :num_sample_frames]
+            if not return_dict:
+                return (dec,)
+            return DecoderOutput(sample=dec)
+
         row = []
         for i in range(0, num_frames, tile_latent_stride_num_frames):
             tile = z[:, :, i : i + tile_latent_min_num_frames + 1, :, :]
-            if self.use_tiling and (tile.shape[-1] > tile_latent_min_width or tile.shape[-2] > tile_latent_min_height):
+            if spatial_tiling:
                 decoded = self.tiled_decode(tile, return_dict=True)[0]
             else:
-                tile = self.post_quant_conv(tile)
-                decoded = self.decoder(tile)
+                decoded = self._decode_tile(tile)
             if i > 0:
                 decoded = decoded[:, :, 1:, :, :]
             row.append(decoded)
@@ -1096,6 +1096,9 @@ class AutoencoderKLWan(ModelMixin, AutoencoderMixin, ConfigMixin, FromOriginalMo
         self.tile_sample_stride_height = 192
         self.tile_sample_stride_width = 192
 
+        # The number of spatial tiles encoded or decoded together when batched tiling is enabled
+        self.tile_batch_size = None
+
         # Precompute and cache conv counts for encoder and decoder for clear_cache speedup
         self._cached_conv_counts = {
             "decoder": sum(isinstance(m, WanCausalConv3d) for _, m in self.decoder.cells_and_names())
@@ -1272,6 +1275,29 @@ class AutoencoderKLWan(ModelMixin, AutoencoderMixin, ConfigMixin, FromOriginalMo
             )
         return b
 
+    def _encode_video_tile(self, tile: ms.Tensor) -> ms.Tensor:
+        # encode all the frames of a spatial tile, chunk by chunk with the causal feature cache
+        self.clear_cache()
+        time = []
+        frame_range = 1 + (tile.shape[2] - 1) // 4
+        for k in range(frame_range):
+            self._enc_conv_idx = [0]
+            chunk = tile[:, :, :1] if k == 0 else tile[:, :, 1 + 4 * (k - 1) : 1 + 4 * k]
+            chunk = self.encoder(chunk, feat_cache=self._enc_feat_map, feat_idx=self._enc_conv_idx)
+            time.append(self.quant_conv(chunk))
+        return mint.cat(time, dim=2)
+
+    def _decode_video_tile(self, tile: ms.Tensor) -> ms.Tensor:
+        # decode all the frames of a spatial tile, one by one with the causal feature cache
+        self.clear_cache()
+        time = []
+        for k in range(tile.shape[2]):
+            self._conv_idx = [0]
+            chunk = self.post_quant_conv(tile[:, :, k : k + 1])
+            decoded = self.decoder(chunk, feat_cache=self._feat_map, feat_idx=self._conv_idx, first_chunk=(k == 0))
+            time.append(decoded)
+        return mint.cat(time, dim=2)
+
     def tiled_encode(self, x: ms.Tensor) -> AutoencoderKLOutput:
         r"""Encode a batch of images using a tiled encoder.
 
@@ -1282,7 +1308,7 @@ class AutoencoderKLWan(ModelMixin, AutoencoderMixin, ConfigMixin, FromOriginalMo
             `ms.Tensor`:
                 The latent representation of the encoded videos.
         """
-        _, _, num_frames, height, width = x.shape
+        _, _, _, height, width = x.shape
         latent_height = height // self.spatial_compression_ratio
         latent_width = width // self.spatial_compression_ratio
 
@@ -1294,31 +1320,31 @@ class AutoencoderKLWan(ModelMixin, AutoencoderMixin, ConfigMixin, FromOriginalMo
         blend_height = tile_latent_min_height - tile_latent_stride_height
         blend_width = tile_latent_min_width - tile_latent_stride_width
 
+        if self.tile_batch_size is not None:
+            row_starts = range(0, height, self.tile_sample_stride_height)
+            col_starts = range(0, width, self.tile_sample_stride_width)
+            tiles = [
+                x[:, :, :, i : i + self.tile_sample_min_height, j : j + self.tile_sample_min_width]
+                for i in row_starts
+                for j in col_starts
+            ]
+            tiles = self._map_tiles(self._encode_video_tile, tiles)
+            self.clear_cache()
+            offsets = [
+                [k * tile_latent_stride_height for k in range(len(row_starts))],
+                [k * tile_latent_stride_width for k in range(len(col_starts))],
+            ]
+            enc = self._blend_tiles(tiles, offsets, (blend_height, blend_width), dims=(3, 4))
+            return enc[:, :, :, :latent_height, :latent_width]
+
         # Split x into overlapping tiles and encode them separately.
         # The tiles have an overlap to avoid seams between tiles.
         rows = []
         for i in range(0, height, self.tile_sample_stride_height):
             row = []
             for j in range(0, width, self.tile_sample_stride_width):
-                self.clear_cache()
-                time = []
-                frame_range = 1 + (num_frames - 1) // 4
-                for k in range(frame_range):
-                    self._enc_conv_idx = [0]
-                    if k == 0:
-                        tile = x[:, :, :1, i : i + self.tile_sample_min_height, j : j + self.tile_sample_min_width]
-                    else:
-                        tile = x[
-                            :,
-                            :,
-                            1 + 4 * (k - 1) : 1 + 4 * k,
-                            i : i + self.tile_sample_min_height,
-                            j : j + self.tile_sample_min_width,
-                        ]
-                    tile = self.encoder(tile, feat_cache=self._enc_feat_map, feat_idx=self._enc_conv_idx)
-                    tile = self.quant_conv(tile)
-                    time.append(tile)
-                row.append(mint.cat(time, dim=2))
+                tile = x[:, :, :, i : i + self.tile_sample_min_height, j : j + self.tile_sample_min_width]
+                row.append(self._encode_video_tile(tile))
             rows.append(row)
         self.clear_cache()
 
@@ -1352,7 +1378,7 @@ class AutoencoderKLWan(ModelMixin, AutoencoderMixin, ConfigMixin, FromOriginalMo
                 If return_dict is True, a [`~models.vae.DecoderOutput`] is returned, otherwise a plain `tuple` is
                 returned.
         """
-        _, _, num_frames, height, width = z.shape
+        _, _, _, height, width = z.shape
         sample_height = height * self.spatial_compression_ratio
         sample_width = width * self.spatial_compression_ratio
 
@@ -1373,23 +1399,31 @@ class AutoencoderKLWan(ModelMixin, AutoencoderMixin, ConfigMixin, FromOriginalMo
             blend_height = self.tile_sample_min_height - tile_sample_stride_height
             blend_width = self.tile_sample_min_width - tile_sample_stride_width
 
+        if self.tile_batch_size is not None:
+            row_starts = range(0, height, tile_latent_stride_height)
+            col_starts = range(0, width, tile_latent_stride_width)
+            tiles = [
+                z[:, :, :, i : i + tile_latent_min_height, j : j + tile_latent_min_width]
+                for i in row_starts
+                for j in col_starts
+            ]
+            tiles = self._map_tiles(self._decode_video_tile, tiles)
+            self.clear_cache()
+            offsets = [
+                [k * tile_sample_stride_height for k in range(len(row_starts))],
+                [k * tile_sample_stride_width for k in range(len(col_starts))],
+            ]
+            dec = self._blend_tiles(tiles, offsets, (blend_height, blend_width), dims=(3, 4))
+            return self._postprocess_tiled_decode(dec[:, :, :, :sample_height, :sample_width], return_dict)
+
         # Split z into overlapping tiles and decode them separately.
         # The tiles have an overlap to avoid seams between tiles.
         rows = []
         for i in range(0, height, tile_latent_stride_height):
             row = []
             for j in range(0, width, tile_latent_stride_width):
-                self.clear_cache()
-                time = []
-                for k in range(num_frames):
-                    self._conv_idx = [0]
-                    tile = z[:, :, k : k + 1, i : i + tile_latent_min_height, j : j + tile_latent_min_width]
-                    tile = self.post_quant_conv(tile)
-                    decoded = self.decoder(
-                        tile, feat_cache=self._feat_map, feat_idx=self._conv_idx, first_chunk=(k == 0)
-                    )
-                    time.append(decoded)
-                row.append(mint.cat(time, dim=2))
+                tile = z[:, :, :, i : i + tile_latent_min_height, j : j + tile_latent_min_width]
+                row.append(self._decode_video_tile(tile))
             rows.append(row)
         self.clear_cache()
 
@@ -1406,7 +1440,9 @@ class AutoencoderKLWan(ModelMixin, AutoencoderMixin, ConfigMixin, FromOriginalMo
                 result_row.append(tile[:, :, :, :tile_sample_stride_height, :tile_sample_stride_width])
             result_rows.append(mint.cat(result_row, dim=-1))
         dec = mint.cat(result_rows, dim=3)[:, :, :, :sample_height, :sample_width]
+        return self._postprocess_tiled_decode(dec, return_dict)
 
+    def _postprocess_tiled_decode(self, dec: ms.Tensor, return_dict: bool) -> Union[DecoderOutput, ms.Tensor]:
         if self.config.patch_size is not None:
             dec = unpatchify(dec, patch_size=self.config.patch_size)
 
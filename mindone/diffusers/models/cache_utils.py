@@ -28,6 +28,8 @@ class CacheMixin:
         - [FasterCache](https://huggingface.co/papers/2410.19355)
         - [FirstBlockCache]
         (https://github.com/chengzeyi/ParaAttention/blob/7a266123671b55e7e5a2fe9af3121f07a36afc78/README.md#first-block-cache-our-dynamic-caching)
+        - [TeaCache](https://huggingface.co/papers/2411.19108)
+        - [MagCache](https://huggingface.co/papers/2506.09045)
     """
 
     _cache_config = None
@@ -65,10 +67,14 @@ class CacheMixin:
         from ..hooks import (
             FasterCacheConfig,
             FirstBlockCacheConfig,
+            MagCacheConfig,
             PyramidAttentionBroadcastConfig,
+            TeaCacheConfig,
             apply_faster_cache,
             apply_first_block_cache,
+            apply_magcache,
             apply_pyramid_attention_broadcast,
+            apply_teacache,
         )
 
         if self.is_cache_enabled:
@@ -82,16 +88,33 @@ class CacheMixin:
             apply_first_block_cache(self, config)
         elif isinstance(config, PyramidAttentionBroadcastConfig):
             apply_pyramid_attention_broadcast(self, config)
+        elif isinstance(config, TeaCacheConfig):
+            apply_teacache(self, config)
+        elif isinstance(config, MagCacheConfig):
+            apply_magcache(self, config)
         else:
             raise ValueError(f"Cache config {type(config)} is not supported.")
 
         self._cache_config = config
 
     def disable_cache(self) -> None:
-        from ..hooks import FasterCacheConfig, FirstBlockCacheConfig, HookRegistry, PyramidAttentionBroadcastConfig
+        from ..hooks import (
+            FasterCacheConfig,
+            FirstBlockCacheConfig,
+            HookRegistry,
+            MagCacheConfig,
+            PyramidAttentionBroadcastConfig,
+            TeaCacheConfig,
+        )
         from ..hooks.faster_cache import _FASTER_CACHE_BLOCK_HOOK, _FASTER_CACHE_DENOISER_HOOK
-        from ..hooks.first_block_cache import _FBC_BLOCK_HOOK, _FBC_LEADER_BLOCK_HOOK
+        from ..hooks.first_block_cache import _FBC_BLOCK_HOOK, _FBC_LEADER_BLOCK_HOOK, _remove_first_block_cache_graph
         from ..hooks.pyramid_attention_broadcast import _PYRAMID_ATTENTION_BROADCAST_HOOK
+        from ..hooks.teacache import (
+            _MAGCACHE_BLOCK_HOOK,
+            _MAGCACHE_LEADER_BLOCK_HOOK,
+            _TEACACHE_BLOCK_HOOK,
+            _TEACACHE_LEADER_BLOCK_HOOK,
+        )
 
         if self._cache_config is None:
             logger.warning("Caching techniques have not been enabled, so there's nothing to disable.")
@@ -102,10 +125,19 @@ class CacheMixin:
             registry.remove_hook(_FASTER_CACHE_DENOISER_HOOK, recurse=True)
             registry.remove_hook(_FASTER_CACHE_BLOCK_HOOK, recurse=True)
         elif isinstance(self._cache_config, FirstBlockCacheConfig):
-            registry.remove_hook(_FBC_LEADER_BLOCK_HOOK, recurse=True)
-            registry.remove_hook(_FBC_BLOCK_HOOK, recurse=True)
+            if self._cache_config.graph_mode:
+                _remove_first_block_cache_graph(self)
+            else:
+                registry.remove_hook(_FBC_LEADER_BLOCK_HOOK, recurse=True)
+                registry.remove_hook(_FBC_BLOCK_HOOK, recurse=True)
         elif isinstance(self._cache_config, PyramidAttentionBroadcastConfig):
             registry.remove_hook(_PYRAMID_ATTENTION_BROADCAST_HOOK, recurse=True)
+        elif isinstance(self._cache_config, TeaCacheConfig):
+            registry.remove_hook(_TEACACHE_LEADER_BLOCK_HOOK, recurse=True)
+            registry.remove_hook(_TEACACHE_BLOCK_HOOK, recurse=True)
+        elif isinstance(self._cache_config, MagCacheConfig):
+            registry.remove_hook(_MAGCACHE_LEADER_BLOCK_HOOK, recurse=True)
+            registry.remove_hook(_MAGCACHE_BLOCK_HOOK, recurse=True)
         else:
             raise ValueError(f"Cache config {type(self._cache_config)} is not supported.")
 
@@ -113,8 +145,12 @@ class CacheMixin:
 
     def _reset_stateful_cache(self, recurse: bool = True) -> None:
         from ..hooks import HookRegistry
+        from ..hooks.first_block_cache import _get_first_block_cache_graph_state
 
         HookRegistry.check_if_exists_or_initialize(self).reset_stateful_hooks(recurse=recurse)
+        fbc_graph_state = _get_first_block_cache_graph_state(self)
+        if fbc_graph_state is not None:
+            fbc_graph_state.reset()
 
     @contextmanager
     def cache_context(self, name: str):
@@ -438,7 +438,24 @@ class ModelMixin(nn.Cell, PushToHubMixin):
             ... )
             ```
         """
-        raise NotImplementedError("`enable_group_offload` is not yet supported.")
+        from ..hooks import apply_group_offloading
+
+        if not self._supports_group_offloading:
+            raise ValueError(
+                f"{self.__class__.__name__} does not support group offloading. Please make sure to set the boolean "
+                f"attribute `_supports_group_offloading` to `True` in the class definition."
+            )
+        apply_group_offloading(
+            module=self,
+            onload_device=onload_device,
+            offload_device=offload_device,
+            offload_type=offload_type,
+            num_blocks_per_group=num_blocks_per_group,
+            non_blocking=non_blocking,
+            use_stream=use_stream,
+            record_stream=record_stream,
+            low_cpu_mem_usage=low_cpu_mem_usage,
+        )
 
     def set_attention_backend(self, backend: str) -> None:
         """
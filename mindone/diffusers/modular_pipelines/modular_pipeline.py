@@ -1436,6 +1436,8 @@ class ModularPipeline(ConfigMixin, PushToHubMixin):
 
     config_name = "modular_model_index.json"
     hf_device_map = None
+    # set by `enable_prompt_embeds_cache`
+    _prompt_embeds_cache = None
 
     # YiYi TODO: add warning for passing multiple ComponentSpec/ConfigSpec with the same name
     def __init__(
@@ -2185,6 +2187,42 @@ class ModularPipeline(ConfigMixin, PushToHubMixin):
             **spec_dict,
         )
 
+    def enable_prompt_embeds_cache(
+        self, max_size: int = 64, cache_dir: Optional[str] = None
+    ) -> "PromptEmbedsCache":  # noqa: F821
+        r"""
+        Caches the outputs of the text encoders of the pipeline across calls, so that repeated prompts, e.g. the empty
+        negative prompt of classifier-free guidance, are not encoded again. The encoders share one LRU cache, keyed by
+        the encoder, its LoRA adapters, its tokenized inputs and its dtype, see [`~hooks.PromptEmbedsCacheConfig`].
+
+        Args:
+            max_size (`int`, defaults to 64):
+                The number of encoder outputs kept in memory.
+            cache_dir (`str`, *optional*):
+                A directory to also keep the outputs on disk, across processes.
+
+        Returns:
+            [`~hooks.prompt_embeds_cache.PromptEmbedsCache`]: The cache, whose `stats()` gives the hit rate.
+        """
+        from ..hooks.prompt_embeds_cache import PromptEmbedsCacheConfig, _apply_prompt_embeds_cache_to_text_encoders
+
+        self.disable_prompt_embeds_cache()
+        config = PromptEmbedsCacheConfig(max_size=max_size, cache_dir=cache_dir)
+        cache = _apply_prompt_embeds_cache_to_text_encoders(self.components, config)
+        if cache is None:
+            raise ValueError(f"{self.__class__.__name__} has no text encoder to cache the outputs of.")
+        self._prompt_embeds_cache = cache
+        return cache
+
+    def disable_prompt_embeds_cache(self) -> None:
+        r"""
+        Removes the cache of the text encoder outputs, see `enable_prompt_embeds_cache`.
+        """
+        from ..hooks.prompt_embeds_cache import _remove_prompt_embeds_cache_from_text_encoders
+
+        _remove_prompt_embeds_cache_from_text_encoders(self.components)
+        self._prompt_embeds_cache = None
+
     def set_progress_bar_config(self, **kwargs):
         for sub_block_name, sub_block in self.blocks.sub_blocks.items():
             if hasattr(sub_block, "set_progress_bar_config"):
@@ -280,6 +280,7 @@ _import_structure = {
         "ImagePipelineOutput",
         "StableDiffusionMixin",
     ],
+    "serving_engine": ["DiffusionServingEngine", "GenerationRequest"],
 }
 
 if TYPE_CHECKING:
@@ -445,6 +446,7 @@ if TYPE_CHECKING:
     )
     from .sana import SanaControlNetPipeline, SanaPipeline, SanaSprintImg2ImgPipeline, SanaSprintPipeline
     from .semantic_stable_diffusion import SemanticStableDiffusionPipeline
+    from .serving_engine import DiffusionServingEngine, GenerationRequest
     from .shap_e import ShapEImg2ImgPipeline, ShapEPipeline
     from .skyreels_v2 import (
         SkyReelsV2DiffusionForcingImageToVideoPipeline,
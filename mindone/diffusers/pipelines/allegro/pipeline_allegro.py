@@ -921,6 +921,9 @@ class AllegroPipeline(DiffusionPipeline):
         else:
             video = latents
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         if not return_dict:
             return (video,)
 
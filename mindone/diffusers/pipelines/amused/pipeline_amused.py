@@ -325,6 +325,9 @@ class AmusedPipeline(DeprecatedPipelineMixin, DiffusionPipeline):
             if needs_upcasting:
                 self.vqvae.half()
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         if not return_dict:
             return (output,)
 
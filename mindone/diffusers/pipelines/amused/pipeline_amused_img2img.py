@@ -350,6 +350,9 @@ class AmusedImg2ImgPipeline(DeprecatedPipelineMixin, DiffusionPipeline):
             if needs_upcasting:
                 self.vqvae.half()
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         if not return_dict:
             return (output,)
 
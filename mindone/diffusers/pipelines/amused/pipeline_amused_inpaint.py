@@ -379,6 +379,9 @@ class AmusedInpaintPipeline(DeprecatedPipelineMixin, DiffusionPipeline):
             if needs_upcasting:
                 self.vqvae.half()
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         if not return_dict:
             return (output,)
 
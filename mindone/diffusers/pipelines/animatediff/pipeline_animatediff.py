@@ -869,6 +869,9 @@ class AnimateDiffPipeline(
             video_tensor = self.decode_latents(latents)
             video = self.video_processor.postprocess_video(video=video_tensor, output_type=output_type)
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         if not return_dict:
             return (video,)
 
@@ -1076,6 +1076,9 @@ class AnimateDiffControlNetPipeline(
             video_tensor = self.decode_latents(latents, decode_chunk_size)
             video = self.video_processor.postprocess_video(video=video_tensor, output_type=output_type)
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         if not return_dict:
             return (video,)
 
@@ -1246,6 +1246,9 @@ class AnimateDiffSDXLPipeline(
         if needs_upcasting:
             self.vae.to(dtype=ms.float16)
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         if not return_dict:
             return (video,)
 
@@ -553,6 +553,9 @@ class AudioLDMPipeline(DeprecatedPipelineMixin, DiffusionPipeline, StableDiffusi
         if output_type == "np":
             audio = audio.numpy()
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         if not return_dict:
             return (audio,)
 
@@ -996,6 +996,9 @@ class AudioLDM2Pipeline(DiffusionPipeline):
         if output_type == "np":
             audio = audio.numpy()
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         if not return_dict:
             return (audio,)
 
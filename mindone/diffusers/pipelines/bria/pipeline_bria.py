@@ -687,6 +687,9 @@ class BriaPipeline(DiffusionPipeline):
             image = self.vae.decode(latents.to(dtype=self.vae.dtype), return_dict=False)[0]
             image = self.image_processor.postprocess(image, output_type=output_type)
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         if not return_dict:
             return (image,)
 
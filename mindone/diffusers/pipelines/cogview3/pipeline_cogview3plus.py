@@ -653,6 +653,9 @@ class CogView3PlusPipeline(DiffusionPipeline):
 
         image = self.image_processor.postprocess(image, output_type=output_type)
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         if not return_dict:
             return (image,)
 
@@ -671,6 +671,9 @@ class CogView4Pipeline(DiffusionPipeline, CogView4LoraLoaderMixin):
 
         image = self.image_processor.postprocess(image, output_type=output_type)
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         if not return_dict:
             return (image,)
 
@@ -717,6 +717,9 @@ class CogView4ControlPipeline(DiffusionPipeline):
 
         image = self.image_processor.postprocess(image, output_type=output_type)
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         if not return_dict:
             return (image,)
 
@@ -0,0 +1,62 @@
+# Copyright 2025 The HuggingFace Team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Callable, Optional
+
+import mindspore as ms
+from mindspore import nn
+
+
+def call_denoiser(denoiser: nn.Cell, cache_context: Optional[str] = None, **kwargs) -> ms.Tensor:
+    r"""
+    Calls `denoiser` with `kwargs` and returns its first output. The call runs inside the cache context
+    `cache_context` of the denoiser if given; without one, the call can be compiled in a `denoise_fn` of
+    [`CompiledDenoiseStep`].
+    """
+    if cache_context is None:
+        return denoiser(**kwargs)[0]
+    with denoiser.cache_context(cache_context):
+        return denoiser(**kwargs)[0]
+
+
+class CompiledDenoiseStep(nn.Cell):
+    r"""
+    One step of a flow-matching denoising loop run as a single static graph: the denoiser forward passes and the
+    guidance combination computed by `denoise_fn`, followed by the Euler update of
+    [`FlowMatchEulerDiscreteScheduler`].
+
+    The sigmas of the step are inputs of the graph, so that the same graph serves every step of the loop. MindSpore
+    caches one graph per input signature: the first call with new latent or prompt shapes (a new shape bucket)
+    compiles, and the later calls with the same shapes reuse it.
+
+    Args:
+        denoiser (`nn.Cell`):
+            The denoising model, e.g. the transformer of the pipeline.
+        denoise_fn (`Callable`):
+            `denoise_fn(denoiser, latents, t, *inputs)` returning the guided noise prediction of `latents` at timestep
+            `t`. It must be compilable in graph mode.
+    """
+
+    def __init__(self, denoiser: nn.Cell, denoise_fn: Callable):
+        # keep the parameter names of the denoiser, it stays owned by the pipeline
+        super().__init__(auto_prefix=False)
+        self.denoiser = denoiser
+        self.denoise_fn = denoise_fn
+
+    @ms.jit
+    def construct(self, latents: ms.Tensor, t: ms.Tensor, sigma: ms.Tensor, sigma_next: ms.Tensor, *inputs):
+        noise_pred = self.denoise_fn(self.denoiser, latents, t, *inputs)
+        # same arithmetic and casts as `FlowMatchEulerDiscreteScheduler.step` followed by the pipeline cast
+        prev_sample = latents.to(ms.float32) + (sigma_next - sigma) * noise_pred
+        return prev_sample.to(noise_pred.dtype).to(latents.dtype)
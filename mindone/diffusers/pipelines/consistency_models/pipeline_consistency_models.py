@@ -261,6 +261,9 @@ class ConsistencyModelPipeline(DiffusionPipeline):
         # 6. Post-process image sample
         image = self.postprocess_image(sample, output_type=output_type)
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         if not return_dict:
             return (image,)
 
@@ -1604,6 +1604,9 @@ class StableDiffusionControlNetInpaintPipeline(
         if padding_mask_crop is not None:
             image = [self.image_processor.apply_overlay(mask_image, original_image, i, crops_coords) for i in image]
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         if not return_dict:
             return (image, has_nsfw_concept)
 
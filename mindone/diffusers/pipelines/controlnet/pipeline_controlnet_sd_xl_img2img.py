@@ -1594,6 +1594,9 @@ class StableDiffusionXLControlNetImg2ImgPipeline(
 
         image = self.image_processor.postprocess(image, output_type=output_type)
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         if not return_dict:
             return (image,)
 
@@ -1060,6 +1060,9 @@ class StableDiffusionXLControlNetXSPipeline(
 
             image = self.image_processor.postprocess(image, output_type=output_type)
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         if not return_dict:
             return (image,)
 
@@ -626,6 +626,9 @@ class Cosmos2TextToImagePipeline(DiffusionPipeline):
         else:
             image = latents[:, :, 0]
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         if not return_dict:
             return (image,)
 
@@ -742,6 +742,9 @@ class Cosmos2VideoToWorldPipeline(DiffusionPipeline):
         else:
             video = latents
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         if not return_dict:
             return (video,)
 
@@ -625,6 +625,9 @@ class CosmosTextToWorldPipeline(DiffusionPipeline):
         else:
             video = latents
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         if not return_dict:
             return (video,)
 
@@ -782,6 +782,9 @@ class CosmosVideoToWorldPipeline(DiffusionPipeline):
         else:
             video = latents
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         if not return_dict:
             return (video,)
 
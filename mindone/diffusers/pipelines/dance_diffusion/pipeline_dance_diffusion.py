@@ -154,6 +154,9 @@ class DanceDiffusionPipeline(DeprecatedPipelineMixin, DiffusionPipeline):
 
         audio = audio[:, :, :original_sample_size]
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         if not return_dict:
             return (audio,)
 
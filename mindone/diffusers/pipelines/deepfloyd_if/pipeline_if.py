@@ -764,6 +764,9 @@ class IFPipeline(DiffusionPipeline, StableDiffusionLoraLoaderMixin):
             # 9. Run safety checker
             image, nsfw_detected, watermark_detected = self.run_safety_checker(image, prompt_embeds.dtype)
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         if not return_dict:
             return (image, nsfw_detected, watermark_detected)
 
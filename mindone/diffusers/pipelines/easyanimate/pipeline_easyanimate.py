@@ -738,6 +738,9 @@ class EasyAnimatePipeline(DiffusionPipeline):
         else:
             video = latents
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         if not return_dict:
             return (video,)
 
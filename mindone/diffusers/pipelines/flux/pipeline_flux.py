@@ -32,6 +32,7 @@ from ...models import AutoencoderKL, FluxTransformer2DModel
 from ...schedulers import FlowMatchEulerDiscreteScheduler
 from ...utils import logging, scale_lora_layers, unscale_lora_layers
 from ...utils.mindspore_utils import randn_tensor
+from ..compiled_denoise_loop import call_denoiser
 from ..pipeline_utils import DiffusionPipeline
 from .pipeline_output import FluxPipelineOutput
 
@@ -596,6 +597,137 @@ class FluxPipeline(
     def interrupt(self):
         return self._interrupt
 
+    @staticmethod
+    def _denoise_fn(
+        transformer,
+        latents,
+        t,
+        guidance,
+        pooled_prompt_embeds,
+        prompt_embeds,
+        text_ids,
+        latent_image_ids,
+        true_cfg_scale,
+        negative_pooled_prompt_embeds,
+        negative_prompt_embeds,
+        negative_text_ids,
+        joint_attention_kwargs=None,
+        negative_joint_attention_kwargs=None,
+        use_cache_context=False,
+    ):
+        # the transformer passes and true CFG of one step of the denoising loop, run by `__call__` or compiled by
+        # `compile_denoise_loop`
+        # broadcast to batch dimension in a way that's compatible with ONNX/Core ML
+        timestep = t.broadcast_to((latents.shape[0],)).to(latents.dtype)
+        noise_pred = call_denoiser(
+            transformer,
+            "cond" if use_cache_context else None,
+            hidden_states=latents,
+            timestep=timestep / 1000,
+            guidance=guidance,
+            pooled_projections=pooled_prompt_embeds,
+            encoder_hidden_states=prompt_embeds,
+            txt_ids=text_ids,
+            img_ids=latent_image_ids,
+            joint_attention_kwargs=joint_attention_kwargs,
+            return_dict=False,
+        )
+        if negative_prompt_embeds is not None:
+            neg_noise_pred = call_denoiser(
+                transformer,
+                "uncond" if use_cache_context else None,
+                hidden_states=latents,
+                timestep=timestep / 1000,
+                guidance=guidance,
+                pooled_projections=negative_pooled_prompt_embeds,
+                encoder_hidden_states=negative_prompt_embeds,
+                txt_ids=negative_text_ids,
+                img_ids=latent_image_ids,
+                joint_attention_kwargs=negative_joint_attention_kwargs,
+                return_dict=False,
+            )
+            noise_pred = neg_noise_pred + true_cfg_scale * (noise_pred - neg_noise_pred)
+        return noise_pred
+
+    def _prepare_serving_request(self, request, scheduler, max_sequence_length=None):
+        # hooks of `DiffusionServingEngine`: the steps of `__call__` for one request, and a batched denoising step
+        max_sequence_length = max_sequence_length or 512
+        prompt_embeds, pooled_prompt_embeds, text_ids = self.encode_prompt(
+            prompt=request.prompt, prompt_2=None, max_sequence_length=max_sequence_length
+        )
+        request.conditions = {
+            "prompt_embeds": prompt_embeds,
+            "pooled_prompt_embeds": pooled_prompt_embeds,
+            "text_ids": text_ids,
+        }
+        request.guidance_mode = request.true_cfg_scale > 1 and request.negative_prompt is not None
+        if request.guidance_mode:
+            negative_prompt_embeds, negative_pooled_prompt_embeds, _ = self.encode_prompt(
+                prompt=request.negative_prompt, prompt_2=None, max_sequence_length=max_sequence_length
+            )
+            request.conditions["negative_prompt_embeds"] = negative_prompt_embeds
+            request.conditions["negative_pooled_prompt_embeds"] = negative_pooled_prompt_embeds
+
+        num_channels_latents = self.transformer.config.in_channels // 4
+        request.latents, request.conditions["latent_image_ids"] = self.prepare_latents(
+            1, num_channels_latents, request.height, request.width, prompt_embeds.dtype, request.generator
+        )
+
+        num_inference_steps = request.num_inference_steps
+        sigmas = np.linspace(1.0, 1 / num_inference_steps, num_inference_steps)
+        if hasattr(scheduler.config, "use_flow_sigmas") and scheduler.config.use_flow_sigmas:
+            sigmas = None
+        mu = calculate_shift(
+            request.latents.shape[1],
+            scheduler.config.get("base_image_seq_len", 256),
+            scheduler.config.get("max_image_seq_len", 4096),
+            scheduler.config.get("base_shift", 0.5),
+            scheduler.config.get("max_shift", 1.15),
+        )
+        retrieve_timesteps(scheduler, num_inference_steps, sigmas=sigmas, mu=mu)
+        request.timesteps = scheduler.timesteps.asnumpy()
+        request.sigmas = scheduler.sigmas.asnumpy()
+
+    def _collate_serving_conditions(self, requests):
+        conditions = {
+            key: mint.cat([request.conditions[key] for request in requests])
+            for key in requests[0].conditions
+            if key not in ("text_ids", "latent_image_ids")
+        }
+        conditions["text_ids"] = requests[0].conditions["text_ids"]
+        conditions["latent_image_ids"] = requests[0].conditions["latent_image_ids"]
+        conditions["guidance"] = None
+        if self.transformer.config.guidance_embeds:
+            conditions["guidance"] = ms.tensor([request.guidance_scale for request in requests], dtype=ms.float32)
+        if requests[0].guidance_mode:
+            true_cfg_scale = [request.true_cfg_scale for request in requests]
+            conditions["true_cfg_scale"] = ms.tensor(true_cfg_scale, dtype=ms.float32).reshape(-1, 1, 1)
+        return conditions
+
+    def _serving_denoise(self, latents, timesteps, conditions):
+        return self._denoise_fn(
+            self.transformer,
+            latents,
+            timesteps,
+            conditions["guidance"],
+            conditions["pooled_prompt_embeds"],
+            conditions["prompt_embeds"],
+            conditions["text_ids"],
+            conditions["latent_image_ids"],
+            conditions.get("true_cfg_scale"),
+            conditions.get("negative_pooled_prompt_embeds"),
+            conditions.get("negative_prompt_embeds"),
+            conditions["text_ids"],
+        )
+
+    def _decode_serving_latents(self, latents, height, width, output_type):
+        if output_type == "latent":
+            return latents
+        latents = self._unpack_latents(latents, height, width, self.vae_scale_factor)
+        latents = (latents / self.vae.config.scaling_factor) + self.vae.config.shift_factor
+        image = self.vae.decode(latents, return_dict=False)[0]
+        return self.image_processor.postprocess(image, output_type=output_type)
+
     def __call__(
         self,
         prompt: Union[str, List[str]] = None,
@@ -871,54 +1003,57 @@ class FluxPipeline(
         # We set the index here to remove DtoH sync, helpful especially during compilation.
         # Check out more details here: https://github.com/huggingface/diffusers/pull/11696
         self.scheduler.set_begin_index(0)
+        # the compiled step, if any, only covers the plain text-to-image path
+        use_compiled_step = self._use_compiled_denoise_step(
+            joint_attention_kwargs=bool(self.joint_attention_kwargs),
+            ip_adapter=image_embeds is not None or negative_image_embeds is not None,
+            cache=self.transformer.is_cache_enabled,
+        )
         with self.progress_bar(total=num_inference_steps) as progress_bar:
             for i, t in enumerate(timesteps):
                 if self.interrupt:
                     continue
 
                 self._current_timestep = t
-                if image_embeds is not None:
-                    self._joint_attention_kwargs["ip_adapter_image_embeds"] = image_embeds
-                # broadcast to batch dimension in a way that's compatible with ONNX/Core ML
-                timestep = t.broadcast_to((latents.shape[0],)).to(latents.dtype)
-
-                with self.transformer.cache_context("cond"):
-                    noise_pred = self.transformer(
-                        hidden_states=latents,
-                        timestep=timestep / 1000,
-                        guidance=guidance,
-                        pooled_projections=pooled_prompt_embeds,
-                        encoder_hidden_states=prompt_embeds,
-                        txt_ids=text_ids,
-                        img_ids=latent_image_ids,
+                denoise_inputs = (
+                    guidance,
+                    pooled_prompt_embeds,
+                    prompt_embeds,
+                    text_ids,
+                    latent_image_ids,
+                    true_cfg_scale,
+                    negative_pooled_prompt_embeds if do_true_cfg else None,
+                    negative_prompt_embeds if do_true_cfg else None,
+                    negative_text_ids if do_true_cfg else None,
+                )
+                if use_compiled_step:
+                    sigma, sigma_next = self.scheduler.next_step_sigmas(t)
+                    latents = self._compiled_denoise_step(latents, t, sigma, sigma_next, *denoise_inputs)
+                else:
+                    negative_joint_attention_kwargs = self.joint_attention_kwargs
+                    if image_embeds is not None:
+                        self._joint_attention_kwargs["ip_adapter_image_embeds"] = image_embeds
+                    if negative_image_embeds is not None:
+                        negative_joint_attention_kwargs = {
+                            **self.joint_attention_kwargs,
+                            "ip_adapter_image_embeds": negative_image_embeds,
+                        }
+                    noise_pred = self._denoise_fn(
+                        self.transformer,
+                        latents,
+                        t,
+                        *denoise_inputs,
                         joint_attention_kwargs=self.joint_attention_kwargs,
-                        return_dict=False,
-                    )[0]
+                        negative_joint_attention_kwargs=negative_joint_attention_kwargs,
+                        use_cache_context=True,
+                    )
 
-                if do_true_cfg:
-                    if negative_image_embeds is not None:
-                        self._joint_attention_kwargs["ip_adapter_image_embeds"] = negative_image_embeds
-
-                    with self.transformer.cache_context("uncond"):
-                        neg_noise_pred = self.transformer(
-                            hidden_states=latents,
-                            timestep=timestep / 1000,
-                            guidance=guidance,
-                            pooled_projections=negative_pooled_prompt_embeds,
-                            encoder_hidden_states=negative_prompt_embeds,
-                            txt_ids=negative_text_ids,
-                            img_ids=latent_image_ids,
-                            joint_attention_kwargs=self.joint_attention_kwargs,
-                            return_dict=False,
-                        )[0]
-                    noise_pred = neg_noise_pred + true_cfg_scale * (noise_pred - neg_noise_pred)
-
-                # compute the previous noisy sample x_t -> x_t-1
-                latents_dtype = latents.dtype
-                latents = self.scheduler.step(noise_pred, t, latents, return_dict=False)[0]
-
-                if latents.dtype != latents_dtype:
-                    latents = latents.to(latents_dtype)
+                    # compute the previous noisy sample x_t -> x_t-1
+                    latents_dtype = latents.dtype
+                    latents = self.scheduler.step(noise_pred, t, latents, return_dict=False)[0]
+
+                    if latents.dtype != latents_dtype:
+                        latents = latents.to(latents_dtype)
 
                 if callback_on_step_end is not None:
                     callback_kwargs = {}
@@ -948,6 +1083,9 @@ class FluxPipeline(
             image = self.vae.decode(latents, return_dict=False)[0]
             image = self.image_processor.postprocess(image, output_type=output_type)
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         if not return_dict:
             return (image,)
 
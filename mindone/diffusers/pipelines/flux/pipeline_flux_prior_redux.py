@@ -463,6 +463,9 @@ class FluxPriorReduxPipeline(DiffusionPipeline):
         prompt_embeds = mint.sum(prompt_embeds, dim=0, keepdim=True)
         pooled_prompt_embeds = mint.sum(pooled_prompt_embeds, dim=0, keepdim=True)
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         if not return_dict:
             return (prompt_embeds, pooled_prompt_embeds)
 
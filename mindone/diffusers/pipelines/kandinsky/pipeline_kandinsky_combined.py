@@ -309,6 +309,9 @@ class KandinskyCombinedPipeline(DiffusionPipeline):
             return_dict=return_dict,
         )
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         return outputs
 
 
@@ -533,6 +536,9 @@ class KandinskyImg2ImgCombinedPipeline(DiffusionPipeline):
             return_dict=return_dict,
         )
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         return outputs
 
 
@@ -764,4 +770,7 @@ class KandinskyInpaintCombinedPipeline(DiffusionPipeline):
             return_dict=return_dict,
         )
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         return outputs
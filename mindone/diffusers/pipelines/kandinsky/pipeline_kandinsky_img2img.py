@@ -479,6 +479,9 @@ class KandinskyImg2ImgPipeline(DiffusionPipeline):
 
         image = self.image_processor.postprocess(image, output_type)
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         if not return_dict:
             return (image,)
 
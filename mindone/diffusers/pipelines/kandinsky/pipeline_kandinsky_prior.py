@@ -522,6 +522,9 @@ class KandinskyPriorPipeline(DiffusionPipeline):
             image_embeddings = image_embeddings.numpy()
             zero_embeds = zero_embeds.numpy()
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         if not return_dict:
             return (image_embeddings, zero_embeds)
 
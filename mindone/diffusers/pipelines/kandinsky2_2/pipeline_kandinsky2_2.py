@@ -313,6 +313,9 @@ class KandinskyV22Pipeline(DiffusionPipeline):
         else:
             image = latents
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         if not return_dict:
             return (image,)
 
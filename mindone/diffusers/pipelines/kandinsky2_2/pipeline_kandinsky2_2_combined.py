@@ -314,6 +314,9 @@ class KandinskyV22CombinedPipeline(DiffusionPipeline):
             callback_on_step_end_tensor_inputs=callback_on_step_end_tensor_inputs,
         )
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         return outputs
 
 
@@ -537,6 +540,9 @@ class KandinskyV22Img2ImgCombinedPipeline(DiffusionPipeline):
             callback_on_step_end_tensor_inputs=callback_on_step_end_tensor_inputs,
         )
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         return outputs
 
 
@@ -795,4 +801,7 @@ class KandinskyV22InpaintCombinedPipeline(DiffusionPipeline):
             **kwargs,
         )
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         return outputs
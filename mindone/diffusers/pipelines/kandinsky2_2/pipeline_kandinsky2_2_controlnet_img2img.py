@@ -351,6 +351,9 @@ class KandinskyV22ControlnetImg2ImgPipeline(DiffusionPipeline):
 
         image = self.image_processor.postprocess(image, output_type)
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         if not return_dict:
             return (image,)
 
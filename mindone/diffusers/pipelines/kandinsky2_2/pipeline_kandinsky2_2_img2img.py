@@ -362,6 +362,9 @@ class KandinskyV22Img2ImgPipeline(DiffusionPipeline):
         else:
             image = latents
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         if not return_dict:
             return (image,)
 
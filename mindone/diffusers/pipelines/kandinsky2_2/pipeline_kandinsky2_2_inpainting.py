@@ -544,6 +544,9 @@ class KandinskyV22InpaintPipeline(DiffusionPipeline):
         else:
             image = latents
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         if not return_dict:
             return (image,)
 
@@ -538,6 +538,9 @@ class KandinskyV22PriorPipeline(DiffusionPipeline):
             image_embeddings = image_embeddings.numpy()
             zero_embeds = zero_embeds.numpy()
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         if not return_dict:
             return (image_embeddings, zero_embeds)
 
@@ -469,6 +469,9 @@ class KandinskyV22PriorEmb2EmbPipeline(DiffusionPipeline):
             image_embeddings = image_embeddings.numpy()
             zero_embeds = zero_embeds.numpy()
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         if not return_dict:
             return (image_embeddings, zero_embeds)
 
@@ -556,6 +556,9 @@ class Kandinsky3Pipeline(DiffusionPipeline, LoraLoaderMixin):
             else:
                 image = latents
 
+            # Offload all models
+            self.maybe_free_model_hooks()
+
             if not return_dict:
                 return (image,)
 
@@ -599,6 +599,9 @@ class Kandinsky3Img2ImgPipeline(DiffusionPipeline, StableDiffusionLoraLoaderMixi
             else:
                 image = latents
 
+            # Offload all models
+            self.maybe_free_model_hooks()
+
             if not return_dict:
                 return (image,)
 
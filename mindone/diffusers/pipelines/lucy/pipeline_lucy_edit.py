@@ -701,6 +701,9 @@ class LucyEditPipeline(DiffusionPipeline, WanLoraLoaderMixin):
         else:
             video = latents
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         if not return_dict:
             return (video,)
 
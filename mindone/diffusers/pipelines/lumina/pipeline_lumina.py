@@ -884,6 +884,9 @@ class LuminaPipeline(DiffusionPipeline):
         else:
             image = latents
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         if not return_dict:
             return (image,)
 
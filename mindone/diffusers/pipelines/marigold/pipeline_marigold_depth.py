@@ -583,6 +583,9 @@ class MarigoldDepthPipeline(DiffusionPipeline):
             if uncertainty is not None and output_uncertainty:
                 uncertainty = self.image_processor.ms_to_numpy(uncertainty)  # [N,H,W,1]
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         if not return_dict:
             return (prediction, uncertainty, pred_latent)
 
@@ -589,6 +589,9 @@ class MarigoldIntrinsicsPipeline(DiffusionPipeline):
             if uncertainty is not None and output_uncertainty:
                 uncertainty = self.image_processor.ms_to_numpy(uncertainty)  # [N*T,H,W,3]
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         if not return_dict:
             return (prediction, uncertainty, pred_latent)
 
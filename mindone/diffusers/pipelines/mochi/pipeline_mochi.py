@@ -717,6 +717,9 @@ class MochiPipeline(DiffusionPipeline, Mochi1LoraLoaderMixin):
             video = self.vae.decode(latents, return_dict=False)[0]
             video = self.video_processor.postprocess_video(video, output_type=output_type)
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         if not return_dict:
             return (video,)
 
@@ -491,6 +491,9 @@ class OmniGenPipeline(
         else:
             image = latents
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         if not return_dict:
             return (image,)
 
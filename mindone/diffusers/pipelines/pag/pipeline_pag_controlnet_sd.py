@@ -1276,6 +1276,9 @@ class StableDiffusionControlNetPAGPipeline(
         if self.do_perturbed_attention_guidance:
             self.unet.set_attn_processor(original_attn_proc)
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         if not return_dict:
             return (image, has_nsfw_concept)
 
@@ -1495,6 +1495,9 @@ class StableDiffusionControlNetPAGInpaintPipeline(
         if self.do_perturbed_attention_guidance:
             self.unet.set_attn_processor(original_attn_proc)
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         if not return_dict:
             return (image, has_nsfw_concept)
 
@@ -1609,6 +1609,9 @@ class StableDiffusionXLControlNetPAGImg2ImgPipeline(
         if self.do_perturbed_attention_guidance:
             self.unet.set_attn_processor(original_attn_proc)
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         if not return_dict:
             return (image,)
 
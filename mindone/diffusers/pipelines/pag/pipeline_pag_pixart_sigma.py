@@ -833,6 +833,9 @@ class PixArtSigmaPAGPipeline(DiffusionPipeline, PAGMixin):
         if self.do_perturbed_attention_guidance:
             self.transformer.set_attn_processor(original_attn_proc)
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         if not return_dict:
             return (image,)
 
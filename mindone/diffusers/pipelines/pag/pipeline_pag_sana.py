@@ -894,6 +894,9 @@ class SanaPAGPipeline(DiffusionPipeline, PAGMixin):
         if self.do_perturbed_attention_guidance:
             self.transformer.set_attn_processor(original_attn_proc)
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         if not return_dict:
             return (image,)
 
@@ -22,7 +22,7 @@ import os
 import re
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, Union, get_args, get_origin
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union, get_args, get_origin
 
 import numpy as np
 import PIL.Image
@@ -47,6 +47,12 @@ from mindspore import nn
 
 from .. import __version__
 from ..configuration_utils import ConfigMixin
+from ..hooks.group_offloading import (
+    _GROUP_OFFLOADING,
+    _MODEL_OFFLOADING,
+    apply_group_offloading,
+    apply_model_offloading,
+)
 from ..models.modeling_utils import ModelMixin
 from ..schedulers.scheduling_utils import SCHEDULER_CONFIG_NAME
 from ..utils import (
@@ -174,6 +180,10 @@ class DiffusionPipeline(ConfigMixin, PushToHubMixin):
     _exclude_from_cpu_offload = []
     _load_connected_pipes = False
     _is_onnx = False
+    # set by `compile_denoise_loop`
+    _compiled_denoise_step = None
+    # set by `enable_prompt_embeds_cache`
+    _prompt_embeds_cache = None
 
     def register_modules(self, **kwargs):
         for name, module in kwargs.items():
@@ -770,25 +780,48 @@ class DiffusionPipeline(ConfigMixin, PushToHubMixin):
         r"""
         Removes all hooks that were added when using `enable_sequential_cpu_offload` or `enable_model_cpu_offload`.
         """
-        raise NotImplementedError("`remove_all_hooks` is not implemented.")
-
-    def enable_model_cpu_offload(self, gpu_id: Optional[int] = None, device: str = "cuda"):
+        for _, model in self.components.items():
+            if isinstance(model, nn.Cell) and hasattr(model, "_diffusers_hook"):
+                model._diffusers_hook.remove_hook(_MODEL_OFFLOADING, recurse=False)
+                model._diffusers_hook.remove_hook(_GROUP_OFFLOADING, recurse=True)
+        self._all_hooks = []
+
+    def _get_offload_components(self) -> List[nn.Cell]:
+        # models in `model_cpu_offload_seq` order first, then the other models which are not excluded from offloading
+        all_model_components = {k: v for k, v in self.components.items() if isinstance(v, nn.Cell)}
+        models = []
+        for name in (self.model_cpu_offload_seq or "").split("->"):
+            model = all_model_components.pop(name, None)
+            if model is not None:
+                models.append(model)
+        for name, model in all_model_components.items():
+            if name not in self._exclude_from_cpu_offload:
+                models.append(model)
+        return models
+
+    def enable_model_cpu_offload(self, gpu_id: Optional[int] = None, device: str = "Ascend"):
         r"""
-        Offloads all models to CPU using accelerate, reducing memory usage with a low impact on performance. Compared
-        to `enable_sequential_cpu_offload`, this method moves one whole model at a time to the GPU when its `forward`
-        method is called, and the model remains in GPU until the next model runs. Memory savings are lower than with
+        Offloads all models to CPU, reducing memory usage with a low impact on performance. Compared to
+        `enable_sequential_cpu_offload`, this method moves one whole model at a time to the device when its `construct`
+        method is called, and the model remains on device until another model runs. Memory savings are lower than with
         `enable_sequential_cpu_offload`, but performance is much better due to the iterative execution of the `unet`.
 
         Arguments:
             gpu_id (`int`, *optional*):
-                The ID of the accelerator that shall be used in inference. If not specified, it will default to 0.
-            device (`torch.Device` or `str`, *optional*, defaults to "cuda"):
-                The PyTorch device type of the accelerator that shall be used in inference. If not specified, it will
-                default to "cuda".
+                Unused, the device id is the one set with `mindspore.set_device`.
+            device (`str`, *optional*, defaults to "Ascend"):
+                The device the models are moved to for computation.
         """
-        raise NotImplementedError(
-            "`enable_model_cpu_offload` is not implemented. If you want to utilize the offload function, you can try the [capabilities provided by the framework itself](https://www.mindspore.cn/docs/zh-CN/master/model_train/parallel/memory_offload.html)."  # noqa: E501
-        )
+        if gpu_id is not None:
+            logger.warning(
+                "`gpu_id` is ignored, the models are onloaded to the device set with `mindspore.set_device`."
+            )
+        if self.model_cpu_offload_seq is None:
+            raise ValueError(
+                "Model CPU offload cannot be enabled because no `model_cpu_offload_seq` class attribute is set."
+            )
+        self.remove_all_hooks()
+        self._all_hooks = apply_model_offloading(self._get_offload_components(), onload_device=device)
 
     def maybe_free_model_hooks(self):
         r"""
@@ -802,26 +835,128 @@ class DiffusionPipeline(ConfigMixin, PushToHubMixin):
         Make sure to add this function to the end of the `__call__` function of your pipeline so that it functions
         correctly when applying `enable_model_cpu_offload`.
         """
-        raise NotImplementedError("`maybe_free_model_hooks` is not implemented.")
+        for component in self.components.values():
+            if hasattr(component, "_reset_stateful_cache"):
+                component._reset_stateful_cache()
 
-    def enable_sequential_cpu_offload(self, gpu_id: Optional[int] = None, device: str = "cuda"):
+        for hook in getattr(self, "_all_hooks", []):
+            # offloading the models is enough, their hooks onload them again when they are called
+            hook.offload()
+
+    def enable_sequential_cpu_offload(self, gpu_id: Optional[int] = None, device: str = "Ascend"):
         r"""
-        Offloads all models to CPU using 🤗 Accelerate, significantly reducing memory usage. When called, the state
-        dicts of all `torch.nn.Module` components (except those in `self._exclude_from_cpu_offload`) are saved to CPU
-        and then moved to `torch.device('meta')` and loaded to GPU only when their specific submodule has its `forward`
-        method called. Offloading happens on a submodule basis. Memory savings are higher than with
-        `enable_model_cpu_offload`, but performance is lower.
+        Offloads all models to CPU, significantly reducing memory usage. When called, the parameters of all `nn.Cell`
+        components (except those in `self._exclude_from_cpu_offload`) are kept on CPU and loaded to the device only
+        when their specific submodule has its `construct` method called. Offloading happens on a submodule basis.
+        Memory savings are higher than with `enable_model_cpu_offload`, but performance is lower.
 
         Arguments:
             gpu_id (`int`, *optional*):
-                The ID of the accelerator that shall be used in inference. If not specified, it will default to 0.
-            device (`torch.Device` or `str`, *optional*, defaults to "cuda"):
-                The PyTorch device type of the accelerator that shall be used in inference. If not specified, it will
-                default to "cuda".
+                Unused, the device id is the one set with `mindspore.set_device`.
+            device (`str`, *optional*, defaults to "Ascend"):
+                The device the submodules are moved to for computation.
         """
-        raise NotImplementedError(
-            "`enable_sequential_cpu_offload` is not implemented. If you want to utilize the offload function, you can try the [capabilities provided by the framework itself](https://www.mindspore.cn/docs/zh-CN/master/model_train/parallel/memory_offload.html)."  # noqa: E501
-        )
+        if gpu_id is not None:
+            logger.warning(
+                "`gpu_id` is ignored, the models are onloaded to the device set with `mindspore.set_device`."
+            )
+        self.remove_all_hooks()
+        for model in self._get_offload_components():
+            apply_group_offloading(model, onload_device=device, offload_device="CPU", offload_type="leaf_level")
+
+    def compile_denoise_loop(
+        self, num_inference_steps: int = 1, shapes: Optional[List[Tuple[int, int]]] = None, **kwargs
+    ) -> None:
+        r"""
+        Runs each step of the denoising loop (the denoiser forward passes, the classifier-free guidance combination and
+        the scheduler update) as one static graph instead of separate PyNative dispatches from Python. A graph is
+        compiled per shape bucket and reused by the later calls with the same shapes. Steps that need Python-side
+        features, such as caching hooks, attention kwargs or skip-layer guidance, keep running eagerly.
+
+        Only pipelines defining `_denoise_fn` with a deterministic [`FlowMatchEulerDiscreteScheduler`] are supported.
+        The compiled loop starts at the first step of the schedule, so the step index is never looked up on device. The
+        scheduler itself is left unchanged, so pipelines sharing it, e.g. through `from_pipe`, are not affected.
+
+        Args:
+            num_inference_steps (`int`, *optional*, defaults to 1):
+                The number of denoising steps of the warm-up calls.
+            shapes (`List[Tuple[int, int]]`, *optional*):
+                The `(height, width)` buckets to compile ahead of time, by running the pipeline once on each of them.
+                Other shapes are compiled on first use.
+            kwargs:
+                Additional arguments of the warm-up calls, e.g. the guidance options whose graphs should be compiled.
+        """
+        from ..schedulers import FlowMatchEulerDiscreteScheduler
+        from .compiled_denoise_loop import CompiledDenoiseStep
+
+        if not hasattr(self, "_denoise_fn"):
+            raise NotImplementedError(f"{self.__class__.__name__} does not support compiling the denoising loop.")
+        scheduler = getattr(self, "scheduler", None)
+        if not isinstance(scheduler, FlowMatchEulerDiscreteScheduler) or scheduler.config.stochastic_sampling:
+            raise ValueError(
+                "Compiling the denoising loop requires a `FlowMatchEulerDiscreteScheduler` without stochastic sampling, "
+                f"but got {scheduler.__class__.__name__}."
+            )
+
+        self._compiled_denoise_step = CompiledDenoiseStep(self.transformer, self._denoise_fn)
+        for height, width in shapes or []:
+            kwargs.setdefault("prompt", "")
+            self(height=height, width=width, num_inference_steps=num_inference_steps, output_type="latent", **kwargs)
+
+    def disable_compiled_denoise_loop(self) -> None:
+        r"""
+        Goes back to running the denoising loop eagerly, see `compile_denoise_loop`.
+        """
+        self._compiled_denoise_step = None
+
+    def _use_compiled_denoise_step(self, **features) -> bool:
+        # whether the step compiled by `compile_denoise_loop` runs this call, the features used need the eager loop
+        if self._compiled_denoise_step is None:
+            return False
+        used_features = [name for name, used in features.items() if used]
+        if used_features:
+            logger.warning(
+                f"The compiled denoising step does not support {', '.join(used_features)}, the denoising loop of this "
+                "call runs eagerly."
+            )
+            return False
+        return True
+
+    def enable_prompt_embeds_cache(
+        self, max_size: int = 64, cache_dir: Optional[str] = None
+    ) -> "PromptEmbedsCache":  # noqa: F821
+        r"""
+        Caches the outputs of the text encoders of the pipeline across calls, so that repeated prompts, e.g. the empty
+        negative prompt of classifier-free guidance, are not encoded again. The encoders share one LRU cache, keyed by
+        the encoder, its LoRA adapters, its tokenized inputs and its dtype, see [`~hooks.PromptEmbedsCacheConfig`].
+
+        Args:
+            max_size (`int`, defaults to 64):
+                The number of encoder outputs kept in memory.
+            cache_dir (`str`, *optional*):
+                A directory to also keep the outputs on disk, across processes.
+
+        Returns:
+            [`~hooks.prompt_embeds_cache.PromptEmbedsCache`]: The cache, whose `stats()` gives the hit rate.
+        """
+        from ..hooks.prompt_embeds_cache import PromptEmbedsCacheConfig, _apply_prompt_embeds_cache_to_text_encoders
+
+        self.disable_prompt_embeds_cache()
+        config = PromptEmbedsCacheConfig(max_size=max_size, cache_dir=cache_dir)
+        cache = _apply_prompt_embeds_cache_to_text_encoders(self.components, config)
+        if cache is None:
+            raise ValueError(f"{self.__class__.__name__} has no text encoder to cache the outputs of.")
+        self._prompt_embeds_cache = cache
+        return cache
+
+    def disable_prompt_embeds_cache(self) -> None:
+        r"""
+        Removes the cache of the text encoder outputs, see `enable_prompt_embeds_cache`.
+        """
+        from ..hooks.prompt_embeds_cache import _remove_prompt_embeds_cache_from_text_encoders
+
+        _remove_prompt_embeds_cache_from_text_encoders(self.components)
+        self._prompt_embeds_cache = None
 
     def reset_device_map(self):
         r"""
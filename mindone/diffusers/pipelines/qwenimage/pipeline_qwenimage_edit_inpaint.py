@@ -1073,6 +1073,9 @@ class QwenImageEditInpaintPipeline(DiffusionPipeline, QwenImageLoraLoaderMixin):
             if padding_mask_crop is not None:
                 image = [self.image_processor.apply_overlay(mask_image, original_image, i, crops_coords) for i in image]
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         if not return_dict:
             return (image,)
 
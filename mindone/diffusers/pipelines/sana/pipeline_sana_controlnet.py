@@ -1052,6 +1052,9 @@ class SanaControlNetPipeline(DiffusionPipeline, SanaLoraLoaderMixin):
 
             image = self.image_processor.postprocess(image, output_type=output_type)
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         if not return_dict:
             return (image,)
 
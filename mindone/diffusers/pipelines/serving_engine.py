@@ -0,0 +1,256 @@
+# Copyright 2025 The HuggingFace Team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import copy
+import itertools
+from dataclasses import dataclass, field
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+import mindspore as ms
+from mindspore import mint
+
+from ..schedulers import FlowMatchEulerDiscreteScheduler
+from ..utils import logging
+
+logger = logging.get_logger(__name__)
+
+
+@dataclass
+class GenerationRequest:
+    """
+    An image generation request tracked by [`DiffusionServingEngine`].
+
+    The prompt and sampling arguments are set by the caller, the state fields are filled by the engine and the
+    pipeline when the request is admitted.
+    """
+
+    request_id: str
+    prompt: str
+    height: int
+    width: int
+    num_inference_steps: int = 28
+    guidance_scale: float = 3.5
+    negative_prompt: Optional[str] = None
+    true_cfg_scale: float = 1.0
+    generator: Optional[np.random.Generator] = None
+    # state, set on admission by `pipe._prepare_serving_request`
+    latents: Optional[ms.Tensor] = None
+    conditions: Dict[str, Any] = field(default_factory=dict)
+    guidance_mode: Hashable = None
+    timesteps: Optional[np.ndarray] = None
+    sigmas: Optional[np.ndarray] = None
+    step: int = 0
+    # decoded output, set when the request finishes
+    image: Any = None
+
+    @property
+    def is_finished(self) -> bool:
+        return self.timesteps is not None and self.step >= len(self.timesteps)
+
+
+class DiffusionServingEngine:
+    r"""
+    Serves concurrent generation requests with one pipeline, batching the denoiser forward passes of several requests.
+
+    Requests are grouped in buckets of equal `(height, width, guidance mode)`, whose latents and prompt embeddings have
+    the same shapes and whose guidance needs the same forward passes. The running requests of a bucket are split in
+    batches of at most `max_batch_size` requests. Every `step` runs one denoising step on the batch holding the oldest
+    unfinished request, topped up with waiting requests of the same bucket while it has free slots. Each request keeps
+    its own schedule, so requests admitted at different times, or with different step counts, are at different
+    timesteps of the same forward. The guidance scales are per sample as well. A request is decoded and returned as soon
+    as its last step is done, and its slot in the batch is reused by the next step.
+
+    The pipeline provides the model specific parts through hooks, currently implemented by [`FluxPipeline`] and
+    [`StableDiffusion3Pipeline`]:
+
+        - `_prepare_serving_request(request, scheduler, max_sequence_length)` encodes the prompts, samples the initial
+          latents and sets the schedule and guidance mode of the request,
+        - `_collate_serving_conditions(requests)` batches the prompt embeddings and guidance scales of the requests,
+        - `_serving_denoise(latents, timesteps, conditions)` returns the guided noise prediction of the batch,
+        - `_decode_serving_latents(latents, height, width, output_type)` decodes the latents of finished requests.
+
+    The Euler update of [`FlowMatchEulerDiscreteScheduler`] is applied by the engine with per-sample sigmas.
+
+    Args:
+        pipe ([`DiffusionPipeline`]):
+            A pipeline implementing the serving hooks, with a deterministic [`FlowMatchEulerDiscreteScheduler`].
+        max_batch_size (`int`, defaults to 8):
+            Maximum number of requests in a denoiser forward. With classifier-free guidance, the forward batch holds
+            twice as many samples.
+        max_sequence_length (`int`, *optional*):
+            Length the prompts are padded to, shared by all the requests so that their embeddings can be batched.
+            Defaults to the default of the pipeline.
+        output_type (`str`, defaults to `"pil"`):
+            The output format of the generated images, see the `output_type` of the pipeline.
+
+    Examples:
+        >>> engine = DiffusionServingEngine(pipe, max_batch_size=8)
+        >>> engine.add_request("0", "A cat holding a sign", height=1024, width=1024, num_inference_steps=28)
+        >>> engine.add_request("1", "A photo of a dog", height=768, width=1024, num_inference_steps=20)
+        >>> for request in engine.generate():
+        ...     request.image.save(f"{request.request_id}.png")
+    """
+
+    def __init__(
+        self,
+        pipe,
+        max_batch_size: int = 8,
+        max_sequence_length: Optional[int] = None,
+        output_type: Optional[str] = "pil",
+    ):
+        missing = [
+            hook
+            for hook in (
+                "_prepare_serving_request",
+                "_collate_serving_conditions",
+                "_serving_denoise",
+                "_decode_serving_latents",
+            )
+            if not hasattr(pipe, hook)
+        ]
+        if missing:
+            raise NotImplementedError(f"{pipe.__class__.__name__} does not implement the serving hooks {missing}.")
+        if not isinstance(pipe.scheduler, FlowMatchEulerDiscreteScheduler) or pipe.scheduler.config.stochastic_sampling:
+            raise ValueError(
+                "`DiffusionServingEngine` requires a `FlowMatchEulerDiscreteScheduler` without stochastic sampling, "
+                f"but got {pipe.scheduler.__class__.__name__}."
+            )
+        if max_batch_size < 1:
+            raise ValueError(f"`max_batch_size` must be at least 1, but got {max_batch_size}.")
+
+        self.pipe = pipe
+        self.max_batch_size = max_batch_size
+        self.max_sequence_length = max_sequence_length
+        self.output_type = output_type
+        # private copy, computing the schedule of a request must not touch the scheduler of the pipeline
+        self.scheduler = copy.deepcopy(pipe.scheduler)
+
+        self.waiting: List[GenerationRequest] = []
+        # running requests by batch, keyed by bucket and batch index, in admission order
+        self.running: Dict[Tuple, List[GenerationRequest]] = {}
+        self.requests: Dict[str, GenerationRequest] = {}
+        # arrival order of the unfinished requests, for oldest-first bucket selection
+        self._arrival: Dict[str, int] = {}
+        self._counter = itertools.count()
+        # conditions of the last batch, reused while the batch composition does not change
+        self._collated: Tuple[Tuple[str, ...], Optional[Dict[str, Any]]] = ((), None)
+
+    def add_request(self, request_id: str, prompt: str, height: int, width: int, **kwargs) -> GenerationRequest:
+        """Queues a new request, see [`GenerationRequest`] for the sampling arguments."""
+        if request_id in self.requests:
+            raise ValueError(f"Request {request_id} already exists.")
+        request = GenerationRequest(request_id, prompt, height, width, **kwargs)
+        if request.num_inference_steps < 1:
+            raise ValueError(f"Request {request_id} needs at least one inference step.")
+        self.requests[request_id] = request
+        self._arrival[request_id] = next(self._counter)
+        self.waiting.append(request)
+        return request
+
+    def has_unfinished_requests(self) -> bool:
+        return bool(self.waiting or self.running)
+
+    def _admit(self, request: GenerationRequest) -> Tuple:
+        """Prepares the request and adds it to the first batch of its bucket with a free slot, or to a new batch."""
+        self.pipe._prepare_serving_request(request, self.scheduler, self.max_sequence_length)
+        bucket = self._bucket(request)
+        index = 0
+        while len(self.running.get((*bucket, index), ())) >= self.max_batch_size:
+            index += 1
+        self.running.setdefault((*bucket, index), []).append(request)
+        return bucket + (index,)
+
+    @staticmethod
+    def _bucket(request: GenerationRequest) -> Tuple:
+        return request.height, request.width, request.guidance_mode
+
+    def _select_batch(self) -> Tuple[Tuple, List[GenerationRequest]]:
+        """Picks the batch of the oldest unfinished request and fills its free slots with waiting requests."""
+        oldest_running = min(self.running, key=lambda b: self._arrival[self.running[b][0].request_id], default=None)
+        if self.waiting and (
+            oldest_running is None
+            or self._arrival[self.waiting[0].request_id] < self._arrival[self.running[oldest_running][0].request_id]
+        ):
+            key = self._admit(self.waiting.pop(0))
+        else:
+            key = oldest_running
+
+        batch = self.running[key]
+        # the guidance mode of a waiting request is known once it is prepared, only requests with the same size are
+        # prepared here; those ending up in another batch run in a later step
+        for request in list(self.waiting):
+            if len(batch) >= self.max_batch_size:
+                break
+            if (request.height, request.width) != key[:2]:
+                continue
+            self.waiting.remove(request)
+            self._admit(request)
+        return key, batch
+
+    def step(self) -> List[GenerationRequest]:
+        """
+        Runs one denoising step on the next batch and returns the requests finished by this step, with their `image`
+        set.
+        """
+        if not self.has_unfinished_requests():
+            return []
+
+        key, batch = self._select_batch()
+        ids = tuple(request.request_id for request in batch)
+        if self._collated[0] != ids:
+            self._collated = (ids, self.pipe._collate_serving_conditions(batch))
+        conditions = self._collated[1]
+
+        latents = mint.cat([request.latents for request in batch])
+        timesteps = ms.tensor(np.array([request.timesteps[request.step] for request in batch], dtype=np.float32))
+        sigmas = np.array([request.sigmas[request.step] for request in batch], dtype=np.float32)
+        sigmas_next = np.array([request.sigmas[request.step + 1] for request in batch], dtype=np.float32)
+        dt = ms.tensor(sigmas_next - sigmas).reshape((-1,) + (1,) * (latents.ndim - 1))
+
+        noise_pred = self.pipe._serving_denoise(latents, timesteps, conditions)
+        # Euler update of `FlowMatchEulerDiscreteScheduler.step`, with per-sample sigmas
+        latents = (latents.to(ms.float32) + dt * noise_pred).to(noise_pred.dtype).to(latents.dtype)
+
+        finished = []
+        for request, request_latents in zip(batch, latents.split(1)):
+            request.latents = request_latents
+            request.step += 1
+            if request.is_finished:
+                finished.append(request)
+        if finished:
+            self._finish(key, finished)
+        return finished
+
+    def _finish(self, key: Tuple, finished: List[GenerationRequest]):
+        height, width = key[:2]
+        images = self.pipe._decode_serving_latents(
+            mint.cat([request.latents for request in finished]), height, width, self.output_type
+        )
+        for request, image in zip(finished, images):
+            request.image = image
+            request.latents = None
+            request.conditions = {}
+            self.running[key].remove(request)
+            self.requests.pop(request.request_id)
+            self._arrival.pop(request.request_id)
+        if not self.running[key]:
+            del self.running[key]
+        logger.debug("finished requests %s", [request.request_id for request in finished])
+
+    def generate(self) -> Iterator[GenerationRequest]:
+        """Steps until all the requests are finished, yielding each request when it finishes."""
+        while self.has_unfinished_requests():
+            yield from self.step()
@@ -327,6 +327,9 @@ class ShapEPipeline(DiffusionPipeline):
             if output_type == "pil":
                 images = [self.numpy_to_pil(image) for image in images]
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         if not return_dict:
             return (images,)
 
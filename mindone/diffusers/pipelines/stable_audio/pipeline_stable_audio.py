@@ -729,6 +729,9 @@ class StableAudioPipeline(DiffusionPipeline):
         if output_type == "np":
             audio = audio.cpu().float().numpy()
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         if not return_dict:
             return (audio,)
 
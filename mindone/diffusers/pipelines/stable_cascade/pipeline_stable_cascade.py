@@ -526,6 +526,9 @@ class StableCascadeDecoderPipeline(DiffusionPipeline):
         else:
             images = latents
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         if not return_dict:
             return images
         return ImagePipelineOutput(images)
@@ -289,4 +289,7 @@ class StableCascadeCombinedPipeline(DiffusionPipeline):
             callback_on_step_end_tensor_inputs=callback_on_step_end_tensor_inputs,
         )
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         return outputs
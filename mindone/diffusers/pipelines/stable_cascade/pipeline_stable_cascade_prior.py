@@ -611,6 +611,9 @@ class StableCascadePriorPipeline(DiffusionPipeline):
                 negative_prompt_embeds.float().asnumpy() if negative_prompt_embeds is not None else None
             )  # float() as bfloat16-> numpy doesn't work
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         if not return_dict:
             return (
                 latents,
@@ -1081,6 +1081,9 @@ class StableDiffusionPipeline(
             do_denormalize = [not has_nsfw for has_nsfw in has_nsfw_concept]
         image = self.image_processor.postprocess(image, output_type=output_type, do_denormalize=do_denormalize)
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         if not return_dict:
             return (image, has_nsfw_concept)
 
@@ -832,6 +832,9 @@ class StableUnCLIPImg2ImgPipeline(
 
         image = self.image_processor.postprocess(image, output_type=output_type)
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         if not return_dict:
             return (image,)
 
@@ -662,6 +662,123 @@ class StableDiffusion3Pipeline(DiffusionPipeline, SD3LoraLoaderMixin, FromSingle
     def interrupt(self):
         return self._interrupt
 
+    @staticmethod
+    def _denoise_fn(
+        transformer,
+        latents,
+        t,
+        prompt_embeds,
+        pooled_prompt_embeds,
+        guidance_scale,
+        joint_attention_kwargs=None,
+        return_noise_pred_text=False,
+    ):
+        # the transformer pass and CFG of one step of the denoising loop, run by `__call__` or compiled by
+        # `compile_denoise_loop`
+        # expand the latents if we are doing classifier free guidance
+        latent_model_input = mint.cat([latents] * 2) if guidance_scale > 1 else latents
+        # broadcast to batch dimension in a way that's compatible with ONNX/Core ML
+        timestep = t.broadcast_to((latent_model_input.shape[0],))
+        noise_pred = transformer(
+            hidden_states=latent_model_input,
+            timestep=timestep,
+            encoder_hidden_states=prompt_embeds,
+            pooled_projections=pooled_prompt_embeds,
+            joint_attention_kwargs=joint_attention_kwargs,
+            return_dict=False,
+        )[0]
+        noise_pred_text = None
+        # perform guidance
+        if guidance_scale > 1:
+            noise_pred_uncond, noise_pred_text = noise_pred.chunk(2)
+            noise_pred = noise_pred_uncond + guidance_scale * (noise_pred_text - noise_pred_uncond)
+        if return_noise_pred_text:
+            return noise_pred, noise_pred_text
+        return noise_pred
+
+    def _prepare_serving_request(self, request, scheduler, max_sequence_length=None):
+        # hooks of `DiffusionServingEngine`: the steps of `__call__` for one request, and a batched denoising step
+        request.guidance_mode = request.guidance_scale > 1
+        (
+            prompt_embeds,
+            negative_prompt_embeds,
+            pooled_prompt_embeds,
+            negative_pooled_prompt_embeds,
+        ) = self.encode_prompt(
+            prompt=request.prompt,
+            prompt_2=None,
+            prompt_3=None,
+            negative_prompt=request.negative_prompt,
+            do_classifier_free_guidance=request.guidance_mode,
+            max_sequence_length=max_sequence_length or 256,
+        )
+        request.conditions = {"prompt_embeds": prompt_embeds, "pooled_prompt_embeds": pooled_prompt_embeds}
+        if request.guidance_mode:
+            request.conditions["negative_prompt_embeds"] = negative_prompt_embeds
+            request.conditions["negative_pooled_prompt_embeds"] = negative_pooled_prompt_embeds
+
+        request.latents = self.prepare_latents(
+            1,
+            self.transformer.config.in_channels,
+            request.height,
+            request.width,
+            prompt_embeds.dtype,
+            request.generator,
+        )
+
+        scheduler_kwargs = {}
+        if scheduler.config.get("use_dynamic_shifting", None):
+            _, _, height, width = request.latents.shape
+            image_seq_len = (height // self.transformer.config.patch_size) * (
+                width // self.transformer.config.patch_size
+            )
+            scheduler_kwargs["mu"] = calculate_shift(
+                image_seq_len,
+                scheduler.config.get("base_image_seq_len", 256),
+                scheduler.config.get("max_image_seq_len", 4096),
+                scheduler.config.get("base_shift", 0.5),
+                scheduler.config.get("max_shift", 1.16),
+            )
+        retrieve_timesteps(scheduler, request.num_inference_steps, **scheduler_kwargs)
+        request.timesteps = scheduler.timesteps.asnumpy()
+        request.sigmas = scheduler.sigmas.asnumpy()
+
+    def _collate_serving_conditions(self, requests):
+        conditions = {}
+        for key in ("prompt_embeds", "pooled_prompt_embeds"):
+            embeds = [request.conditions[key] for request in requests]
+            if requests[0].guidance_mode:
+                embeds = [request.conditions[f"negative_{key}"] for request in requests] + embeds
+            conditions[key] = mint.cat(embeds)
+        if requests[0].guidance_mode:
+            guidance_scale = [request.guidance_scale for request in requests]
+            conditions["guidance_scale"] = ms.tensor(guidance_scale, dtype=ms.float32).reshape(-1, 1, 1, 1)
+        return conditions
+
+    def _serving_denoise(self, latents, timesteps, conditions):
+        guidance_scale = conditions.get("guidance_scale")
+        if guidance_scale is not None:
+            latents = mint.cat([latents] * 2)
+            timesteps = mint.cat([timesteps] * 2)
+        noise_pred = self.transformer(
+            hidden_states=latents,
+            timestep=timesteps,
+            encoder_hidden_states=conditions["prompt_embeds"],
+            pooled_projections=conditions["pooled_prompt_embeds"],
+            return_dict=False,
+        )[0]
+        if guidance_scale is not None:
+            noise_pred_uncond, noise_pred_text = noise_pred.chunk(2)
+            noise_pred = noise_pred_uncond + guidance_scale * (noise_pred_text - noise_pred_uncond)
+        return noise_pred
+
+    def _decode_serving_latents(self, latents, height, width, output_type):
+        if output_type == "latent":
+            return latents
+        latents = (latents / self.vae.config.scaling_factor) + self.vae.config.shift_factor
+        image = self.vae.decode(latents.to(self.vae.dtype), return_dict=False)[0]
+        return self.image_processor.postprocess(image, output_type=output_type)
+
     # Adapted from diffusers.pipelines.stable_diffusion.pipeline_stable_diffusion_xl.StableDiffusionXLPipeline.encode_image
     def encode_image(self, image: PipelineImageInput) -> ms.Tensor:
         """Encodes the given image into a feature representation using a pre-trained image encoder.
@@ -1002,57 +1119,67 @@ class StableDiffusion3Pipeline(DiffusionPipeline, SD3LoraLoaderMixin, FromSingle
             scale_lora_layers(self.transformer, lora_scale)
 
         # 7. Denoising loop
+        # the compiled step, if any, does not cover skip-layer guidance, attention kwargs or caching hooks
+        use_compiled_step = self._use_compiled_denoise_step(
+            skip_guidance_layers=skip_guidance_layers is not None,
+            joint_attention_kwargs=bool(self.joint_attention_kwargs),
+            cache=self.transformer.is_cache_enabled,
+        )
+        if use_compiled_step:
+            # start at the first step without looking up the timestep on device
+            self.scheduler.set_begin_index(0)
         with self.progress_bar(total=num_inference_steps) as progress_bar:
             for i, t in enumerate(timesteps):
                 if self.interrupt:
                     continue
 
-                # expand the latents if we are doing classifier free guidance
-                latent_model_input = mint.cat([latents] * 2) if self.do_classifier_free_guidance else latents
-                # broadcast to batch dimension in a way that's compatible with ONNX/Core ML
-                timestep = t.broadcast_to((latent_model_input.shape[0],))
-
-                noise_pred = self.transformer(
-                    hidden_states=latent_model_input,
-                    timestep=timestep,
-                    encoder_hidden_states=prompt_embeds,
-                    pooled_projections=pooled_prompt_embeds,
-                    joint_attention_kwargs=self.joint_attention_kwargs,
-                    return_dict=False,
-                )[0]
-
-                # perform guidance
-                if self.do_classifier_free_guidance:
-                    noise_pred_uncond, noise_pred_text = noise_pred.chunk(2)
-                    noise_pred = noise_pred_uncond + self.guidance_scale * (noise_pred_text - noise_pred_uncond)
-                    should_skip_layers = (
-                        True
-                        if i > num_inference_steps * skip_layer_guidance_start
-                        and i < num_inference_steps * skip_layer_guidance_stop
-                        else False
+                if use_compiled_step:
+                    sigma, sigma_next = self.scheduler.next_step_sigmas(t)
+                    latents = self._compiled_denoise_step(
+                        latents, t, sigma, sigma_next, prompt_embeds, pooled_prompt_embeds, self.guidance_scale
+                    )
+                else:
+                    noise_pred, noise_pred_text = self._denoise_fn(
+                        self.transformer,
+                        latents,
+                        t,
+                        prompt_embeds,
+                        pooled_prompt_embeds,
+                        self.guidance_scale,
+                        joint_attention_kwargs=self.joint_attention_kwargs,
+                        return_noise_pred_text=True,
                     )
-                    if skip_guidance_layers is not None and should_skip_layers:
-                        timestep = t.broadcast_to((latents.shape[0],))
-                        latent_model_input = latents
-                        noise_pred_skip_layers = self.transformer(
-                            hidden_states=latent_model_input,
-                            timestep=timestep,
-                            encoder_hidden_states=original_prompt_embeds,
-                            pooled_projections=original_pooled_prompt_embeds,
-                            joint_attention_kwargs=self.joint_attention_kwargs,
-                            return_dict=False,
-                            skip_layers=skip_guidance_layers,
-                        )[0]
-                        noise_pred = (
-                            noise_pred + (noise_pred_text - noise_pred_skip_layers) * self._skip_layer_guidance_scale
-                        )
-
-                # compute the previous noisy sample x_t -> x_t-1
-                latents_dtype = latents.dtype
-                latents = self.scheduler.step(noise_pred, t, latents, return_dict=False)[0]
 
-                if latents.dtype != latents_dtype:
-                    latents = latents.to(latents_dtype)
+                    if self.do_classifier_free_guidance:
+                        should_skip_layers = (
+                            True
+                            if i > num_inference_steps * skip_layer_guidance_start
+                            and i < num_inference_steps * skip_layer_guidance_stop
+                            else False
+                        )
+                        if skip_guidance_layers is not None and should_skip_layers:
+                            timestep = t.broadcast_to((latents.shape[0],))
+                            latent_model_input = latents
+                            noise_pred_skip_layers = self.transformer(
+                                hidden_states=latent_model_input,
+                                timestep=timestep,
+                                encoder_hidden_states=original_prompt_embeds,
+                                pooled_projections=original_pooled_prompt_embeds,
+                                joint_attention_kwargs=self.joint_attention_kwargs,
+                                return_dict=False,
+                                skip_layers=skip_guidance_layers,
+                            )[0]
+                            noise_pred = (
+                                noise_pred
+                                + (noise_pred_text - noise_pred_skip_layers) * self._skip_layer_guidance_scale
+                            )
+
+                    # compute the previous noisy sample x_t -> x_t-1
+                    latents_dtype = latents.dtype
+                    latents = self.scheduler.step(noise_pred, t, latents, return_dict=False)[0]
+
+                    if latents.dtype != latents_dtype:
+                        latents = latents.to(latents_dtype)
 
                 if callback_on_step_end is not None:
                     callback_kwargs = {}
@@ -1085,6 +1212,9 @@ class StableDiffusion3Pipeline(DiffusionPipeline, SD3LoraLoaderMixin, FromSingle
             image = self.vae.decode(latents, return_dict=False)[0]
             image = self.image_processor.postprocess(image, output_type=output_type)
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         if not return_dict:
             return (image,)
 
@@ -1050,6 +1050,9 @@ class StableDiffusionAttendAndExcitePipeline(
         # make sure to set the original attention processors back
         self.unet.set_attn_processor(original_attn_proc)
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         if not return_dict:
             return (image, has_nsfw_concept)
 
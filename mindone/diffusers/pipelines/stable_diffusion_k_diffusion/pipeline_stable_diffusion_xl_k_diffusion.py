@@ -852,6 +852,9 @@ class StableDiffusionXLKDiffusionPipeline(
         if not output_type == "latent":
             image = self.image_processor.postprocess(image, output_type=output_type)
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         if not return_dict:
             return (image,)
 
@@ -1001,6 +1001,9 @@ class StableDiffusionLDM3DPipeline(
 
         rgb, depth = self.image_processor.postprocess(image, output_type=output_type, do_denormalize=do_denormalize)
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         if not return_dict:
             return ((rgb, depth), has_nsfw_concept)
 
@@ -763,6 +763,9 @@ class StableDiffusionPipelineSafe(DeprecatedPipelineMixin, DiffusionPipeline, St
             if flagged_images is not None:
                 flagged_images = self.numpy_to_pil(flagged_images)
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         if not return_dict:
             return (
                 image,
@@ -859,6 +859,9 @@ class StableDiffusionSAGPipeline(
         # make sure to set the original attention processors back
         self.unet.set_attn_processor(original_attn_proc)
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         if not return_dict:
             return (image, has_nsfw_concept)
 
@@ -1242,6 +1242,9 @@ class StableDiffusionXLPipeline(
 
             image = self.image_processor.postprocess(image, output_type=output_type)
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         if not return_dict:
             return (image,)
 
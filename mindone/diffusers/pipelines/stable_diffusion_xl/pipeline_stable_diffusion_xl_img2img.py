@@ -1425,6 +1425,9 @@ class StableDiffusionXLImg2ImgPipeline(
 
         image = self.image_processor.postprocess(image, output_type=output_type)
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         if not return_dict:
             return (image,)
 
@@ -596,6 +596,9 @@ class StableVideoDiffusionPipeline(DiffusionPipeline):
         else:
             frames = latents
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         if not return_dict:
             return frames
 
@@ -753,6 +753,9 @@ class TextToVideoZeroPipeline(
         # make sure to set the original attention processors back
         self.unet.set_attn_processor(original_attn_proc)
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         if not return_dict:
             return image, has_nsfw_concept
 
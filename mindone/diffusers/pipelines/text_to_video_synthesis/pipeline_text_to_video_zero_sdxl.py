@@ -1292,6 +1292,9 @@ class TextToVideoZeroSDXLPipeline(
         # make sure to set the original attention processors back
         self.unet.set_attn_processor(original_attn_proc)
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         if not return_dict:
             return (image,)
 
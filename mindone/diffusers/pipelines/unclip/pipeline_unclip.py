@@ -474,6 +474,9 @@ class UnCLIPPipeline(DeprecatedPipelineMixin, DiffusionPipeline):
         if output_type == "pil":
             image = self.numpy_to_pil(image)
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         if not return_dict:
             return (image,)
 
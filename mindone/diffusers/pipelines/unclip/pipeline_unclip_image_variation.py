@@ -400,6 +400,9 @@ class UnCLIPImageVariationPipeline(DeprecatedPipelineMixin, DiffusionPipeline):
         if output_type == "pil":
             image = self.numpy_to_pil(image)
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         if not return_dict:
             return (image,)
 
@@ -1385,6 +1385,9 @@ class UniDiffuserPipeline(DeprecatedPipelineMixin, DiffusionPipeline):
             do_denormalize = [True] * image.shape[0]
             image = self.image_processor.postprocess(image, output_type=output_type, do_denormalize=do_denormalize)
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         if not return_dict:
             return (image, text)
 
@@ -432,6 +432,9 @@ class VisualClozePipeline(
         else:
             output = image
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         if not return_dict:
             return (output,)
 
@@ -639,6 +639,9 @@ class WanPipeline(DiffusionPipeline, WanLoraLoaderMixin):
         else:
             video = latents
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         if not return_dict:
             return (video,)
 
@@ -957,6 +957,9 @@ class WanVACEPipeline(DiffusionPipeline, WanLoraLoaderMixin):
         else:
             video = latents
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         if not return_dict:
             return (video,)
 
@@ -287,4 +287,7 @@ class WuerstchenCombinedPipeline(DeprecatedPipelineMixin, DiffusionPipeline):
             **kwargs,
         )
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         return outputs
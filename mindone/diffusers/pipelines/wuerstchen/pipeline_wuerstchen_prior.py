@@ -507,6 +507,9 @@ class WuerstchenPriorPipeline(DiffusionPipeline, LoraLoaderMixin):
         if output_type == "np":
             latents = latents.float().numpy()
 
+        # Offload all models
+        self.maybe_free_model_hooks()
+
         if not return_dict:
             return (latents,)
 
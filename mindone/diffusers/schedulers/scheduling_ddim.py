@@ -289,7 +289,12 @@ class DDIMScheduler(SchedulerMixin, ConfigMixin):
 
         abs_sample = sample.abs()  # "a certain percentile absolute pixel value"
 
-        s = ms.Tensor.from_numpy(np.quantile(abs_sample.asnumpy(), self.config.dynamic_thresholding_ratio, axis=1))
+        # linearly interpolated quantile of each row, computed on device to avoid a host round-trip every step
+        sorted_sample = mint.sort(abs_sample, dim=1)[0]
+        position = self.config.dynamic_thresholding_ratio * (sorted_sample.shape[1] - 1)
+        low = int(position)
+        high = min(low + 1, sorted_sample.shape[1] - 1)
+        s = sorted_sample[:, low] + (sorted_sample[:, high] - sorted_sample[:, low]) * (position - low)
         s = mint.clamp(
             s, min=1, max=self.config.sample_max_value
         )  # When clamped to min=1, equivalent to standard clipping to [-1, 1]
@@ -281,6 +281,9 @@ class DPMSolverMultistepScheduler(SchedulerMixin, ConfigMixin):
         self.sigma_t = mint.sqrt(1 - self.alphas_cumprod)
         self.lambda_t = mint.log(self.alpha_t) - mint.log(self.sigma_t)
         self.sigmas = ((1 - self.alphas_cumprod) / self.alphas_cumprod) ** 0.5
+        # host copies of the training schedule, `set_timesteps` builds the inference tables from them
+        self._lambda_t_host = self.lambda_t.asnumpy()
+        self._train_sigmas_host = self.sigmas.asnumpy()
 
         # standard deviation of the initial noise distribution
         self.init_noise_sigma = 1.0
@@ -311,6 +314,9 @@ class DPMSolverMultistepScheduler(SchedulerMixin, ConfigMixin):
         self.lower_order_nums = 0
         self._step_index = None
         self._begin_index = None
+        self._device_resident = False
+        # host copy of `self.timesteps`, used to look up step indices without reading the device
+        self._timesteps_host = None
 
     @property
     def step_index(self):
@@ -336,6 +342,18 @@ class DPMSolverMultistepScheduler(SchedulerMixin, ConfigMixin):
         """
         self._begin_index = begin_index
 
+    def set_device_resident(self, device_resident: bool = True):
+        """
+        Sets whether `step` may read values back from the device. In device-resident mode, the step index of the first
+        `step` is `begin_index` (0 if not set) instead of being looked up from the timestep tensor, so that the
+        denoising loop never waits for the device and can be traced into a graph.
+
+        Args:
+            device_resident (`bool`, defaults to `True`):
+                Whether to enable the device-resident mode.
+        """
+        self._device_resident = device_resident
+
     def set_timesteps(
         self,
         num_inference_steps: int = None,
@@ -374,10 +392,8 @@ class DPMSolverMultistepScheduler(SchedulerMixin, ConfigMixin):
         else:
             # Clipping the minimum of all lambda(t) for numerical stability.
             # This is critical for cosine (squaredcos_cap_v2) noise schedule.
-            clipped_idx = ms.tensor(
-                np.searchsorted(mint.flip(self.lambda_t, [0]).asnumpy(), self.config.lambda_min_clipped), dtype=ms.int64
-            )
-            last_timestep = ((self.config.num_train_timesteps - clipped_idx).asnumpy()).item()
+            clipped_idx = np.searchsorted(np.flip(self._lambda_t_host), self.config.lambda_min_clipped)
+            last_timestep = int(self.config.num_train_timesteps - clipped_idx)
 
             # "linspace", "leading", "trailing" corresponds to annotation of Table 2. of https://huggingface.co/papers/2305.08891
             if self.config.timestep_spacing == "linspace":
@@ -406,7 +422,7 @@ class DPMSolverMultistepScheduler(SchedulerMixin, ConfigMixin):
                     f"{self.config.timestep_spacing} is not supported. Please make sure to choose one of 'linspace', 'leading' or 'trailing'."
                 )
 
-        sigmas = (((1 - self.alphas_cumprod) / self.alphas_cumprod) ** 0.5).asnumpy()
+        sigmas = self._train_sigmas_host
         log_sigmas = np.log(sigmas)
 
         if self.config.use_karras_sigmas:
@@ -439,7 +455,7 @@ class DPMSolverMultistepScheduler(SchedulerMixin, ConfigMixin):
             sigmas = np.interp(timesteps, np.arange(0, len(sigmas)), sigmas)
 
         if self.config.final_sigmas_type == "sigma_min":
-            sigma_last = ((1 - self.alphas_cumprod[0]) / self.alphas_cumprod[0]) ** 0.5
+            sigma_last = self._train_sigmas_host[0]
         elif self.config.final_sigmas_type == "zero":
             sigma_last = 0
         else:
@@ -450,7 +466,8 @@ class DPMSolverMultistepScheduler(SchedulerMixin, ConfigMixin):
         sigmas = np.concatenate([sigmas, [sigma_last]]).astype(np.float32)
 
         self.sigmas = ms.tensor(sigmas)
-        self.timesteps = ms.tensor(timesteps, dtype=ms.int64)
+        self._timesteps_host = np.asarray(timesteps, dtype=np.int64)
+        self.timesteps = ms.tensor(self._timesteps_host, dtype=ms.int64)
 
         self.num_inference_steps = len(timesteps)
 
@@ -485,7 +502,12 @@ class DPMSolverMultistepScheduler(SchedulerMixin, ConfigMixin):
 
         abs_sample = sample.abs()  # "a certain percentile absolute pixel value"
 
-        s = ms.Tensor.from_numpy(np.quantile(abs_sample.asnumpy(), self.config.dynamic_thresholding_ratio, axis=1))
+        # linearly interpolated quantile of each row, computed on device to avoid a host round-trip every step
+        sorted_sample = mint.sort(abs_sample, dim=1)[0]
+        position = self.config.dynamic_thresholding_ratio * (sorted_sample.shape[1] - 1)
+        low = int(position)
+        high = min(low + 1, sorted_sample.shape[1] - 1)
+        s = sorted_sample[:, low] + (sorted_sample[:, high] - sorted_sample[:, low]) * (position - low)
         s = mint.clamp(
             s, min=1, max=self.config.sample_max_value
         )  # When clamped to min=1, equivalent to standard clipping to [-1, 1]
@@ -1016,6 +1038,12 @@ class DPMSolverMultistepScheduler(SchedulerMixin, ConfigMixin):
 
     def index_for_timestep(self, timestep, schedule_timesteps=None):
         if schedule_timesteps is None:
+            if not isinstance(timestep, ms.Tensor) and self._timesteps_host is not None:
+                # look up host timesteps on the host table
+                indices = np.nonzero(self._timesteps_host == timestep)[0]
+                if len(indices) == 0:
+                    return len(self._timesteps_host) - 1
+                return int(indices[1 if len(indices) > 1 else 0])
             schedule_timesteps = self.timesteps
 
         index_candidates_num = (schedule_timesteps == timestep).sum()
@@ -1085,7 +1113,11 @@ class DPMSolverMultistepScheduler(SchedulerMixin, ConfigMixin):
             )
 
         if self.step_index is None:
-            self._init_step_index(timestep)
+            if self._device_resident:
+                # no timestep lookup, the loop starts at `begin_index`
+                self._step_index = self.begin_index or 0
+            else:
+                self._init_step_index(timestep)
 
         # Improve numerical stability for small number of steps
         lower_order_final = (self.step_index == len(self.timesteps) - 1) and (
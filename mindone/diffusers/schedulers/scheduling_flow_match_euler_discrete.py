@@ -119,23 +119,26 @@ class FlowMatchEulerDiscreteScheduler(SchedulerMixin, ConfigMixin):
             raise ValueError("`time_shift_type` must either be 'exponential' or 'linear'.")
 
         timesteps = np.linspace(1, num_train_timesteps, num_train_timesteps, dtype=np.float32)[::-1].copy()
-        timesteps = ms.Tensor.from_numpy(timesteps).to(dtype=ms.float32)
 
+        # the schedule is built on host so that reading its bounds does not wait on the device
         sigmas = timesteps / num_train_timesteps
         if not use_dynamic_shifting:
             # when use_dynamic_shifting is True, we apply the timestep shifting on the fly based on the image resolution
             sigmas = shift * sigmas / (1 + (shift - 1) * sigmas)
 
-        self.timesteps = sigmas * num_train_timesteps
+        self.timesteps = ms.Tensor.from_numpy(sigmas * num_train_timesteps).to(dtype=ms.float32)
 
         self._step_index = None
         self._begin_index = None
+        self._device_resident = False
+        # host copy of `self.timesteps`, used to look up step indices without reading the device
+        self._timesteps_host = None
 
         self._shift = shift
 
-        self.sigmas = sigmas
-        self.sigma_min = self.sigmas[-1].item()
-        self.sigma_max = self.sigmas[0].item()
+        self.sigmas = ms.Tensor.from_numpy(sigmas).to(dtype=ms.float32)
+        self.sigma_min = float(sigmas[-1])
+        self.sigma_max = float(sigmas[0])
 
     @property
     def shift(self):
@@ -169,6 +172,19 @@ class FlowMatchEulerDiscreteScheduler(SchedulerMixin, ConfigMixin):
         """
         self._begin_index = begin_index
 
+    # Copied from diffusers.schedulers.scheduling_dpmsolver_multistep.DPMSolverMultistepScheduler.set_device_resident
+    def set_device_resident(self, device_resident: bool = True):
+        """
+        Sets whether `step` may read values back from the device. In device-resident mode, the step index of the first
+        `step` is `begin_index` (0 if not set) instead of being looked up from the timestep tensor, so that the
+        denoising loop never waits for the device and can be traced into a graph.
+
+        Args:
+            device_resident (`bool`, defaults to `True`):
+                Whether to enable the device-resident mode.
+        """
+        self._device_resident = device_resident
+
     def set_shift(self, shift: float):
         self._shift = shift
 
@@ -323,12 +339,10 @@ class FlowMatchEulerDiscreteScheduler(SchedulerMixin, ConfigMixin):
         elif self.config.use_beta_sigmas:
             sigmas = self._convert_to_beta(in_sigmas=sigmas, num_inference_steps=num_inference_steps)
 
-        # 5. Convert sigmas and timesteps to tensors
-        sigmas = ms.Tensor.from_numpy(sigmas).to(dtype=ms.float32)
+        # 5. Compute the timesteps. The tables are completed on host and copied to the device once.
+        sigmas = np.asarray(sigmas, dtype=np.float32)
         if not is_timesteps_provided:
             timesteps = sigmas * self.config.num_train_timesteps
-        else:
-            timesteps = ms.Tensor.from_numpy(timesteps).to(dtype=ms.float32)
 
         # 6. Append the terminal sigma value.
         #    If a model requires inverted sigma schedule for denoising but timesteps without inversion, the
@@ -336,17 +350,25 @@ class FlowMatchEulerDiscreteScheduler(SchedulerMixin, ConfigMixin):
         if self.config.invert_sigmas:
             sigmas = 1.0 - sigmas
             timesteps = sigmas * self.config.num_train_timesteps
-            sigmas = mint.cat([sigmas, mint.ones(1, dtype=sigmas.dtype)])
+            sigmas = np.concatenate([sigmas, np.ones(1, dtype=sigmas.dtype)])
         else:
-            sigmas = mint.cat([sigmas, mint.zeros(1, dtype=sigmas.dtype)])
+            sigmas = np.concatenate([sigmas, np.zeros(1, dtype=sigmas.dtype)])
 
-        self.timesteps = timesteps
-        self.sigmas = sigmas
+        self._timesteps_host = np.asarray(timesteps, dtype=np.float32)
+        self.timesteps = ms.Tensor.from_numpy(self._timesteps_host).to(dtype=ms.float32)
+        self.sigmas = ms.Tensor.from_numpy(sigmas).to(dtype=ms.float32)
         self._step_index = None
         self._begin_index = None
 
     def index_for_timestep(self, timestep, schedule_timesteps=None):
         if schedule_timesteps is None:
+            if not isinstance(timestep, ms.Tensor) and self._timesteps_host is not None:
+                # look up host timesteps on the host table
+                indices = np.nonzero(self._timesteps_host == np.float32(timestep))[0]
+                if len(indices) == 0:
+                    raise ValueError(f"Timestep {timestep} is not in the schedule set by `set_timesteps`.")
+                pos = 1 if len(indices) > 1 else 0
+                return int(indices[pos])
             schedule_timesteps = self.timesteps
 
         indices = (schedule_timesteps == timestep).nonzero()
@@ -365,6 +387,28 @@ class FlowMatchEulerDiscreteScheduler(SchedulerMixin, ConfigMixin):
         else:
             self._step_index = self._begin_index
 
+    def next_step_sigmas(self, timestep: Union[float, ms.Tensor]) -> Tuple[ms.Tensor, ms.Tensor]:
+        """
+        Returns the current and next sigmas of the step at `timestep` and advances the step index, for loops applying
+        the Euler update of `step` themselves, e.g. inside a compiled denoising step.
+
+        Args:
+            timestep (`float` or `ms.Tensor`):
+                The current discrete timestep in the diffusion chain.
+
+        Returns:
+            `Tuple[ms.Tensor, ms.Tensor]`: The sigmas `(sigma, sigma_next)` of the step.
+        """
+        if self.step_index is None:
+            if self._device_resident:
+                self._step_index = self.begin_index or 0
+            else:
+                self._init_step_index(timestep)
+
+        sigma, sigma_next = self.sigmas[self.step_index], self.sigmas[self.step_index + 1]
+        self._step_index += 1
+        return sigma, sigma_next
+
     def step(
         self,
         model_output: ms.Tensor,
@@ -421,7 +465,11 @@ class FlowMatchEulerDiscreteScheduler(SchedulerMixin, ConfigMixin):
             )
 
         if self.step_index is None:
-            self._init_step_index(timestep)
+            if self._device_resident:
+                # no timestep lookup, the loop starts at `begin_index`
+                self._step_index = self.begin_index or 0
+            else:
+                self._init_step_index(timestep)
 
         # Upcast to avoid precision issues when computing prev_sample
         sample = sample.to(ms.float32)
@@ -28,7 +28,7 @@ from .mapping import (
 )
 from .mapping_func import get_peft_model
 from .peft_model import PeftModel, PeftModelForCausalLM, get_layer_status, get_model_status
-from .tuners import EvaConfig, LoftQConfig, LoraConfig, LoraModel, LoraRuntimeConfig
+from .tuners import EvaConfig, LoftQConfig, LoraAdapterRegistry, LoraConfig, LoraModel, LoraRuntimeConfig
 from .utils import (
     TRANSFORMERS_MODELS_TO_PREFIX_TUNING_POSTPROCESS_MAPPING,
     PeftType,
@@ -51,6 +51,7 @@ __all__ = [
     "AutoPeftModelForCausalLM",
     "EvaConfig",
     "LoftQConfig",
+    "LoraAdapterRegistry",
     "LoraConfig",
     "LoraModel",
     "LoraRuntimeConfig",
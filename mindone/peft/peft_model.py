@@ -628,12 +628,14 @@ class PeftModel(PushToHubMixin, nn.Cell):
         """
         Forward pass of the model.
         """
-        kwargs = {k: v for k, v in kwargs.items() if k not in self.special_peft_forward_args}
-        return self.get_base_model()(*args, **kwargs)
+        with self._enable_peft_forward_hooks(*args, **kwargs):
+            kwargs = {k: v for k, v in kwargs.items() if k not in self.special_peft_forward_args}
+            return self.get_base_model()(*args, **kwargs)
 
     def generate(self, *args, **kwargs):
-        kwargs = {k: v for k, v in kwargs.items() if k not in self.special_peft_forward_args}
-        return self.get_base_model().generate(*args, **kwargs)
+        with self._enable_peft_forward_hooks(*args, **kwargs):
+            kwargs = {k: v for k, v in kwargs.items() if k not in self.special_peft_forward_args}
+            return self.get_base_model().generate(*args, **kwargs)
 
     def _get_base_model_class(self, is_prompt_tuning=False):
         """
@@ -643,6 +645,19 @@ class PeftModel(PushToHubMixin, nn.Cell):
             return self.base_model.model.__class__
         return self.base_model.__class__
 
+    @contextmanager
+    def _enable_peft_forward_hooks(self, *args, **kwargs):
+        # If the base model has a method called _enable_peft_forward_hooks, it is invoked as a context. Otherwise, this
+        # runs without any changes
+        if hasattr(self.base_model, "_enable_peft_forward_hooks"):
+            with self.base_model._enable_peft_forward_hooks(*args, **kwargs):
+                yield
+            return
+        else:
+            # nothing to enable
+            yield
+            return
+
     @contextmanager
     def disable_adapter(self):
         """
@@ -1161,17 +1176,18 @@ class PeftModelForCausalLM(PeftModel):
             if peft_config.peft_type == PeftType.POLY:
                 kwargs["task_ids"] = task_ids
 
-            kwargs = {k: v for k, v in kwargs.items() if k not in self.special_peft_forward_args}
-            return self.base_model(
-                input_ids=input_ids,
-                attention_mask=attention_mask,
-                inputs_embeds=inputs_embeds,
-                labels=labels,
-                output_attentions=output_attentions,
-                output_hidden_states=output_hidden_states,
-                return_dict=return_dict,
-                **kwargs,
-            )
+            with self._enable_peft_forward_hooks(**kwargs):
+                kwargs = {k: v for k, v in kwargs.items() if k not in self.special_peft_forward_args}
+                return self.base_model(
+                    input_ids=input_ids,
+                    attention_mask=attention_mask,
+                    inputs_embeds=inputs_embeds,
+                    labels=labels,
+                    output_attentions=output_attentions,
+                    output_hidden_states=output_hidden_states,
+                    return_dict=return_dict,
+                    **kwargs,
+                )
 
         batch_size = _get_batch_size(input_ids, inputs_embeds)
         if attention_mask is not None:
@@ -1225,8 +1241,9 @@ class PeftModelForCausalLM(PeftModel):
             self.base_model.generation_config = self.generation_config
         try:
             if not peft_config.is_prompt_learning:
-                kwargs = {k: v for k, v in kwargs.items() if k not in self.special_peft_forward_args}
-                outputs = self.base_model.generate(*args, **kwargs)
+                with self._enable_peft_forward_hooks(*args, **kwargs):
+                    kwargs = {k: v for k, v in kwargs.items() if k not in self.special_peft_forward_args}
+                    outputs = self.base_model.generate(*args, **kwargs)
             else:
                 outputs = self.base_model.generate(**kwargs)
         except:  # noqa: E722
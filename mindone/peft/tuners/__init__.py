@@ -15,11 +15,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from .lora import EvaConfig, LoftQConfig, LoraConfig, LoraModel, LoraRuntimeConfig
+from .lora import EvaConfig, LoftQConfig, LoraAdapterRegistry, LoraConfig, LoraModel, LoraRuntimeConfig
 
 __all__ = [
     "EvaConfig",
     "LoftQConfig",
+    "LoraAdapterRegistry",
     "LoraConfig",
     "LoraModel",
     "LoraRuntimeConfig",
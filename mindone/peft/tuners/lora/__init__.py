@@ -20,6 +20,7 @@ from mindone.peft.utils import register_peft_method
 from .config import EvaConfig, LoftQConfig, LoraConfig, LoraRuntimeConfig
 from .layer import Conv2d, Conv3d, Linear, LoraLayer
 from .model import LoraModel
+from .registry import LoraAdapterRegistry
 
 __all__ = [
     "Conv2d",
@@ -27,6 +28,7 @@ __all__ = [
     "EvaConfig",
     "Linear",
     "LoftQConfig",
+    "LoraAdapterRegistry",
     "LoraConfig",
     "LoraLayer",
     "LoraModel",
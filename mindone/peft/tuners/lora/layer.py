@@ -49,6 +49,8 @@ class LoraLayer(BaseTunerLayer):
     adapter_layer_names = ("lora_A", "lora_B")
     # All names of other parameters that may contain adapter-related parameters
     other_param_names = ("r", "lora_alpha", "scaling", "lora_dropout")
+    # Adapter names of the samples of the current batch, set by `LoraModel._enable_peft_forward_hooks`
+    _batch_adapter_names = None
 
     def __init__(self, base_layer: nn.Cell, ephemeral_gpu_offload: bool = False, **kwargs) -> None:
         self.base_layer = base_layer
@@ -147,6 +149,7 @@ class LoraLayer(BaseTunerLayer):
         if r <= 0:
             raise ValueError(f"`r` should be a positive integer value but the value passed is {r}")
 
+        self._reset_stacked_lora_weights()
         self.r[adapter_name] = r
         self.lora_alpha[adapter_name] = lora_alpha
         if lora_dropout > 0.0:
@@ -336,12 +339,75 @@ class LoraLayer(BaseTunerLayer):
                 msg = "Cannot pass `adapter_names` when DoRA is enabled."
                 raise ValueError(msg)
 
+    def delete_adapter(self, adapter_name: str) -> None:
+        self._reset_stacked_lora_weights()
+        super().delete_adapter(adapter_name)
+
+    def _reset_stacked_lora_weights(self) -> None:
+        """Drops the stacked weights of `_stacked_lora_weights`, they are built again for the next mixed batch."""
+        self._caches.pop("lora_stacked", None)
+
+    def _stacked_lora_weights(self) -> tuple[dict[str, int], ms.Tensor, ms.Tensor, Optional[ms.Tensor]]:
+        """
+        Returns the LoRA weights of all the adapters of the layer stacked along a new first axis, for
+        `_grouped_mixed_batch_forward`.
+
+        The ranks are zero padded to the largest one and the scalings are folded into B. Slot 0 is a zero adapter, used
+        by the samples without adapter. The stacks are built once and reused until the adapters or their scalings
+        change, new weights are loaded with `set_peft_model_state_dict` or the model is set to training mode.
+
+        Returns:
+            The slot of every adapter, A of shape `(num_adapters + 1, in_features, r_max)`, B of shape
+            `(num_adapters + 1, r_max, out_features)` and the stacked biases of B, if any adapter has one.
+        """
+        adapters = tuple(self.lora_A.keys())
+        key = (adapters, tuple(self.scaling[adapter] for adapter in adapters))
+        stacked = self._caches.get("lora_stacked")
+        if stacked is not None and stacked[0] == key:
+            return stacked[1]
+
+        dtype = self.lora_A[adapters[0]].weight.dtype
+        max_rank = max(self.r[adapter] for adapter in adapters)
+        lora_A = mint.zeros((len(adapters) + 1, self.in_features, max_rank), dtype=dtype)
+        lora_B = mint.zeros((len(adapters) + 1, max_rank, self.out_features), dtype=dtype)
+        use_bias = any(self.lora_bias.get(adapter, False) for adapter in adapters)
+        lora_bias = mint.zeros((len(adapters) + 1, 1, self.out_features), dtype=dtype) if use_bias else None
+        for slot, adapter in enumerate(adapters, start=1):
+            rank, scaling = self.r[adapter], self.scaling[adapter]
+            lora_A[slot, :, :rank] = self.lora_A[adapter].weight.T.to(dtype)
+            lora_B[slot, :rank] = (self.lora_B[adapter].weight.T * scaling).to(dtype)
+            if use_bias and self.lora_B[adapter].bias is not None:
+                lora_bias[slot, 0] = (self.lora_B[adapter].bias * scaling).to(dtype)
+
+        slots = {adapter: slot for slot, adapter in enumerate(adapters, start=1)}
+        self._caches["lora_stacked"] = (key, (slots, lora_A, lora_B, lora_bias))
+        return slots, lora_A, lora_B, lora_bias
+
+    def _grouped_mixed_batch_forward(self, x: ms.Tensor, result: ms.Tensor, adapter_names: list[str]) -> ms.Tensor:
+        # S-LoRA style: every sample gathers the (padded) weights of its adapter, and all the adapters of the batch run
+        # in the same two batched matmuls, whatever their number
+        slots, lora_A, lora_B, lora_bias = self._stacked_lora_weights()
+        indices = ms.tensor([slots.get(name, 0) for name in adapter_names], dtype=ms.int32)
+
+        batch_size = x.shape[0]
+        x = x.reshape(batch_size, -1, x.shape[-1]).to(lora_A.dtype)
+        lora_output = mint.bmm(mint.bmm(x, lora_A[indices]), lora_B[indices])
+        if lora_bias is not None:
+            lora_output = lora_output + lora_bias[indices]
+        return result + lora_output.reshape(result.shape).to(result.dtype)
+
     def _mixed_batch_forward(self, x: ms.Tensor, *args: Any, adapter_names: list[str], **kwargs: Any) -> ms.Tensor:
         # This is a special method that handles the case when users pass the argument `adapter_names`. This is an
         # extra argument that allows mixing different adapters in the same batch at inference time.
         result = self.base_layer(x, *args, **kwargs)
         mindspore_result_dtype = result.dtype
 
+        # at inference, linear adapters are grouped into a single gathered matmul, see `_stacked_lora_weights`
+        if not self.training and all(isinstance(lora_A, mint.nn.Linear) for lora_A in self.lora_A.values()):
+            if not any(name in self.lora_A for name in adapter_names):
+                return result
+            return self._grouped_mixed_batch_forward(x, result, adapter_names)
+
         unique_adapters = set(adapter_names)
         sub_batch_indices_list = []
         for adapter in unique_adapters:
@@ -552,6 +618,8 @@ class Linear(nn.Cell, LoraLayer):
                     continue
                 copied_kwargs[k] = v
             kwargs = copied_kwargs
+        elif self._batch_adapter_names is not None:
+            adapter_names = self._batch_adapter_names
 
         if self.disable_adapters:
             if self.merged:
@@ -644,6 +712,7 @@ class _ConvNd(nn.Cell, LoraLayer):
         if r <= 0:
             raise ValueError(f"`r` should be a positive integer value but the value passed is {r}")
 
+        self._reset_stacked_lora_weights()
         self.r[adapter_name] = r
         self.lora_alpha[adapter_name] = lora_alpha
         if lora_dropout > 0.0:
@@ -833,6 +902,8 @@ class _ConvNd(nn.Cell, LoraLayer):
                     continue
                 copied_kwargs[k] = v
             kwargs = copied_kwargs
+        elif self._batch_adapter_names is not None:
+            adapter_names = self._batch_adapter_names
 
         if self.disable_adapters:
             if self.merged:
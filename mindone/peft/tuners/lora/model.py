@@ -19,6 +19,7 @@ from __future__ import annotations
 import math
 import operator
 import warnings
+from contextlib import contextmanager
 from dataclasses import asdict, replace
 from enum import Enum
 from functools import reduce
@@ -345,6 +346,53 @@ class LoraModel(BaseTuner):
                 module.set_adapter(adapter_name)
         self.active_adapter = adapter_name
 
+    def add_flags_recursive(self, **flags):
+        # `set_train(True)` sets the flags of the LoRA layers through this method. Their adapters can then be trained,
+        # so the weights they stacked for mixed adapter batches are built again afterwards.
+        if flags.get("training", False):
+            for _, module in self.model.cells_and_names():
+                if isinstance(module, LoraLayer):
+                    module._reset_stacked_lora_weights()
+        return super().add_flags_recursive(**flags)
+
+    @contextmanager
+    def _enable_peft_forward_hooks(self, *args, **kwargs):
+        # If adapter_names is passed as an argument, every LoRA layer reads it from `_batch_adapter_names`, since
+        # forward pre-hooks cannot add keyword arguments in MindSpore
+        adapter_names = kwargs.pop("adapter_names", None)
+        if adapter_names is None:
+            # nothing to do
+            yield
+            return
+
+        if self.training:
+            raise ValueError("Cannot pass `adapter_names` when the model is in training mode.")
+
+        # Check that users only passed actually existing adapters.
+        # Note: We cannot do this on the layer level, as each individual layer may not have each adapter. Still, we want
+        # to check that there is at least one layer with the given name, or else something like typos can easily slip.
+        lora_layers = [module for _, module in self.model.cells_and_names() if isinstance(module, LoraLayer)]
+        expected_adapters = set()
+        for layer in lora_layers:
+            expected_adapters |= set(layer.lora_A.keys())
+        unique_adapters = {name for name in adapter_names if name != "__base__"}
+        unexpected_adapters = unique_adapters - expected_adapters
+        if unexpected_adapters:
+            raise ValueError(f"Trying to infer with non-existing adapter(s): {', '.join(sorted(unexpected_adapters))}")
+
+        # the inputs are expanded to `num_beams` sequences each
+        num_beams = kwargs.get("num_beams", None)
+        if num_beams is not None and num_beams > 1:
+            adapter_names = [name for name in adapter_names for _ in range(num_beams)]
+
+        for layer in lora_layers:
+            layer._batch_adapter_names = adapter_names
+        try:
+            yield
+        finally:
+            for layer in lora_layers:
+                layer._batch_adapter_names = None
+
     def _check_merge_allowed(self):
         """Verify that the configuration supports merging.
 
@@ -0,0 +1,146 @@
+# Copyright 2023-present the HuggingFace Inc. team.
+#
+# This code is adapted from https://github.com/huggingface/peft
+# with modifications to run peft on mindspore.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Any, Union
+
+import mindspore as ms
+
+from mindone.peft.config import PeftConfig
+from mindone.peft.utils import get_peft_model_state_dict, set_peft_model_state_dict
+from mindone.peft.utils.other import refresh_parameter_name_of_model
+
+
+class LoraAdapterRegistry:
+    """
+    Pages the LoRA adapters of a [`PeftModel`] in and out of device memory, to serve more adapters than fit on the
+    device with mixed adapter batches.
+
+    At most `max_loaded_adapters` adapters are injected in the model. The others are registered with the path they are
+    loaded from, or kept in host memory once they were paged out. Before running a batch,
+    [`~LoraAdapterRegistry.prepare`] loads the adapters of its samples, paging out the least recently used adapters
+    that the batch does not use.
+
+    Args:
+        model ([`PeftModel`]):
+            The model the adapters are injected in. Its current adapters are managed by the registry as well.
+        max_loaded_adapters (`int`, *optional*, defaults to 32):
+            The maximum number of adapters injected in the model at the same time.
+
+    Example:
+
+    ```py
+    >>> registry = LoraAdapterRegistry(peft_model, max_loaded_adapters=16)
+    >>> for customer_id, path in adapter_paths.items():
+    ...     registry.register(customer_id, path)
+    >>> adapter_names = registry.prepare(["customer_0", "__base__", "customer_7"])
+    >>> outputs = peft_model.generate(input_ids=input_ids, adapter_names=adapter_names)
+    ```
+    """
+
+    def __init__(self, model, max_loaded_adapters: int = 32):
+        if max_loaded_adapters < 1:
+            raise ValueError(f"`max_loaded_adapters` should be at least 1, but got {max_loaded_adapters}.")
+        self.model = model
+        self.max_loaded_adapters = max_loaded_adapters
+        # adapter name -> (model_id, kwargs of `load_adapter`)
+        self._sources: dict[str, tuple[Union[str, Any], dict[str, Any]]] = {}
+        # adapter name -> (config, host state dict) of the paged out adapters
+        self._host: dict[str, tuple[PeftConfig, dict[str, ms.Tensor]]] = {}
+        # injected adapters, least recently used first
+        self._loaded: OrderedDict[str, None] = OrderedDict((name, None) for name in model.peft_config)
+        self.page_ins = 0
+        self.page_outs = 0
+
+    @property
+    def loaded_adapters(self) -> list[str]:
+        return list(self._loaded)
+
+    def __contains__(self, adapter_name: str) -> bool:
+        return adapter_name in self._loaded or adapter_name in self._host or adapter_name in self._sources
+
+    def register(self, adapter_name: str, model_id: Union[str, Any], **kwargs: Any) -> None:
+        """
+        Registers an adapter to load from `model_id` when a batch first uses it, see [`PeftModel.load_adapter`] for the
+        arguments.
+        """
+        if adapter_name in self:
+            raise ValueError(f"Adapter {adapter_name} is already registered.")
+        self._sources[adapter_name] = (model_id, kwargs)
+
+    def prepare(self, adapter_names: list[str]) -> list[str]:
+        """
+        Makes sure that every adapter of `adapter_names`, the adapter of each sample of a batch, is injected in the
+        model. `"__base__"` is the base model.
+
+        Returns:
+            `list[str]`: `adapter_names`, to pass to the forward or `generate` of the model.
+        """
+        needed = list(dict.fromkeys(name for name in adapter_names if name != "__base__"))
+        if len(needed) > self.max_loaded_adapters:
+            raise ValueError(
+                f"The batch uses {len(needed)} adapters, more than `max_loaded_adapters={self.max_loaded_adapters}`."
+            )
+        unknown = [name for name in needed if name not in self]
+        if unknown:
+            raise ValueError(f"Unknown adapter(s): {', '.join(unknown)}")
+
+        for name in needed:
+            if name in self._loaded:
+                self._loaded.move_to_end(name)
+                continue
+            while len(self._loaded) >= self.max_loaded_adapters:
+                victim = next(loaded for loaded in self._loaded if loaded not in needed)
+                self.page_out(victim)
+            self._page_in(name)
+        return adapter_names
+
+    def page_out(self, adapter_name: str) -> None:
+        """Moves the weights of an injected adapter to host memory and removes it from the model."""
+        if adapter_name not in self._loaded:
+            raise ValueError(f"Adapter {adapter_name} is not loaded.")
+        state_dict = get_peft_model_state_dict(self.model, adapter_name=adapter_name)
+        state_dict = {key: value.move_to("CPU", blocking=True) for key, value in state_dict.items()}
+        self._host[adapter_name] = (self.model.peft_config[adapter_name], state_dict)
+        self.model.base_model.delete_adapter(adapter_name)
+        del self._loaded[adapter_name]
+        self.page_outs += 1
+
+    def _page_in(self, adapter_name: str) -> None:
+        if adapter_name in self._host:
+            peft_config, state_dict = self._host.pop(adapter_name)
+            # `set_peft_model_state_dict` loads parameters, like those of a checkpoint
+            state_dict = {key: ms.Parameter(value, name=key) for key, value in state_dict.items()}
+            self.model.add_adapter(adapter_name, peft_config)
+            refresh_parameter_name_of_model(self.model, only_peft=True)  # Only MindSpore can do
+            set_peft_model_state_dict(self.model, state_dict, adapter_name=adapter_name)
+            self.model.set_train(False)
+        else:
+            model_id, kwargs = self._sources[adapter_name]
+            self.model.load_adapter(model_id, adapter_name=adapter_name, **kwargs)
+        self._loaded[adapter_name] = None
+        self.page_ins += 1
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "loaded": len(self._loaded),
+            "host": len(self._host),
+            "registered": len(self._sources),
+            "page_ins": self.page_ins,
+            "page_outs": self.page_outs,
+        }
@@ -450,6 +450,10 @@ def set_peft_model_state_dict(
 
     with silence_mindspore_logger():
         load_result = _load_state_dict_into_model(model, peft_model_state_dict)
+    # the LoRA layers stack the weights of their adapters for mixed adapter batches, the stacks are now stale
+    for _, module in model.cells_and_names():
+        if hasattr(module, "_reset_stacked_lora_weights"):
+            module._reset_stacked_lora_weights()
     if config.is_prompt_learning:
         _load_state_dict_into_model(
             model.prompt_encoder[adapter_name].embedding,
@@ -1,5 +1,8 @@
+import json
+import mmap
 import os
-from typing import Dict, Optional, Union
+import struct
+from typing import Callable, Dict, Iterable, List, Optional, Union
 
 import numpy as np
 from safetensors import numpy
@@ -98,13 +101,27 @@ def load(data: bytes) -> Dict[str, ms.Tensor]:
     return _np2ms(flat)
 
 
-def load_file(filename: Union[str, os.PathLike]) -> Dict[str, ms.Tensor]:
+def load_file(
+    filename: Union[str, os.PathLike],
+    prefix: Optional[str] = None,
+    filter_fn: Optional[Callable[[str], bool]] = None,
+    strip_prefix: bool = False,
+) -> Dict[str, ms.Tensor]:
     """
     Loads a safetensors file into mindspore format.
 
+    The file is memory-mapped and only the byte ranges of the selected tensors are read, so the peak host memory is
+    roughly the size of the selected tensors instead of twice the size of the whole file.
+
     Args:
         filename (`str`, or `os.PathLike`)):
             The name of the file which contains the tensors
+        prefix (`str`, *optional*, defaults to `None`):
+            Only load tensors whose name starts with `prefix`, e.g. `"vae."`.
+        filter_fn (`Callable[[str], bool]`, *optional*, defaults to `None`):
+            Only load tensors for which `filter_fn(name)` returns `True`.
+        strip_prefix (`bool`, *optional*, defaults to `False`):
+            Whether to remove `prefix` from the names of the returned tensors.
 
     Returns:
         `Dict[str, ms.Tensor]`: dictionary that contains name as key, value as `ms.Tensor`
@@ -118,11 +135,135 @@ def load_file(filename: Union[str, os.PathLike]) -> Dict[str, ms.Tensor]:
     loaded = load_file(file_path)
     ```
     """
-    flat = numpy.load_file(filename)
-    output = _np2ms(flat)
+    output = {}
+    with safe_open(filename) as f:
+        for k in f.keys(prefix=prefix, filter_fn=filter_fn):
+            name = k[len(prefix) :] if (strip_prefix and prefix) else k
+            output[name] = f.get_tensor(k, name=name)
     return output
 
 
+_SAFETENSORS_DTYPES = {
+    "F64": np.float64,
+    "F32": np.float32,
+    "F16": np.float16,
+    "BF16": np.uint16,  # numpy has no bfloat16, the raw bits are widened to float32 on read
+    "I64": np.int64,
+    "I32": np.int32,
+    "I16": np.int16,
+    "I8": np.int8,
+    "U64": np.uint64,
+    "U32": np.uint32,
+    "U16": np.uint16,
+    "U8": np.uint8,
+    "BOOL": np.bool_,
+}
+
+
+class safe_open:
+    """
+    Lazy, memory-mapped handle of a safetensors file, similar to `safetensors.safe_open`.
+
+    The header is parsed once on open and every tensor is created on demand from the mapped buffer, so reading a
+    subset of keys only touches the corresponding byte ranges of the file.
+
+    Args:
+        filename (`str`, or `os.PathLike`)):
+            The name of the file which contains the tensors
+
+    Example:
+
+    ```python
+    from mindone.safetensors.mindspore import safe_open
+
+    with safe_open("./my_folder/pipeline.safetensors") as f:
+        vae_state_dict = {k: f.get_tensor(k) for k in f.keys(prefix="vae.")}
+    ```
+    """
+
+    def __init__(self, filename: Union[str, os.PathLike]):
+        self.filename = filename
+        self._file = open(filename, "rb")
+        try:
+            (header_size,) = struct.unpack("<Q", self._file.read(8))
+            header = json.loads(self._file.read(header_size))
+            # copy-on-write mapping, tensors built on top of it are writable without touching the file
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_COPY)
+        except Exception:
+            self._file.close()
+            raise
+        self._metadata = header.pop("__metadata__", None)
+        self._header = header
+        self._data_start = 8 + header_size
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                # numpy views returned by `get_numpy` are still alive, the mapping is released with them
+                pass
+            self._mmap = None
+        self._file.close()
+
+    def metadata(self) -> Optional[Dict[str, str]]:
+        return self._metadata
+
+    def keys(self, prefix: Optional[str] = None, filter_fn: Optional[Callable[[str], bool]] = None) -> List[str]:
+        """
+        Returns the tensor names of the file, optionally restricted to those starting with `prefix` and accepted by
+        `filter_fn`. Names are sorted by their offset in the file so that sequential reads stay sequential on disk.
+        """
+        keys = sorted(self._header, key=lambda k: self._header[k]["data_offsets"][0])
+        if prefix is not None:
+            keys = [k for k in keys if k.startswith(prefix)]
+        if filter_fn is not None:
+            keys = [k for k in keys if filter_fn(k)]
+        return keys
+
+    def get_numpy(self, key: str) -> np.ndarray:
+        """
+        Returns a numpy view of `key` on the mapped buffer, no data is copied. BF16 tensors are returned as their raw
+        `uint16` bits.
+        """
+        if self._mmap is None:
+            raise ValueError(f"Cannot read `{key}` from closed file {self.filename}.")
+        info = self._header[key]
+        dtype = info["dtype"]
+        if dtype not in _SAFETENSORS_DTYPES:
+            raise ValueError(f"Unsupported dtype {dtype} of tensor `{key}` in {self.filename}.")
+        begin, end = info["data_offsets"]
+        np_dtype = np.dtype(_SAFETENSORS_DTYPES[dtype])
+        array = np.frombuffer(
+            self._mmap, dtype=np_dtype, count=(end - begin) // np_dtype.itemsize, offset=self._data_start + begin
+        )
+        return array.reshape(info["shape"])
+
+    def get_tensor(self, key: str, name: Optional[str] = None) -> ms.Parameter:
+        """
+        Creates the `ms.Parameter` of `key` from the mapped buffer.
+        """
+        array = self.get_numpy(key)
+        if self._header[key]["dtype"] == "BF16":
+            array = (array.astype(np.uint32) << 16).view(np.float32)
+            return ms.Parameter(ms.Tensor(array, dtype=ms.bfloat16), name=name or key)
+        return ms.Parameter(array, name=name or key)
+
+    def iter_tensors(self, prefix: Optional[str] = None, filter_fn: Optional[Callable[[str], bool]] = None) -> Iterable:
+        """
+        Yields `(name, ms.Parameter)` pairs one by one in file order, so that a consumer can release each tensor
+        before the next one is read.
+        """
+        for k in self.keys(prefix=prefix, filter_fn=filter_fn):
+            yield k, self.get_tensor(k)
+
+
 def _np2ms(np_dict: Dict[str, np.ndarray]) -> Dict[str, ms.Tensor]:
     for k, v in np_dict.items():
         np_dict[k] = ms.Parameter(v, name=k)
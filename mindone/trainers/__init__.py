@@ -1,5 +1,5 @@
 from .callback import EvalSaveCallback, OverflowMonitor, ProfilerCallback
-from .ema import EMA
+from .ema import EMA, FusedEMA
 from .lr_schedule import create_scheduler
 from .optim import create_optimizer
 from .train_step import TrainOneStepWrapper
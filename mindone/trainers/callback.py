@@ -9,9 +9,9 @@ from mindspore.communication import get_rank
 from mindspore.communication.management import GlobalComm
 from mindspore.train.callback._callback import Callback, _handle_loss
 
-from .checkpoint import CheckpointManager
-from .ema import EMA
-from .recorder import PerfRecorder
+from .checkpoint import CheckpointManager, save_sharded_checkpoint
+from .ema import EMA, FusedEMA
+from .recorder import MetricsRingBuffer, PerfRecorder
 
 _logger = logging.getLogger("")
 
@@ -70,6 +70,9 @@ class EvalSaveCallback(Callback):
         zero_stage: int = 0,
         optimizer_parallel_group: str = None,
         ckpt_combine_online: bool = False,
+        async_save: bool = False,
+        metrics_fetch_interval: Optional[int] = None,
+        sharded_resume: bool = False,
     ):
         """
         Args:
@@ -84,6 +87,18 @@ class EvalSaveCallback(Callback):
                 using allgather ops to combile the checkpoint online if `ckpt_combine_online=True`, \
                 saving all device parameters if `ckpt_combine_online=False`, \
                 and need to use `convert_checkpoints` to combile the checkpoint offline. default is False.
+            async_save (`bool`, *optional*): write the checkpoints managed by `CheckpointManager` in a background \
+                thread after snapshotting them to host memory, so that saving does not stall training. default is False.
+            metrics_fetch_interval (`int`, *optional*): if set, the training steps do not synchronize with the device. \
+                The global step is read once and then counted on host, the loss, lr and loss scale of the logged steps \
+                are kept on device in a `MetricsRingBuffer` and fetched together every `metrics_fetch_interval` \
+                logged steps, and the records are written by a background thread. The train time of a record is then \
+                the average over the fetched records. With gradient accumulation or skipped overflow updates, the \
+                host step counts the training steps rather than the optimizer updates. default is None.
+            sharded_resume (`bool`, *optional*): save the training resume checkpoint with `save_sharded_checkpoint` \
+                in the `train_resume` folder of `ckpt_save_dir`, each rank of the optimizer parallel group writing only \
+                its shard, instead of one `train_resume.ckpt` per rank. `resume_train_network` loads the folder, \
+                with any number of ranks. All the ranks of the group must run the callback. default is False.
         """
         self.rank_id = rank_id
         self.is_main_device = rank_id in [0, None]
@@ -121,9 +136,14 @@ class EvalSaveCallback(Callback):
         self.start_epoch = start_epoch
         self.record_lr = record_lr
         self.save_ema_only = save_ema_only
+        self.metrics_fetch_interval = metrics_fetch_interval
+        # offset between the global step and `cur_step_num`, read once when the step is counted on host
+        self._step_offset = None
+        self._metrics = None
+        self._metrics_positions = []
 
+        self.ckpt_save_policy = ckpt_save_policy
         if self.need_save_network:
-            self.ckpt_save_policy = ckpt_save_policy
             self.monitor_metric = monitor_metric
             self.ckpt_manager = CheckpointManager(
                 ckpt_save_dir,
@@ -131,15 +151,21 @@ class EvalSaveCallback(Callback):
                 k=ckpt_max_keep,
                 integrated_save=integrated_save,
                 prefer_low_perf=prefer_low_perf,
+                async_save=async_save,
             )
             if self.start_epoch == 0:
                 if self.record_lr:
                     perf_columns = ["step", "loss", "lr", "train_time(s)"]
                 else:
                     perf_columns = ["step", "loss", "train_time(s)"]
-                self.rec = PerfRecorder(self.output_dir, metric_names=perf_columns)
+                self.rec = PerfRecorder(
+                    self.output_dir, metric_names=perf_columns, async_write=metrics_fetch_interval is not None
+                )
             else:
-                self.rec = PerfRecorder(self.output_dir, resume=True)
+                self.rec = PerfRecorder(self.output_dir, resume=True, async_write=metrics_fetch_interval is not None)
+            if metrics_fetch_interval is not None:
+                metric_names = ["loss", "lr", "loss_scale"] if self.record_lr else ["loss", "loss_scale"]
+                self._metrics = MetricsRingBuffer(metric_names, capacity=metrics_fetch_interval)
 
         self.save_trainable_only = save_trainable_only or use_lora
         if self.save_trainable_only:
@@ -162,12 +188,40 @@ class EvalSaveCallback(Callback):
         self.use_step_unit = use_step_unit
         self.train_steps = train_steps
         self.save_training_resume = save_training_resume
+        self.sharded_resume = sharded_resume
         self.choice_func = None
         if resume_prefix_blacklist:
             if isinstance(resume_prefix_blacklist, str):
                 resume_prefix_blacklist = (resume_prefix_blacklist,)
             self.choice_func = lambda x: not x.startswith(resume_prefix_blacklist)
 
+    def _join_ema_gather(self):
+        # the EMA swapped in by the saving rank is gathered from the shards of every rank of the group
+        if not self.need_save_network and isinstance(self.ema, FusedEMA) and self.ema.num_shards > 1:
+            self.ema.gather_shards()
+
+    def _save_training_resume(self, cb_params, cur_epoch, cur_step=None):
+        if self.sharded_resume:
+            save_sharded_checkpoint(
+                cb_params.train_network,
+                os.path.join(self.ckpt_save_dir, "train_resume"),
+                zero_helper=getattr(cb_params.train_network, "zero_helper", None),
+                epoch_num=cur_epoch,
+                cur_step=cur_step if cur_step is not None else cb_params.cur_step_num,
+                choice_func=self.choice_func,
+            )
+            return
+        ckpt_name = f"train_resume_op_rank_{self.op_rank_id}.ckpt" if self.use_zero else "train_resume.ckpt"
+        append_dict = {"epoch_num": cur_epoch, "loss_scale": self._get_scaling_value_from_cbp(cb_params)}
+        if cur_step is not None:
+            append_dict["cur_step"] = cur_step
+        save_checkpoint(
+            cb_params.train_network,
+            os.path.join(self.ckpt_save_dir, ckpt_name),
+            choice_func=self.choice_func,
+            append_dict=append_dict,
+        )
+
     def _do_ckpt_combine_online(self):
         new_net_to_save = []
         all_gather_op = ops.AllGather(self.optimizer_parallel_group)
@@ -182,11 +236,20 @@ class EvalSaveCallback(Callback):
 
     def on_train_step_end(self, run_context):
         cb_params = run_context.original_args()
-        loss = _handle_loss(cb_params.net_outputs)
+        if isinstance(self.ema, FusedEMA) and self.ema.offload_to_host:
+            net_outputs = cb_params.net_outputs
+            self.ema.host_update(net_outputs[1] if isinstance(net_outputs, (tuple, list)) else None)
         opt = self._get_optimizer_from_cbp(cb_params)
-        cur_step = int(opt.global_step.asnumpy().item())
-        if cur_step <= 0:
-            cur_step = cb_params.cur_step_num + self.start_epoch * cb_params.batch_num
+        if self.metrics_fetch_interval is None:
+            loss = _handle_loss(cb_params.net_outputs)
+            cur_step = int(opt.global_step.asnumpy().item())
+            if cur_step <= 0:
+                cur_step = cb_params.cur_step_num + self.start_epoch * cb_params.batch_num
+        else:
+            # `_handle_loss` reads the loss on host
+            net_outputs = cb_params.net_outputs
+            loss = net_outputs[0] if isinstance(net_outputs, (tuple, list)) else net_outputs
+            cur_step = self._get_host_step(cb_params, opt)
 
         step_num = (cb_params.batch_num * cb_params.epoch_num) if self.train_steps < 0 else self.train_steps
 
@@ -199,18 +262,10 @@ class EvalSaveCallback(Callback):
         if self.step_mode and (cur_step % self.ckpt_save_interval == 0 or cur_step == step_num):
             if self.save_training_resume and self.need_save_optimizer:
                 # TODO: resume training for step.
-                ckpt_name = f"train_resume_op_rank_{self.op_rank_id}.ckpt" if self.use_zero else "train_resume.ckpt"
-                save_checkpoint(
-                    cb_params.train_network,
-                    os.path.join(self.ckpt_save_dir, ckpt_name),
-                    choice_func=self.choice_func,
-                    append_dict={
-                        "epoch_num": cur_epoch,
-                        "cur_step": cur_step,
-                        "loss_scale": self._get_scaling_value_from_cbp(cb_params),
-                    },
-                )
+                self._save_training_resume(cb_params, cur_epoch, cur_step)
                 if self.ema is not None:
+                    if isinstance(self.ema, FusedEMA):
+                        self.ema.synchronize()
                     ckpt_name = f"ema_resume_op_rank_{self.op_rank_id}.ckpt" if self.use_zero else "ema_resume.ckpt"
                     save_checkpoint(
                         self.ema,
@@ -219,6 +274,8 @@ class EvalSaveCallback(Callback):
                     )
             if self.ckpt_combine_online:
                 new_net_to_save = self._do_ckpt_combine_online()
+            if self.ema is not None and (cb_params.get("eval_results") or self.ckpt_save_policy != "top_k"):
+                self._join_ema_gather()
             if self.need_save_network:
                 ckpt_name = (
                     f"{self.model_name}-s{cur_step}.ckpt"
@@ -249,11 +306,16 @@ class EvalSaveCallback(Callback):
                     # save history checkpoints
                     self.ckpt_manager.save(net_to_save, perf, ckpt_name=ckpt_name, append_dict=append_dict)
 
-                # swap back network weight and ema weight. MUST execute after model saving and before next-step training
-                if self.ema is not None:
-                    self.ema.swap_after_eval()
+                    # swap back network weight and ema weight. MUST execute after model saving and before next-step
+                    # training
+                    if self.ema is not None:
+                        self.ema.swap_after_eval()
 
         if self.is_main_device and cur_step % self.log_interval == 0 or cur_step == step_num:
+            if self._metrics is not None:
+                self._buffer_step_metrics(cb_params, cur_step, loss, last_step=cur_step == step_num)
+                return
+
             if self.record_lr:
                 cur_lr = self._fetch_optimizer_lr(cb_params)  # get lr
 
@@ -285,6 +347,58 @@ class EvalSaveCallback(Callback):
 
             self.step_start_time = time.time()
 
+    def _get_host_step(self, cb_params, opt) -> int:
+        if self._step_offset is None:
+            # the only read of the global step, the next steps are counted on host
+            global_step = int(opt.global_step.asnumpy().item())
+            if global_step <= 0:
+                global_step = cb_params.cur_step_num + self.start_epoch * cb_params.batch_num
+            self._step_offset = global_step - cb_params.cur_step_num
+        return cb_params.cur_step_num + self._step_offset
+
+    def _buffer_step_metrics(self, cb_params, cur_step, loss, last_step=False):
+        values = [loss, self._fetch_optimizer_lr(cb_params)] if self.record_lr else [loss]
+        self._metrics.append(cur_step, *values, self._get_scale_sense_from_cbp(cb_params))
+        self._metrics_positions.append(
+            (cb_params.cur_epoch_num, (cb_params.cur_step_num - 1) % cb_params.batch_num + 1)
+        )
+        if self._metrics.is_full() or last_step:
+            self._flush_step_metrics()
+
+    def _flush_step_metrics(self):
+        records = self._metrics.fetch()
+        if not records:
+            return
+        # the steps run asynchronously, only the time of all the fetched records is measured
+        train_time = (time.time() - self.step_start_time) / len(records)
+        for (cur_step, *values, loss_scale), (epoch, step_in_epoch) in zip(records, self._metrics_positions):
+            self.rec.add(cur_step, *values, train_time)
+            if self.record_lr:
+                loss, cur_lr = values
+                _logger.info(
+                    "epoch %d, step %d, lr %.7f, loss %.6f, loss scale %d, global_step %d, step_time(ms) %.1f",
+                    epoch,
+                    step_in_epoch,
+                    cur_lr,
+                    loss,
+                    loss_scale,
+                    cur_step,
+                    (train_time * 1000) / self.log_interval,
+                )
+            else:
+                (loss,) = values
+                _logger.info(
+                    "epoch %d, step %d, loss %.6f, loss scale %d, global_step %d, step_time(ms) %.1f",
+                    epoch,
+                    step_in_epoch,
+                    loss,
+                    loss_scale,
+                    cur_step,
+                    (train_time * 1000) / self.log_interval,
+                )
+        self._metrics_positions = []
+        self.step_start_time = time.time()
+
     def on_train_epoch_begin(self, run_context):
         """
         Called before each epoch beginning.
@@ -306,22 +420,18 @@ class EvalSaveCallback(Callback):
 
         # cur_step = cur_epoch * cb_params.batch_num
         opt = self._get_optimizer_from_cbp(cb_params)
-        cur_step = int(opt.global_step.asnumpy().item())
+        if self.metrics_fetch_interval is None:
+            cur_step = int(opt.global_step.asnumpy().item())
+        else:
+            cur_step = self._get_host_step(cb_params, opt)
 
         if not self.step_mode and (cur_epoch % self.ckpt_save_interval == 0) or (cur_epoch == epoch_num):
             if self.save_training_resume and self.need_save_optimizer:
                 # TODO: resume training for step.
-                ckpt_name = f"train_resume_op_rank_{self.op_rank_id}.ckpt" if self.use_zero else "train_resume.ckpt"
-                save_checkpoint(
-                    cb_params.train_network,
-                    os.path.join(self.ckpt_save_dir, ckpt_name),
-                    choice_func=self.choice_func,
-                    append_dict={
-                        "epoch_num": cur_epoch,
-                        "loss_scale": self._get_scaling_value_from_cbp(cb_params),
-                    },
-                )
+                self._save_training_resume(cb_params, cur_epoch)
                 if self.ema is not None:
+                    if isinstance(self.ema, FusedEMA):
+                        self.ema.synchronize()
                     ckpt_name = f"ema_resume_op_rank_{self.op_rank_id}.ckpt" if self.use_zero else "ema_resume.ckpt"
                     save_checkpoint(
                         self.ema,
@@ -330,6 +440,8 @@ class EvalSaveCallback(Callback):
                     )
             if self.ckpt_combine_online:
                 new_net_to_save = self._do_ckpt_combine_online()
+            if self.ema is not None:
+                self._join_ema_gather()
             if self.need_save_network:
                 ckpt_name = (
                     f"{self.model_name}-s{cur_step}.ckpt"
@@ -365,6 +477,11 @@ class EvalSaveCallback(Callback):
         self.last_epoch_end_time = time.time()
 
     def on_train_end(self, run_context):
+        if self.need_save_network:
+            self.ckpt_manager.wait()
+            if self._metrics is not None:
+                self._flush_step_metrics()
+            self.rec.close()
         if self.is_main_device:
             if self.ckpt_save_policy == "top_k":
                 log_str = f"Top K checkpoints:\n{self.monitor_metric}\tcheckpoint\n"
@@ -391,11 +508,14 @@ class EvalSaveCallback(Callback):
             optimizer = cb_params.train_network.optimizer
         return optimizer
 
-    def _get_scaling_value_from_cbp(self, cb_params):
+    def _get_scale_sense_from_cbp(self, cb_params) -> Tensor:
         if cb_params.dataset_sink_mode:
-            return cb_params.train_network.network.scale_sense.asnumpy().item()
+            return cb_params.train_network.network.scale_sense
         else:
-            return cb_params.train_network.scale_sense.asnumpy().item()
+            return cb_params.train_network.scale_sense
+
+    def _get_scaling_value_from_cbp(self, cb_params):
+        return self._get_scale_sense_from_cbp(cb_params).asnumpy().item()
 
     def _fetch_optimizer_lr(self, cb_params) -> Tensor:
         opt = self._get_optimizer_from_cbp(cb_params)
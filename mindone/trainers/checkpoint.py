@@ -1,9 +1,15 @@
 """checkpoint manager """
+import json
 import logging
 import os
 import stat
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 import mindspore as ms
+from mindspore import Tensor, nn, ops
+from mindspore.communication import get_rank
+from mindspore.train.serialization import _get_merged_param_data
 
 _logger = logging.getLogger(__name__)
 
@@ -19,11 +25,24 @@ class CheckpointManager:
         k (int): top k value
         prefer_low_perf (bool): standard for selecting the top k performance. If False, pick top k checkpoints with
             highest performance e.g. accuracy. If True, pick top k checkpoints with the lowest performance, e.g. loss.
+        async_save (bool): If True, parameters are snapshotted to host memory on the calling thread, then serialized
+            and written by a background thread. Files are written to a temporary name and atomically renamed, and
+            outdated checkpoints are only removed after the newer one has been written. Default: False.
+        max_inflight_saves (int): maximum number of asynchronous saves whose snapshot is held in host memory. Saving
+            blocks until an earlier save is finished once the limit is reached. Default: 1.
 
     """
 
     def __init__(
-        self, ckpt_save_dir, ckpt_save_policy="top_k", k=10, prefer_low_perf=False, del_past=True, integrated_save=False
+        self,
+        ckpt_save_dir,
+        ckpt_save_policy="top_k",
+        k=10,
+        prefer_low_perf=False,
+        del_past=True,
+        integrated_save=False,
+        async_save=False,
+        max_inflight_saves=1,
     ):
         self.ckpt_save_dir = ckpt_save_dir
         self._ckpt_filelist = []
@@ -35,6 +54,12 @@ class CheckpointManager:
         self.prefer_low_perf = prefer_low_perf
         self.integrated_save = integrated_save
 
+        self.async_save = async_save
+        self.max_inflight_saves = max(max_inflight_saves, 1)
+        # a single writer keeps writes and the removals that depend on them in submission order
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ckpt_writer") if async_save else None
+        self._inflight = deque()
+
     def get_ckpt_queue(self):
         """Get all the related checkpoint files managed here."""
         return self.ckpt_queue
@@ -55,6 +80,41 @@ class CheckpointManager:
         except ValueError:
             _logger.warning(f"ValueError, failed to remove the older ckpt file {file_name}.")
 
+    def _save_checkpoint(self, network, ckpt_name, append_dict=None, files_to_remove=()):
+        """Save `network` to `ckpt_name`, then remove `files_to_remove`, synchronously or in the background."""
+        ckpt_path = os.path.join(self.ckpt_save_dir, ckpt_name)
+        files_to_remove = [os.path.join(self.ckpt_save_dir, f) for f in files_to_remove]
+        if not self.async_save:
+            ms.save_checkpoint(network, ckpt_path, integrated_save=self.integrated_save, append_dict=append_dict)
+            for file_name in files_to_remove:
+                self.remove_ckpt_file(file_name)
+            return
+
+        # errors of finished writes are raised by the next save instead of when the in-flight limit is reached
+        while self._inflight and (self._inflight[0].done() or len(self._inflight) >= self.max_inflight_saves):
+            self._inflight.popleft().result()
+        save_list = _snapshot_to_host(network, integrated_save=self.integrated_save)
+        append_dict = _snapshot_to_host(append_dict) if append_dict else append_dict
+        future = self._executor.submit(self._write_checkpoint, save_list, ckpt_path, append_dict, files_to_remove)
+        future.add_done_callback(_log_write_error)
+        self._inflight.append(future)
+
+    def _write_checkpoint(self, save_list, ckpt_path, append_dict, files_to_remove):
+        # `ms.save_checkpoint` appends the suffix when it is missing, keep the renamed file consistent with that
+        if not ckpt_path.endswith(".ckpt"):
+            ckpt_path += ".ckpt"
+        tmp_path = os.path.join(os.path.dirname(ckpt_path), f".tmp-{os.path.basename(ckpt_path)}")
+        ms.save_checkpoint(save_list, tmp_path, integrated_save=self.integrated_save, append_dict=append_dict)
+        os.replace(tmp_path, ckpt_path)
+        _logger.info(f"Checkpoint saved in {ckpt_path}")
+        for file_name in files_to_remove:
+            self.remove_ckpt_file(file_name)
+
+    def wait(self):
+        """Block until all asynchronous saves are written. Errors raised by the writer are re-raised here."""
+        while self._inflight:
+            self._inflight.popleft().result()
+
     def save_top_k(self, network, perf, ckpt_name, verbose=True, append_dict=None):
         """Save and return Top K checkpoint address and accuracy."""
         self.ckpt_queue.append((perf, ckpt_name))
@@ -65,53 +125,33 @@ class CheckpointManager:
             to_del = self.ckpt_queue.pop(-1)
             # save if the perf is better than the minimum in the heap
             if to_del[1] != ckpt_name:
-                ms.save_checkpoint(
-                    network,
-                    os.path.join(self.ckpt_save_dir, ckpt_name),
-                    integrated_save=self.integrated_save,
-                    append_dict=append_dict,
-                )
                 # del minimum
-                self.remove_ckpt_file(os.path.join(self.ckpt_save_dir, to_del[1]))
+                self._save_checkpoint(network, ckpt_name, append_dict=append_dict, files_to_remove=[to_del[1]])
         else:
-            ms.save_checkpoint(
-                network,
-                os.path.join(self.ckpt_save_dir, ckpt_name),
-                integrated_save=self.integrated_save,
-                append_dict=append_dict,
-            )
+            self._save_checkpoint(network, ckpt_name, append_dict=append_dict)
 
     def save_latest_k(self, network, ckpt_name, append_dict):
         """Save latest K checkpoint."""
-        ms.save_checkpoint(
-            network,
-            os.path.join(self.ckpt_save_dir, ckpt_name),
-            integrated_save=self.integrated_save,
-            append_dict=append_dict,
-        )
-
-        _logger.info(f"Checkpoint saved in {os.path.join(self.ckpt_save_dir, ckpt_name)}")
         self.ckpt_queue.append(ckpt_name)
+        files_to_remove = []
         if len(self.ckpt_queue) > self.k:
             to_del = self.ckpt_queue.pop(0)
             if self.del_past:
-                self.remove_ckpt_file(os.path.join(self.ckpt_save_dir, to_del))
+                files_to_remove.append(to_del)
+        self._save_checkpoint(network, ckpt_name, append_dict=append_dict, files_to_remove=files_to_remove)
+        if not self.async_save:
+            _logger.info(f"Checkpoint saved in {os.path.join(self.ckpt_save_dir, ckpt_name)}")
 
     def save(self, network, perf=None, ckpt_name=None, append_dict=None):
         """Save checkpoint according to different save strategy."""
         if self.ckpt_save_policy is None:
-            ms.save_checkpoint(
-                network,
-                os.path.join(self.ckpt_save_dir, ckpt_name),
-                integrated_save=self.integrated_save,
-                append_dict=append_dict,
-            )
+            self._save_checkpoint(network, ckpt_name, append_dict=append_dict)
         elif self.ckpt_save_policy == "top_k":
             if perf is None:
                 raise ValueError(
                     "Evaluation performance is None, but `top_k` ckpt save policy requires evaluation performance"
                 )
-            self.save_top_k(network, perf, ckpt_name, append_dict)
+            self.save_top_k(network, perf, ckpt_name, append_dict=append_dict)
             return self.ckpt_queue
         elif self.ckpt_save_policy == "latest_k":
             self.save_latest_k(network, ckpt_name, append_dict)
@@ -122,7 +162,263 @@ class CheckpointManager:
             )
 
 
-def resume_train_network(network, optimizer, resume_ckpt):
+def _tensor_to_host(data):
+    # numpy has no bfloat16, go through float32 on host and cast back
+    if data.dtype == ms.bfloat16:
+        return Tensor(data.astype(ms.float32).asnumpy(), dtype=ms.bfloat16)
+    return Tensor.from_numpy(data.asnumpy().copy())
+
+
+def _log_write_error(future):
+    # logged as soon as the write fails, the error itself is raised by the next `save` or `wait`
+    if not future.cancelled() and future.exception() is not None:
+        _logger.error(f"Asynchronous checkpoint save failed: {future.exception()!r}")
+
+
+def _snapshot_to_host(save_obj, integrated_save=False):
+    """
+    Copy the parameters of a Cell, a `[{"name": ..., "data": ...}]` list, or the tensor values of an append dict to
+    host memory, so that training can keep updating the originals while the snapshot is written.
+
+    The parameters of a Cell split by auto parallel are merged here when `integrated_save` is set, as
+    `ms.save_checkpoint` does for a Cell: it only merges them for a Cell, not for the saved list.
+    """
+    if isinstance(save_obj, dict):
+        return {k: _tensor_to_host(v) if isinstance(v, Tensor) else v for k, v in save_obj.items()}
+    if isinstance(save_obj, nn.Cell):
+        save_obj.init_parameters_data()
+        layout_dict = save_obj.parameter_layout_dict
+        save_list = []
+        for _, param in save_obj.parameters_and_names():
+            data = _tensor_to_host(param)
+            if param.name in layout_dict:
+                data = _get_merged_param_data(save_obj, layout_dict, param.name, data, integrated_save)
+            save_list.append({"name": param.name, "data": data})
+        return save_list
+    return [{"name": item["name"], "data": _tensor_to_host(item["data"])} for item in save_obj]
+
+
+SHARDED_CKPT_INDEX_NAME = "index.json"
+SHARDED_CKPT_FORMAT_VERSION = 1
+
+
+def _shard_name(rank_id):
+    return f"rank_{rank_id:05d}.ckpt"
+
+
+def _collect_train_params(networks, zero_helper=None):
+    params = {param.name: param for network in networks for _, param in network.parameters_and_names()}
+    if zero_helper is not None:
+        # optimizer parameters cloned by ZeRO stage 1/2 are not always registered in the train network
+        for param in zero_helper.optimizer._parameters:
+            params.setdefault(param.name, param)
+        for param_tuple in zero_helper.get_optimizer_param_tuples():
+            for param in param_tuple:
+                params.setdefault(param.name, param)
+    return params
+
+
+def _get_loss_scale_state(train_network):
+    state = {}
+    scale_sense = getattr(train_network, "scale_sense", None)
+    if isinstance(scale_sense, Tensor):
+        state["scale_sense"] = float(scale_sense.asnumpy().item())
+    manager = getattr(train_network, "loss_scaling_manager", None)
+    if manager is not None:
+        for attr in ("cur_iter", "last_overflow_iter"):
+            value = getattr(manager, attr, None)
+            if isinstance(value, Tensor):
+                state[attr] = int(value.asnumpy().item())
+        for attr in ("scale_window", "scale_factor"):
+            value = getattr(manager, attr, None)
+            if isinstance(value, (int, float)):
+                state[attr] = value
+    return state
+
+
+def save_sharded_checkpoint(
+    train_network,
+    save_dir,
+    zero_helper=None,
+    epoch_num=0,
+    cur_step=0,
+    dataloader_state=None,
+    choice_func=None,
+):
+    """
+    Save a distributed checkpoint made of one shard per rank of the optimizer parallel group and a JSON index.
+
+    Parameters split by ZeRO (see `ZeroHelper.get_params_split_info`) are saved by every rank as their local slice,
+    replicated parameters are spread over the ranks round-robin, so each rank writes about 1/N of the state in parallel.
+    The index written by rank 0 records the global shape and layout of every parameter, which allows loading the
+    checkpoint with a different number of ranks, the training position and the loss scale state.
+
+    Args:
+        train_network (nn.Cell): the train network, e.g. `TrainOneStepWrapper`, including the optimizer.
+        save_dir (str): directory of the checkpoint, created if missing.
+        zero_helper (ZeroHelper): ZeRO helper of the train network, None if ZeRO is not used. Default: None.
+        epoch_num (int): the current epoch. Default: 0.
+        cur_step (int): the current global step. Default: 0.
+        dataloader_state (dict): JSON serializable position of the data loader, e.g. epoch, step in epoch and seed,
+            to resume the data stream from. Default: None.
+        choice_func (function): takes a parameter name and returns whether to save it, as in
+            `mindspore.save_checkpoint`. Default: None, all the parameters are saved.
+    """
+    if zero_helper is not None and zero_helper.is_parallel:
+        rank_id, world_size = zero_helper.op_rank_id, zero_helper.op_group_size
+        split_info = zero_helper.get_params_split_info()
+        # optimizer parallel groups smaller than the world hold identical shards, only one of them writes
+        need_write = not zero_helper.need_dp or get_rank(zero_helper.dp_group) == 0
+        zero_stage = zero_helper.zero_stage
+    else:
+        rank_id, world_size, split_info, need_write, zero_stage = 0, 1, {}, True, 0
+
+    params = _collect_train_params([train_network], zero_helper)
+    if choice_func is not None:
+        params = {name: param for name, param in params.items() if choice_func(name)}
+    index_params = {}
+    save_list = []
+    for i, name in enumerate(sorted(params)):
+        param = params[name]
+        split = split_info.get(name, {}).get("split", False)
+        shape = list(param.shape)
+        if split:
+            shape[0] *= world_size
+            owner = None
+        else:
+            owner = i % world_size
+        index_params[name] = {"shape": shape, "dtype": str(param.dtype), "split": split, "rank": owner}
+        if split or owner == rank_id:
+            save_list.append({"name": name, "data": param})
+
+    if not need_write:
+        return
+    os.makedirs(save_dir, exist_ok=True)
+    shard_path = os.path.join(save_dir, _shard_name(rank_id))
+    tmp_path = os.path.join(save_dir, f".tmp-{_shard_name(rank_id)}")
+    ms.save_checkpoint(save_list, tmp_path)
+    os.replace(tmp_path, shard_path)
+
+    if rank_id == 0:
+        index = {
+            "format_version": SHARDED_CKPT_FORMAT_VERSION,
+            "world_size": world_size,
+            "zero_stage": zero_stage,
+            "shards": [_shard_name(i) for i in range(world_size)],
+            "epoch_num": epoch_num,
+            "cur_step": cur_step,
+            "loss_scale": _get_loss_scale_state(train_network),
+            "dataloader": dataloader_state or {},
+            "params": index_params,
+        }
+        tmp_path = os.path.join(save_dir, f".tmp-{SHARDED_CKPT_INDEX_NAME}")
+        with open(tmp_path, "w") as f:
+            json.dump(index, f, indent=2)
+        os.replace(tmp_path, os.path.join(save_dir, SHARDED_CKPT_INDEX_NAME))
+    _logger.info(f"Sharded checkpoint of rank {rank_id} saved in {shard_path}")
+
+
+def is_sharded_checkpoint(ckpt_path):
+    return os.path.isdir(ckpt_path) and os.path.exists(os.path.join(ckpt_path, SHARDED_CKPT_INDEX_NAME))
+
+
+def load_sharded_checkpoint(train_network, ckpt_dir, zero_helper=None, strict_load=False):
+    """
+    Load a checkpoint saved by `save_sharded_checkpoint` into `train_network`, resharding the split parameters when the
+    number of ranks differs from the one used for saving. Only the shards holding rows needed by this rank are read.
+
+    Args:
+        train_network (Union[nn.Cell, List[nn.Cell]]): the train network, e.g. `TrainOneStepWrapper`, including the
+            optimizer, or a list of cells sharing the checkpoint, e.g. `[network, optimizer]`.
+        ckpt_dir (str): directory of the sharded checkpoint.
+        zero_helper (ZeroHelper): ZeRO helper of the train network, None if ZeRO is not used. Default: None.
+        strict_load (bool): passed to `mindspore.load_param_into_net`. Default: False.
+
+    Returns:
+        The index of the checkpoint (dict), holding `epoch_num`, `cur_step`, `loss_scale` and `dataloader` states.
+    """
+    with open(os.path.join(ckpt_dir, SHARDED_CKPT_INDEX_NAME), "r") as f:
+        index = json.load(f)
+    missing_shards = [s for s in index["shards"] if not os.path.exists(os.path.join(ckpt_dir, s))]
+    if missing_shards:
+        raise ValueError(f"Sharded checkpoint {ckpt_dir} is incomplete, missing shards: {missing_shards}")
+
+    if zero_helper is not None and zero_helper.is_parallel:
+        rank_id, world_size = zero_helper.op_rank_id, zero_helper.op_group_size
+        split_info = zero_helper.get_params_split_info()
+    else:
+        rank_id, world_size, split_info = 0, 1, {}
+    src_world_size = index["world_size"]
+    networks = list(train_network) if isinstance(train_network, (list, tuple)) else [train_network]
+
+    # rank of the saved shard -> {name: [(start row in the saved slice, end row, position in the local slice)]}
+    reads = {}
+    for name in _collect_train_params(networks, zero_helper):
+        info = index["params"].get(name)
+        if info is None:
+            continue
+        local_split = split_info.get(name, {}).get("split", False)
+        if not info["split"] and not local_split:
+            reads.setdefault(info["rank"], {})[name] = [(None, None, 0)]
+            continue
+        rows = info["shape"][0]
+        dst_len = rows // world_size if local_split else rows
+        start = rank_id * dst_len if local_split else 0
+        end = start + dst_len
+        if not info["split"]:
+            reads.setdefault(info["rank"], {})[name] = [(start, end, 0)]
+            continue
+        src_len = rows // src_world_size
+        for src_rank in range(start // src_len, (end - 1) // src_len + 1):
+            src_start = max(start, src_rank * src_len)
+            src_end = min(end, (src_rank + 1) * src_len)
+            reads.setdefault(src_rank, {}).setdefault(name, []).append(
+                (src_start - src_rank * src_len, src_end - src_rank * src_len, src_start - start)
+            )
+
+    pieces = {}
+    for src_rank in sorted(reads):
+        names = reads[src_rank]
+        shard = ms.load_checkpoint(
+            os.path.join(ckpt_dir, index["shards"][src_rank]), choice_func=lambda x, names=names: x in names
+        )
+        for name, slices in names.items():
+            pieces.setdefault(name, []).extend(
+                (pos, shard[name] if begin is None else shard[name][begin:end]) for begin, end, pos in slices
+            )
+        del shard
+
+    param_dict = {}
+    for name, parts in pieces.items():
+        parts = [data for _, data in sorted(parts, key=lambda x: x[0])]
+        data = parts[0] if len(parts) == 1 else ops.cat(parts)
+        param_dict[name] = data if isinstance(data, ms.Parameter) else ms.Parameter(data, name=name)
+    del pieces
+    for network in networks:
+        ms.load_param_into_net(network, param_dict, strict_load=strict_load)
+    if zero_helper is not None:
+        # optimizer parameters cloned by ZeRO stage 1/2 are not always registered in the train network
+        ms.load_param_into_net(zero_helper.optimizer, param_dict, strict_load=strict_load)
+    _logger.info(
+        f"Finish loading sharded checkpoint from {ckpt_dir}, saved with {src_world_size} ranks and loaded into rank "
+        f"{rank_id} of {world_size}."
+    )
+    return index
+
+
+def resume_train_network(network, optimizer, resume_ckpt, zero_helper=None):
+    if is_sharded_checkpoint(resume_ckpt):
+        index = load_sharded_checkpoint([network, optimizer], resume_ckpt, zero_helper=zero_helper)
+        loss_scale_state = index.get("loss_scale", {})
+        start_epoch = index.get("epoch_num", 0)
+        _logger.info(f"Resume train from epoch: {start_epoch + 1}")
+        return (
+            start_epoch,
+            loss_scale_state.get("scale_sense", 0.0),
+            ms.Tensor(loss_scale_state.get("cur_iter", 0), ms.int32),
+            ms.Tensor(loss_scale_state.get("last_overflow_iter", 0), ms.int32),
+        )
+
     resume_param = ms.load_checkpoint(resume_ckpt)
     start_epoch = int(resume_param.get("epoch_num", ms.Tensor(0, ms.int32)).asnumpy().item())
     loss_scale = float(resume_param.get("loss_scale", ms.Tensor(0, ms.float32)).asnumpy().item())
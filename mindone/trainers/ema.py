@@ -1,9 +1,16 @@
+import math
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+import numpy as np
+
 import mindspore as ms
 from mindspore import Parameter, Tensor, mint, nn, ops
+from mindspore.communication import get_group_size, get_rank
 from mindspore.ops import composite as C
 from mindspore.ops import functional as F
 
-__all__ = ["EMA"]
+__all__ = ["EMA", "FusedEMA"]
 
 _ema_op = C.MultitypeFuncGraph("grad_ema_op")
 
@@ -77,3 +84,233 @@ class EMA(nn.Cell):
             return True
         success = self.map(self.assign, self.net_weight, self.swap_cache)
         return success
+
+
+class FusedEMA(nn.Cell):
+    """
+    EMA of the network parameters kept in a few flat buffers, with the interface of `EMA`.
+
+    The parameters are grouped by dtype in buckets of at most `bucket_size` elements, and each bucket of the EMA is
+    updated by one lerp, instead of one update per parameter. MindSpore parameters cannot be views of a shared buffer,
+    so every update concatenates the parameters of a bucket in a temporary buffer, whose size is bounded by
+    `bucket_size`. The checkpoints of a `FusedEMA` hold its flat buckets, not per parameter weights.
+
+    Args:
+        ema_decay: decay of the EMA for every step.
+        updates: number of steps, which can be restored from resumed training.
+        update_every: update the EMA every `update_every` steps only, with the decay raised to the power
+            `update_every`, so that it averages over the same number of steps.
+        bucket_size: maximum number of elements of a bucket.
+        offload_to_host: if True, keep the EMA in host memory, in float32. `ema_update` does nothing, and the EMA is
+            updated by `host_update`, called by `EvalSaveCallback` after every step: the parameters are copied to host
+            every `update_every` steps and averaged by a background thread, off the training stream. The EMA
+            parameters only exist from `synchronize`, which creates them to save or swap the EMA, to the next
+            `host_update`. To resume the EMA, call `synchronize` before loading the checkpoint into them.
+    """
+
+    def __init__(
+        self,
+        network: nn.Cell,
+        ema_decay: float = 0.9999,
+        updates: int = 0,
+        trainable_only: bool = True,
+        update_every: int = 1,
+        bucket_size: int = 2**27,
+        offload_to_host: bool = False,
+    ):
+        super().__init__()
+        if update_every < 1:
+            raise ValueError(f"`update_every` must be at least 1, but got {update_every}.")
+        if trainable_only:
+            self.net_weight = ms.ParameterTuple(network.trainable_params())
+        else:
+            self.net_weight = ms.ParameterTuple(network.get_parameters())
+        self.ema_decay = ema_decay
+        self.update_every = update_every
+        self.bucket_size = bucket_size
+        self.offload_to_host = offload_to_host
+        self.updates = Parameter(Tensor(updates, ms.float32), requires_grad=False)
+        self._host_steps = updates
+
+        # ZeRO group the buckets are sharded across, see `shard`
+        self.shard_group = None
+        self.shard_rank = 0
+        self.num_shards = 1
+        self._build_buckets([p.value() for p in self.net_weight])
+
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ema") if offload_to_host else None
+        self._pending = None
+        self._swap_cache = None
+
+    def _build_buckets(self, values):
+        self._shapes = tuple(p.shape for p in self.net_weight)
+        groups, numels = [], []
+        open_buckets = {}  # dtype -> index of the bucket being filled
+        for i, param in enumerate(self.net_weight):
+            b = open_buckets.get(param.dtype)
+            if b is None or numels[b] + param.size > self.bucket_size:
+                b = open_buckets[param.dtype] = len(groups)
+                groups.append([])
+                numels.append(0)
+            groups[b].append(i)
+            numels[b] += param.size
+        self.bucket_indices = tuple(tuple(indices) for indices in groups)
+        self.bucket_numels = tuple(numels)
+        self.shard_numels = tuple(-(-numel // self.num_shards) for numel in numels)
+
+        weights, shadows = [], []
+        for b, indices in enumerate(self.bucket_indices):
+            if self.offload_to_host:
+                flat = self._local_shard(mint.cat([values[i].reshape(-1).float() for i in indices]), b)
+                shadows.append(flat.asnumpy())
+            else:
+                flat = mint.cat([values[i].reshape(-1).to(self.net_weight[i].dtype) for i in indices])
+                flat = self._local_shard(flat, b)
+                weights.append(Parameter(flat, name=f"ema.bucket_{b}", requires_grad=False))
+        self.ema_weight = ms.ParameterTuple(weights)
+        # the EMA kept in host memory, see `offload_to_host`
+        self._host_shadow = shadows if self.offload_to_host else None
+
+    def shard(self, group: str, zero_stage: int):
+        """
+        Adapts the buckets to ZeRO. With stage 1 or 2, every rank of `group` only keeps its slice of each bucket. With
+        stage 3, the buckets are rebuilt from the slices of the parameters of the rank, the network being split already.
+        """
+        group_size, rank = get_group_size(group), get_rank(group)
+        self._wait()
+        values = [None] * len(self.net_weight)
+        for b, indices in enumerate(self.bucket_indices):
+            sizes = [int(np.prod(self._shapes[i])) for i in indices]
+            bucket = Tensor(self._host_shadow[b]) if self.offload_to_host else self.ema_weight[b].value()
+            for i, value in zip(indices, mint.split(bucket, sizes)):
+                value = value.reshape(self._shapes[i])
+                if value.shape != self.net_weight[i].shape:
+                    # same slicing as `split_np` of zero
+                    size = value.shape[0] // group_size
+                    value = value[size * rank : size * (rank + 1)]
+                values[i] = value
+        if zero_stage in (1, 2):
+            self.shard_group, self.shard_rank, self.num_shards = group, rank, group_size
+        self._build_buckets(values)
+        return self
+
+    def _flatten(self, b):
+        return mint.cat([self.net_weight[i].reshape(-1) for i in self.bucket_indices[b]])
+
+    def _local_shard(self, flat, b):
+        if self.num_shards == 1:
+            return flat
+        size = self.shard_numels[b]
+        start = min(size * self.shard_rank, self.bucket_numels[b])
+        end = min(start + size, self.bucket_numels[b])
+        if end - start == size:
+            return flat[start:end]
+        padding = mint.zeros((size - (end - start),), dtype=flat.dtype)
+        return mint.cat([flat[start:end], padding]) if end > start else padding
+
+    def _decay(self, updates):
+        return (self.ema_decay * (1 - mint.exp(-updates / 2000))) ** self.update_every
+
+    def _update_buckets(self, d):
+        success = ()
+        for b in range(len(self.bucket_indices)):
+            ema_weight = self.ema_weight[b]
+            flat = self._local_shard(self._flatten(b), b)
+            weight = F.cast(1 - d, ema_weight.dtype)
+            success += (F.assign(ema_weight, mint.lerp(ema_weight, flat, weight)),)
+        return success
+
+    def ema_update(self):
+        """Update EMA parameters, every `update_every` steps."""
+        if self.offload_to_host:
+            return self.updates
+        self.updates += 1
+        if self.update_every > 1:
+            if self.updates % self.update_every != 0:
+                return self.updates
+        return F.depend(self.updates, self._update_buckets(self._decay(self.updates)))
+
+    def host_update(self, overflow: Optional[Tensor] = None):
+        """
+        Counts a step of the EMA kept in host memory. Every `update_every` steps, the parameters are copied to host and
+        averaged in the EMA by a background thread, unless `overflow`, the overflow flag of the step, is set.
+        """
+        if len(self.ema_weight):
+            # the parameters created by `synchronize`, which a resumed EMA may have been loaded into
+            self._host_shadow = [weight.asnumpy() for weight in self.ema_weight]
+            self._host_steps = int(self.updates.asnumpy().item())
+            self.ema_weight = ms.ParameterTuple(())
+        self._host_steps += 1
+        if self._host_steps % self.update_every:
+            return
+        flats = [
+            self._local_shard(self._flatten(b), b).float().move_to("CPU", blocking=False)
+            for b in range(len(self.bucket_indices))
+        ]
+        # one update in flight, which bounds the host copies of the parameters
+        self._wait()
+        self._pending = self._executor.submit(self._host_lerp, flats, self._host_steps, overflow)
+
+    def _host_lerp(self, flats, steps, overflow):
+        if overflow is not None and overflow.asnumpy().item():
+            return
+        d = (self.ema_decay * (1 - math.exp(-steps / 2000))) ** self.update_every
+        for shadow, flat in zip(self._host_shadow, flats):
+            shadow += (flat.asnumpy() - shadow) * (1 - d)
+
+    def _wait(self):
+        if self._pending is not None:
+            self._pending.result()
+            self._pending = None
+
+    def synchronize(self):
+        """
+        Waits for the update in flight and creates the EMA parameters from the host EMA, e.g. before saving them. They
+        are released by the next `host_update`.
+        """
+        self._wait()
+        if self.offload_to_host:
+            self.ema_weight = ms.ParameterTuple(
+                [
+                    Parameter(Tensor(shadow), name=f"ema.bucket_{b}", requires_grad=False)
+                    for b, shadow in enumerate(self._host_shadow)
+                ]
+            )
+            self.updates.set_data(Tensor(self._host_steps, ms.float32))
+
+    def gather_shards(self):
+        """
+        Returns the full buckets of the EMA. With ZeRO sharding, the shards are all-gathered: all the ranks of the group
+        must call it, or `swap_before_eval`.
+        """
+        self.synchronize()
+        if self.num_shards == 1:
+            return [weight.value() for weight in self.ema_weight]
+        all_gather = ops.AllGather(self.shard_group)
+        return [all_gather(weight.value())[:numel] for weight, numel in zip(self.ema_weight, self.bucket_numels)]
+
+    def _unflatten(self, b, flat):
+        params = [self.net_weight[i] for i in self.bucket_indices[b]]
+        for param, value in zip(params, mint.split(flat, [param.size for param in params])):
+            param.set_data(value.reshape(param.shape).to(param.dtype))
+
+    def swap_before_eval(self):
+        buckets = self.gather_shards()
+        # net -> host, the copy only lives until `swap_after_eval`
+        self._swap_cache = []
+        for b in range(len(self.bucket_indices)):
+            flat = self._flatten(b)
+            self._swap_cache.append(flat.float().asnumpy() if flat.dtype == ms.bfloat16 else flat.asnumpy())
+        # ema -> net
+        for b, flat in enumerate(buckets):
+            self._unflatten(b, flat)
+        return True
+
+    def swap_after_eval(self):
+        if self._swap_cache is None:
+            return True
+        # host -> net
+        for b, flat in enumerate(self._swap_cache):
+            self._unflatten(b, Tensor.from_numpy(flat))
+        self._swap_cache = None
+        return True
@@ -6,8 +6,24 @@ import mindspore as ms
 import mindspore.mint as mint
 import mindspore.ops as ops
 from mindspore import Parameter, ParameterTuple, Tensor
+from mindspore.communication import get_group_size, get_rank
 from mindspore.experimental.optim.optimizer import Optimizer
 
+_muon_momentum = ops.MultitypeFuncGraph("muon_momentum")
+
+
+@_muon_momentum.register("Float", "Bool", "Tensor", "Tensor", "Bool")
+def _update_momentum_op(mu: float, nesterov: bool, m: Parameter, g: Tensor, use_muon: bool) -> Tensor:
+    # returns the update to orthogonalize, the AdamW parameters keep their gradient
+    if use_muon:
+        m.mul_(mu).add_(g)
+        if nesterov:
+            g = g.add(m, alpha=mu)
+        else:
+            g = m
+    return g
+
+
 _muon_opt = ops.MultitypeFuncGraph("muon_opt")
 
 
@@ -16,9 +32,7 @@ _muon_opt = ops.MultitypeFuncGraph("muon_opt")
     "Float",
     "Float",
     "Float",
-    "Bool",
-    "Int",
-    "Float",
+    "Tensor",
     "Tensor",
     "Tensor",
     "Tensor",
@@ -29,12 +43,9 @@ _muon_opt = ops.MultitypeFuncGraph("muon_opt")
     "Bool",
 )
 def _update_run_op(
-    mu: float,
     beta1: float,
     beta2: float,
     eps: float,
-    nesterov: bool,
-    ns_steps: int,
     weight_decay: float,
     lr: Parameter,
     denom: Parameter,
@@ -42,6 +53,7 @@ def _update_run_op(
     m: Parameter,
     v: Parameter,
     g: Tensor,
+    update: Tensor,
     ratio: float,
     use_muon: bool,
 ) -> bool:
@@ -49,13 +61,8 @@ def _update_run_op(
         param.mul_(1 - lr * weight_decay)
 
     if use_muon:
-        m.mul_(mu).add_(g)
-        if nesterov:
-            g = g.add(m, alpha=mu)
-        else:
-            g = m
-        g = zeropower_via_newtonschulz5(g, steps=ns_steps)
-        param.add_(lr * g, alpha=-ratio)
+        # `update` is the orthogonalized momentum, see `Muon._orthogonalize`
+        param.add_(lr * update, alpha=-ratio)
     else:
         m_next = mint.lerp(g, m, beta1)
         v_next = mint.lerp(mint.square(g), v, beta2)
@@ -133,8 +140,53 @@ def zeropower_via_newtonschulz5(G: Tensor, steps: int) -> Tensor:
     return X
 
 
+def batched_zeropower_via_newtonschulz5(G: Tensor, steps: int) -> Tensor:
+    """
+    `zeropower_via_newtonschulz5` of a stack of matrices of the same shape, `G` of shape `(batch, rows, cols)`. All the
+    matrices go through the same batched matmuls.
+    """
+    assert G.ndim == 3
+
+    a, b, c = 3.4445, -4.7750, 2.0315
+    X = G.bfloat16()
+    if G.shape[1] > G.shape[2]:
+        X = mint.transpose(X, 1, 2)
+
+    # Ensure spectral norm is at most 1
+    X = X / (mint.norm(X, dim=(1, 2), keepdim=True) + 1e-7)
+    # Perform the NS iterations
+    for _ in range(steps):
+        A = mint.bmm(X, mint.transpose(X, 1, 2))
+        B = mint.baddbmm(A, A, A, beta=b, alpha=c)
+        X = mint.baddbmm(X, B, X, beta=a)
+
+    if G.shape[1] > G.shape[2]:
+        X = mint.transpose(X, 1, 2)
+    return X
+
+
 class Muon(Optimizer):
-    """Following https://github.com/MoonshotAI/Moonlight"""
+    """
+    Following https://github.com/MoonshotAI/Moonlight
+
+    The Newton-Schulz orthogonalization runs on stacks of the Muon parameters of the same shape, with batched matmuls.
+    With `ns_parallel_group`, each rank of the group orthogonalizes a subset of every stack and the results are
+    all-gathered, so that every rank updates all the parameters. The Muon parameters then need their full matrices,
+    `ZeroHelper` keeps them unsplit and shards the Newton-Schulz work over the optimizer parallel group instead.
+
+    Args:
+        ns_parallel_group (`str`, *optional*):
+            The communication group sharing the Newton-Schulz work. Defaults to None, every rank orthogonalizes all
+            the parameters.
+        ns_bucket_size (`int`, *optional*):
+            The maximum number of matrices orthogonalized together. Defaults to None, all the parameters of the same
+            shape.
+        overlap_ns (`bool`, *optional*):
+            Order the stacks from the last parameters to the first, whose gradients are reduced first in the backward
+            pass, in buckets of `ns_bucket_size` (4 if not set) matrices. Each bucket only depends on the gradients of
+            its own parameters, so that the orthogonalization of the last layers can run while the gradients of the
+            first ones are still being reduced. Defaults to False.
+    """
 
     def __init__(
         self,
@@ -149,6 +201,9 @@ class Muon(Optimizer):
         adamw_eps: float = 1e-8,
         clip_value: Optional[float] = 100.0,
         qk_nope_head_dim: int = 64,
+        ns_parallel_group: Optional[str] = None,
+        ns_bucket_size: Optional[int] = None,
+        overlap_ns: bool = False,
     ) -> None:
         defaults = dict(
             lr=lr,
@@ -191,6 +246,10 @@ class Muon(Optimizer):
 
         self.lr_ratio = tuple([self._cal_lr_ratio(x, use_muon) for x, use_muon in zip(self.parameters, self.use_muon)])
 
+        self.ns_bucket_size = ns_bucket_size if ns_bucket_size is not None or not overlap_ns else 4
+        self.overlap_ns = overlap_ns
+        self.shard_newton_schulz(ns_parallel_group)
+
         self.state_step = Parameter(Tensor(0, dtype=ms.int32))
         self.increase_tensor = Tensor(1, dtype=ms.int32)
         self.denom = Parameter(Tensor(1.0, dtype=ms.float32))
@@ -213,6 +272,53 @@ class Muon(Optimizer):
             self.kv_b_projs = ParameterTuple([x[1] for x in kv_b_projs])
             assert len(self.q_b_projs) > 0 and len(self.kv_b_projs) > 0
 
+    def shard_newton_schulz(self, group: Optional[str] = None) -> None:
+        """Shards the Newton-Schulz work of every step over the ranks of `group`, or disables the sharding if None."""
+        self.ns_group_size = get_group_size(group) if group is not None else 1
+        self.ns_rank = get_rank(group) if group is not None else 0
+        self.ns_allgather = ops.AllGather(group=group) if group is not None else None
+        self.ns_buckets = tuple(
+            self._build_ns_buckets(self.group_start_id[group_id], self.group_start_id[group_id + 1])
+            for group_id in range(len(self.param_groups))
+        )
+
+    def _build_ns_buckets(self, start_id: int, end_id: int) -> Tuple[Tuple, ...]:
+        # buckets of (rows, cols, indices, indices orthogonalized by this rank, matrices per rank), with the indices
+        # relative to `start_id`
+        stacks = {}
+        indices = range(start_id, end_id)
+        for i in reversed(indices) if self.overlap_ns else indices:
+            if self.use_muon[i]:
+                shape = self.parameters[i].shape
+                stacks.setdefault((shape[0], math.prod(shape[1:])), []).append(i - start_id)
+
+        buckets = []
+        for (rows, cols), stack in stacks.items():
+            bucket_size = self.ns_bucket_size or len(stack)
+            for bucket_start in range(0, len(stack), bucket_size):
+                bucket = tuple(stack[bucket_start : bucket_start + bucket_size])
+                per_rank = -(-len(bucket) // self.ns_group_size)
+                owned = bucket[self.ns_rank * per_rank : (self.ns_rank + 1) * per_rank]
+                buckets.append((rows, cols, bucket, owned, per_rank))
+        if self.overlap_ns:
+            # interleave the stacks, so that the buckets of the last layers come first
+            buckets.sort(key=lambda bucket: -bucket[2][0])
+        return tuple(buckets)
+
+    def _orthogonalize(self, updates: Tuple[Tensor, ...], ns_steps: int, buckets: Tuple[Tuple, ...]) -> List[Tensor]:
+        updates = list(updates)
+        for rows, cols, bucket, owned, per_rank in buckets:
+            matrices = [updates[i].view(1, rows, cols) for i in owned]
+            if len(owned) < per_rank:
+                # zero padding, so that every rank orthogonalizes the same number of matrices for the all-gather
+                matrices.append(mint.zeros((per_rank - len(owned), rows, cols), dtype=updates[bucket[0]].dtype))
+            orthogonalized = batched_zeropower_via_newtonschulz5(mint.cat(matrices), steps=ns_steps)
+            if self.ns_allgather is not None:
+                orthogonalized = self.ns_allgather(orthogonalized)
+            for j, i in enumerate(bucket):
+                updates[i] = orthogonalized[j].view(updates[i].shape)
+        return updates
+
     def _cal_lr_ratio(self, param: Parameter, use_muon: bool, rms_scale: float = 0.2) -> float:
         if not use_muon:
             return 1.0
@@ -239,20 +345,26 @@ class Muon(Optimizer):
         use_muon: Tuple[bool, ...],
         start_id: int,
         end_id: int,
+        ns_buckets: Tuple[Tuple, ...],
     ) -> bool:
         bias_correction1 = 1 - beta1**self.state_step
         bias_correction2 = 1 - beta2**self.state_step
         ops.assign(self.denom, bias_correction1 / bias_correction2**0.5)
 
+        updates = self.hyper_map(
+            ops.partial(_muon_momentum, momentum, nesterov),
+            self.exp_avg[start_id:end_id],
+            gradients[start_id:end_id],
+            use_muon[start_id:end_id],
+        )
+        updates = self._orthogonalize(updates, ns_steps, ns_buckets)
+
         optim_result = self.hyper_map(
             ops.partial(
                 _muon_opt,
-                momentum,
                 beta1,
                 beta2,
                 eps,
-                nesterov,
-                ns_steps,
                 weight_decay,
                 lr,
                 self.denom,
@@ -261,6 +373,7 @@ class Muon(Optimizer):
             self.exp_avg[start_id:end_id],
             self.exp_avg_sq[start_id:end_id],
             gradients[start_id:end_id],
+            tuple(updates),
             ratio[start_id:end_id],
             use_muon[start_id:end_id],
         )
@@ -300,6 +413,7 @@ class Muon(Optimizer):
                 self.use_muon,
                 start_id,
                 end_id,
+                self.ns_buckets[group_id],
             )
 
         if self.clip_value is None:
@@ -1,15 +1,38 @@
+import json
 import logging
 import os
-from typing import List
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Literal, Tuple
 
 import numpy as np
 
 import mindspore as ms
+from mindspore import mint
 
 _logger = logging.getLogger(__name__)
 
 
 class PerfRecorder(object):
+    """
+    Records the training metrics of each logged step in a file.
+
+    Args:
+        save_dir (str): directory of the log file, created if missing.
+        metric_names (List): column names, the first one is the step.
+        file_name (str): name of the log file. Default: "result.log".
+        separator (str): column separator of the "tsv" format. Default: "\t".
+        resume (bool): append to an existing log file instead of starting a new one. Default: False.
+        record_format (str): "tsv", one line of separated values per step after a header line, or "jsonl", one json
+            object keyed by the metric names per step. Default: "tsv".
+        async_write (bool): If True, records are written by a background thread, so that `add` does not wait for the
+            file system. Call `flush` to wait for the pending records and `close` at the end of training.
+            Default: False.
+
+    The log file is kept open until `close`, which is also called when the recorder is used as a context manager
+    or garbage collected.
+    """
+
     def __init__(
         self,
         save_dir,
@@ -17,23 +40,84 @@ class PerfRecorder(object):
         file_name="result.log",
         separator="\t",
         resume=False,
+        record_format: Literal["tsv", "jsonl"] = "tsv",
+        async_write: bool = False,
     ):
+        if record_format not in ("tsv", "jsonl"):
+            raise ValueError(f"record_format should be 'tsv' or 'jsonl', but got {record_format}.")
         self.save_dir = save_dir
         self.sep = separator
+        self.metric_names = list(metric_names)
+        self.record_format = record_format
         if not os.path.exists(save_dir):
             os.makedirs(save_dir, exist_ok=True)
             _logger.info(f"{save_dir} not exist. Created.")
 
         self.log_txt_fp = os.path.join(save_dir, file_name)
-        if not resume:
-            result_log = separator.join(metric_names)
-            with open(self.log_txt_fp, "w", encoding="utf-8") as fp:
-                fp.write(result_log + "\n")
+        # kept open, instead of opening the file for every record
+        self._fp = open(self.log_txt_fp, "a" if resume else "w", encoding="utf-8")
+        if not resume and record_format == "tsv":
+            self._fp.write(separator.join(metric_names) + "\n")
+            self._fp.flush()
+
+        # a single writer keeps the records in order
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="perf_writer") if async_write else None
+        self._pending = deque()
 
     def add(self, step, *measures):
         """
         measures (Tuple): measurement values corresponding to the metric names
         """
+        line = self._format_json(step, measures) if self.record_format == "jsonl" else self._format_tsv(step, measures)
+        if self._executor is None:
+            self._write(line)
+            return
+        # drop the futures already done, their errors are re-raised by `flush`
+        while self._pending and self._pending[0].done() and self._pending[0].exception() is None:
+            self._pending.popleft()
+        self._pending.append(self._executor.submit(self._write, line))
+
+    def _write(self, line):
+        self._fp.write(line + "\n")
+        self._fp.flush()
+
+    def flush(self):
+        """Block until all the records are written. Errors raised by the writer are re-raised here."""
+        while self._pending:
+            self._pending.popleft().result()
+
+    def close(self):
+        """Writes the pending records and closes the log file."""
+        if self._fp.closed:
+            return
+        self.flush()
+        if self._executor is not None:
+            self._executor.shutdown()
+        self._fp.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __del__(self):
+        if hasattr(self, "_fp"):
+            self.close()
+
+    def _format_json(self, step, measures):
+        record = {}
+        for name, m in zip(self.metric_names, (step,) + tuple(measures)):
+            if isinstance(m, ms.Tensor):
+                m = m.asnumpy()
+            if isinstance(m, np.ndarray):
+                m = m.tolist()
+            elif isinstance(m, np.generic):
+                m = m.item()
+            record[name] = m
+        return json.dumps(record)
+
+    def _format_tsv(self, step, measures):
         sep = self.sep
         line = f"{step}{sep}"
         for i, m in enumerate(measures):
@@ -51,11 +135,56 @@ class PerfRecorder(object):
 
             if i < len(measures) - 1:
                 line += f"{sep}"
+        return line
+
+
+class MetricsRingBuffer:
+    """
+    Device ring buffer of scalar training metrics, fetched to host in one transfer.
+
+    `append` writes the metrics of a step into the next row of a preallocated device tensor, without waiting for the
+    device. `fetch` copies the rows appended since the previous fetch to host with a single synchronization, then the
+    rows are reused from the start.
+
+    Args:
+        metric_names (List[str]): names of the metrics of each row.
+        capacity (int): number of rows, the steps appended between two fetches. Default: 100.
+    """
+
+    def __init__(self, metric_names: List[str], capacity: int = 100):
+        if capacity < 1:
+            raise ValueError(f"capacity should be at least 1, but got {capacity}.")
+        self.metric_names = list(metric_names)
+        self.capacity = capacity
+        self._buffer = mint.zeros((capacity, len(self.metric_names)), dtype=ms.float32)
+        self._steps = []
+
+    def __len__(self):
+        return len(self._steps)
+
+    def is_full(self) -> bool:
+        return len(self._steps) >= self.capacity
+
+    def append(self, step: int, *values) -> None:
+        """Records the metric values of `step`, tensors or python numbers in the order of `metric_names`."""
+        if self.is_full():
+            raise RuntimeError(f"MetricsRingBuffer is full after {self.capacity} steps, fetch it first.")
+        row = [
+            v.reshape(()).to(ms.float32) if isinstance(v, ms.Tensor) else ms.tensor(v, dtype=ms.float32) for v in values
+        ]
+        self._buffer[len(self._steps)] = mint.stack(row)
+        self._steps.append(step)
 
-        with open(self.log_txt_fp, "a", encoding="utf-8") as fp:
-            fp.write(line + "\n")
+    def fetch(self) -> List[Tuple]:
+        """Returns the `(step, *values)` records appended since the previous fetch, as python numbers."""
+        if not self._steps:
+            return []
+        values = self._buffer[: len(self._steps)].asnumpy()  # the only synchronization with the device
+        records = [(step, *row.tolist()) for step, row in zip(self._steps, values)]
+        self._steps = []
+        return records
 
 
 if __name__ == "__main__":
-    r = PerfRecorder("./")
-    r.add(1, 0.2, 0.4, 0.5, 199)
+    with PerfRecorder("./") as r:
+        r.add(1, 0.2, 0.4, 0.5, 199)
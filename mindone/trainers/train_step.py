@@ -42,6 +42,14 @@ class TrainOneStepWrapper(nn.TrainOneStepWithLossScaleCell):
             to update loss scale. If this value is a Tensor, the loss scale can be modified by `set_sense_scale`,
             the shape should be :math:`()` or :math:`(1,)`.
         zero_helper (class): Zero redundancy optimizer(ZeRO) build helper, default is None.
+        grad_bucket_size (int): if set, the gradients are flattened in buckets of at most `grad_bucket_size` elements,
+            grouped by dtype, in the reverse order of the parameters. The gradients are accumulated, reduced, checked
+            and clipped by bucket, with one collective per bucket. Without gradient accumulation, the all-reduce of a
+            bucket only depends on its gradients and overlaps with the backward of the next buckets. Not supported
+            with ZeRO, default is None.
+        grad_accum_dtype (ms.Type): dtype of the gradient accumulation buckets, e.g. `ms.float32` to accumulate bf16
+            gradients in float32 master buckets. The gradients are still reduced in their own dtype. Defaults to the
+            dtype of the parameters.
 
     Returns:
         Tuple of 3 Tensor, the loss, overflow flag and current loss scale value.
@@ -64,6 +72,8 @@ class TrainOneStepWrapper(nn.TrainOneStepWithLossScaleCell):
         clip_norm=1.0,
         verbose=False,
         zero_helper=None,
+        grad_bucket_size: Optional[int] = None,
+        grad_accum_dtype: Optional[ms.Type] = None,
     ):
         super().__init__(network, optimizer, scale_sense)
         self.ema = ema
@@ -77,7 +87,8 @@ class TrainOneStepWrapper(nn.TrainOneStepWithLossScaleCell):
         assert gradient_accumulation_steps >= 1
         self.accum_steps = gradient_accumulation_steps
         if gradient_accumulation_steps > 1:
-            self.accumulated_grads = optimizer.parameters.clone(prefix="grad_accumulated_", init="zeros")
+            if grad_bucket_size is None:
+                self.accumulated_grads = optimizer.parameters.clone(prefix="grad_accumulated_", init="zeros")
 
             self.cur_accum_step = ms.Parameter(ms.Tensor(0, dtype=ms.int32), name="accum_step")
             self.zero = Tensor(0, ms.int32)
@@ -99,6 +110,93 @@ class TrainOneStepWrapper(nn.TrainOneStepWithLossScaleCell):
             if gradient_accumulation_steps > 1:
                 self.accumulated_grads = optimizer.parameters.clone(prefix="grad_accumulated_", init="zeros")
 
+        # gradient buckets
+        self.grad_bucket_indices = ()
+        if grad_bucket_size is not None:
+            if self.zero_stage != 0:
+                raise ValueError(
+                    f"`grad_bucket_size` is not supported with ZeRO, but got zero_stage {self.zero_stage}."
+                )
+            self._init_grad_buckets(grad_bucket_size, grad_accum_dtype)
+
+    def _init_grad_buckets(self, bucket_size, accum_dtype):
+        groups, numels, dtypes = [], [], []
+        open_buckets = {}  # dtype -> index of the bucket being filled
+        # the backward computes the gradients of the last parameters first
+        for i in reversed(range(len(self.weights))):
+            dtype = self.weights[i].dtype
+            b = open_buckets.get(dtype)
+            if b is None or numels[b] + self.weights[i].size > bucket_size:
+                b = open_buckets[dtype] = len(groups)
+                groups.append([])
+                numels.append(0)
+                dtypes.append(dtype)
+            groups[b].append(i)
+            numels[b] += self.weights[i].size
+        self.grad_bucket_indices = tuple(tuple(indices) for indices in groups)
+        self.grad_bucket_dtypes = tuple(dtypes)
+        # (bucket, start, end, shape) of the gradient of each parameter
+        slices = [None] * len(self.weights)
+        for b, indices in enumerate(self.grad_bucket_indices):
+            start = 0
+            for i in indices:
+                slices[i] = (b, start, start + self.weights[i].size, self.weights[i].shape)
+                start += self.weights[i].size
+        self.grad_bucket_slices = tuple(slices)
+
+        if self.accum_steps > 1:
+            self.accumulated_grads = ms.ParameterTuple(
+                [
+                    ms.Parameter(
+                        mint.zeros((numel,), dtype=accum_dtype if accum_dtype is not None else dtype),
+                        name=f"grad_accumulated_bucket_{b}",
+                    )
+                    for b, (numel, dtype) in enumerate(zip(numels, dtypes))
+                ]
+            )
+        if self.reducer_flag:
+            self.bucket_allreduce = ops.AllReduce()
+
+    def _flatten_grads(self, grads):
+        buckets = ()
+        for indices in self.grad_bucket_indices:
+            buckets += (mint.cat([grads[i].reshape(-1) for i in indices]),)
+        return buckets
+
+    def _accumulate_grads(self, grads):
+        if self.grad_bucket_indices:
+            # the accumulation buckets may be in a higher precision than the gradients
+            buckets = ()
+            for grad, accumulated in zip(grads, self.accumulated_grads):
+                buckets += (F.cast(grad, accumulated.dtype),)
+            grads = buckets
+        return self.hyper_map(F.partial(_grad_accum_op, self.accum_steps), self.accumulated_grads, grads)
+
+    def _unflatten_grads(self, buckets):
+        grads = ()
+        for b, start, end, shape in self.grad_bucket_slices:
+            grads += (buckets[b][start:end].reshape(shape),)
+        return grads
+
+    def _reduce_grads(self, grads):
+        if not self.grad_bucket_indices:
+            return self.grad_reducer(grads)
+        buckets = ()
+        for bucket, dtype in zip(grads, self.grad_bucket_dtypes):
+            # the accumulated gradients are reduced in the dtype of the gradients
+            bucket = F.cast(bucket, dtype)
+            if self.reducer_flag:
+                bucket = self.bucket_allreduce(bucket)
+                if self.mean:
+                    bucket = bucket / self.degree
+            buckets += (bucket,)
+        return buckets
+
+    def _optimize(self, grads):
+        if self.grad_bucket_indices:
+            grads = self._unflatten_grads(grads)
+        return self.run_optimizer(grads)
+
     def set_train(self, mode: bool = True):
         # Delegate the setting of training mode behavior to the network.
         self.network.set_train(mode)
@@ -123,12 +221,15 @@ class TrainOneStepWrapper(nn.TrainOneStepWithLossScaleCell):
         # 1. compute gradients (of the up-scaled loss w.r.t. the model weights)
         grads = self.grad(self.network, weights)(*inputs, scaling_sens_filled)
 
+        if self.grad_bucket_indices:
+            grads = self._flatten_grads(grads)
+
         # Gradient communication
         if self.zero_helper is not None:
             grads = self.zero_helper.cal_gradients(grads)
 
         if self.accum_steps == 1:
-            grads = self.grad_reducer(grads)
+            grads = self._reduce_grads(grads)
             scaling_sens = ops.depend(scaling_sens, grads)
 
         # 2. down-scale gradients by loss_scale. grads = grads / scaling_sense  / grad_accum_steps
@@ -148,22 +249,20 @@ class TrainOneStepWrapper(nn.TrainOneStepWithLossScaleCell):
             # 4. gradient accumulation if enabled
             if self.accum_steps > 1:
                 # self.accumulated_grads += grads / accum_steps
-                loss = F.depend(
-                    loss, self.hyper_map(F.partial(_grad_accum_op, self.accum_steps), self.accumulated_grads, grads)
-                )
+                loss = F.depend(loss, self._accumulate_grads(grads))
 
                 # self.cur_accum_step += 1
                 loss = F.depend(loss, ops.assign_add(self.cur_accum_step, Tensor(1, ms.int32)))
 
                 if self.cur_accum_step >= self.accum_steps:
                     # 5. gradient reduction on distributed GPUs/NPUs
-                    grads = self.grad_reducer(self.accumulated_grads)
+                    grads = self._reduce_grads(self.accumulated_grads)
 
                     # 6. clip grad
                     if self.clip_grad:
                         grads = ops.clip_by_global_norm(grads, self.clip_norm)
                     # 7. optimize
-                    loss = F.depend(loss, self.run_optimizer(grads))
+                    loss = F.depend(loss, self._optimize(grads))
 
                     # clear gradient accumulation states
                     loss = F.depend(loss, self.hyper_map(F.partial(_grad_clear_op), self.accumulated_grads))
@@ -180,7 +279,7 @@ class TrainOneStepWrapper(nn.TrainOneStepWithLossScaleCell):
                 if self.clip_grad:
                     grads = ops.clip_by_global_norm(grads, self.clip_norm)
                 # 7. optimize
-                loss = F.depend(loss, self.run_optimizer(grads))
+                loss = F.depend(loss, self._optimize(grads))
 
             # 8.ema
             if self.ema is not None:
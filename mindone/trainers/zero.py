@@ -13,6 +13,7 @@ from mindspore.parallel._utils import _get_parallel_mode
 from mindone.models.modules.parallel import PARALLEL_MODULES, SPECIAL_CASE_FOR_PARALLEL_MODULES
 from mindone.utils.version_control import MS_VERSION
 
+from .ema import FusedEMA
 from .train_step import TrainOneStepWrapper
 
 _logger = logging.getLogger(__name__)
@@ -83,6 +84,9 @@ class ZeroHelper:
         manually updating optimizer parameters.
     - zero_stage is 3: Split optimizer parameters, normal optimizer update.
 
+    With zero_stage 1 or 2, the parameters of `Muon` are not split, since it orthogonalizes the full matrices: their
+    momentum is replicated on every rank of the optimizer parallel group and only the Newton-Schulz work is sharded.
+
     Args:
         optimizer (`nn.Optimizer`): Must be the subclass of MindSpore Optimizer.
         zero_stage (`int`, *optional*): Stage setting of ZeRO, default is 0.
@@ -287,9 +291,13 @@ class ZeroHelper:
                     param_tuples.append(getattr(self.optimizer, attr))
         return param_tuples
 
-    def dump_params_split_info(self, params_split_info):
-        params_split_info_path = os.path.join(params_split_info, f"params_split_info_{self.op_rank_id}.json")
+    def get_params_split_info(self):
+        """
+        Split info of the optimizer parameters and of the optimizer states sharing their layout, e.g. `adam_m.xxx`,
+        keyed by parameter name.
+        """
         params_split_info_dict = {}
+        param_tuples = self.get_optimizer_param_tuples()
         for i, param in enumerate(self.optimizer._parameters):
             param_split_info = {
                 "split": self.need_parameter_split[i],
@@ -297,16 +305,32 @@ class ZeroHelper:
                 "rank_id": self.op_rank_id,
             }
             params_split_info_dict[param.name] = param_split_info
-        params_split_info_json = json.dumps(params_split_info_dict, indent=2)
+            for param_tuple in param_tuples:
+                if i < len(param_tuple):
+                    params_split_info_dict[param_tuple[i].name] = param_split_info
+        return params_split_info_dict
+
+    def dump_params_split_info(self, params_split_info):
+        params_split_info_path = os.path.join(params_split_info, f"params_split_info_{self.op_rank_id}.json")
+        params_split_info_json = json.dumps(self.get_params_split_info(), indent=2)
         with open(params_split_info_path, "w") as f:
             f.write(params_split_info_json)
 
     def get_need_parameter_split(self):
         self.need_parameter_split = [False] * len(self.optimizer._parameters)
+        # Muon orthogonalizes full matrices, its parameters are not split but its Newton-Schulz work is sharded
+        whole_params = getattr(self.optimizer, "use_muon", (False,) * len(self.optimizer._parameters))
+        if self.zero_stage in [1, 2] and any(whole_params):
+            self.optimizer.shard_newton_schulz(self.optimizer_parallel_group)
+            num_whole = sum(p.size for p, whole in zip(self.optimizer._parameters, whole_params) if whole)
+            _logger.warning(
+                f"ZeRO stage {self.zero_stage} does not split the {sum(whole_params)} Muon parameters "
+                f"({num_whole} elements), their momentum is replicated on every rank of the optimizer parallel group."
+            )
         for i, param in enumerate(self.optimizer._parameters):
             if self.zero_stage == 3:
                 self.need_parameter_split[i] = param.parallel_optimizer
-            else:
+            elif not whole_params[i]:
                 B = param.shape[0]
                 if param.parallel_optimizer and B >= self.op_group_size and B % self.op_group_size == 0:
                     if self.zero_stage in [1, 2]:
@@ -334,7 +358,8 @@ class ZeroHelper:
             if self.zero_stage in [1, 2]:
                 B = param.shape[0]
                 if (
-                    self.ori_parameters[i].parallel_optimizer
+                    self.need_parameter_split[i]
+                    and self.ori_parameters[i].parallel_optimizer
                     and B >= self.op_group_size
                     and B % self.op_group_size == 0
                 ):
@@ -555,7 +580,12 @@ def prepare_network(
 
 def prepare_ema(ema, zero_stage: int = 0, optimizer_parallel_group: str = None):
     is_parallel = _get_parallel_mode() == ParallelMode.DATA_PARALLEL
-    if not is_parallel or zero_stage != 3:
+    if not is_parallel or zero_stage == 0:
+        return ema
+    if isinstance(ema, FusedEMA):
+        _logger.info(f"Shard EMA buckets, zero_stage {zero_stage}.")
+        return ema.shard(optimizer_parallel_group, zero_stage)
+    if zero_stage != 3:
         return ema
     op_group_size = get_group_size(optimizer_parallel_group)
     op_rank_id = get_rank(optimizer_parallel_group)
@@ -585,6 +615,8 @@ def prepare_train_network(
     dp_group: str = None,
     comm_fusion: dict = None,
     parallel_modules=None,
+    grad_bucket_size: int = None,
+    grad_accum_dtype: ms.Type = None,
 ) -> TrainOneStepWrapper:
     """
     Prepare network and optimizer for distributed training.
@@ -608,6 +640,10 @@ def prepare_train_network(
                        "allgather": {"openstate": False, "bucket_size": 5e8},}
         parallel_modules (`dict`, *optional*): A dict of Cells could split parameters in zero3, default is None.
             If None, use `PARALLEL_MODULES` from `mindone.models.modules.parallel`.
+        grad_bucket_size (`int`, *optional*): Number of elements of the flat gradient buckets, only with zero_stage 0,
+            see `TrainOneStepWrapper`, default is None.
+        grad_accum_dtype (`ms.Type`, *optional*): dtype of the gradient accumulation buckets only, the gradients are
+            still reduced in their own dtype, see `TrainOneStepWrapper`. Default is None, the dtype of the parameters.
     """
     if zero_stage not in [0, 1, 2, 3]:
         raise ValueError("Not support zero_stage {zero_stage}")
@@ -645,6 +681,8 @@ def prepare_train_network(
         clip_norm=clip_norm,
         verbose=verbose,
         zero_helper=zero_helper,
+        grad_bucket_size=grad_bucket_size,
+        grad_accum_dtype=grad_accum_dtype,
     )
     return train_network
 
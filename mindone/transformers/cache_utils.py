@@ -21,6 +21,8 @@ class CacheLayerMixin(ABC):
     """Base, abstract class for a single layer's cache."""
 
     is_compileable = False
+    # whether the keys and values are on host, see `offload`
+    is_offloaded = False
 
     def __init__(self):
         self.keys: Optional[ms.Tensor] = None
@@ -57,11 +59,18 @@ class CacheLayerMixin(ABC):
 
     def offload(self):
         """Offload this layer's data to CPU device."""
-        raise NotImplementedError("mindspore do not support offload/prefetch yet")
+        if self.is_initialized and not self.is_offloaded:
+            self.keys = self.keys.move_to("CPU", blocking=False)
+            self.values = self.values.move_to("CPU", blocking=False)
+            self.is_offloaded = True
 
     def prefetch(self):
         """In case of layer offloading, this allows to move the data back to the layer's device ahead of time."""
-        raise NotImplementedError("mindspore do not support offload/prefetch yet")
+        if self.is_initialized and self.is_offloaded:
+            device = ms.get_context("device_target")
+            self.keys = self.keys.move_to(device, blocking=False)
+            self.values = self.values.move_to(device, blocking=False)
+            self.is_offloaded = False
 
     def reset(self) -> None:
         """Resets the cache values while preserving the objects"""
@@ -473,6 +482,48 @@ class StaticSlidingWindowLayer(StaticLayer):
         return self.cumulative_length
 
 
+def _quantize_kv(states: ms.Tensor, nbits: int, axis: int, q_group_size: int) -> tuple[ms.Tensor, ms.Tensor]:
+    """
+    Symmetric quantization of key or value states of shape `[batch_size, num_heads, seq_len, head_dim]`.
+
+    With `axis=0`, each token has one scale per group of `q_group_size` channels, with `axis=-1` each channel has one
+    scale over the tokens of `states`. 4-bit values are packed by pairs of channels into uint8.
+
+    Returns:
+        tuple[`ms.Tensor`, `ms.Tensor`]: The quantized states and their scales, in the dtype of `states`.
+    """
+    shape = states.shape
+    qmax = 2 ** (nbits - 1) - 1
+    x = states.float()
+    if axis == 0:
+        group_size = q_group_size if shape[-1] % q_group_size == 0 else shape[-1]
+        x = x.reshape(*shape[:-1], shape[-1] // group_size, group_size)
+        scales = mint.amax(x.abs(), dim=-1, keepdim=True)
+    else:
+        scales = mint.amax(x.abs(), dim=-2, keepdim=True)
+    # written slots always have a positive scale, see `StaticQuantizedLayer.get_seq_length`
+    scales = scales.clamp(min=1e-6) / qmax
+    quantized = mint.clamp(mint.round(x / scales), -qmax, qmax).reshape(shape)
+    if nbits == 8:
+        quantized = quantized.to(ms.int8)
+    else:
+        quantized = (quantized + 8).reshape(*shape[:-1], shape[-1] // 2, 2)
+        quantized = (quantized[..., 0] + quantized[..., 1] * 16).to(ms.uint8)
+    return quantized, scales.to(states.dtype)
+
+
+def _dequantize_kv(quantized: ms.Tensor, scales: ms.Tensor, nbits: int, axis: int) -> ms.Tensor:
+    """Inverse of `_quantize_kv`, returns the states in the dtype of `scales`."""
+    if nbits == 4:
+        packed = quantized.to(ms.int32)
+        quantized = mint.stack([packed % 16, packed // 16], dim=-1).reshape(*packed.shape[:-1], -1) - 8
+    shape = quantized.shape
+    x = quantized.to(scales.dtype)
+    if axis == 0:
+        x = x.reshape(*shape[:-1], scales.shape[-2], -1)
+    return (x * scales).reshape(shape)
+
+
 class QuantizedLayer(DynamicLayer):
     """
     A quantized layer similar to what is described in the
@@ -484,6 +535,9 @@ class QuantizedLayer(DynamicLayer):
     is set as a maximum capacity for the original precision cache. When the length goes beyond maximum capacity, the original
     precision cache is discarded and moved into the quantized cache. The quantization is done per-channel with a set `q_group_size`
     for both Keys and Values, in contrast to what was described in the paper.
+
+    The residual states are quantized as a new chunk when they reach `residual_length`, the chunks quantized before are
+    not quantized again. Subclasses implement `_quantize` and `_dequantize`.
     """
 
     def __init__(
@@ -494,7 +548,98 @@ class QuantizedLayer(DynamicLayer):
         q_group_size: int = 64,
         residual_length: int = 128,
     ):
-        raise NotImplementedError(f"Not support {self.__class__.__name__} in mindspore yet.")
+        super().__init__()
+        self.nbits = nbits
+        self.axis_key = axis_key
+        self.axis_value = axis_value
+        self.q_group_size = q_group_size
+        self.residual_length = residual_length
+        self.cumulative_length = 0
+        self._quantized_keys = []
+        self._quantized_values = []
+
+    def update(
+        self,
+        key_states: ms.Tensor,
+        value_states: ms.Tensor,
+        cache_kwargs: Optional[dict[str, Any]] = None,
+    ) -> tuple[ms.Tensor, ms.Tensor]:
+        """
+        Update the key and value caches in-place, and return the necessary keys and value states.
+
+        Args:
+            key_states (`ms.Tensor`): The new key states to cache.
+            value_states (`ms.Tensor`): The new value states to cache.
+            cache_kwargs (`dict[str, Any]`, *optional*): Additional arguments for the cache.
+
+        Returns:
+            tuple[`ms.Tensor`, `ms.Tensor`]: The key and value states.
+        """
+        self.cumulative_length += key_states.shape[-2]
+        if not self.is_initialized or self.keys is None:
+            self.keys, self.values = key_states, value_states
+            self.is_initialized = True
+        else:
+            self.keys = mint.cat([self.keys, key_states], dim=-2)
+            self.values = mint.cat([self.values, value_states], dim=-2)
+
+        keys_to_return = mint.cat([self._dequantize(q) for q in self._quantized_keys] + [self.keys], dim=-2)
+        values_to_return = mint.cat([self._dequantize(q) for q in self._quantized_values] + [self.values], dim=-2)
+
+        if self.keys.shape[-2] >= self.residual_length:
+            self._quantized_keys.append(self._quantize(self.keys, axis=self.axis_key))
+            self._quantized_values.append(self._quantize(self.values, axis=self.axis_value))
+            # FIXME "mindspore.mint.cat" does not support empty tensors, an empty residual is `None`
+            self.keys, self.values = None, None
+        return keys_to_return, values_to_return
+
+    def get_seq_length(self) -> int:
+        """Returns the sequence length of the cached states."""
+        return self.cumulative_length
+
+    def reset(self) -> None:
+        """Resets the cache values while preserving the objects"""
+        self.keys, self.values = None, None
+        self._quantized_keys, self._quantized_values = [], []
+        self.cumulative_length = 0
+        self.is_initialized = False
+
+    def _quantize(self, tensor, axis):
+        raise NotImplementedError("Make sure to implement `_quantize` in a subclass.")
+
+    def _dequantize(self, q_tensor):
+        raise NotImplementedError("Make sure to implement `_dequantize` in a subclass.")
+
+
+class NativeQuantizedLayer(QuantizedLayer):
+    """
+    A `QuantizedLayer` quantizing with MindSpore operations, to int8 or to int4 packed by pairs into uint8.
+
+    The axes follow the quanto convention: with `axis=0` every token has one scale per group of `q_group_size`
+    channels, with `axis=-1` every channel has one scale per quantized chunk of `residual_length` tokens, as done for
+    the keys in KIVI.
+    """
+
+    def __init__(
+        self,
+        nbits: int = 4,
+        axis_key: int = 0,
+        axis_value: int = 0,
+        q_group_size: int = 64,
+        residual_length: int = 128,
+    ):
+        if nbits not in (4, 8):
+            raise ValueError(f"`nbits` for the native backend should be 4 or 8, but got {nbits}.")
+        if axis_key not in (0, -1) or axis_value not in (0, -1):
+            raise ValueError(f"`axis_key` and `axis_value` should be 0 or -1, but got {axis_key} and {axis_value}.")
+        super().__init__(nbits, axis_key, axis_value, q_group_size, residual_length)
+
+    def _quantize(self, tensor, axis):
+        return _quantize_kv(tensor, self.nbits, axis, self.q_group_size) + (axis,)
+
+    def _dequantize(self, q_tensor):
+        quantized, scales, axis = q_tensor
+        return _dequantize_kv(quantized, scales, self.nbits, axis)
 
 
 class QuantoQuantizedLayer(QuantizedLayer):
@@ -506,7 +651,89 @@ class QuantoQuantizedLayer(QuantizedLayer):
         q_group_size: int = 64,
         residual_length: int = 128,
     ):
-        raise NotImplementedError(f"Not support {self.__class__.__name__} in mindspore yet.")
+        raise NotImplementedError(
+            f"Not support {self.__class__.__name__} in mindspore yet, use `NativeQuantizedLayer`."
+        )
+
+
+class StaticQuantizedLayer(StaticLayer):
+    """
+    A static cache layer storing quantized keys and values in preallocated tensors of `max_cache_len` tokens, for
+    `mindspore.jit`. Every token is quantized on its own, with one scale per group of `q_group_size` channels, so new
+    tokens are written in place like in `StaticLayer` and no full-precision residual is kept.
+
+    Args:
+        max_cache_len (`int`):
+            Maximum number of tokens that can be stored, used for tensor preallocation.
+        nbits (`int`, *optional*, defaults to 8):
+            The number of bits for quantization, 4 or 8.
+        q_group_size (`int`, *optional*, defaults to 64):
+            The number of channels sharing a scale.
+    """
+
+    def __init__(self, max_cache_len: int, nbits: int = 8, q_group_size: int = 64):
+        if nbits not in (4, 8):
+            raise ValueError(f"`nbits` should be 4 or 8, but got {nbits}.")
+        super().__init__(max_cache_len)
+        self.nbits = nbits
+        self.q_group_size = q_group_size
+
+    def lazy_initialization(self, key_states: ms.Tensor):
+        self.max_batch_size, self.num_heads, _, self.head_dim = key_states.shape
+        self.dtype = key_states.dtype
+        group_size = self.q_group_size if self.head_dim % self.q_group_size == 0 else self.head_dim
+        q_dim, q_dtype = (self.head_dim, ms.int8) if self.nbits == 8 else (self.head_dim // 2, ms.uint8)
+
+        shape = (self.max_batch_size, self.num_heads, self.max_cache_len)
+        self._quantized_keys = mint.zeros(shape + (q_dim,), dtype=q_dtype)
+        self._quantized_values = mint.zeros(shape + (q_dim,), dtype=q_dtype)
+        self._key_scales = mint.zeros(shape + (self.head_dim // group_size, 1), dtype=self.dtype)
+        self._value_scales = mint.zeros(shape + (self.head_dim // group_size, 1), dtype=self.dtype)
+        self.is_initialized = True
+
+    def update(
+        self,
+        key_states: ms.Tensor,
+        value_states: ms.Tensor,
+        cache_kwargs: Optional[dict[str, Any]] = None,
+    ) -> tuple[ms.Tensor, ms.Tensor]:
+        """
+        Quantize the new states into the static cache tensors in place.
+
+        Args:
+            key_states (`ms.Tensor`): The new key states to cache.
+            value_states (`ms.Tensor`): The new value states to cache.
+            cache_kwargs (`dict[str, Any]`, *optional*): Additional arguments for the cache.
+
+        Returns:
+            tuple[`ms.Tensor`, `ms.Tensor`]: The dequantized key and value states of the whole cache.
+        """
+        if not self.is_initialized:
+            self.lazy_initialization(key_states)
+
+        cache_position = cache_kwargs.get("cache_position") if cache_kwargs is not None else None
+        cache_position = cache_position if cache_position is not None else mint.arange(key_states.shape[-2])
+
+        quantized_keys, key_scales = _quantize_kv(key_states, self.nbits, 0, self.q_group_size)
+        quantized_values, value_scales = _quantize_kv(value_states, self.nbits, 0, self.q_group_size)
+        self._quantized_keys[:, :, cache_position] = quantized_keys
+        self._quantized_values[:, :, cache_position] = quantized_values
+        self._key_scales[:, :, cache_position] = key_scales
+        self._value_scales[:, :, cache_position] = value_scales
+
+        keys = _dequantize_kv(self._quantized_keys, self._key_scales, self.nbits, 0)
+        values = _dequantize_kv(self._quantized_values, self._value_scales, self.nbits, 0)
+        return keys, values
+
+    def get_seq_length(self) -> int:
+        """Returns the sequence length of the cached states."""
+        return (self._key_scales[0, 0, :, 0, 0] > 0).sum() if self.is_initialized else 0
+
+    def reset(self) -> None:
+        """Resets the cache values while preserving the objects"""
+        if self.is_initialized:
+            for tensor in (self._quantized_keys, self._quantized_values, self._key_scales, self._value_scales):
+                tensor.zero_()
 
 
 class Cache:
@@ -523,20 +750,20 @@ class Cache:
             and the layers will be added lazily as soon as `update` is called with a `layer_idx` greater than the current
             list of layers.
         offloading (`bool`, *optional*, defaults to `False`):
-            Whether to perform offloading of the layers to `cpu`, to save GPU memory.
-            Not support yet.
+            Whether to perform offloading of the layers to `cpu`, to save device memory. Only two layers are then
+            resident at a time: the layer being computed and the next one, which is prefetched on a side stream so that
+            its copy overlaps with the computation of the current layer. See `offload_stats` for the overlap achieved.
         offload_only_non_sliding (`bool`, *optional*, defaults to `True`):
             If `offloading` is `True`, this further decides if only the non-sliding layers will be offloaded (because
             usually the sliding layers are small in size, so there is no need to offload them, and skipping it is faster).
-            Not support yet.
     """
 
     def __init__(
         self,
         layers: Optional[list[CacheLayerMixin]] = None,
         layer_class_to_replicate: Optional[type[CacheLayerMixin]] = None,
-        offloading: bool = False,  # not support yet
-        offload_only_non_sliding: bool = True,  # not support yet
+        offloading: bool = False,
+        offload_only_non_sliding: bool = True,
     ):
         if layers is not None and layer_class_to_replicate is not None:
             raise ValueError(
@@ -552,9 +779,14 @@ class Cache:
         self.layer_class_to_replicate = layer_class_to_replicate
         self.offloading = offloading
         if self.offloading:
-            raise NotImplementedError(
-                "mindspore do not support offload/prefetch yet, please set to `offloading` to `False`"
-            )
+            self.only_non_sliding = offload_only_non_sliding
+            self.prefetch_stream = ms.runtime.Stream()
+            # pending copies by layer: prefetches to wait for before computing, offloads to wait for before prefetching
+            self._prefetch_events: dict[int, Any] = {}
+            self._offload_events: dict[int, Any] = {}
+            self._num_prefetches = 0
+            self._num_overlapped_prefetches = 0
+            self._prefetched_bytes = 0
 
     def __repr__(self):
         return f"{self.__class__.__name__}(layers={self.layers})"
@@ -565,7 +797,31 @@ class Cache:
         which are non-sliding. If the `layer_idx` is outside the range, this will circle back to the first layers.
         Note that we use a non-default stream for this, to avoid blocking.
         """
-        raise NotImplementedError("mindspore do not support offload/prefetch yet")
+        if len(self.layers) == 0:
+            return
+        if only_non_sliding:
+            try:
+                layer_idx = layer_idx + self.is_sliding[layer_idx:].index(False)
+            except ValueError:
+                if False not in self.is_sliding:
+                    return
+                layer_idx = self.is_sliding.index(False)
+        elif layer_idx >= len(self.layers):
+            layer_idx = 0
+
+        layer = self.layers[layer_idx]
+        if not layer.is_offloaded or layer_idx in self._prefetch_events:
+            return
+        with ms.runtime.StreamCtx(self.prefetch_stream):
+            # the host copy must be complete before it is copied back
+            offload_event = self._offload_events.pop(layer_idx, None)
+            if offload_event is not None:
+                offload_event.wait(self.prefetch_stream)
+            layer.prefetch()
+            event = ms.runtime.Event()
+            event.record(self.prefetch_stream)
+        self._prefetch_events[layer_idx] = event
+        self._prefetched_bytes += layer.keys.nbytes + layer.values.nbytes
 
     def offload(self, layer_idx: int, only_non_sliding: bool = True):
         """
@@ -573,7 +829,38 @@ class Cache:
         non-sliding layer. Note that we do it on the default stream, so that we ensure all earlier
         computation in the layer's `update` methods are finished.
         """
-        raise NotImplementedError("mindspore do not support offload/prefetch yet")
+        if only_non_sliding and self.is_sliding[layer_idx]:
+            return
+        self.layers[layer_idx].offload()
+        event = ms.runtime.Event()
+        event.record(ms.runtime.current_stream())
+        self._offload_events[layer_idx] = event
+
+    def _wait_for_prefetch(self, layer_idx: int):
+        """Makes the current stream wait for the prefetch of `layer_idx`, counting whether it was already complete."""
+        event = self._prefetch_events.pop(layer_idx, None)
+        if event is None:
+            return
+        self._num_prefetches += 1
+        # `query` does not block: a complete copy was fully hidden behind the computation of the previous layer
+        if event.query():
+            self._num_overlapped_prefetches += 1
+        event.wait(ms.runtime.current_stream())
+
+    @property
+    def offload_stats(self) -> dict[str, Any]:
+        """
+        Statistics of the layer prefetches of an offloaded cache. `overlap_efficiency` is the fraction of the
+        prefetches that were complete when their layer was needed, i.e. whose copy was entirely overlapped.
+        """
+        if not self.offloading:
+            return {}
+        return {
+            "num_prefetches": self._num_prefetches,
+            "num_overlapped_prefetches": self._num_overlapped_prefetches,
+            "overlap_efficiency": self._num_overlapped_prefetches / max(self._num_prefetches, 1),
+            "prefetched_bytes": self._prefetched_bytes,
+        }
 
     def update(
         self,
@@ -604,8 +891,19 @@ class Cache:
             while len(self.layers) <= layer_idx:
                 self.layers.append(self.layer_class_to_replicate())
 
+        if self.offloading:
+            # Wait for the prefetch of this layer if needed, and start prefetching the next layer
+            self._wait_for_prefetch(layer_idx)
+            if self.layers[layer_idx].is_offloaded:  # e.g. first call after a `reset`
+                self.layers[layer_idx].prefetch()
+            self.prefetch(layer_idx + 1, self.only_non_sliding)
+
         keys, values = self.layers[layer_idx].update(key_states, value_states, cache_kwargs)
 
+        if self.offloading:
+            # the returned device states stay valid for the attention of this layer
+            self.offload(layer_idx, self.only_non_sliding)
+
         return keys, values
 
     def early_initialization(self, batch_size: int, num_heads: int, head_dim: int, dtype: ms.Type):
@@ -648,30 +946,46 @@ class Cache:
             return -1
         return self.layers[layer_idx].get_max_cache_shape()
 
+    def _apply_to_layers(self, method: str, *args):
+        """
+        Calls `method` of every layer. The offloaded layers are moved back to device for the call, since the index
+        tensors live there, and offloaded again afterwards.
+        """
+        for layer_idx, layer in enumerate(self.layers):
+            if not self.offloading:
+                getattr(layer, method)(*args)
+                continue
+            # copies in flight must be complete before the layer is read or replaced
+            for events in (self._prefetch_events, self._offload_events):
+                event = events.pop(layer_idx, None)
+                if event is not None:
+                    event.wait(ms.runtime.current_stream())
+            is_offloaded = layer.is_offloaded
+            if is_offloaded:
+                layer.prefetch()
+            getattr(layer, method)(*args)
+            if is_offloaded:
+                self.offload(layer_idx, only_non_sliding=False)
+
     def reset(self):
         """Recursively reset all layers tensors"""
-        for layer_idx in range(len(self.layers)):
-            self.layers[layer_idx].reset()
+        self._apply_to_layers("reset")
 
     def reorder_cache(self, beam_idx: ms.Tensor):
         """Reorder the cache for beam search"""
-        for layer_idx in range(len(self.layers)):
-            self.layers[layer_idx].reorder_cache(beam_idx)
+        self._apply_to_layers("reorder_cache", beam_idx)
 
     def crop(self, max_length: int):
         """Crop the cache to the given length"""
-        for layer_idx in range(len(self.layers)):
-            self.layers[layer_idx].crop(max_length)
+        self._apply_to_layers("crop", max_length)
 
     def batch_repeat_interleave(self, repeats: int):
         """Repeat and interleave the cache"""
-        for layer_idx in range(len(self.layers)):
-            self.layers[layer_idx].batch_repeat_interleave(repeats)
+        self._apply_to_layers("batch_repeat_interleave", repeats)
 
     def batch_select_indices(self, indices: ms.Tensor):
         """Select indices from the cache"""
-        for layer_idx in range(len(self.layers)):
-            self.layers[layer_idx].batch_select_indices(indices)
+        self._apply_to_layers("batch_select_indices", indices)
 
     @property
     def max_batch_size(self) -> int:
@@ -756,11 +1070,9 @@ class DynamicCache(Cache):
             `[batch_size, num_heads, min(seq_len, sliding_window), head_dim]`.
         offloading (`bool`, *optional*, defaults to `False`):
             Whether to perform offloading of the layers to `cpu`, to save GPU memory.
-            Not support yet.
         offload_only_non_sliding (`bool`, *optional*, defaults to `False`):
             If `offloading` is `True`, this further decides if only the non-sliding layers will be offloaded (because
             usually the sliding layers are small in size, so there is no need to offload them, and skipping it is faster).
-            Not support yet.
 
     Example:
 
@@ -786,8 +1098,8 @@ class DynamicCache(Cache):
         self,
         ddp_cache_data: Optional[Iterable[tuple[ms.Tensor, ms.Tensor]]] = None,
         config: Optional[PretrainedConfig] = None,
-        offloading: bool = False,  # Not support yet
-        offload_only_non_sliding: bool = False,  # Not support yet
+        offloading: bool = False,
+        offload_only_non_sliding: bool = False,
     ):
         layers = []
         # If a config is passed, use it to infer the layer types and initialize accordingly
@@ -956,7 +1268,7 @@ class QuantizedCache(Cache):
 
     Args:
         backend (`str`):
-            The quantization backend to use. One of `("quanto", "hqq").
+            The quantization backend to use. Only `"native"`, quantizing with MindSpore operations, is supported.
         config (`PretrainedConfig`):
             The config of the model for which this Cache will be used.
         nbits (`int`, *optional*, defaults to 4):
@@ -969,6 +1281,10 @@ class QuantizedCache(Cache):
             Quantization is done per-channel according to a set `q_group_size` for both keys and values.
         residual_length (`int`, *optional*, defaults to 128):
             Maximum capacity for the original precision cache
+        max_cache_len (`int`, *optional*):
+            If set, the layers are `StaticQuantizedLayer` of `max_cache_len` tokens, with static shapes for
+            `mindspore.jit`. Their tokens are quantized on their own along `q_group_size` channels, the axes and
+            `residual_length` are then ignored.
     """
 
     def __init__(
@@ -980,8 +1296,23 @@ class QuantizedCache(Cache):
         axis_value: int = 0,
         q_group_size: int = 64,
         residual_length: int = 128,
+        max_cache_len: Optional[int] = None,
     ):
-        raise NotImplementedError
+        if backend in ("quanto", "hqq"):
+            raise NotImplementedError(f"The `{backend}` backend is not supported in mindspore, use `backend='native'`.")
+        if backend != "native":
+            raise ValueError(f"Unknown quantization backend `{backend}`")
+
+        config = config.get_text_config(decoder=True)
+        num_layers = config.num_hidden_layers - getattr(config, "num_kv_shared_layers", 0)
+        if max_cache_len is None:
+            layers = [
+                NativeQuantizedLayer(nbits, axis_key, axis_value, q_group_size, residual_length)
+                for _ in range(num_layers)
+            ]
+        else:
+            layers = [StaticQuantizedLayer(max_cache_len, nbits, q_group_size) for _ in range(num_layers)]
+        super().__init__(layers=layers)
 
 
 class EncoderDecoderCache(Cache):
@@ -1217,7 +1548,6 @@ class OffloadedCache(DynamicCache):
             "Use `DynamicCache(offloading=True)` instead"
         )
         super().__init__(offloading=True)
-        raise NotImplementedError
 
 
 class OffloadedStaticCache(StaticCache):
@@ -1227,7 +1557,6 @@ class OffloadedStaticCache(StaticCache):
             "Use `StaticCache(..., offloading=True)` instead"
         )
         super().__init__(config=config, max_cache_len=max_cache_len, offloading=True)
-        raise NotImplementedError
 
 
 class SlidingWindowCache(StaticCache):
@@ -1264,7 +1593,6 @@ class OffloadedHybridCache(StaticCache):
             "Use `StaticCache(..., offload=True)` instead which will correctly infer the type of each layer."
         )
         super().__init__(config=config, max_cache_len=max_cache_len, offloading=True)
-        raise NotImplementedError
 
 
 class QuantoQuantizedCache(QuantizedCache):
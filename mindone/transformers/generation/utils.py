@@ -48,6 +48,7 @@ from mindone.transformers.cache_utils import (
     HybridCache,
     MambaCache,
     OffloadedStaticCache,
+    QuantizedCache,
     SlidingWindowCache,
     StaticCache,
 )
@@ -107,6 +108,7 @@ from mindone.transformers.generation.stopping_criteria import (
 )
 from mindone.transformers.masking_utils import create_masks_for_generate
 from mindone.transformers.mindspore_adapter.paged_attention_block_tables import BlockTables
+from mindone.transformers.mindspore_adapter.paged_attention_scheduler import ContinuousBatchingScheduler, ScheduledBatch
 from mindone.transformers.mindspore_adapter.select_operator import get_multinomial_op
 from mindone.transformers.utils import TransformersKwargs
 
@@ -2095,9 +2097,15 @@ class GenerationMixin:
                         "This model does not support the quantized cache. If you want your model to support quantized "
                         "cache, please open an issue and tag @zucchini-nlp."
                     )
-                raise NotImplementedError
+                cache_config = dict(generation_config.cache_config or {})
+                # Add the config if it was not provided, as it's a required argument
+                if "config" not in cache_config:
+                    cache_config["config"] = self.config.get_text_config()
+                # only the native backend is available in mindspore
+                backend = cache_config.pop("backend", "native")
+                model_kwargs[cache_name] = QuantizedCache(backend=backend, **cache_config)
             elif generation_config.cache_implementation == "offloaded":
-                raise NotImplementedError
+                model_kwargs[cache_name] = DynamicCache(**dynamic_cache_kwargs, offloading=True)
             elif "dynamic" in generation_config.cache_implementation:
                 model_kwargs[cache_name] = DynamicCache(**dynamic_cache_kwargs)
 
@@ -2626,6 +2634,74 @@ class GenerationMixin:
             return False
         return True
 
+    def generate_continuous_batching(
+        self,
+        prompts: list[list[int]],
+        max_new_tokens: int = 32,
+        eos_token_id: Optional[int] = None,
+        max_batch_size: int = 8,
+        max_num_batched_tokens: int = 512,
+    ) -> list[list[int]]:
+        r"""
+        Greedily generates the continuations of `prompts` with paged attention and continuous batching. Every model
+        step runs the tokens selected by a [`ContinuousBatchingScheduler`]: one decode token of each running sequence
+        and prefill chunks of the admitted ones, flattened in a single sequence with their `q_seq_lens`. Finished
+        sequences free their cache blocks right away for the waiting ones, and sequences are preempted and recomputed
+        later when the cache runs out of blocks.
+
+        Only models whose paged attention path handles `q_seq_lens` (e.g. Qwen3 with `attn_implementation="paged"`)
+        can be used.
+
+        Parameters:
+            prompts (`list[list[int]]`): The token ids of the prompts.
+            max_new_tokens (`int`, *optional*, defaults to 32): Maximum number of tokens generated for each prompt.
+            eos_token_id (`int`, *optional*): Token ending a sequence, defaults to the one of the generation config.
+            max_batch_size (`int`, *optional*, defaults to 8): Maximum number of sequences in a step.
+            max_num_batched_tokens (`int`, *optional*, defaults to 512): Maximum number of tokens in a step, shared by
+                decode tokens and prefill chunks.
+        Return:
+            `list[list[int]]`: The generated token ids of each prompt.
+        """
+        if "paged" not in self.config._attn_implementation:
+            raise ValueError("Continuous batching requires paged attention, please set `attn_implementation='paged'`.")
+        if eos_token_id is None:
+            eos_token_id = self.generation_config.eos_token_id
+            if isinstance(eos_token_id, list):
+                eos_token_id = eos_token_id[0]
+
+        # the block tables must match the key and value caches of the attention layers
+        block_mgr = BlockTables(1024, 32, self.config.max_position_embeddings)
+        scheduler = ContinuousBatchingScheduler(block_mgr, max_batch_size, max_num_batched_tokens)
+        for i, prompt_ids in enumerate(prompts):
+            scheduler.add_request(str(i), prompt_ids, max_new_tokens, eos_token_id)
+
+        # prefill chunks are attended with the cached keys and values too, so every step goes through paged attention
+        self._add_flags_custom(False)
+        outputs = {}
+        while scheduler.has_unfinished_requests():
+            batch = scheduler.schedule()
+            logits = self(**self._prepare_continuous_batching_inputs(batch), return_dict=False)[0]
+            next_tokens = logits.reshape(-1, logits.shape[-1]).argmax(-1).asnumpy().tolist()
+            for request in scheduler.update(batch, next_tokens):
+                outputs[request.request_id] = request.output_ids
+        self._add_flags_custom(True)
+        return [outputs[str(i)] for i in range(len(prompts))]
+
+    @staticmethod
+    def _prepare_continuous_batching_inputs(batch: ScheduledBatch) -> dict[str, Any]:
+        """Model inputs of a step of `generate_continuous_batching`, as a batch of one flattened sequence."""
+        return {
+            "input_ids": ms.tensor(batch.input_ids, ms.int64).reshape(1, -1),
+            "position_ids": ms.tensor(batch.positions, ms.int32).reshape(1, -1),
+            "block_tables": ms.tensor(batch.block_tables, ms.int32),
+            "slot_mapping": ms.tensor(batch.slot_mapping, ms.int32),
+            "batch_valid_length": ms.tensor(batch.batch_valid_length, ms.int32),
+            "q_seq_lens": ms.tensor(batch.q_seq_lens, ms.int32),
+            # only the last token of each sequence gives a next token
+            "logits_to_keep": ms.tensor(batch.logits_indices, ms.int32),
+            "use_cache": False,
+        }
+
     def heal_tokens(self, input_ids: ms.Tensor, tokenizer: Optional["PreTrainedTokenizerBase"] = None) -> ms.Tensor:
         r"""
         Generates sequences of token ids for models with a language modeling head.
@@ -22,6 +22,8 @@ def paged_attention_forward(
         v: (total_k, nheads_k, headdim), where total_k = total number of key tokens in the batch.  but if there is a block table it can be the full v
         kwargs:
         batch_valid_length, block_tables, slot_mapping are needed to do mapping between cache getting/saving and physical blocks
+        q_seq_lens (optional) is the number of query tokens of each sequence when prefill chunks and decode tokens are
+        flattened in one step, see `ContinuousBatchingScheduler`
     """
     if not hasattr(module, "infer_attention"):
         raise NotImplementedError(
@@ -37,7 +39,7 @@ def paged_attention_forward(
         kwargs["slot_mapping"],
         kwargs["freqs_cis"],
         kwargs["mask"],
-        q_seq_lens=None,
+        q_seq_lens=kwargs.get("q_seq_lens"),
     )
 
     return attn_output, None
@@ -4,7 +4,7 @@ from typing import List
 import numpy as np
 from transformers import logging
 
-from .paged_attention_cache_engine import BlockMemPool, CacheEngine
+from .paged_attention_cache_engine import BlockMemPool
 
 logger = logging.get_logger(__name__)
 
@@ -36,81 +36,89 @@ class BlockTables:
         self.seq_length = seq_length
         self.max_num_blocks_per_seq = self.seq_length // self.block_size
         self.block_mem_pool = BlockMemPool(self.num_blocks, self.block_size)
-        self.cache_engines = []
+        # persistent (batch_size, max_num_blocks_per_seq) block table, padded with -1 and updated in place
+        self.block_tables = np.full((0, self.max_num_blocks_per_seq), -1, dtype=np.int32)
+        self.num_blocks_per_seq = np.zeros(0, dtype=np.int32)
+        self.num_tokens = np.zeros(0, dtype=np.int64)
 
     def init_cache_engine(self, batch_size):
         """Init cache engine, allocate block memory bool."""
-        self.cache_engines.clear()
+        self.clear_cache()
         if batch_size * self.seq_length // self.block_size > self.num_blocks:
             logger.warning(
                 "Argument `num blocks` is less than the maximum possible block numbers. "
                 "May cause `block pool is out of memory` error. "
                 "Please make sure batch_size * seq_length <= block_size * num_blocks. "
             )
-        for _ in range(batch_size):
-            self.cache_engines.append(CacheEngine(self.block_size, self.block_mem_pool))
+        self.block_tables = np.full((batch_size, self.max_num_blocks_per_seq), -1, dtype=np.int32)
+        self.num_blocks_per_seq = np.zeros(batch_size, dtype=np.int32)
+        self.num_tokens = np.zeros(batch_size, dtype=np.int64)
         logger.info("init cache engine success.")
 
+    def prepare_cache(self, num_new_tokens: np.ndarray):
+        """
+        Reserves slots for `num_new_tokens[i]` more tokens of each sequence i, allocating the missing blocks of the
+        whole batch from the pool at once.
+        """
+        num_new_tokens = np.asarray(num_new_tokens, dtype=np.int64)
+        if num_new_tokens.shape[0] < self.num_tokens.shape[0]:
+            num_new_tokens = np.pad(num_new_tokens, (0, self.num_tokens.shape[0] - num_new_tokens.shape[0]))
+        total_tokens = self.num_tokens + num_new_tokens
+        num_new_blocks = np.maximum(-(-total_tokens // self.block_size) - self.num_blocks_per_seq, 0)
+        if (self.num_blocks_per_seq + num_new_blocks > self.max_num_blocks_per_seq).any():
+            raise RuntimeError(f"sequence is longer than the maximum length {self.seq_length} of the block table.")
+        total_new_blocks = int(num_new_blocks.sum())
+        if total_new_blocks > 0:
+            new_blocks = self.block_mem_pool.allocate(total_new_blocks)
+            rows = np.repeat(np.arange(num_new_blocks.shape[0]), num_new_blocks)
+            # column of each new block: first free column of its row + its rank among the new blocks of the row
+            group_starts = np.repeat(np.cumsum(num_new_blocks) - num_new_blocks, num_new_blocks)
+            cols = self.num_blocks_per_seq[rows] + (np.arange(total_new_blocks) - group_starts)
+            self.block_tables[rows, cols] = new_blocks
+            self.num_blocks_per_seq += num_new_blocks.astype(np.int32)
+        self.num_tokens = total_tokens
+
+    def release(self, rows):
+        """Returns the blocks of sequences `rows` to the pool and resets their block tables."""
+        blocks = self.block_tables[rows]
+        self.block_mem_pool.free(blocks[blocks >= 0])
+        self.block_tables[rows] = -1
+        self.num_blocks_per_seq[rows] = 0
+        self.num_tokens[rows] = 0
+
+    @staticmethod
+    def _to_numpy(batch_valid_length, is_finished):
+        if hasattr(batch_valid_length, "asnumpy"):
+            batch_valid_length = batch_valid_length.asnumpy()
+        batch_valid_length = np.asarray(batch_valid_length, dtype=np.int64).reshape(-1)
+        is_finished = np.broadcast_to(np.asarray(is_finished, dtype=np.bool_), batch_valid_length.shape)
+        return batch_valid_length, is_finished
+
     def assemble_pa_full_inputs(self, max_input_length, batch_valid_length: np.array, is_finished: List[bool]):
         """Prepare prefill inputs for Paged Attention."""
+        batch_valid_length, is_finished = self._to_numpy(batch_valid_length, is_finished)
         bs = batch_valid_length.shape[0]
-        block_tables = []
-        for i in range(bs):
-            if not is_finished[i]:
-                logger.debug("prepare cache for full: %s", batch_valid_length[i])
-                self.cache_engines[i].prepare_cache(batch_valid_length[i])
-            padded_table = self.cache_engines[i].block_table + [-1] * (
-                self.max_num_blocks_per_seq - len(self.cache_engines[i].block_table)
-            )
-            block_tables.append(padded_table)
-        block_tables = np.array(block_tables, dtype=np.int32)
-
-        # new method to generate slot mapping, to improve the performance
-        batch_valid_np = -1 * np.ones((bs, max_input_length), dtype=np.int32)
-        batch_valid_np[:] = np.arange(max_input_length)
-        batch_valid_mask = batch_valid_np.copy()
-        for i in range(bs):
-            batch_valid_mask[i] = batch_valid_mask[i] < batch_valid_length[i]
-        batch_valid_mask = batch_valid_mask.astype(np.bool_)
-        valid_index_np = batch_valid_np.copy()
-        valid_index_np[batch_valid_mask] = batch_valid_np[batch_valid_mask] // self.block_size
-        block_tables_np = -1 * np.ones((bs, max_input_length), dtype=np.int32)
-        min_block_table_length = min(block_tables_np.shape[1], block_tables.shape[1])
-        block_tables_np[:, :min_block_table_length] = block_tables[:, :min_block_table_length]
-        for i in range(bs):
-            block_tables_np[i] = block_tables_np[i, valid_index_np[i]]
-        block_tables_np[batch_valid_mask] *= self.block_size
-        batch_valid_np[batch_valid_mask] %= self.block_size
-        block_tables_np[batch_valid_mask] += batch_valid_np[batch_valid_mask]
-        slot_mapping = block_tables_np.flatten()
-        return block_tables, slot_mapping
+        self.prepare_cache(np.where(is_finished, 0, batch_valid_length))
+        block_tables = self.block_tables[:bs].copy()
+
+        positions = np.arange(max_input_length)
+        block_index = np.minimum(positions // self.block_size, self.max_num_blocks_per_seq - 1)
+        slot_mapping = block_tables[:, block_index] * self.block_size + positions % self.block_size
+        slot_mapping[positions[None, :] >= batch_valid_length[:, None]] = -1
+        return block_tables, slot_mapping.astype(np.int32).reshape(-1)
 
     def assemble_pa_inc_inputs(self, batch_valid_length: np.array, is_finished: List[bool]):
         """Prepare incremental inputs for Paged Attention."""
+        batch_valid_length, is_finished = self._to_numpy(batch_valid_length, is_finished)
         bs = batch_valid_length.shape[0]
+        self.prepare_cache((~is_finished).astype(np.int64))
+        block_tables = self.block_tables[:bs].copy()
 
-        block_tables = []
-        slot_mapping = []
-        for i in range(bs):
-            if not is_finished[i]:
-                logger.debug("prepare cache for inc: %s", batch_valid_length[i])
-                self.cache_engines[i].prepare_cache(1)
-
-            block_table = self.cache_engines[i].block_table
-            padded_table = block_table + [-1] * (self.max_num_blocks_per_seq - len(self.cache_engines[i].block_table))
-            block_tables.append(padded_table)
-
-            curent_idx = batch_valid_length[i] - 1
-            index = curent_idx // self.block_size
-            if index >= len(block_table):
-                index = len(block_table) - 1
-            slots = [block_table[index] * self.block_size + curent_idx % self.block_size]
-            slot_mapping = slot_mapping + slots
-        block_tables = np.array(block_tables, dtype=np.int32)
-        slot_mapping = np.array(slot_mapping, dtype=np.int32)
-        return block_tables, slot_mapping
+        current_idx = batch_valid_length - 1
+        index = np.clip(current_idx // self.block_size, 0, np.maximum(self.num_blocks_per_seq[:bs] - 1, 0))
+        slot_mapping = block_tables[np.arange(bs), index] * self.block_size + current_idx % self.block_size
+        return block_tables, slot_mapping.astype(np.int32)
 
     def clear_cache(self):
-        for cache_engine in self.cache_engines:
-            cache_engine.release_cache()
+        self.release(slice(None))
         logger.info("Clear block table cache engines.")
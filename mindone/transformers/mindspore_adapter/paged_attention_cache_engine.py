@@ -2,6 +2,8 @@
 import logging
 from typing import List
 
+import numpy as np
+
 
 class BlockMemPool:
     """
@@ -26,25 +28,49 @@ class BlockMemPool:
     def __init__(self, num_blocks: int, block_size: int):
         self.num_blocks = num_blocks
         self.block_size = block_size
-        self.free_blocks = [i for i in range(num_blocks)]
-        self.used_blocks = []
-
-    def allocate_block(self, num_new_block: int):
-        if len(self.free_blocks) < num_new_block:
+        # free-list stack, the top `num_free` entries are free. Allocation pops from the top and freeing pushes back,
+        # so both are O(n) in the number of blocks requested, regardless of the pool size.
+        self._free_stack = np.arange(num_blocks - 1, -1, -1, dtype=np.int32)
+        self.num_free = num_blocks
+        self._used = np.zeros(num_blocks, dtype=np.bool_)
+
+    @property
+    def free_blocks(self) -> List[int]:
+        return self._free_stack[: self.num_free][::-1].tolist()
+
+    @property
+    def used_blocks(self) -> List[int]:
+        return np.flatnonzero(self._used).tolist()
+
+    def allocate(self, num_new_block: int) -> np.ndarray:
+        """Allocates `num_new_block` blocks and returns their indices as an int32 array."""
+        if self.num_free < num_new_block:
             raise RuntimeError("block pool is out of memory")
 
-        new_blocks = self.free_blocks[0:num_new_block]
-        self.used_blocks += new_blocks
-        self.free_blocks = self.free_blocks[num_new_block:]
-        logging.info("free block num in pool: %s", len(self.free_blocks))
+        new_blocks = self._free_stack[self.num_free - num_new_block : self.num_free][::-1].copy()
+        self.num_free -= num_new_block
+        self._used[new_blocks] = True
+        logging.debug("free block num in pool: %s", self.num_free)
         return new_blocks
 
+    def free(self, block_indices: np.ndarray):
+        """Returns blocks to the pool."""
+        block_indices = np.asarray(block_indices, dtype=np.int32).reshape(-1)
+        if block_indices.size == 0:
+            return
+        if not self._used[block_indices].all() or np.unique(block_indices).size != block_indices.size:
+            bad = block_indices[~self._used[block_indices]]
+            idx = bad[0] if bad.size else block_indices[0]
+            raise RuntimeError(f"bad block idx, {idx} is not in the used block list.")
+        self._used[block_indices] = False
+        self._free_stack[self.num_free : self.num_free + block_indices.size] = block_indices[::-1]
+        self.num_free += block_indices.size
+
+    def allocate_block(self, num_new_block: int) -> List[int]:
+        return self.allocate(num_new_block).tolist()
+
     def free_block(self, block_indices: List[int]):
-        for idx in block_indices:
-            if idx not in self.used_blocks:
-                raise RuntimeError(f"bad block idx, {idx} is not in the used block list.")
-            self.free_blocks.append(idx)
-            self.used_blocks.remove(idx)
+        self.free(block_indices)
 
 
 class CacheEngine:
@@ -1,7 +1,7 @@
 import numpy as np
 
 import mindspore
-from mindspore import Tensor, context, nn
+from mindspore import Tensor, context, mint, nn
 from mindspore.ops import operations as P
 
 
@@ -120,3 +120,11 @@ class LowerTriangularMaskWithDynamic(nn.Cell):
     def chunk_masks(self, seq_range):
         masks = self.gather(self.lower_triangle_mask, seq_range, 0)
         return 1 - masks
+
+    def chunk_masks_by_positions(self, positions):
+        """
+        Masks of the flattened prefill chunk and decode tokens at `positions` over the whole sequence, 1 indicates
+        discard. Unlike `chunk_masks`, it does not need the (seq_length, seq_length) lower triangle mask.
+        """
+        key_positions = mint.arange(self.seq_length, dtype=positions.dtype).reshape(1, -1)
+        return (key_positions > positions.reshape(-1, 1)).to(self.dtype)
@@ -48,7 +48,7 @@ class PagedAttentionMgr(nn.Cell):
 
     def paged_attn(self, query, batch_valid_length, block_tables, attn_mask=None, q_seq_lens=None):
         """The forward compute of Paged Attention."""
-        if self.parallel_decoding or self.chunk_prefill:
+        if self.parallel_decoding or self.chunk_prefill or q_seq_lens is not None:
             attn_mask = attn_mask.astype(mstype.bool_).astype(query.dtype) * -10000
             return self.paged_attention(
                 query,
@@ -0,0 +1,254 @@
+"""iteration-level (continuous batching) scheduler for paged attention."""
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Optional, Sequence
+
+import numpy as np
+from transformers import logging
+
+from .paged_attention_block_tables import BlockTables
+
+logger = logging.get_logger(__name__)
+
+
+@dataclass
+class Request:
+    """A generation request tracked by `ContinuousBatchingScheduler`."""
+
+    request_id: str
+    prompt_ids: List[int]
+    max_new_tokens: int
+    eos_token_id: Optional[int] = None
+    output_ids: List[int] = field(default_factory=list)
+    # number of tokens whose key and value are in the cache
+    num_computed_tokens: int = 0
+    # row of the request in the block tables, None when the request is not running
+    slot: Optional[int] = None
+    num_preemptions: int = 0
+
+    @property
+    def all_ids(self) -> List[int]:
+        return self.prompt_ids + self.output_ids
+
+    @property
+    def num_tokens(self) -> int:
+        return len(self.prompt_ids) + len(self.output_ids)
+
+    @property
+    def is_finished(self) -> bool:
+        if len(self.output_ids) >= self.max_new_tokens:
+            return True
+        return self.eos_token_id is not None and len(self.output_ids) > 0 and self.output_ids[-1] == self.eos_token_id
+
+
+@dataclass
+class ScheduledBatch:
+    """
+    Inputs of one model step mixing prefill chunks and decode tokens, in the flattened (chunk prefill) layout used by
+    paged attention with `q_seq_lens`.
+
+    Attributes:
+        requests: The scheduled requests, in batch order.
+        input_ids: (total_tokens,) token ids of all the requests, concatenated.
+        positions: (total_tokens,) position of each token in its sequence.
+        q_seq_lens: (batch,) number of query tokens of each request in this step.
+        batch_valid_length: (batch,) length of the key/value of each request after this step.
+        block_tables: (batch, max_num_blocks_per_seq) block tables of the requests.
+        slot_mapping: (total_tokens,) cache slot of each token.
+        logits_indices: (batch,) index in `input_ids` of the last token of each request, whose logits give the next
+            token.
+    """
+
+    requests: List[Request]
+    input_ids: np.ndarray
+    positions: np.ndarray
+    q_seq_lens: np.ndarray
+    batch_valid_length: np.ndarray
+    block_tables: np.ndarray
+    slot_mapping: np.ndarray
+    logits_indices: np.ndarray
+
+    @property
+    def num_prefill_tokens(self) -> int:
+        return int(self.q_seq_lens[self.q_seq_lens > 1].sum())
+
+
+class ContinuousBatchingScheduler:
+    """
+    Schedules generation requests at the granularity of one model step on top of `BlockTables`.
+
+    Every step, running requests get one decode token each, then partially prefilled and waiting requests are
+    admitted into the free batch slots with prompt chunks, as long as the token budget of the step and the free
+    blocks allow it. Finished requests leave the batch and return their blocks to the pool as soon as their last token
+    is produced. When the pool runs out of blocks for running requests, the most recently admitted ones are preempted:
+    their blocks are freed and they are put back in front of the waiting queue to be recomputed later.
+
+    Args:
+        block_tables (BlockTables): The block manager of the paged attention cache.
+        max_batch_size (int): Maximum number of requests in a step.
+        max_num_batched_tokens (int): Token budget of a step, shared by decode tokens and prefill chunks.
+
+    Examples:
+        >>> scheduler = ContinuousBatchingScheduler(BlockTables(1024, 32, 4096), max_batch_size=64,
+        ...                                         max_num_batched_tokens=2048)
+        >>> scheduler.add_request("0", prompt_ids, max_new_tokens=128, eos_token_id=2)
+        >>> while scheduler.has_unfinished_requests():
+        ...     batch = scheduler.schedule()
+        ...     next_tokens = run_model(batch)  # one token per request, sampled at `batch.logits_indices`
+        ...     for request in scheduler.update(batch, next_tokens):
+        ...         print(request.request_id, request.output_ids)
+    """
+
+    def __init__(self, block_tables: BlockTables, max_batch_size: int, max_num_batched_tokens: int):
+        self.block_tables = block_tables
+        self.block_size = block_tables.block_size
+        self.max_batch_size = max_batch_size
+        self.max_num_batched_tokens = max_num_batched_tokens
+        self.block_tables.init_cache_engine(max_batch_size)
+
+        self.waiting: Deque[Request] = deque()
+        # running requests in admission order, preemption picks from the end
+        self.running: List[Request] = []
+        self.free_slots: List[int] = list(range(max_batch_size - 1, -1, -1))
+        self.requests: Dict[str, Request] = {}
+
+    def add_request(
+        self,
+        request_id: str,
+        prompt_ids: Sequence[int],
+        max_new_tokens: int,
+        eos_token_id: Optional[int] = None,
+    ) -> Request:
+        """Queues a new request, it is admitted in the next steps when slots and blocks are available."""
+        if request_id in self.requests:
+            raise ValueError(f"Request {request_id} already exists.")
+        if len(prompt_ids) + max_new_tokens > self.block_tables.seq_length:
+            raise ValueError(
+                f"Request {request_id} needs {len(prompt_ids) + max_new_tokens} tokens, more than the maximum "
+                f"sequence length {self.block_tables.seq_length}."
+            )
+        request = Request(request_id, list(prompt_ids), max_new_tokens, eos_token_id)
+        self.requests[request_id] = request
+        self.waiting.append(request)
+        return request
+
+    def has_unfinished_requests(self) -> bool:
+        return bool(self.waiting or self.running)
+
+    def _num_new_blocks(self, request: Request, num_new_tokens: int) -> int:
+        num_blocks = self.block_tables.num_blocks_per_seq[request.slot] if request.slot is not None else 0
+        return max(-(-(request.num_computed_tokens + num_new_tokens) // self.block_size) - num_blocks, 0)
+
+    def _release(self, request: Request):
+        self.block_tables.release([request.slot])
+        self.free_slots.append(request.slot)
+        request.slot = None
+
+    def _preempt(self, request: Request):
+        """Frees the blocks of `request` and queues it again, its tokens are recomputed when it is re-admitted."""
+        logger.debug("preempt request %s", request.request_id)
+        self.running.remove(request)
+        self._release(request)
+        request.num_computed_tokens = 0
+        request.num_preemptions += 1
+        self.waiting.appendleft(request)
+
+    def schedule(self) -> Optional[ScheduledBatch]:
+        """Selects the requests and tokens of the next step and reserves their cache slots."""
+        budget = self.max_num_batched_tokens
+        num_free_blocks = self.block_tables.block_mem_pool.num_free
+        scheduled: List[Request] = []
+        num_scheduled_tokens: List[int] = []
+
+        # 1. running requests, decodes and remaining prefill chunks, preempting the latest ones if blocks run out
+        queue = list(self.running)
+        while queue and budget > 0:
+            request = queue.pop(0)
+            num_new_tokens = min(request.num_tokens - request.num_computed_tokens, budget)
+            num_new_blocks = self._num_new_blocks(request, num_new_tokens)
+            while num_new_blocks > num_free_blocks and queue:
+                victim = queue.pop()
+                num_free_blocks += int(self.block_tables.num_blocks_per_seq[victim.slot])
+                self._preempt(victim)
+            if num_new_blocks > num_free_blocks:
+                num_free_blocks += int(self.block_tables.num_blocks_per_seq[request.slot])
+                self._preempt(request)
+                continue
+            num_free_blocks -= num_new_blocks
+            budget -= num_new_tokens
+            scheduled.append(request)
+            num_scheduled_tokens.append(num_new_tokens)
+
+        # 2. admit waiting requests into the free slots with the remaining budget
+        while self.waiting and self.free_slots and budget > 0 and len(scheduled) < self.max_batch_size:
+            request = self.waiting[0]
+            num_new_tokens = min(request.num_tokens, budget)
+            num_new_blocks = self._num_new_blocks(request, num_new_tokens)
+            if num_new_blocks > num_free_blocks:
+                break
+            self.waiting.popleft()
+            request.slot = self.free_slots.pop()
+            self.running.append(request)
+            num_free_blocks -= num_new_blocks
+            budget -= num_new_tokens
+            scheduled.append(request)
+            num_scheduled_tokens.append(num_new_tokens)
+
+        if not scheduled:
+            if self.waiting and not self.running:
+                raise RuntimeError("block pool is out of memory, cannot admit any request.")
+            return None
+        return self._assemble(scheduled, np.array(num_scheduled_tokens, dtype=np.int64))
+
+    def _assemble(self, requests: List[Request], q_seq_lens: np.ndarray) -> ScheduledBatch:
+        rows = np.array([request.slot for request in requests], dtype=np.int64)
+        starts = np.array([request.num_computed_tokens for request in requests], dtype=np.int64)
+
+        num_new_tokens = np.zeros(self.max_batch_size, dtype=np.int64)
+        num_new_tokens[rows] = q_seq_lens
+        self.block_tables.prepare_cache(num_new_tokens)
+
+        total_tokens = int(q_seq_lens.sum())
+        token_to_seq = np.repeat(np.arange(len(requests)), q_seq_lens)
+        ends = np.cumsum(q_seq_lens)
+        positions = starts[token_to_seq] + np.arange(total_tokens) - np.repeat(ends - q_seq_lens, q_seq_lens)
+        block_tables = self.block_tables.block_tables[rows]
+        slot_mapping = (
+            block_tables[token_to_seq, positions // self.block_size] * self.block_size + positions % self.block_size
+        )
+        input_ids = np.concatenate(
+            [
+                np.asarray(request.all_ids[start : start + n], dtype=np.int32)
+                for request, start, n in zip(requests, starts, q_seq_lens)
+            ]
+        )
+        return ScheduledBatch(
+            requests=requests,
+            input_ids=input_ids,
+            positions=positions.astype(np.int32),
+            q_seq_lens=q_seq_lens.astype(np.int32),
+            batch_valid_length=(starts + q_seq_lens).astype(np.int32),
+            block_tables=block_tables,
+            slot_mapping=slot_mapping.astype(np.int32),
+            logits_indices=(ends - 1).astype(np.int32),
+        )
+
+    def update(self, batch: ScheduledBatch, next_token_ids: Sequence[int]) -> List[Request]:
+        """
+        Records the step outputs: advances the computed tokens of the scheduled requests and appends the sampled token
+        of those whose whole sequence has been computed. Finished requests are evicted and returned.
+        """
+        finished = []
+        for request, n, token_id in zip(batch.requests, batch.q_seq_lens, next_token_ids):
+            if request.slot is None:  # preempted after being scheduled
+                continue
+            request.num_computed_tokens += int(n)
+            if request.num_computed_tokens < request.num_tokens:  # partial prefill chunk
+                continue
+            request.output_ids.append(int(token_id))
+            if request.is_finished:
+                self.running.remove(request)
+                self._release(request)
+                self.requests.pop(request.request_id)
+                finished.append(request)
+        return finished
@@ -25,6 +25,8 @@ import re
 import sys
 import warnings
 from abc import abstractmethod
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager, nullcontext
 from dataclasses import dataclass
 from enum import Enum
@@ -38,6 +40,7 @@ from transformers.utils import (
     ADAPTER_WEIGHTS_NAME,
     CONFIG_NAME,
     DUMMY_INPUTS,
+    ENV_VARS_TRUE_VALUES,
     FLAX_WEIGHTS_NAME,
     SAFE_WEIGHTS_INDEX_NAME,
     SAFE_WEIGHTS_NAME,
@@ -365,6 +368,56 @@ def load_state_dict(checkpoint_file: Union[str, os.PathLike]):
             )
 
 
+def _get_shard_prefetch_workers() -> int:
+    """
+    Number of shards read ahead on background threads while the current shard is loaded into the model. Each prefetched
+    shard is kept in host memory until consumed, so this also bounds the extra peak host memory of loading: at most
+    two shards ahead unless `HF_PARALLEL_LOADING_WORKERS` asks for more.
+    """
+    if os.environ.get("HF_ENABLE_PARALLEL_LOADING", "").upper() in ENV_VARS_TRUE_VALUES:
+        return max(int(os.environ.get("HF_PARALLEL_LOADING_WORKERS", "2")), 1)
+    return 1
+
+
+def _iter_shard_state_dicts(shard_files: list, num_workers: Optional[int] = None):
+    """
+    Yields `(shard_file, state_dict)` in order while the next `num_workers` shards are read on a thread pool, so that
+    reading shard N+1 from disk overlaps with dtype casting and assigning shard N. No reference to a yielded state dict
+    is kept here, it is released as soon as the caller drops it.
+    """
+    if num_workers is None:
+        num_workers = _get_shard_prefetch_workers()
+    if num_workers <= 0 or len(shard_files) <= 1:
+        for shard_file in shard_files:
+            yield shard_file, load_state_dict(shard_file)
+        return
+
+    def _load_boxed(shard_file):
+        # the state dict is handed over through a list so that neither the future nor this generator keeps it alive
+        return [load_state_dict(shard_file)]
+
+    shard_iter = iter(shard_files)
+    with ThreadPoolExecutor(max_workers=num_workers) as executor:
+        pending = deque()
+        for shard_file in shard_iter:
+            pending.append((shard_file, executor.submit(_load_boxed, shard_file)))
+            if len(pending) >= num_workers:
+                break
+        while pending:
+            shard_file, future = pending.popleft()
+            next_shard_file = next(shard_iter, None)
+            if next_shard_file is not None:
+                pending.append((next_shard_file, executor.submit(_load_boxed, next_shard_file)))
+            try:
+                box = future.result()
+            except BaseException:
+                for _, f in pending:
+                    f.cancel()
+                raise
+            del future
+            yield shard_file, box.pop()
+
+
 def _load_state_dict_into_model(model_to_load, state_dict, start_prefix, is_sharded=False):
     # # add prefix to the name of parameters
     # if len(start_prefix) > 0:
@@ -3269,12 +3322,14 @@ class PreTrainedModel(nn.Cell, EmbeddingAccessMixin, ModuleUtilsMixin, PushToHub
             error_msgs = []
             mismatched_keys = []
 
+            # loading checkpoint, the next shards are read in the background while the current one is assigned
+            shard_iter = _iter_shard_state_dicts(resolved_archive_file)
             if len(resolved_archive_file) > 1:
-                resolved_archive_file = logging.tqdm(resolved_archive_file, desc="Loading checkpoint shards")
+                shard_iter = logging.tqdm(
+                    shard_iter, total=len(resolved_archive_file), desc="Loading checkpoint shards"
+                )
 
-            # loading checkpoint
-            for shard_file in resolved_archive_file:
-                state_dict = load_state_dict(shard_file)
+            for shard_file, state_dict in shard_iter:
                 # checkpoint mapping from pt to hf
                 matching = [s for s in key_renaming_mapping.keys()]
                 if matching:
@@ -256,7 +256,8 @@ class Qwen3Attention(nn.Cell):
         query_states, key_states = apply_rotary_pos_emb(query_states, key_states, cos, sin)
 
         if "paged" in self.config._attn_implementation:
-            if not self.is_first_iteration:
+            # with `q_seq_lens`, the prefill chunks and decode tokens of the batch are flattened in one sequence
+            if not self.is_first_iteration and kwargs.get("q_seq_lens") is None:
                 query_states = query_states[:, :, -1:, :]
                 key_states = key_states[:, :, -1:, :]
                 value_states = value_states[:, :, -1:, :]
@@ -988,7 +989,12 @@ class Qwen3ForCausalLM(Qwen3PreTrainedModel, GenerationMixin):
         if is_page_attention:
             bs, seq_len = input_ids.shape
             mask = None
-            if self.is_first_iteration:
+            if kwargs.get("q_seq_lens") is not None:
+                # mixed prefill chunks and decode tokens, see `GenerationMixin.generate_continuous_batching`
+                positions = position_ids.reshape(-1)
+                freqs_cis = self.freqs_mgr.chunk_with_decode(positions)
+                mask = self.casual_mask.chunk_masks_by_positions(positions)
+            elif self.is_first_iteration:
                 freqs_cis = self.freqs_mgr.prefill(bs, seq_len)
                 mask = self.casual_mask.prefill()
             else:
@@ -1,26 +1,54 @@
-import copy
 import os
-from typing import List, Optional, Union
+from collections.abc import Iterable
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
 
 import mindspore as ms
 import mindspore.nn as nn
-from mindspore import Parameter
+from mindspore import Parameter, Tensor
 from mindspore import log as logger
 
 # from mindspore._checkparam import Validator
 from mindspore.train.serialization import _load_dismatch_prefix_params, _update_param
 
+from ..safetensors.mindspore import safe_open
+
+
+def _to_parameter(name: str, value) -> Union[Parameter, str]:
+    if isinstance(value, (Parameter, str)):
+        return value
+    if isinstance(value, Tensor):
+        return Parameter(value, name=name)
+    if isinstance(value, np.ndarray):
+        return Parameter(Tensor(value), name=name)
+    logger.critical("Load parameters into net failed.")
+    msg = (
+        "For 'parameter_dict', the element in the argument 'parameter_dict' should be a "
+        "'str' and 'Parameter' , but got {} and {}.".format(type(name), type(value))
+    )
+    raise TypeError(msg)
+
 
 def load_param_into_net_with_filter(
-    net: nn.Cell, parameter_dict: dict, strict_load: bool = False, filter: Optional[List] = None
+    net: nn.Cell,
+    parameter_dict: Union[dict, Iterable[Tuple[str, Union[Parameter, Tensor, np.ndarray]]]],
+    strict_load: bool = False,
+    filter: Optional[List] = None,
 ):
     """
     Load parameters into network, return parameter list that are not loaded in the network.
 
+    Checkpoint parameters are moved into the network without copying and the bookkeeping is done with dicts and sets,
+    so the cost is linear in the number of parameters.
+
     Args:
         net (Cell): The network where the parameters will be loaded.
-        parameter_dict (dict): The dictionary generated by load checkpoint file,
+        parameter_dict (Union[dict, Iterable]): The dictionary generated by load checkpoint file,
                                it is a dictionary consisting of key: parameters's name, value: parameter.
+                               It can also be an iterator of (name, Parameter/Tensor/numpy.ndarray) pairs, e.g.
+                               `mindone.safetensors.mindspore.safe_open(...).iter_tensors()`, so that a checkpoint can
+                               be consumed lazily without holding all of it in memory.
         strict_load (bool): Whether to strict load the parameter into net. If False, it will load parameter
                             into net when parameter name's suffix in checkpoint file is the same as the
                             parameter in the network. When the types are inconsistent perform type conversion
@@ -49,37 +77,46 @@ def load_param_into_net_with_filter(
         msg = "For 'load_param_into_net', the argument 'net' should be a Cell, but got {}.".format(type(net))
         raise TypeError(msg)
 
-    if not isinstance(parameter_dict, dict):
+    if isinstance(parameter_dict, dict):
+        # values are checked and converted by `_to_parameter`, as for an iterable
+        parameter_items = parameter_dict.items()
+    elif isinstance(parameter_dict, Iterable) and not isinstance(parameter_dict, (str, bytes)):
+        parameter_items = parameter_dict
+    else:
         logger.critical("Failed to combine the net and the parameters.")
-        msg = "For 'load_param_into_net', the argument 'parameter_dict' should be a dict, " "but got {}.".format(
-            type(parameter_dict)
+        msg = (
+            "For 'load_param_into_net', the argument 'parameter_dict' should be a dict or an iterable of "
+            "(name, parameter) pairs, but got {}.".format(type(parameter_dict))
         )
         raise TypeError(msg)
-    for key, value in parameter_dict.items():
-        if not isinstance(key, str) or not isinstance(value, (Parameter, str)):
-            logger.critical("Load parameters into net failed.")
-            msg = (
-                "For 'parameter_dict', the element in the argument 'parameter_dict' should be a "
-                "'str' and 'Parameter' , but got {} and {}.".format(type(key), type(value))
-            )
-            raise TypeError(msg)
 
     # TODO: replace by otherway to do check_bool
     # strict_load = Validator.check_bool(strict_load)
     logger.info("Execute the process of loading parameters into net.")
     net.init_parameters_data()
-    param_not_load = []
-    ckpt_not_load = list(parameter_dict.keys())
-    for _, param in net.parameters_and_names():
-        if param.name in parameter_dict:
-            new_param = copy.deepcopy(parameter_dict[param.name])
-            _update_param(param, new_param, strict_load)
-            ckpt_not_load.remove(param.name)
-        else:
-            param_not_load.append(param.name)
+    net_params = {param.name: param for _, param in net.parameters_and_names()}
+    loaded = set()
+    ckpt_not_load = []
+    # checkpoint parameters whose name does not match, kept for the prefix matching in non-strict mode only
+    dismatch_dict = {}
+    for name, value in parameter_items:
+        if not isinstance(name, str):
+            logger.critical("Load parameters into net failed.")
+            msg = "For 'parameter_dict', the parameter name should be a 'str', but got {}.".format(type(name))
+            raise TypeError(msg)
+        param = net_params.get(name)
+        if param is None:
+            ckpt_not_load.append(name)
+            if not strict_load:
+                dismatch_dict[name] = _to_parameter(name, value)
+            continue
+        _update_param(param, _to_parameter(name, value), strict_load)
+        loaded.add(name)
+    param_not_load = [name for name in net_params if name not in loaded]
 
     if param_not_load and not strict_load:
-        _load_dismatch_prefix_params(net, parameter_dict, param_not_load, strict_load)
+        _load_dismatch_prefix_params(net, dismatch_dict, param_not_load, strict_load)
+    del dismatch_dict
 
     logger.info("Loading parameters into net is finished.")
     if filter:
@@ -109,31 +146,38 @@ def load_checkpoint_to_net(
     ensure_all_ckpt_params_loaded : set True for inference if you want to ensure no checkpoint param is missed in loading
     """
     if isinstance(checkpoint, str):
-        if os.path.exists(checkpoint):
-            param_dict = ms.load_checkpoint(checkpoint)
-        else:
+        if not os.path.exists(checkpoint):
             raise FileNotFoundError(f"{checkpoint} doesn't exist")
+        if checkpoint.endswith(".safetensors"):
+            # stream tensors from the memory-mapped file one by one instead of materializing the whole checkpoint
+            with safe_open(checkpoint) as f:
+                _load_params_to_net(
+                    net, f.keys(), f.iter_tensors(), ignore_net_params_not_loaded, ensure_all_ckpt_params_loaded
+                )
+            return
+        param_dict = ms.load_checkpoint(checkpoint)
     elif isinstance(checkpoint, dict):
         param_dict = checkpoint
     else:
         raise TypeError(f"unknown checkpoint type: {checkpoint}")
+    _load_params_to_net(net, param_dict, param_dict, ignore_net_params_not_loaded, ensure_all_ckpt_params_loaded)
+
+
+def _load_params_to_net(net, param_names, parameter_dict, ignore_net_params_not_loaded, ensure_all_ckpt_params_loaded):
+    if not param_names:
+        return
+    filter = list(param_names) if ignore_net_params_not_loaded else None
+    param_not_load, ckpt_not_load = load_param_into_net_with_filter(net, parameter_dict, filter=filter)
+
+    if ensure_all_ckpt_params_loaded:
+        assert (
+            len(ckpt_not_load) == 0
+        ), f"All params in checkpoint must be loaded. but got these not loaded {ckpt_not_load}"
 
-    if param_dict:
-        if ignore_net_params_not_loaded:
-            filter = param_dict.keys()
-        else:
-            filter = None
-        param_not_load, ckpt_not_load = load_param_into_net_with_filter(net, param_dict, filter=filter)
-
-        if ensure_all_ckpt_params_loaded:
-            assert (
-                len(ckpt_not_load) == 0
-            ), f"All params in checkpoint must be loaded. but got these not loaded {ckpt_not_load}"
-
-        if not ignore_net_params_not_loaded:
-            if len(param_not_load) > 0:
-                logger.info("Net params not loaded: {}".format([p for p in param_not_load if not p.startswith("adam")]))
-        logger.info("Checkpoint params not loaded: {}".format([p for p in ckpt_not_load if not p.startswith("adam")]))
+    if not ignore_net_params_not_loaded:
+        if len(param_not_load) > 0:
+            logger.info("Net params not loaded: {}".format([p for p in param_not_load if not p.startswith("adam")]))
+    logger.info("Checkpoint params not loaded: {}".format([p for p in ckpt_not_load if not p.startswith("adam")]))
 
 
 def count_params(model: nn.Cell, verbose: bool = False) -> tuple[int, int]:
@@ -0,0 +1,156 @@
+# Copyright 2025 HuggingFace Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import numpy as np
+
+import mindspore as ms
+from mindspore import mint
+
+from mindone.diffusers.hooks import FirstBlockCacheConfig, allocate_first_block_cache
+from mindone.diffusers.hooks._helpers import TransformerBlockMetadata, TransformerBlockRegistry
+from mindone.diffusers.models.cache_utils import CacheMixin
+
+
+class DummyFBCBlock(ms.nn.Cell):
+    def __init__(self, features: int) -> None:
+        super().__init__()
+
+        self.proj = mint.nn.Linear(features, features)
+        self.num_calls = 0
+
+    def construct(self, hidden_states: ms.Tensor, encoder_hidden_states: ms.Tensor):
+        self.num_calls += 1
+        hidden_states = hidden_states + mint.tanh(self.proj(hidden_states + encoder_hidden_states))
+        return encoder_hidden_states * 0.5, hidden_states
+
+
+TransformerBlockRegistry.register(
+    DummyFBCBlock, TransformerBlockMetadata(return_hidden_states_index=1, return_encoder_hidden_states_index=0)
+)
+
+
+class DummyTransformer(ms.nn.Cell, CacheMixin):
+    def __init__(self, features: int, num_layers: int) -> None:
+        super().__init__()
+
+        self.transformer_blocks = ms.nn.CellList([DummyFBCBlock(features) for _ in range(num_layers)])
+
+    def construct(self, hidden_states: ms.Tensor, encoder_hidden_states: ms.Tensor) -> ms.Tensor:
+        for block in self.transformer_blocks:
+            encoder_hidden_states, hidden_states = block(hidden_states, encoder_hidden_states)
+        return hidden_states
+
+
+class FirstBlockCacheTests(unittest.TestCase):
+    features = 8
+
+    def setUp(self):
+        ms.manual_seed(0)
+        self.model = DummyTransformer(self.features, num_layers=3)
+        rng = np.random.default_rng(0)
+        self.hidden_states = ms.tensor(rng.standard_normal((2, self.features)), ms.float32)
+        self.encoder_hidden_states = ms.tensor(rng.standard_normal((2, self.features)), ms.float32)
+
+    def run_steps(self, scales):
+        """Runs one step per scale of the inputs and returns whether the remaining blocks were computed."""
+        computed, outputs = [], []
+        for scale in scales:
+            num_calls = self.model.transformer_blocks[-1].num_calls
+            with self.model.cache_context("cond"):
+                outputs.append(self.model(self.hidden_states * scale, self.encoder_hidden_states))
+            computed.append(self.model.transformer_blocks[-1].num_calls > num_calls)
+        return computed, outputs
+
+    def check_skip_decisions(self, graph_mode):
+        scales = [1.0, 1.01, 1.5, 1.51]
+        expected = [self.model(self.hidden_states * scale, self.encoder_hidden_states) for scale in scales]
+        head_block = self.model.transformer_blocks[0]
+        head_outputs = [head_block(self.hidden_states * scale, self.encoder_hidden_states)[1] for scale in scales]
+        self.model.enable_cache(FirstBlockCacheConfig(threshold=0.1, graph_mode=graph_mode))
+
+        computed, outputs = self.run_steps(scales)
+        self.assertEqual(computed, [True, False, True, False])
+        for i in (0, 2):
+            self.assertTrue(mint.allclose(outputs[i], expected[i], atol=1e-6))
+        # a skipped step adds the cached residual of the remaining blocks to the output of the first block
+        residual = outputs[0] - head_outputs[0]
+        self.assertTrue(mint.allclose(outputs[1], head_outputs[1] + residual, atol=1e-6))
+
+        # after a reset, the first step computes all the blocks even if its input is close to the cached one
+        self.assertEqual(self.run_steps([1.51])[0], [False])
+        self.model._reset_stateful_cache()
+        self.assertEqual(self.run_steps([1.51, 1.51])[0], [True, False])
+
+    def test_skip_decisions(self):
+        self.check_skip_decisions(graph_mode=False)
+
+    def test_graph_mode_skip_decisions(self):
+        self.check_skip_decisions(graph_mode=True)
+
+    def test_graph_mode_keeps_blocks_in_place(self):
+        blocks = list(self.model.transformer_blocks)
+        names = [name for name, _ in self.model.parameters_and_names()]
+
+        self.model.enable_cache(FirstBlockCacheConfig(graph_mode=True))
+        self.assertEqual(list(self.model.transformer_blocks), blocks)
+        # the cache parameters are shared by the blocks, they are listed once under the head block
+        new_names = [name for name, _ in self.model.parameters_and_names()]
+        self.assertEqual([name for name in new_names if ".fbc_" not in name], names)
+        self.assertEqual(
+            [name for name in new_names if ".fbc_" in name],
+            ["transformer_blocks.0.fbc_should_compute", "transformer_blocks.0.fbc_is_initialized"],
+        )
+
+        self.model.disable_cache()
+        self.assertEqual([name for name, _ in self.model.parameters_and_names()], names)
+        self.assertFalse(any("construct" in block.__dict__ for block in blocks))
+        self.assertEqual(self.run_steps([1.0, 1.0])[0], [True, True])
+
+    def test_graph_mode_static_cache(self):
+        self.model.enable_cache(FirstBlockCacheConfig(threshold=0.1, graph_mode=True))
+        allocate_first_block_cache(self.model, (2, self.features), (2, self.features), dtype=ms.float32)
+
+        # the decision stays on device, in the parameter the remaining blocks branch on
+        self.assertEqual(self.run_steps([1.0, 1.01, 1.5])[0], [True, False, True])
+        self.model._reset_stateful_cache()
+        self.assertEqual(self.run_steps([1.0, 1.0])[0], [True, False])
+
+        with self.assertRaises(ValueError):
+            allocate_first_block_cache(DummyTransformer(self.features, num_layers=2), (2, self.features))
+
+    def test_graph_mode_compiled(self):
+        scales = [1.0, 1.01, 1.5, 1.51]
+        expected = [self.model(self.hidden_states * scale, self.encoder_hidden_states) for scale in scales]
+        head_block = self.model.transformer_blocks[0]
+        head_outputs = [head_block(self.hidden_states * scale, self.encoder_hidden_states)[1] for scale in scales]
+        self.model.enable_cache(FirstBlockCacheConfig(threshold=0.1, graph_mode=True))
+        allocate_first_block_cache(self.model, (2, self.features), (2, self.features), dtype=ms.float32)
+
+        ms.set_context(mode=ms.GRAPH_MODE)
+        try:
+            computed, outputs = [], []
+            for scale in scales:
+                outputs.append(self.model(self.hidden_states * scale, self.encoder_hidden_states))
+                computed.append(bool(head_block.fbc_should_compute))
+        finally:
+            ms.set_context(mode=ms.PYNATIVE_MODE)
+
+        # the compiled blocks update the cache in place and skip the remaining blocks on the decision
+        self.assertEqual(computed, [True, False, True, False])
+        residual = outputs[2] - head_outputs[2]
+        self.assertTrue(mint.allclose(head_block.fbc_tail_block_residual, residual, atol=1e-6))
+        self.assertTrue(mint.allclose(outputs[2], expected[2], atol=1e-6))
+        self.assertTrue(mint.allclose(outputs[3], head_outputs[3] + residual, atol=1e-6))
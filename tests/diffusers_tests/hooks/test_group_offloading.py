@@ -0,0 +1,170 @@
+# Copyright 2025 HuggingFace Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import gc
+import unittest
+
+import mindspore as ms
+from mindspore import mint
+
+from mindone.diffusers.hooks import apply_group_offloading
+from mindone.diffusers.hooks.group_offloading import _GROUP_OFFLOADING, _MODEL_OFFLOADING, apply_model_offloading
+
+
+class DummyBlock(ms.nn.Cell):
+    def __init__(self, in_features: int, hidden_features: int, out_features: int) -> None:
+        super().__init__()
+
+        self.proj_in = mint.nn.Linear(in_features, hidden_features)
+        self.activation = mint.nn.ReLU()
+        self.proj_out = mint.nn.Linear(hidden_features, out_features)
+
+    def construct(self, x: ms.Tensor) -> ms.Tensor:
+        x = self.proj_in(x)
+        x = self.activation(x)
+        x = self.proj_out(x)
+        return x
+
+
+class DummyModel(ms.nn.Cell):
+    def __init__(self, in_features: int, hidden_features: int, out_features: int, num_layers: int) -> None:
+        super().__init__()
+
+        self.linear_1 = mint.nn.Linear(in_features, hidden_features)
+        self.activation = mint.nn.ReLU()
+        self.blocks = ms.nn.CellList(
+            [DummyBlock(hidden_features, hidden_features, hidden_features) for _ in range(num_layers)]
+        )
+        self.linear_2 = mint.nn.Linear(hidden_features, out_features)
+
+    def construct(self, x: ms.Tensor) -> ms.Tensor:
+        x = self.linear_1(x)
+        x = self.activation(x)
+        for block in self.blocks:
+            x = block(x)
+        x = self.linear_2(x)
+        return x
+
+
+class DummyAutoencoder(ms.nn.Cell):
+    def __init__(self, features: int) -> None:
+        super().__init__()
+
+        self.encoder = DummyBlock(features, features, features)
+        self.decoder = DummyBlock(features, features, features)
+        # a parameter owned by the root module, as `post_quant_conv` of the autoencoders
+        self.scale = ms.Parameter(mint.ones(features), name="scale")
+
+    def encode(self, x: ms.Tensor) -> ms.Tensor:
+        return self.encoder(x) * self.scale
+
+    def decode(self, z: ms.Tensor) -> ms.Tensor:
+        return self.decoder(z * self.scale)
+
+    def construct(self, x: ms.Tensor) -> ms.Tensor:
+        return self.decode(self.encode(x))
+
+
+class GroupOffloadTests(unittest.TestCase):
+    in_features = 64
+    hidden_features = 256
+    out_features = 64
+    num_layers = 4
+
+    def setUp(self):
+        ms.manual_seed(0)
+        self.model = DummyModel(self.in_features, self.hidden_features, self.out_features, self.num_layers)
+        self.input = mint.randn(4, self.in_features, generator=ms.manual_seed(0))
+
+    def tearDown(self):
+        super().tearDown()
+
+        del self.model
+        del self.input
+        gc.collect()
+
+    def test_offloading_forward_pass(self):
+        output_without_group_offloading = self.model(self.input)
+
+        for kwargs in (
+            {"offload_type": "block_level", "num_blocks_per_group": 1},
+            {"offload_type": "block_level", "num_blocks_per_group": 3, "use_stream": True},
+            {"offload_type": "leaf_level"},
+            {"offload_type": "leaf_level", "use_stream": True, "low_cpu_mem_usage": True},
+        ):
+            apply_group_offloading(self.model, onload_device="Ascend", offload_device="CPU", **kwargs)
+            output = self.model(self.input)
+            self.assertTrue(mint.allclose(output_without_group_offloading, output, atol=1e-5), kwargs)
+
+            self.model._diffusers_hook.remove_hook(_GROUP_OFFLOADING, recurse=True)
+            output = self.model(self.input)
+            self.assertTrue(mint.allclose(output_without_group_offloading, output, atol=1e-5), kwargs)
+
+    def test_block_level_requires_num_blocks_per_group(self):
+        with self.assertRaises(ValueError):
+            apply_group_offloading(self.model, offload_type="block_level")
+
+    def test_model_offloading_keeps_one_model_onloaded(self):
+        other_model = DummyModel(self.in_features, self.hidden_features, self.out_features, self.num_layers)
+        expected = [self.model(self.input), other_model(self.input)]
+
+        hooks = apply_model_offloading([self.model, other_model], onload_device="Ascend", offload_device="CPU")
+        self.assertFalse(any(hook.group.onloaded for hook in hooks))
+
+        output = self.model(self.input)
+        self.assertTrue(mint.allclose(expected[0], output, atol=1e-5))
+        self.assertEqual([hook.group.onloaded for hook in hooks], [True, False])
+
+        output = other_model(self.input)
+        self.assertTrue(mint.allclose(expected[1], output, atol=1e-5))
+        self.assertEqual([hook.group.onloaded for hook in hooks], [False, True])
+
+        for model in (self.model, other_model):
+            model._diffusers_hook.remove_hook(_MODEL_OFFLOADING, recurse=False)
+        self.assertTrue(all(hook.group.onloaded for hook in hooks))
+
+    def test_offloading_entry_methods(self):
+        vae = DummyAutoencoder(self.in_features)
+        expected = [vae.encode(self.input), vae.decode(self.input), vae(self.input)]
+
+        for kwargs in (
+            {"offload_type": "block_level", "num_blocks_per_group": 1},
+            {"offload_type": "leaf_level", "use_stream": True},
+        ):
+            apply_group_offloading(vae, onload_device="Ascend", offload_device="CPU", **kwargs)
+            root_group = vae._diffusers_hook.get_hook(_GROUP_OFFLOADING).group
+            self.assertFalse(root_group.onloaded)
+            outputs = [vae.encode(self.input), vae.decode(self.input), vae(self.input)]
+            for output, expected_output in zip(outputs, expected):
+                self.assertTrue(mint.allclose(expected_output, output, atol=1e-5), kwargs)
+            # the parameters of the root module are offloaded again after each call
+            self.assertFalse(root_group.onloaded)
+
+            vae._diffusers_hook.remove_hook(_GROUP_OFFLOADING, recurse=True)
+            self.assertNotIn("decode", vae.__dict__)
+            self.assertTrue(mint.allclose(expected[1], vae.decode(self.input), atol=1e-5), kwargs)
+
+    def test_model_offloading_entry_methods(self):
+        vae = DummyAutoencoder(self.in_features)
+        expected = [self.model(self.input), vae.decode(self.input)]
+
+        hooks = apply_model_offloading([self.model, vae], onload_device="Ascend", offload_device="CPU")
+        self.model(self.input)
+        output = vae.decode(self.input)
+        self.assertTrue(mint.allclose(expected[1], output, atol=1e-5))
+        # decoding onloads the autoencoder and offloads the other model
+        self.assertEqual([hook.group.onloaded for hook in hooks], [False, True])
+
+        vae._diffusers_hook.remove_hook(_MODEL_OFFLOADING, recurse=False)
+        self.assertNotIn("decode", vae.__dict__)
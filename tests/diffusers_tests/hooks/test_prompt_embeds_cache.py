@@ -0,0 +1,125 @@
+# Copyright 2025 HuggingFace Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import tempfile
+import unittest
+
+import numpy as np
+
+import mindspore as ms
+from mindspore import mint
+
+from mindone.diffusers.hooks import PromptEmbedsCacheConfig, apply_prompt_embeds_cache
+from mindone.diffusers.hooks.prompt_embeds_cache import _PROMPT_EMBEDS_CACHE_HOOK
+from mindone.diffusers.utils import set_adapter_layers, set_weights_and_activate_adapters
+from mindone.peft import LoraConfig, inject_adapter_in_model
+
+
+class DummyTextEncoder(ms.nn.Cell):
+    def __init__(self, vocab_size: int = 32, hidden_size: int = 16) -> None:
+        super().__init__()
+        self.embedding = mint.nn.Embedding(vocab_size, hidden_size)
+        self.proj = mint.nn.Linear(hidden_size, hidden_size)
+        self.num_calls = 0
+
+    def construct(self, input_ids: ms.Tensor, output_hidden_states: bool = False):
+        self.num_calls += 1
+        hidden_states = self.embedding(input_ids)
+        last_hidden_state = self.proj(hidden_states)
+        pooled_output = last_hidden_state.mean(axis=1)
+        if output_hidden_states:
+            return last_hidden_state, pooled_output, (hidden_states, last_hidden_state)
+        return last_hidden_state, pooled_output
+
+
+class PromptEmbedsCacheTests(unittest.TestCase):
+    def setUp(self):
+        ms.manual_seed(0)
+        self.encoder = DummyTextEncoder()
+        self.input_ids = [ms.tensor(np.array([[1, 2, 3, 0]], dtype=np.int32)), ms.tensor(np.array([[4, 5, 0, 0]]))]
+
+    def test_cache_hits(self):
+        expected = [self.encoder(input_ids) for input_ids in self.input_ids]
+        self.encoder.num_calls = 0
+
+        cache = apply_prompt_embeds_cache(self.encoder, PromptEmbedsCacheConfig(max_size=4))
+        for _ in range(3):
+            for input_ids, (last_hidden_state, pooled_output) in zip(self.input_ids, expected):
+                output = self.encoder(input_ids)
+                self.assertTrue(mint.allclose(output[0], last_hidden_state, atol=1e-6))
+                self.assertTrue(mint.allclose(output[1], pooled_output, atol=1e-6))
+        self.assertEqual(self.encoder.num_calls, 2)
+        self.assertEqual((cache.hits, cache.misses), (4, 2))
+
+        # other arguments are part of the key
+        self.encoder(self.input_ids[0], output_hidden_states=True)
+        self.assertEqual(self.encoder.num_calls, 3)
+
+        self.encoder._diffusers_hook.remove_hook(_PROMPT_EMBEDS_CACHE_HOOK, recurse=False)
+        self.encoder(self.input_ids[0])
+        self.assertEqual(self.encoder.num_calls, 4)
+
+    def test_lru_eviction(self):
+        cache = apply_prompt_embeds_cache(self.encoder, PromptEmbedsCacheConfig(max_size=1))
+        self.encoder(self.input_ids[0])
+        self.encoder(self.input_ids[1])
+        self.encoder(self.input_ids[0])
+        self.assertEqual(len(cache), 1)
+        self.assertEqual((cache.hits, cache.misses), (0, 3))
+
+    def test_disk_tier(self):
+        expected = self.encoder(self.input_ids[0], output_hidden_states=True)
+        with tempfile.TemporaryDirectory() as cache_dir:
+            config = PromptEmbedsCacheConfig(max_size=1, cache_dir=cache_dir)
+            cache = apply_prompt_embeds_cache(self.encoder, config)
+            self.encoder._diffusers_hook.get_hook(_PROMPT_EMBEDS_CACHE_HOOK).persistent = True
+
+            self.encoder(self.input_ids[0], output_hidden_states=True)
+            self.encoder(self.input_ids[1], output_hidden_states=True)  # evicts the first output from memory
+            output = self.encoder(self.input_ids[0], output_hidden_states=True)
+
+            self.assertEqual(cache.stats()["disk_hits"], 1)
+            self.assertIsInstance(output[2], tuple)
+            for a, b in zip((output[0], output[1], *output[2]), (expected[0], expected[1], *expected[2])):
+                self.assertEqual(a.dtype, b.dtype)
+                self.assertTrue(mint.allclose(a, b, atol=1e-6))
+
+    def test_adapter_changes(self):
+        cache = apply_prompt_embeds_cache(self.encoder, PromptEmbedsCacheConfig(max_size=4))
+        hook = self.encoder._diffusers_hook.get_hook(_PROMPT_EMBEDS_CACHE_HOOK)
+        base_output = self.encoder(self.input_ids[0])[0]
+
+        for adapter_name in ("a", "b"):
+            config = LoraConfig(r=4, target_modules=["proj"], init_lora_weights=False)
+            inject_adapter_in_model(config, self.encoder, adapter_name)
+        fingerprints = []
+        for adapter_names in (["a"], ["b"], ["a", "b"]):
+            set_weights_and_activate_adapters(self.encoder, adapter_names, [1.0] * len(adapter_names))
+            num_calls = self.encoder.num_calls
+            output = self.encoder(self.input_ids[0])[0]
+            # a new adapter state empties the memory tier and gets its own keys
+            self.assertEqual(self.encoder.num_calls, num_calls + 1)
+            self.assertEqual(len(cache), 1)
+            self.assertFalse(mint.allclose(output, base_output, atol=1e-4))
+            self.encoder(self.input_ids[0])
+            self.assertEqual(self.encoder.num_calls, num_calls + 1)
+            fingerprints.append(hook.weights_fingerprint)
+        self.assertEqual(len(set(fingerprints)), 3)
+
+        # so does disabling the adapters, whose output is the one of the base encoder again
+        set_adapter_layers(self.encoder, enabled=False)
+        output = self.encoder(self.input_ids[0])[0]
+        self.assertTrue(mint.allclose(output, base_output, atol=1e-6))
+        self.assertNotIn(hook.weights_fingerprint, fingerprints)
+        self.assertEqual(self.encoder.num_calls, 5)
@@ -0,0 +1,147 @@
+# Copyright 2025 HuggingFace Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import numpy as np
+
+import mindspore as ms
+from mindspore import mint
+
+from mindone.diffusers.hooks import MagCacheConfig, TeaCacheConfig, fit_magcache_ratios, fit_teacache_coefficients
+from mindone.diffusers.hooks._helpers import TransformerBlockMetadata, TransformerBlockRegistry
+from mindone.diffusers.models.cache_utils import CacheMixin
+
+
+class DummyTransformerBlock(ms.nn.Cell):
+    def __init__(self, features: int) -> None:
+        super().__init__()
+
+        self.proj = mint.nn.Linear(features, features)
+        self.num_calls = 0
+
+    def construct(self, hidden_states: ms.Tensor, temb: ms.Tensor) -> ms.Tensor:
+        self.num_calls += 1
+        return hidden_states + mint.tanh(self.proj(hidden_states)) * temb
+
+
+TransformerBlockRegistry.register(DummyTransformerBlock, TransformerBlockMetadata(return_hidden_states_index=0))
+
+
+class DummyTransformer(ms.nn.Cell, CacheMixin):
+    def __init__(self, features: int, num_layers: int) -> None:
+        super().__init__()
+
+        self.transformer_blocks = ms.nn.CellList([DummyTransformerBlock(features) for _ in range(num_layers)])
+
+    def construct(self, hidden_states: ms.Tensor, temb: ms.Tensor) -> ms.Tensor:
+        for block in self.transformer_blocks:
+            hidden_states = block(hidden_states, temb)
+        return hidden_states
+
+
+class TimestepCacheTests(unittest.TestCase):
+    features = 8
+
+    def setUp(self):
+        ms.manual_seed(0)
+        self.model = DummyTransformer(self.features, num_layers=3)
+        self.hidden_states = ms.tensor(np.random.default_rng(0).standard_normal((2, self.features)), ms.float32)
+
+    def run_steps(self, temb_scales):
+        """Runs one step per scale of the timestep embedding and returns whether each step was computed."""
+        computed, outputs = [], []
+        for scale in temb_scales:
+            num_calls = self.model.transformer_blocks[-1].num_calls
+            with self.model.cache_context("cond"):
+                outputs.append(self.model(self.hidden_states, ms.tensor(np.full((2, 1), scale), ms.float32)))
+            computed.append(self.model.transformer_blocks[-1].num_calls > num_calls)
+        return computed, outputs
+
+    def test_teacache_skip_decisions(self):
+        # relative L1 distances between consecutive embeddings: 0.02, 0.0196, 0.25, 0.0077, 0.0076
+        temb_scales = [1.0, 1.02, 1.04, 1.3, 1.31, 1.32]
+        self.model.enable_cache(TeaCacheConfig(num_inference_steps=6, threshold=0.1, retention_ratio=0.0))
+
+        # the distances accumulate until the threshold, the last step is always computed
+        expected = [True, False, False, True, False, True]
+        computed, outputs = self.run_steps(temb_scales)
+        self.assertEqual(computed, expected)
+        # a skipped step adds the residual of the last computed step to its input
+        residual = outputs[0] - self.hidden_states
+        self.assertTrue(mint.allclose(outputs[1], self.hidden_states + residual, atol=1e-6))
+
+        # the state is reset for the next generation
+        computed, _ = self.run_steps(temb_scales)
+        self.assertEqual(computed, expected)
+
+    def test_teacache_rescaling_and_retention(self):
+        temb_scales = [1.0, 1.02, 1.04, 1.3, 1.31, 1.32]
+        # only the fourth rescaled distance is below the threshold
+        config = TeaCacheConfig(num_inference_steps=6, threshold=0.1, coefficients=[10.0, 0.0], retention_ratio=0.0)
+        self.model.enable_cache(config)
+        self.assertEqual(self.run_steps(temb_scales)[0], [True, True, True, True, False, True])
+        self.model.disable_cache()
+
+        self.model.enable_cache(TeaCacheConfig(num_inference_steps=6, threshold=0.3, retention_ratio=0.0))
+        self.assertEqual(self.run_steps(temb_scales)[0], [True, False, False, False, False, True])
+        self.model.disable_cache()
+
+        # the first half of the steps is always computed, and the distances only accumulate after them
+        self.model.enable_cache(TeaCacheConfig(num_inference_steps=6, threshold=0.3, retention_ratio=0.5))
+        self.assertEqual(self.run_steps(temb_scales)[0], [True, True, True, False, False, True])
+
+    def test_teacache_calibration(self):
+        self.model.enable_cache(TeaCacheConfig(num_inference_steps=6, calibrate=True))
+        with self.assertRaises(ValueError):
+            fit_teacache_coefficients(self.model)
+
+        for offset in (0.0, 0.5):
+            computed, _ = self.run_steps([1.0 + offset + 0.1 * i for i in range(6)])
+            self.assertTrue(all(computed))
+        coefficients = fit_teacache_coefficients(self.model, degree=1)
+        self.assertEqual(len(coefficients), 2)
+        self.assertTrue(all(np.isfinite(coefficients)))
+
+    def test_magcache_skip_decisions(self):
+        mag_ratios = [1.0, 0.99, 0.98, 0.97, 0.9, 0.99, 0.99, 0.99]
+        config = MagCacheConfig(num_inference_steps=8, mag_ratios=mag_ratios, threshold=0.06, retention_ratio=0.25)
+        self.model.enable_cache(config)
+
+        # the first quarter of the steps is computed, then the error of the ratios accumulates until the threshold
+        expected = [True, True, False, True, True, False, False, True]
+        computed, _ = self.run_steps([1.0] * 8)
+        self.assertEqual(computed, expected)
+        computed, _ = self.run_steps([1.0] * 8)
+        self.assertEqual(computed, expected)
+
+    def test_magcache_max_skip_steps(self):
+        config = MagCacheConfig(num_inference_steps=8, mag_ratios=[1.0] * 8, retention_ratio=0.0, max_skip_steps=2)
+        self.model.enable_cache(config)
+        self.assertEqual(self.run_steps([1.0] * 8)[0], [True, False, False, True, False, False, True, True])
+
+    def test_magcache_calibration(self):
+        with self.assertRaises(ValueError):
+            self.model.enable_cache(MagCacheConfig(num_inference_steps=4))
+
+        self.model.enable_cache(MagCacheConfig(num_inference_steps=4, calibrate=True))
+        computed, outputs = self.run_steps([1.0, 0.8, 0.6, 0.4])
+        self.assertTrue(all(computed))
+        mag_ratios = fit_magcache_ratios(self.model)
+        self.assertEqual(len(mag_ratios), 4)
+        self.assertEqual(mag_ratios[0], 1.0)
+
+        norms = [np.linalg.norm((output - self.hidden_states).asnumpy(), axis=-1).mean() for output in outputs]
+        expected = [norms[i] / norms[i - 1] for i in range(1, 4)]
+        np.testing.assert_allclose(mag_ratios[1:], expected, rtol=1e-5)
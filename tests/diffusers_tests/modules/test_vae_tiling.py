@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+import mindspore as ms
+
+from mindone.diffusers.models.autoencoders.autoencoder_kl import AutoencoderKL
+
+
+def get_autoencoder_kl():
+    ms.manual_seed(0)
+    return AutoencoderKL(
+        block_out_channels=(8, 16),
+        down_block_types=["DownEncoderBlock2D"] * 2,
+        up_block_types=["UpDecoderBlock2D"] * 2,
+        latent_channels=4,
+        norm_num_groups=4,
+        sample_size=16,
+    )
+
+
+@pytest.mark.parametrize("height,width", [(16, 40), (40, 16), (24, 40), (40, 40)])
+@pytest.mark.parametrize("tile_batch_size", [1, 3, 16])
+def test_batched_tiling_matches_tiling(height, width, tile_batch_size):
+    vae = get_autoencoder_kl()
+    rng = np.random.default_rng(0)
+    x = ms.tensor(rng.standard_normal((2, 3, height, width)), ms.float32)
+    z = ms.tensor(rng.standard_normal((2, 4, height // 2, width // 2)), ms.float32)
+
+    vae.enable_tiling()
+    expected_latents = vae._encode(x).asnumpy()
+    expected_images = vae.decode(z)[0].asnumpy()
+
+    vae.enable_batched_tiling(tile_batch_size)
+    latents = vae._encode(x).asnumpy()
+    images = vae.decode(z)[0].asnumpy()
+    assert latents.shape == expected_latents.shape and images.shape == expected_images.shape
+
+    # the rows then the columns are blended, corners included
+    np.testing.assert_allclose(latents, expected_latents, atol=1e-5)
+    np.testing.assert_allclose(images, expected_images, atol=1e-5)
+
+    vae.disable_tiling()
+    assert vae.tile_batch_size is None
@@ -10,7 +10,9 @@ from transformers import CLIPTextConfig
 
 import mindspore as ms
 
-from mindone.diffusers.utils.testing_utils import load_numpy_from_local_file, slow
+from mindone.diffusers.hooks import FirstBlockCacheConfig
+from mindone.diffusers.utils import logging
+from mindone.diffusers.utils.testing_utils import CaptureLogger, load_numpy_from_local_file, slow
 
 from ..pipeline_test_utils import (
     THRESHOLD_FP16,
@@ -170,6 +172,90 @@ class FluxPipelineFastTests(PipelineTesterMixin, unittest.TestCase):
         threshold = THRESHOLD_FP32 if dtype == "float32" else THRESHOLD_FP16
         assert np.max(np.linalg.norm(pt_image_slice - ms_image_slice) / np.linalg.norm(pt_image_slice)) < threshold
 
+    def test_flux_compiled_denoise_loop(self):
+        ms.set_context(mode=ms.PYNATIVE_MODE)
+
+        _, ms_components = self.get_dummy_components()
+        ms_pipe_cls = get_module("mindone.diffusers.pipelines.flux.pipeline_flux.FluxPipeline")
+        ms_pipe = ms_pipe_cls(**ms_components)
+
+        inputs = self.get_dummy_inputs()
+        eager_image = ms_pipe(**inputs, generator=np.random.default_rng(0))[0]
+
+        ms_pipe.compile_denoise_loop(num_inference_steps=1, shapes=[(inputs["height"], inputs["width"])])
+        compiled_image = ms_pipe(**inputs, generator=np.random.default_rng(0))[0]
+        assert np.max(np.abs(eager_image - compiled_image)) < 1e-4
+
+        # the scheduler shared with the pipelines created by `from_pipe` is left unchanged
+        sibling_pipe = ms_pipe_cls.from_pipe(ms_pipe)
+        sibling_image = sibling_pipe(**inputs, generator=np.random.default_rng(0))[0]
+        assert np.max(np.abs(eager_image - sibling_image)) < 1e-6
+
+        # the features the compiled step does not support fall back to the eager loop
+        logger = logging.get_logger("mindone.diffusers.pipelines.pipeline_utils")
+        ms_pipe.transformer.enable_cache(FirstBlockCacheConfig(threshold=0.0))
+        with CaptureLogger(logger) as cap_logger:
+            cached_image = ms_pipe(**inputs, generator=np.random.default_rng(0))[0]
+        assert "does not support cache" in cap_logger.out
+        assert np.max(np.abs(eager_image - cached_image)) < 1e-4
+        ms_pipe.transformer.disable_cache()
+
+        ms_pipe.disable_compiled_denoise_loop()
+        eager_image_again = ms_pipe(**inputs, generator=np.random.default_rng(0))[0]
+        assert np.max(np.abs(eager_image - eager_image_again)) < 1e-6
+
+    def test_flux_serving_engine(self):
+        ms.set_context(mode=ms.PYNATIVE_MODE)
+
+        _, ms_components = self.get_dummy_components()
+        ms_pipe_cls = get_module("mindone.diffusers.pipelines.flux.pipeline_flux.FluxPipeline")
+        ms_pipe = ms_pipe_cls(**ms_components)
+        engine_cls = get_module("mindone.diffusers.pipelines.serving_engine.DiffusionServingEngine")
+
+        requests = [
+            dict(prompt="A painting of a squirrel eating a burger", height=8, width=8, num_inference_steps=2),
+            dict(prompt="A photo of a cat", height=8, width=8, num_inference_steps=3),
+            dict(prompt="A photo of a dog", height=16, width=8, num_inference_steps=2),
+        ]
+        expected = [
+            ms_pipe(**kwargs, max_sequence_length=48, output_type="np", generator=np.random.default_rng(i))[0][0]
+            for i, kwargs in enumerate(requests)
+        ]
+
+        engine = engine_cls(ms_pipe, max_batch_size=2, max_sequence_length=48, output_type="np")
+        for i, kwargs in enumerate(requests):
+            engine.add_request(str(i), generator=np.random.default_rng(i), **kwargs)
+        finished = {request.request_id: request.image for request in engine.generate()}
+
+        assert sorted(finished) == ["0", "1", "2"]
+        for i, image in enumerate(expected):
+            assert np.max(np.abs(finished[str(i)] - image)) < 1e-4
+
+    def test_flux_cpu_offload(self):
+        ms.set_context(mode=ms.PYNATIVE_MODE)
+
+        _, ms_components = self.get_dummy_components()
+        ms_pipe_cls = get_module("mindone.diffusers.pipelines.flux.pipeline_flux.FluxPipeline")
+        ms_pipe = ms_pipe_cls(**ms_components)
+
+        inputs = self.get_dummy_inputs()
+        expected = ms_pipe(**inputs, generator=np.random.default_rng(0))[0]
+
+        # the vae is only called with `vae.decode`, never with its `construct`
+        ms_pipe.enable_model_cpu_offload()
+        image = ms_pipe(**inputs, generator=np.random.default_rng(0))[0]
+        assert np.max(np.abs(expected - image)) < 1e-4
+        # `maybe_free_model_hooks` offloads the last model at the end of the call
+        assert not any(hook.group.onloaded for hook in ms_pipe._all_hooks)
+
+        ms_pipe.enable_sequential_cpu_offload()
+        image = ms_pipe(**inputs, generator=np.random.default_rng(0))[0]
+        assert np.max(np.abs(expected - image)) < 1e-4
+
+        ms_pipe.remove_all_hooks()
+        image = ms_pipe(**inputs, generator=np.random.default_rng(0))[0]
+        assert np.max(np.abs(expected - image)) < 1e-6
+
 
 @slow
 @ddt
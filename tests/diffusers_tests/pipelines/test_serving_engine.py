@@ -0,0 +1,85 @@
+import unittest
+
+import numpy as np
+
+import mindspore as ms
+from mindspore import mint
+
+from mindone.diffusers.pipelines.serving_engine import DiffusionServingEngine
+from mindone.diffusers.schedulers import FlowMatchEulerDiscreteScheduler
+
+
+class DummyServingPipeline:
+    """Implements the serving hooks with a denoiser predicting the timestep of each sample."""
+
+    def __init__(self):
+        self.scheduler = FlowMatchEulerDiscreteScheduler()
+        self.batch_sizes = []
+
+    def _prepare_serving_request(self, request, scheduler, max_sequence_length=None):
+        request.guidance_mode = request.true_cfg_scale > 1
+        request.latents = mint.zeros((1, 2), dtype=ms.float32)
+        scheduler.set_timesteps(request.num_inference_steps)
+        request.timesteps = scheduler.timesteps.asnumpy()
+        request.sigmas = scheduler.sigmas.asnumpy()
+
+    def _collate_serving_conditions(self, requests):
+        return {}
+
+    def _serving_denoise(self, latents, timesteps, conditions):
+        self.batch_sizes.append(latents.shape[0])
+        return timesteps.reshape(-1, 1).broadcast_to(latents.shape) / 1000
+
+    def _decode_serving_latents(self, latents, height, width, output_type):
+        return latents.asnumpy()
+
+
+class DiffusionServingEngineTests(unittest.TestCase):
+    def expected_latents(self, num_inference_steps):
+        scheduler = FlowMatchEulerDiscreteScheduler()
+        scheduler.set_timesteps(num_inference_steps)
+        timesteps, sigmas = scheduler.timesteps.asnumpy(), scheduler.sigmas.asnumpy()
+        return np.sum((sigmas[1:] - sigmas[:-1]) * timesteps / 1000)
+
+    def test_batches_respect_max_batch_size(self):
+        pipe = DummyServingPipeline()
+        engine = DiffusionServingEngine(pipe, max_batch_size=2)
+        steps = {"0": 3, "1": 2, "2": 4, "3": 1, "4": 2}
+        for request_id, num_inference_steps in steps.items():
+            engine.add_request(request_id, "", height=8, width=8, num_inference_steps=num_inference_steps)
+
+        finished = {}
+        while engine.has_unfinished_requests():
+            for request in engine.step():
+                finished[request.request_id] = request.image
+            self.assertTrue(all(len(batch) <= 2 for batch in engine.running.values()))
+
+        self.assertEqual(sorted(finished), sorted(steps))
+        self.assertTrue(max(pipe.batch_sizes) <= 2)
+        # every step of every request ran exactly once
+        self.assertEqual(sum(pipe.batch_sizes), sum(steps.values()))
+        for request_id, num_inference_steps in steps.items():
+            np.testing.assert_allclose(finished[request_id], self.expected_latents(num_inference_steps), rtol=1e-5)
+
+    def test_full_batch_starts_a_new_batch(self):
+        pipe = DummyServingPipeline()
+        engine = DiffusionServingEngine(pipe, max_batch_size=2)
+        engine.add_request("0", "", height=8, width=8, num_inference_steps=2, true_cfg_scale=2.0)
+        for request_id in ("1", "2", "3"):
+            engine.add_request(request_id, "", height=8, width=8, num_inference_steps=2)
+
+        # the other requests are admitted while the batch of "0" is filled, "3" does not fit next to "1" and "2"
+        key, batch = engine._select_batch()
+        self.assertEqual(key, (8, 8, True, 0))
+        self.assertEqual(
+            {k: [r.request_id for r in b] for k, b in engine.running.items()},
+            {
+                (8, 8, True, 0): ["0"],
+                (8, 8, False, 0): ["1", "2"],
+                (8, 8, False, 1): ["3"],
+            },
+        )
+
+        finished = [request.request_id for request in engine.generate()]
+        self.assertEqual(sorted(finished), ["0", "1", "2", "3"])
+        self.assertEqual(sorted(pipe.batch_sizes), [1, 1, 1, 1, 2, 2])
@@ -217,3 +217,40 @@ def test_schedulers(scheduler_name, dtype):
             np.max(np.abs(output_ms.asnumpy() - output_pt.numpy())) / np.mean(np.abs(output_pt.numpy())) < STEP_THR_FP32
         )
     assert output_ms.dtype == ms_dtype and output_pt.dtype == pt_dtype
+
+
+@pytest.mark.parametrize(
+    "scheduler_name, kwargs",
+    [
+        ("FlowMatchEulerDiscreteScheduler", {}),
+        ("DPMSolverMultistepScheduler", {}),
+        ("DPMSolverMultistepScheduler", {"thresholding": True, "lambda_min_clipped": -5.1}),
+    ],
+)
+def test_device_resident_schedulers(scheduler_name, kwargs):
+    ms.set_context(mode=ms.PYNATIVE_MODE)
+    np.random.seed(0)
+    noise = ms.tensor(np.random.randn(4, 3, 8, 8), ms.float32)
+    scheduler_cls = getattr(importlib.import_module("mindone.diffusers.schedulers"), scheduler_name)
+
+    outputs = []
+    for device_resident in (False, True):
+        scheduler = scheduler_cls(**kwargs)
+        scheduler.set_timesteps(10)
+        scheduler.set_device_resident(device_resident)
+        sample = noise
+        for t in scheduler.timesteps:
+            sample = scheduler.step(0.1 * sample, t, sample)[0]
+        outputs.append(sample.asnumpy())
+
+    assert np.max(np.abs(outputs[0] - outputs[1])) < THR
+
+
+def test_flow_match_index_for_timestep():
+    scheduler = importlib.import_module("mindone.diffusers.schedulers").FlowMatchEulerDiscreteScheduler()
+    scheduler.set_timesteps(10)
+    timesteps = scheduler.timesteps.asnumpy()
+    assert scheduler.index_for_timestep(float(timesteps[3])) == 3
+    assert scheduler.index_for_timestep(scheduler.timesteps[3]) == 3
+    with pytest.raises(ValueError, match="not in the schedule"):
+        scheduler.index_for_timestep(float(timesteps[3]) + 0.5)
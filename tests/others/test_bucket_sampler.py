@@ -0,0 +1,131 @@
+from collections import Counter
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from mindone.data import BaseDataset, create_dataloader
+from mindone.data.sampler import BucketBatchSampler
+
+# (height, width) of the buckets and the number of samples in each
+BUCKETS = {(4, 4): 20, (4, 8): 13, (8, 8): 7}
+
+
+class ShapeDataset(BaseDataset):
+    output_columns = ["image", "index"]
+
+    def __init__(self):
+        self.shapes = [shape for shape, num in BUCKETS.items() for _ in range(num)]
+
+    def __getitem__(self, idx):
+        return np.full(self.shapes[idx], idx, dtype=np.float32), np.array(idx, dtype=np.int32)
+
+    def __len__(self):
+        return len(self.shapes)
+
+    def get_bucket_key(self, idx):
+        return self.shapes[idx]
+
+    def get_bucket_cost(self, key):
+        return key[0] * key[1]
+
+    @staticmethod
+    def train_transforms(**kwargs):
+        return []
+
+
+def _flatten(batches):
+    return [idx for batch in batches for idx in batch]
+
+
+@pytest.mark.parametrize("drop_remainder", [True, False])
+def test_batch_budget(drop_remainder):
+    dataset = ShapeDataset()
+    sampler = BucketBatchSampler(dataset, batch_size=6, batch_budget=128, drop_remainder=drop_remainder)
+    # min(batch_size, budget // cost) samples per batch
+    expected_sizes = {(4, 4): 6, (4, 8): 4, (8, 8): 2}
+    batches = sampler.get_batches(0)
+    for batch in batches:
+        shapes = {dataset.get_bucket_key(idx) for idx in batch}
+        assert len(shapes) == 1
+        (shape,) = shapes
+        cost = len(batch) * dataset.get_bucket_cost(shape)
+        assert cost <= 128
+        if drop_remainder:
+            assert len(batch) == expected_sizes[shape]
+        else:
+            assert len(batch) <= expected_sizes[shape]
+
+    indices = _flatten(batches)
+    assert len(indices) == len(set(indices))
+    if drop_remainder:
+        assert len(indices) == sum(
+            num // expected_sizes[shape] * expected_sizes[shape] for shape, num in BUCKETS.items()
+        )
+    else:
+        assert sorted(indices) == list(range(len(dataset)))
+
+
+def test_oversized_sample_gets_its_own_batch():
+    sampler = BucketBatchSampler(ShapeDataset(), batch_size=4, batch_budget=10, drop_remainder=False)
+    assert {len(batch) for batch in sampler.get_batches(0)} == {1}
+
+
+def test_fixed_batch_size():
+    sampler = BucketBatchSampler(ShapeDataset(), batch_size=5, shuffle=False)
+    assert [len(batch) for batch in sampler.get_batches(0)] == [5] * (20 // 5 + 13 // 5 + 7 // 5)
+    assert len(sampler) == 5 * len(sampler.get_batches(0))
+
+
+def test_plan_is_deterministic_and_sharded():
+    dataset = ShapeDataset()
+    full = BucketBatchSampler(dataset, batch_size=6, batch_budget=128, seed=1).get_batches(0)
+    assert full == BucketBatchSampler(dataset, batch_size=6, batch_budget=128, seed=1).get_batches(0)
+    assert full != BucketBatchSampler(dataset, batch_size=6, batch_budget=128, seed=1).get_batches(1)
+
+    num_shards = 3
+    shards = [
+        BucketBatchSampler(dataset, batch_size=6, batch_budget=128, seed=1, num_shards=num_shards, shard_id=i)
+        for i in range(num_shards)
+    ]
+    plans = [shard.get_batches(0) for shard in shards]
+    # same number of batches on every shard, taken without overlap from the shared plan
+    assert len({len(plan) for plan in plans}) == 1
+    assert len(plans[0]) == len(full) // num_shards
+    indices = [idx for plan in plans for idx in _flatten(plan)]
+    assert len(indices) == len(set(indices))
+    assert set(indices) <= set(_flatten(full))
+
+
+def test_iteration_and_batch_size_callable():
+    sampler = BucketBatchSampler(ShapeDataset(), batch_size=6, batch_budget=128)
+    for epoch in range(2):
+        batches = sampler.get_batches(epoch)
+        assert list(sampler) == _flatten(batches)
+        sizes = [
+            sampler.get_batch_size(SimpleNamespace(get_epoch_num=lambda: epoch, get_batch_num=lambda i=i: i))
+            for i in range(len(batches))
+        ]
+        assert sizes == [len(batch) for batch in batches]
+
+
+def test_create_dataloader_with_bucketing():
+    dataset = ShapeDataset()
+    dataloader = create_dataloader(
+        dataset,
+        batch_size=6,
+        shuffle=True,
+        num_workers=1,
+        num_workers_dataset=1,
+        num_workers_batch=1,
+        python_multiprocessing=False,
+        bucketing=True,
+        batch_budget=128,
+    )
+    expected = BucketBatchSampler(dataset, batch_size=6, batch_budget=128, shuffle=True).get_batches(0)
+    batches = list(dataloader.create_tuple_iterator(num_epochs=1, output_numpy=True))
+    assert len(batches) == len(expected)
+    for (images, indices), batch in zip(batches, expected):
+        assert indices.tolist() == batch
+        assert images.shape == (len(batch), *dataset.get_bucket_key(batch[0]))
+    assert Counter(images.shape[1:] for images, _ in batches).keys() == BUCKETS.keys()
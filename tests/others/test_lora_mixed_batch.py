@@ -0,0 +1,135 @@
+import numpy as np
+import pytest
+
+import mindspore as ms
+from mindspore import mint, nn
+
+from mindone.peft import LoraAdapterRegistry, LoraConfig, get_peft_model
+from mindone.peft.tuners.lora import LoraLayer
+from mindone.peft.utils import get_peft_model_state_dict, set_peft_model_state_dict
+from mindone.peft.utils.other import refresh_parameter_name_of_model
+
+FEATURES = 8
+ADAPTER_NAMES = ["cat", "__base__", "dog", "cat", "fox", "__base__"]
+
+
+class TwoLayerModel(nn.Cell):
+    def __init__(self):
+        super().__init__()
+        self.q = mint.nn.Linear(FEATURES, FEATURES)
+        self.v = mint.nn.Linear(FEATURES, FEATURES)
+
+    def construct(self, x):
+        return self.v(mint.nn.functional.relu(self.q(x)))
+
+
+def _peft_model():
+    ms.manual_seed(0)
+    # adapters of different ranks and scalings, "fox" only targets one layer
+    configs = {
+        "cat": LoraConfig(r=4, lora_alpha=8, target_modules=["q", "v"], init_lora_weights=False),
+        "dog": LoraConfig(r=2, lora_alpha=2, target_modules=["q", "v"], init_lora_weights=False, lora_bias=True),
+        "fox": LoraConfig(r=3, lora_alpha=6, target_modules=["v"], init_lora_weights=False),
+    }
+    model = get_peft_model(TwoLayerModel(), configs["cat"], adapter_name="cat")
+    for name in ("dog", "fox"):
+        model.add_adapter(name, configs[name])
+    model.set_train(False)
+    return model
+
+
+def _inputs():
+    return ms.tensor(np.random.default_rng(0).standard_normal((len(ADAPTER_NAMES), 3, FEATURES)), ms.float32)
+
+
+def _lora_layers(model):
+    return [module for _, module in model.cells_and_names() if isinstance(module, LoraLayer)]
+
+
+def _loop_forward(layer, x, adapter_names):
+    # the per-adapter loop of `_mixed_batch_forward`, which is used in training mode
+    layer.training = True
+    try:
+        return layer._mixed_batch_forward(x, adapter_names=adapter_names)
+    finally:
+        layer.training = False
+
+
+def _assert_grouped_matches_loop(model, x):
+    for layer in _lora_layers(model):
+        grouped = layer._mixed_batch_forward(x, adapter_names=ADAPTER_NAMES)
+        expected = _loop_forward(layer, x, ADAPTER_NAMES)
+        np.testing.assert_allclose(grouped.asnumpy(), expected.asnumpy(), rtol=1e-5, atol=1e-5)
+
+
+def test_grouped_matches_loop():
+    model = _peft_model()
+    x = _inputs()
+    _assert_grouped_matches_loop(model, x)
+
+    # the whole model gives every sample the output of its own adapter
+    output = model(x, adapter_names=ADAPTER_NAMES).asnumpy()
+    for name in set(ADAPTER_NAMES):
+        indices = [i for i, n in enumerate(ADAPTER_NAMES) if n == name]
+        if name == "__base__":
+            model.base_model.disable_adapter_layers()
+            expected = model(x[indices])
+            model.base_model.enable_adapter_layers()
+        else:
+            model.set_adapter(name)
+            expected = model(x[indices])
+        np.testing.assert_allclose(output[indices], expected.asnumpy(), rtol=1e-5, atol=1e-5)
+
+
+@pytest.mark.parametrize("update", ["set_peft_model_state_dict", "set_train"])
+def test_stacked_weights_follow_weight_updates(update):
+    model = _peft_model()
+    x = _inputs()
+    _assert_grouped_matches_loop(model, x)  # builds the stacks
+    weight = model.base_model.model.q.lora_A["cat"].weight.asnumpy()
+
+    if update == "set_peft_model_state_dict":
+        state_dict = get_peft_model_state_dict(model, adapter_name="cat")
+        state_dict = {key: ms.Parameter(value * 2, name=key) for key, value in state_dict.items()}
+        refresh_parameter_name_of_model(model, only_peft=True)
+        set_peft_model_state_dict(model, state_dict, adapter_name="cat")
+    else:
+        # e.g. a training step, which updates the weights in place
+        model.set_train(True)
+        for name, param in model.parameters_and_names():
+            if "lora_" in name and ".cat." in name:
+                param.set_data(param * 2)
+        model.set_train(False)
+    np.testing.assert_allclose(model.base_model.model.q.lora_A["cat"].weight.asnumpy(), weight * 2)
+    _assert_grouped_matches_loop(model, x)
+
+
+def test_registry_page_out_and_in():
+    model = _peft_model()
+    x = _inputs()
+    expected = model(x, adapter_names=ADAPTER_NAMES).asnumpy()
+
+    registry = LoraAdapterRegistry(model, max_loaded_adapters=3)
+    registry.page_out("cat")
+    assert registry.loaded_adapters == ["dog", "fox"] and "cat" in registry
+    registry.max_loaded_adapters = 2
+
+    # "dog" is the least recently used adapter that the batch does not need
+    adapter_names = registry.prepare(["cat", "__base__", "fox"])
+    assert registry.loaded_adapters == ["cat", "fox"]
+    assert registry.stats() == {"loaded": 2, "host": 1, "registered": 0, "page_ins": 1, "page_outs": 2}
+
+    names = ["cat", "__base__", "fox"]
+    indices = [ADAPTER_NAMES.index(name) for name in names]
+    output = model(x[indices], adapter_names=adapter_names).asnumpy()
+    np.testing.assert_allclose(output, expected[indices], rtol=1e-5, atol=1e-5)
+
+    # and back, "dog" is paged in from host memory as well
+    adapter_names = registry.prepare(["dog", "cat"])
+    assert registry.loaded_adapters == ["dog", "cat"]
+    indices = [ADAPTER_NAMES.index(name) for name in adapter_names]
+    output = model(x[indices], adapter_names=adapter_names).asnumpy()
+    np.testing.assert_allclose(output, expected[indices], rtol=1e-5, atol=1e-5)
+
+    with pytest.raises(ValueError, match="more than"):
+        registry.prepare(["cat", "dog", "fox"])
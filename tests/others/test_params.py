@@ -0,0 +1,81 @@
+from unittest import mock
+
+import numpy as np
+import pytest
+
+import mindspore as ms
+from mindspore import mint, nn
+
+from mindone.safetensors import mindspore as safetensors_ms
+from mindone.safetensors.mindspore import save_file
+from mindone.utils.params import load_checkpoint_to_net, load_param_into_net_with_filter
+
+
+class Net(nn.Cell):
+    def __init__(self):
+        super().__init__()
+        self.proj = mint.nn.Linear(3, 4)
+        self.out = mint.nn.Linear(4, 2)
+
+
+def _random_state(net, seed=0):
+    rng = np.random.default_rng(seed)
+    return {p.name: rng.standard_normal(p.shape).astype(np.float32) for p in net.get_parameters()}
+
+
+def _assert_loaded(net, state):
+    for p in net.get_parameters():
+        np.testing.assert_array_equal(p.asnumpy(), state[p.name])
+
+
+@pytest.mark.parametrize("kind", ["parameter", "tensor", "ndarray"])
+def test_dict_and_iterable_values(kind):
+    convert = {
+        "parameter": lambda k, v: ms.Parameter(ms.tensor(v), name=k),
+        "tensor": lambda k, v: ms.tensor(v),
+        "ndarray": lambda k, v: v,
+    }[kind]
+    for as_iterable in (False, True):
+        net = Net()
+        state = _random_state(net)
+        param_dict = {k: convert(k, v) for k, v in state.items()}
+        param_not_load, ckpt_not_load = load_param_into_net_with_filter(
+            net, iter(param_dict.items()) if as_iterable else param_dict
+        )
+        assert param_not_load == [] and ckpt_not_load == []
+        _assert_loaded(net, state)
+
+
+def test_invalid_value():
+    net = Net()
+    with pytest.raises(TypeError):
+        load_param_into_net_with_filter(net, {"proj.weight": [1.0, 2.0]})
+
+
+def test_streaming_safetensors(tmp_path):
+    net = Net()
+    state = _random_state(net)
+    path = str(tmp_path / "net.safetensors")
+    save_file({k: ms.tensor(v) for k, v in state.items()}, path)
+
+    load_checkpoint_to_net(net, path, ensure_all_ckpt_params_loaded=True)
+    _assert_loaded(net, state)
+
+
+@pytest.mark.parametrize("state", [{}, {"other.weight": np.zeros((2,), dtype=np.float32)}])
+def test_safetensors_handle_closed(tmp_path, state):
+    # key-less and fully unmatched checkpoints must release the mapping as well
+    path = str(tmp_path / "net.safetensors")
+    save_file({k: ms.tensor(v) for k, v in state.items()}, path)
+
+    handles = []
+
+    class RecordingSafeOpen(safetensors_ms.safe_open):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            handles.append(self)
+
+    with mock.patch("mindone.utils.params.safe_open", RecordingSafeOpen):
+        load_checkpoint_to_net(Net(), path)
+    assert len(handles) == 1
+    assert handles[0]._mmap is None and handles[0]._file.closed
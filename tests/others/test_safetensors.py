@@ -0,0 +1,73 @@
+import json
+import struct
+
+import numpy as np
+import pytest
+
+import mindspore as ms
+
+from mindone.safetensors.mindspore import load_file, safe_open, save_file
+
+
+@pytest.fixture
+def tensors():
+    rng = np.random.default_rng(0)
+    return {
+        "vae.encoder.weight": rng.standard_normal((4, 3)).astype(np.float32),
+        "vae.decoder.bias": rng.standard_normal((5,)).astype(np.float16),
+        "text_encoder.embedding": rng.integers(0, 100, (2, 6)).astype(np.int64),
+        "unet.scale": np.array(True),
+    }
+
+
+@pytest.fixture
+def filename(tmp_path, tensors):
+    path = str(tmp_path / "model.safetensors")
+    save_file({k: ms.tensor(v) for k, v in tensors.items()}, path, metadata={"format": "np"})
+    return path
+
+
+def test_load_file_round_trip(filename, tensors):
+    loaded = load_file(filename)
+    assert sorted(loaded) == sorted(tensors)
+    for k, v in tensors.items():
+        assert loaded[k].dtype == ms.tensor(v).dtype
+        np.testing.assert_array_equal(loaded[k].asnumpy(), v)
+
+
+def test_load_file_prefix_and_filter(filename, tensors):
+    assert sorted(load_file(filename, prefix="vae.")) == ["vae.decoder.bias", "vae.encoder.weight"]
+    assert list(load_file(filename, filter_fn=lambda k: k.endswith("bias"))) == ["vae.decoder.bias"]
+
+    loaded = load_file(filename, prefix="vae.", filter_fn=lambda k: "encoder" in k, strip_prefix=True)
+    assert list(loaded) == ["encoder.weight"]
+    assert loaded["encoder.weight"].name == "encoder.weight"
+    np.testing.assert_array_equal(loaded["encoder.weight"].asnumpy(), tensors["vae.encoder.weight"])
+
+
+def test_safe_open(filename, tensors):
+    with safe_open(filename) as f:
+        assert f.metadata() == {"format": "np"}
+        assert sorted(f.keys()) == sorted(tensors)
+        assert f.keys(prefix="text_encoder.") == ["text_encoder.embedding"]
+        np.testing.assert_array_equal(f.get_numpy("vae.encoder.weight"), tensors["vae.encoder.weight"])
+        names = [name for name, _ in f.iter_tensors(prefix="vae.")]
+        assert sorted(names) == ["vae.decoder.bias", "vae.encoder.weight"]
+    with pytest.raises(ValueError):
+        f.get_numpy("vae.encoder.weight")
+
+
+def test_bf16(tmp_path):
+    values = np.array([[1.0, -2.5], [0.15625, 384.0]], dtype=np.float32)
+    bits = (values.view(np.uint32) >> 16).astype(np.uint16)
+    header = json.dumps({"w": {"dtype": "BF16", "shape": list(values.shape), "data_offsets": [0, bits.nbytes]}})
+    path = str(tmp_path / "bf16.safetensors")
+    with open(path, "wb") as f:
+        f.write(struct.pack("<Q", len(header)) + header.encode() + bits.tobytes())
+
+    loaded = load_file(path)["w"]
+    assert loaded.dtype == ms.bfloat16
+    # the values are exactly representable in bf16
+    np.testing.assert_array_equal(loaded.float().asnumpy(), values)
+    with safe_open(path) as f:
+        np.testing.assert_array_equal(f.get_numpy("w"), bits)
@@ -0,0 +1,106 @@
+import os
+import threading
+
+import numpy as np
+
+from mindone.data.cache import CachedDataset, SampleCache
+
+
+class CountingDataset:
+    output_columns = ["video", "label"]
+
+    def __init__(self, size=8):
+        self.size = size
+        self.calls = 0
+
+    def __getitem__(self, idx):
+        self.calls += 1
+        return np.full((16, 16), idx, dtype=np.float32), np.array(idx)
+
+    def __len__(self):
+        return self.size
+
+
+def test_put_and_get(tmp_path):
+    cache = SampleCache(str(tmp_path), config={"size": 16})
+    assert cache.get(0) is None
+    cache.put(0, (np.arange(6).reshape(2, 3), np.array("caption")))
+    columns = cache.get(0, num_columns=2)
+    np.testing.assert_array_equal(columns[0], np.arange(6).reshape(2, 3))
+    assert columns[1] == "caption"
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+    # another configuration never sees the samples
+    assert SampleCache(str(tmp_path), config={"size": 32}).get(0) is None
+
+
+def test_object_columns_are_not_cached(tmp_path):
+    cache = SampleCache(str(tmp_path))
+    cache.put(0, (np.zeros(2), {"not": "an array"}))
+    assert cache.get(0) is None
+
+
+def test_column_count_mismatch_is_a_miss(tmp_path):
+    cache = SampleCache(str(tmp_path))
+    cache.put(0, (np.zeros(2), np.ones(2)))
+    os.remove(os.path.join(cache._key_dir(0), "1.npy"))
+    assert cache.get(0, num_columns=2) is None
+    assert cache.stats()["misses"] == 1
+
+
+def test_cached_dataset(tmp_path):
+    dataset = CountingDataset()
+    cached = CachedDataset(dataset, SampleCache(str(tmp_path)))
+    for _ in range(2):
+        for idx in range(len(cached)):
+            video, label = cached[idx]
+            np.testing.assert_array_equal(video, np.full((16, 16), idx))
+            assert label == idx
+    assert dataset.calls == len(dataset)
+
+
+def test_evict_least_recently_used(tmp_path):
+    cache = SampleCache(str(tmp_path))
+    for idx in range(4):
+        cache.put(idx, (np.full((16, 16), idx, dtype=np.float32),))
+        os.utime(cache._key_dir(idx), (idx, idx))
+    cache.max_size = int(cache.stats()["size_gb"] * 1024**3 / 4 * 4.5)  # room for four and a half samples
+    cache.get(0)  # the oldest entry becomes the most recently used one
+    cache.put(4, (np.full((16, 16), 4, dtype=np.float32),))
+
+    assert cache.stats()["evictions"] > 0
+    assert cache.get(0) is not None and cache.get(4) is not None
+    assert cache.get(1) is None
+    # evicted entries are deleted, including the renamed directories
+    assert not [name for name in os.listdir(tmp_path) if name.startswith(".")]
+
+
+def test_concurrent_get_and_evict(tmp_path):
+    # readers racing with eviction see either the complete sample or a miss
+    num_columns = 4
+    cache = SampleCache(str(tmp_path), max_size_gb=0)
+    stop = threading.Event()
+    errors = []
+
+    def read():
+        while not stop.is_set():
+            try:
+                columns = cache.get(0)
+                assert columns is None or len(columns) == num_columns
+                for column in columns or ():
+                    np.testing.assert_array_equal(column, np.ones(1024))
+            except Exception as e:
+                errors.append(e)
+                return
+
+    readers = [threading.Thread(target=read) for _ in range(4)]
+    for reader in readers:
+        reader.start()
+    for _ in range(200):
+        cache.put(0, tuple(np.ones(1024) for _ in range(num_columns)))
+    stop.set()
+    for reader in readers:
+        reader.join()
+
+    assert not errors, errors[0]
+    assert cache.stats()["evictions"] == 200
@@ -0,0 +1,91 @@
+import cv2
+import numpy as np
+import pytest
+
+from mindone.data.video_reader import VideoReader
+
+NUM_FRAMES, WIDTH, HEIGHT = 24, 64, 48
+
+
+@pytest.fixture(scope="module")
+def video(tmp_path_factory):
+    # intra-only codec, so that seeking is frame exact and every decode path sees the same frames
+    path = str(tmp_path_factory.mktemp("video") / "video.avi")
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 8, (WIDTH, HEIGHT))
+    rng = np.random.default_rng(0)
+    for i in range(NUM_FRAMES):
+        frame = rng.integers(0, 255, (HEIGHT, WIDTH, 3), dtype=np.uint8)
+        frame[: 8 * (i % 6 + 1)] = i * 10
+        writer.write(frame)
+    writer.release()
+    return path
+
+
+@pytest.fixture(scope="module")
+def all_frames(video):
+    cap = cv2.VideoCapture(video, apiPreference=cv2.CAP_FFMPEG)
+    frames = []
+    ret, frame = cap.read()
+    while ret:
+        frames.append(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+        ret, frame = cap.read()
+    cap.release()
+    assert len(frames) == NUM_FRAMES
+    return np.stack(frames)
+
+
+def _legacy_fetch_frames(video, num, start_pos, step):
+    # the previous implementation of `VideoReader.fetch_frames`, one seek per frame
+    cap = cv2.VideoCapture(video, apiPreference=cv2.CAP_FFMPEG)
+    cap.set(cv2.CAP_PROP_POS_FRAMES, start_pos)
+    frames = []
+    i = start_pos
+    ret, frame = cap.read()
+    while ret and len(frames) < num:
+        frames.append(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+        if step > 1:
+            i += step
+            cap.set(cv2.CAP_PROP_POS_FRAMES, i)
+        ret, frame = cap.read()
+    cap.release()
+    return np.stack(frames)
+
+
+@pytest.mark.parametrize("num,start_pos,step", [(8, 0, 1), (6, 3, 2), (4, 5, 5), (1, 10, 3)])
+def test_fetch_frames_matches_legacy(video, all_frames, num, start_pos, step):
+    with VideoReader(video) as reader:
+        frames = reader.fetch_frames(num=num, start_pos=start_pos, step=step)
+    start_pos = start_pos or 0
+    np.testing.assert_array_equal(frames, _legacy_fetch_frames(video, num, start_pos, step))
+    np.testing.assert_array_equal(frames, all_frames[start_pos : start_pos + (num - 1) * step + 1 : step])
+
+
+def test_fetch_indices(video, all_frames):
+    indices = [12, 0, 5, 5, 23, 1]
+    with VideoReader(video) as reader:
+        frames = reader.fetch_indices(indices)
+        assert frames.shape == (len(indices), HEIGHT, WIDTH, 3) and frames.dtype == np.uint8
+        np.testing.assert_array_equal(frames, all_frames[indices])
+        # earlier frames after a later read, which needs a seek back
+        np.testing.assert_array_equal(reader.fetch_indices([2, 3]), all_frames[[2, 3]])
+
+
+def test_fetch_indices_crop_and_resize(video, all_frames):
+    crop, size = (8, 4, 32, 24), (16, 12)
+    with VideoReader(video) as reader:
+        frames = reader.fetch_indices([1, 7], size=size, crop=crop)
+    x, y, w, h = crop
+    expected = [
+        cv2.resize(frame[y : y + h, x : x + w], size, interpolation=cv2.INTER_AREA) for frame in all_frames[[1, 7]]
+    ]
+    np.testing.assert_array_equal(frames, np.stack(expected))
+
+
+def test_fetch_indices_errors(video):
+    with VideoReader(video) as reader:
+        with pytest.raises(ValueError):
+            reader.fetch_indices([])
+        with pytest.raises(ValueError):
+            reader.fetch_indices([-1])
+        with pytest.raises(RuntimeError):
+            reader.fetch_indices([NUM_FRAMES + 5])
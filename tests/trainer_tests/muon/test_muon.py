@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+import mindspore as ms
+from mindspore import mint
+
+from mindone.trainers.muon import Muon, batched_zeropower_via_newtonschulz5, zeropower_via_newtonschulz5
+
+# the shapes of the Muon parameters, the tall ones are orthogonalized transposed
+SHAPES = [(4, 8)] * 5 + [(8, 4)] * 3 + [(4, 2, 3)]
+
+
+def _params():
+    rng = np.random.default_rng(0)
+    muon_params = [
+        ms.Parameter(rng.standard_normal(shape).astype(np.float32), name=f"w{i}") for i, shape in enumerate(SHAPES)
+    ]
+    adamw_params = [ms.Parameter(rng.standard_normal((4,)).astype(np.float32), name="bias")]
+    return muon_params, adamw_params
+
+
+def _assert_close(actual, expected):
+    np.testing.assert_allclose(actual.float().asnumpy(), expected.float().asnumpy(), atol=1e-2)
+
+
+def test_batched_matches_per_matrix():
+    rng = np.random.default_rng(0)
+    for shape in [(3, 4, 8), (3, 8, 4)]:
+        G = ms.tensor(rng.standard_normal(shape), ms.float32)
+        batched = batched_zeropower_via_newtonschulz5(G, steps=5)
+        for i in range(shape[0]):
+            _assert_close(batched[i], zeropower_via_newtonschulz5(G[i], steps=5))
+
+
+@pytest.mark.parametrize("ns_bucket_size", [None, 2])
+@pytest.mark.parametrize("ns_group_size", [1, 2, 3])
+def test_sharded_orthogonalize(ns_group_size, ns_bucket_size):
+    muon_params, adamw_params = _params()
+    optimizer = Muon(muon_params=muon_params, adamw_params=adamw_params, clip_value=None, ns_bucket_size=ns_bucket_size)
+    updates = tuple(p.value() for p in muon_params) + tuple(p.value() for p in adamw_params)
+
+    # every rank orthogonalizes its zero padded share of each bucket, the all-gather is replayed from their outputs
+    shares = []
+    for rank in range(ns_group_size):
+        optimizer.ns_group_size, optimizer.ns_rank = ns_group_size, rank
+        optimizer.ns_allgather = lambda x: (shares[-1].append(x), mint.cat([x] * ns_group_size))[1]
+        shares.append([])
+        buckets = optimizer._build_ns_buckets(0, len(updates))
+        optimizer._orthogonalize(updates, 5, buckets)
+    gathered = iter([mint.cat(outputs) for outputs in zip(*shares)])
+    optimizer.ns_allgather = lambda x: next(gathered)
+    orthogonalized = optimizer._orthogonalize(updates, 5, buckets)
+
+    for update, expected in zip(orthogonalized[: len(SHAPES)], updates):
+        assert update.shape == expected.shape
+        matrix = expected.view(expected.shape[0], -1)
+        _assert_close(update, zeropower_via_newtonschulz5(matrix, steps=5).view(expected.shape))
+    # the AdamW parameters are left unchanged
+    assert orthogonalized[-1] is updates[-1]
@@ -0,0 +1,65 @@
+import os
+from unittest import mock
+
+import numpy as np
+import pytest
+
+import mindspore as ms
+from mindspore import mint, nn
+
+from mindone.trainers.checkpoint import CheckpointManager
+
+
+class Net(nn.Cell):
+    def __init__(self):
+        super().__init__()
+        self.proj = mint.nn.Linear(3, 4)
+        self.out = mint.nn.Linear(4, 2, dtype=ms.bfloat16)
+
+
+def _save(ckpt_dir, async_save, network, save_obj, steps=3):
+    os.makedirs(ckpt_dir)
+    manager = CheckpointManager(str(ckpt_dir), "latest_k", k=2, async_save=async_save)
+    for step in range(steps):
+        for param in network.get_parameters():
+            param.set_data(ms.Tensor(np.full(param.shape, step, np.float32), dtype=param.dtype))
+        manager.save(save_obj, ckpt_name=f"net-s{step}.ckpt", append_dict={"step": ms.tensor(step), "epoch": 1})
+    manager.wait()
+    return manager
+
+
+@pytest.mark.parametrize("use_list", [False, True])
+def test_async_matches_sync(tmp_path, use_list):
+    network = Net()
+    save_obj = [{"name": p.name, "data": p} for p in network.get_parameters()] if use_list else network
+    _save(tmp_path / "sync", False, network, save_obj)
+    _save(tmp_path / "async", True, network, save_obj)
+
+    files = sorted(os.listdir(tmp_path / "sync"))
+    assert files == ["net-s1.ckpt", "net-s2.ckpt"]
+    assert sorted(os.listdir(tmp_path / "async")) == files
+    for name in files:
+        expected = ms.load_checkpoint(str(tmp_path / "sync" / name))
+        loaded = ms.load_checkpoint(str(tmp_path / "async" / name))
+        assert sorted(loaded) == sorted(expected)
+        for k, v in expected.items():
+            assert loaded[k].dtype == v.dtype
+            np.testing.assert_array_equal(loaded[k].float().asnumpy(), v.float().asnumpy())
+
+
+def test_async_errors_surface_in_wait(tmp_path):
+    manager = CheckpointManager(str(tmp_path), None, async_save=True)
+    with mock.patch.object(ms, "save_checkpoint", side_effect=OSError("disk full")):
+        manager.save(Net(), ckpt_name="net.ckpt")
+        with pytest.raises(OSError, match="disk full"):
+            manager.wait()
+    assert not os.path.exists(tmp_path / "net.ckpt")
+
+
+def test_async_errors_surface_in_next_save(tmp_path):
+    manager = CheckpointManager(str(tmp_path), None, async_save=True, max_inflight_saves=4)
+    with mock.patch.object(ms, "save_checkpoint", side_effect=OSError("disk full")):
+        manager.save(Net(), ckpt_name="net-0.ckpt")
+        manager._inflight[0].exception()  # the write has failed
+        with pytest.raises(OSError, match="disk full"):
+            manager.save(Net(), ckpt_name="net-1.ckpt")
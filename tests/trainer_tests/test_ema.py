@@ -0,0 +1,158 @@
+import numpy as np
+import pytest
+
+import mindspore as ms
+from mindspore import mint, nn
+
+from mindone.trainers import ema as ema_module
+from mindone.trainers.ema import EMA, FusedEMA
+
+
+class Net(nn.Cell):
+    def __init__(self):
+        super().__init__()
+        self.proj = mint.nn.Linear(3, 4)
+        self.out = mint.nn.Linear(4, 2)
+
+
+def _step(network, step):
+    # moves the parameters as an optimizer step would
+    for param in network.trainable_params():
+        param.set_data(param.value() + ms.tensor(np.full(param.shape, 0.1 * step, np.float32)))
+
+
+def _unflatten(ema, buckets):
+    # per parameter values of the full buckets of a `FusedEMA`
+    values = []
+    for b, indices in enumerate(ema.bucket_indices):
+        params = [ema.net_weight[i] for i in indices]
+        values += [
+            v.reshape(p.shape).asnumpy() for p, v in zip(params, mint.split(buckets[b], [p.size for p in params]))
+        ]
+    return values
+
+
+def _expected(network, ema_decay, num_steps, update_every=1):
+    # the EMA of the parameters, updated every `update_every` steps
+    values = [param.asnumpy() for param in network.trainable_params()]
+    shadow = [value.copy() for value in values]
+    for step in range(1, num_steps + 1):
+        values = [value + 0.1 * step for value in values]
+        if step % update_every == 0:
+            d = (ema_decay * (1 - np.exp(-step / 2000))) ** update_every
+            shadow = [s * d + v * (1 - d) for s, v in zip(shadow, values)]
+    return shadow
+
+
+@pytest.mark.parametrize("bucket_size", [2**27, 8])
+def test_matches_ema(bucket_size):
+    network = Net()
+    ema = EMA(network, ema_decay=0.9, offloading=False)
+    fused = FusedEMA(network, ema_decay=0.9, bucket_size=bucket_size)
+    assert len(fused.ema_weight) == (1 if bucket_size > 100 else 4)
+
+    for step in range(1, 4):
+        _step(network, step)
+        ema.ema_update()
+        fused.ema_update()
+    for actual, expected in zip(_unflatten(fused, fused.gather_shards()), ema.ema_weight):
+        np.testing.assert_allclose(actual, expected.asnumpy(), rtol=1e-5)
+
+
+def test_update_every():
+    network = Net()
+    expected = _expected(network, 0.9, num_steps=5, update_every=2)
+    fused = FusedEMA(network, ema_decay=0.9, update_every=2)
+    for step in range(1, 6):
+        _step(network, step)
+        fused.ema_update()
+    assert fused.updates.item() == 5
+    for actual, value in zip(_unflatten(fused, fused.gather_shards()), expected):
+        np.testing.assert_allclose(actual, value, rtol=1e-5)
+
+    with pytest.raises(ValueError):
+        FusedEMA(network, update_every=0)
+
+
+def test_swap():
+    network = Net()
+    fused = FusedEMA(network, ema_decay=0.9)
+    _step(network, 1)
+    fused.ema_update()
+    weights = [param.asnumpy() for param in network.trainable_params()]
+
+    # without a swap in, nothing is swapped back
+    fused.swap_after_eval()
+    for param, weight in zip(network.trainable_params(), weights):
+        np.testing.assert_array_equal(param.asnumpy(), weight)
+
+    fused.swap_before_eval()
+    for param, value in zip(network.trainable_params(), _unflatten(fused, fused.gather_shards())):
+        np.testing.assert_array_equal(param.asnumpy(), value)
+    fused.swap_after_eval()
+    for param, weight in zip(network.trainable_params(), weights):
+        np.testing.assert_array_equal(param.asnumpy(), weight)
+
+
+@pytest.mark.parametrize("offload_to_host", [False, True])
+def test_shard(monkeypatch, offload_to_host):
+    num_shards = 3
+    network = Net()
+    expected = _expected(network, 0.9, num_steps=3)
+    shards = []
+    for rank in range(num_shards):
+        monkeypatch.setattr(ema_module, "get_group_size", lambda group: num_shards)
+        monkeypatch.setattr(ema_module, "get_rank", lambda group, rank=rank: rank)
+        shards.append(FusedEMA(network, ema_decay=0.9, bucket_size=20, offload_to_host=offload_to_host).shard("op", 2))
+    # the buckets of 16 and 10 elements are padded to shards of 6 and 4 elements
+    assert shards[0].bucket_numels == (16, 10) and shards[0].shard_numels == (6, 4)
+    assert [w.shape for w in shards[-1].ema_weight] == ([] if offload_to_host else [(6,), (4,)])
+
+    for step in range(1, 4):
+        _step(network, step)
+        for ema in shards:
+            ema.host_update() if offload_to_host else ema.ema_update()
+
+    # the all-gather of the buckets concatenates the shards of the ranks
+    for ema in shards:
+        ema.synchronize()
+    buckets = iter([mint.cat(weights) for weights in zip(*[ema.ema_weight for ema in shards])])
+    monkeypatch.setattr(ema_module.ops, "AllGather", lambda group: lambda weight: next(buckets))
+    for actual, value in zip(_unflatten(shards[0], shards[0].gather_shards()), expected):
+        np.testing.assert_allclose(actual, value, rtol=1e-5)
+
+
+def test_offload_to_host():
+    network = Net()
+    expected = _expected(network, 0.9, num_steps=4, update_every=2)
+    fused = FusedEMA(network, ema_decay=0.9, update_every=2, offload_to_host=True)
+    # the EMA only lives in host memory
+    assert len(fused.ema_weight) == 0
+
+    for step in range(1, 5):
+        _step(network, step)
+        fused.ema_update()
+        fused.host_update()
+    # an overflowed step is not averaged
+    _step(network, 5)
+    fused.host_update()
+    _step(network, 6)
+    fused.host_update(ms.tensor(True))
+
+    fused.synchronize()
+    assert fused.updates.item() == 6
+    for actual, value in zip(_unflatten(fused, [w.value() for w in fused.ema_weight]), expected):
+        np.testing.assert_allclose(actual, value, rtol=1e-5)
+
+    # the EMA loaded into the parameters of `synchronize` replaces the host EMA, the parameters are released
+    state_dict = {w.name: ms.Parameter(w.value() * 0 + 1, name=w.name) for w in fused.ema_weight}
+    state_dict["updates"] = ms.Parameter(ms.tensor(1, ms.float32), name="updates")
+    param_not_load, _ = ms.load_param_into_net(fused, state_dict)
+    assert not [name for name in param_not_load if name.startswith("ema.") or name == "updates"]
+    fused.host_update()
+    assert len(fused.ema_weight) == 0 and fused._host_steps == 2
+    fused.synchronize()
+    d = 0.9 * (1 - np.exp(-2 / 2000))
+    params = [param.asnumpy() for param in network.trainable_params()]
+    for actual, param in zip(_unflatten(fused, [w.value() for w in fused.ema_weight]), params):
+        np.testing.assert_allclose(actual, d**2 + param * (1 - d**2), rtol=1e-5)
@@ -0,0 +1,88 @@
+import json
+
+import numpy as np
+import pytest
+
+import mindspore as ms
+
+from mindone.trainers.recorder import MetricsRingBuffer, PerfRecorder
+
+METRIC_NAMES = ["step", "loss", "train_time(s)"]
+
+
+def _records(steps=5):
+    return [(step, ms.tensor(0.5 / step, ms.float32), 0.1 * step) for step in range(1, steps + 1)]
+
+
+@pytest.mark.parametrize("async_write", [False, True])
+def test_tsv(tmp_path, async_write):
+    with PerfRecorder(str(tmp_path), metric_names=METRIC_NAMES, async_write=async_write) as rec:
+        for record in _records():
+            rec.add(*record)
+    assert rec._fp.closed
+
+    with open(tmp_path / "result.log") as f:
+        lines = f.read().splitlines()
+    assert lines[0] == "\t".join(METRIC_NAMES)
+    assert lines[1:] == [f"{step}\t{loss.asnumpy():.7f}\t{time:.7f}" for step, loss, time in _records()]
+
+    # resuming appends the records without a new header
+    with PerfRecorder(str(tmp_path), resume=True, async_write=async_write) as rec:
+        rec.add(6, 0.1, None)
+    with open(tmp_path / "result.log") as f:
+        assert f.read().splitlines()[1:] == lines[1:] + ["6\t0.1000000\tNA"]
+
+
+@pytest.mark.parametrize("async_write", [False, True])
+def test_jsonl(tmp_path, async_write):
+    rec = PerfRecorder(str(tmp_path), metric_names=METRIC_NAMES, record_format="jsonl", async_write=async_write)
+    for record in _records():
+        rec.add(*record)
+    # the pending records are written by `flush`, before the file is closed
+    rec.flush()
+    with open(tmp_path / "result.log") as f:
+        records = [json.loads(line) for line in f]
+    rec.close()
+    rec.close()
+
+    assert [list(record) for record in records] == [METRIC_NAMES] * 5
+    for record, (step, loss, time) in zip(records, _records()):
+        assert record["step"] == step
+        assert record["loss"] == pytest.approx(loss.item())
+        assert record["train_time(s)"] == pytest.approx(time)
+
+
+def test_async_write_errors(tmp_path):
+    rec = PerfRecorder(str(tmp_path), metric_names=METRIC_NAMES, async_write=True)
+    rec._fp.close()
+    rec.add(1, 0.5, 0.1)
+    with pytest.raises(ValueError):
+        rec.flush()
+
+
+def test_invalid_format(tmp_path):
+    with pytest.raises(ValueError):
+        PerfRecorder(str(tmp_path), record_format="csv")
+
+
+def test_metrics_ring_buffer():
+    buffer = MetricsRingBuffer(["loss", "lr"], capacity=3)
+    assert buffer.fetch() == []
+
+    for step in range(1, 4):
+        buffer.append(step, ms.tensor([0.5 * step], ms.float16), 1e-4)
+    assert buffer.is_full()
+    with pytest.raises(RuntimeError, match="full"):
+        buffer.append(4, 0.0, 0.0)
+
+    records = buffer.fetch()
+    assert [record[0] for record in records] == [1, 2, 3]
+    np.testing.assert_allclose([record[1:] for record in records], [[0.5, 1e-4], [1.0, 1e-4], [1.5, 1e-4]], rtol=1e-6)
+
+    # the rows are reused after a fetch
+    assert len(buffer) == 0
+    buffer.append(4, ms.tensor(2.0), ms.tensor(2e-4))
+    np.testing.assert_allclose(buffer.fetch(), [[4, 2.0, 2e-4]], rtol=1e-6)
+
+    with pytest.raises(ValueError):
+        MetricsRingBuffer(["loss"], capacity=0)
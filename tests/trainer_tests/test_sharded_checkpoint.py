@@ -0,0 +1,140 @@
+import json
+import os
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+import mindspore as ms
+from mindspore import nn
+
+from mindone.trainers.callback import EvalSaveCallback
+from mindone.trainers.checkpoint import (
+    SHARDED_CKPT_INDEX_NAME,
+    is_sharded_checkpoint,
+    load_sharded_checkpoint,
+    save_sharded_checkpoint,
+)
+from mindone.trainers.zero import ZeroHelper
+
+ROWS = 8
+
+
+class Net(nn.Cell):
+    """`weight` is split by ZeRO on the first axis, `bias` is replicated."""
+
+    def __init__(self, world_size=1):
+        super().__init__()
+        self.weight = ms.Parameter(ms.Tensor(np.zeros((ROWS // world_size, 3), np.float32)), name="weight")
+        self.bias = ms.Parameter(ms.Tensor(np.zeros((3,), np.float32)), name="bias")
+
+
+class FakeOptimizer(nn.Cell):
+    def __init__(self, network):
+        super().__init__()
+        # plain attribute, as the list of the parameters of `nn.Optimizer`
+        object.__setattr__(self, "_parameters", list(network.get_parameters()))
+
+
+class FakeZeroHelper:
+    """The attributes of `ZeroHelper` read by the sharded checkpoints, for one rank of a group."""
+
+    def __init__(self, network, rank_id, world_size, zero_stage=2):
+        self.is_parallel = True
+        self.need_dp = False
+        self.zero_stage = zero_stage
+        self.op_rank_id = rank_id
+        self.op_group_size = world_size
+        self.optimizer = FakeOptimizer(network)
+
+    def get_params_split_info(self):
+        return {
+            "weight": {"split": True, "group_size": self.op_group_size, "rank_id": self.op_rank_id},
+            "bias": {"split": False, "group_size": self.op_group_size, "rank_id": self.op_rank_id},
+        }
+
+    def get_optimizer_param_tuples(self):
+        return []
+
+
+FULL_WEIGHT = np.arange(ROWS * 3, dtype=np.float32).reshape(ROWS, 3)
+BIAS = np.array([1.0, 2.0, 3.0], dtype=np.float32)
+
+
+def _save(ckpt_dir, world_size):
+    for rank_id in range(world_size):
+        net = Net(world_size)
+        rows = ROWS // world_size
+        net.weight.set_data(ms.Tensor(FULL_WEIGHT[rank_id * rows : (rank_id + 1) * rows]))
+        net.bias.set_data(ms.Tensor(BIAS))
+        helper = FakeZeroHelper(net, rank_id, world_size) if world_size > 1 else None
+        save_sharded_checkpoint(net, ckpt_dir, zero_helper=helper, epoch_num=2, cur_step=10)
+
+
+@pytest.mark.parametrize("src_world_size", [1, 2, 4])
+@pytest.mark.parametrize("dst_world_size", [1, 2, 4])
+def test_reshard(tmp_path, src_world_size, dst_world_size):
+    ckpt_dir = str(tmp_path / "ckpt")
+    _save(ckpt_dir, src_world_size)
+    assert is_sharded_checkpoint(ckpt_dir)
+    with open(os.path.join(ckpt_dir, SHARDED_CKPT_INDEX_NAME)) as f:
+        index = json.load(f)
+    assert index["world_size"] == src_world_size
+    assert index["params"]["weight"]["shape"] == [ROWS, 3]
+
+    rows = ROWS // dst_world_size
+    for rank_id in range(dst_world_size):
+        net = Net(dst_world_size)
+        helper = FakeZeroHelper(net, rank_id, dst_world_size) if dst_world_size > 1 else None
+        index = load_sharded_checkpoint(net, ckpt_dir, zero_helper=helper)
+        assert (index["epoch_num"], index["cur_step"]) == (2, 10)
+        np.testing.assert_array_equal(net.weight.asnumpy(), FULL_WEIGHT[rank_id * rows : (rank_id + 1) * rows])
+        np.testing.assert_array_equal(net.bias.asnumpy(), BIAS)
+
+
+def test_incomplete_checkpoint(tmp_path):
+    ckpt_dir = str(tmp_path / "ckpt")
+    _save(ckpt_dir, 2)
+    os.remove(os.path.join(ckpt_dir, "rank_00001.ckpt"))
+    with pytest.raises(ValueError, match="incomplete"):
+        load_sharded_checkpoint(Net(), ckpt_dir)
+
+
+@pytest.mark.parametrize("resume_prefix_blacklist", [None, "bias"])
+def test_callback_sharded_resume(tmp_path, resume_prefix_blacklist):
+    world_size = 2
+    callback = EvalSaveCallback(
+        Net(),
+        ckpt_save_dir=str(tmp_path / "ckpt"),
+        output_dir=str(tmp_path),
+        resume_prefix_blacklist=resume_prefix_blacklist,
+        sharded_resume=True,
+    )
+    rows = ROWS // world_size
+    for rank_id in range(world_size):
+        net = Net(world_size)
+        net.weight.set_data(ms.Tensor(FULL_WEIGHT[rank_id * rows : (rank_id + 1) * rows]))
+        net.bias.set_data(ms.Tensor(BIAS))
+        net.zero_helper = FakeZeroHelper(net, rank_id, world_size)
+        # every rank writes its shard only
+        callback._save_training_resume(SimpleNamespace(train_network=net, cur_step_num=10), cur_epoch=2)
+        assert os.path.exists(tmp_path / "ckpt" / "train_resume" / f"rank_{rank_id:05d}.ckpt")
+    callback.rec.close()
+
+    ckpt_dir = str(tmp_path / "ckpt" / "train_resume")
+    assert sorted(os.listdir(ckpt_dir)) == [SHARDED_CKPT_INDEX_NAME, "rank_00000.ckpt", "rank_00001.ckpt"]
+    net = Net()
+    index = load_sharded_checkpoint(net, ckpt_dir)
+    assert (index["epoch_num"], index["cur_step"]) == (2, 10)
+    np.testing.assert_array_equal(net.weight.asnumpy(), FULL_WEIGHT)
+    if resume_prefix_blacklist is None:
+        np.testing.assert_array_equal(net.bias.asnumpy(), BIAS)
+    else:
+        assert "bias" not in index["params"]
+
+
+def test_dump_params_split_info(tmp_path):
+    helper = FakeZeroHelper(Net(2), 1, 2)
+    ZeroHelper.dump_params_split_info(helper, str(tmp_path))
+    with open(tmp_path / "params_split_info_1.json") as f:
+        assert json.load(f) == helper.get_params_split_info()
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+import mindspore as ms
+from mindspore import mint, nn
+
+from mindone.trainers.train_step import TrainOneStepWrapper
+
+
+class Net(nn.Cell):
+    def __init__(self, dtype=ms.float32):
+        super().__init__()
+        self.proj = mint.nn.Linear(3, 4)
+        self.out = mint.nn.Linear(4, 2, dtype=dtype)
+
+    def construct(self, x):
+        x = self.proj(x)
+        return mint.mean(self.out(x.to(self.out.weight.dtype)).float() ** 2)
+
+
+def _train(grad_bucket_size=None, grad_accum_dtype=None, accum_steps=1, dtype=ms.float32, num_steps=4):
+    ms.set_seed(0)
+    network = Net(dtype)
+    optimizer = nn.SGD(network.trainable_params(), learning_rate=0.1)
+    train_step = TrainOneStepWrapper(
+        network,
+        optimizer,
+        scale_sense=ms.tensor(1.0, ms.float32),
+        gradient_accumulation_steps=accum_steps,
+        clip_grad=True,
+        grad_bucket_size=grad_bucket_size,
+        grad_accum_dtype=grad_accum_dtype,
+    )
+    rng = np.random.default_rng(0)
+    for _ in range(num_steps):
+        train_step(ms.tensor(rng.standard_normal((5, 3)), ms.float32))
+    return train_step, [param.float().asnumpy() for param in network.trainable_params()]
+
+
+@pytest.mark.parametrize("accum_steps", [1, 2])
+@pytest.mark.parametrize("grad_bucket_size", [10, 2**20])
+def test_buckets_match_unbucketed(grad_bucket_size, accum_steps):
+    _, expected = _train(accum_steps=accum_steps)
+    train_step, params = _train(grad_bucket_size=grad_bucket_size, accum_steps=accum_steps)
+    # the buckets are filled from the last parameters
+    assert train_step.grad_bucket_indices[0][0] == len(params) - 1
+    for param, value in zip(params, expected):
+        np.testing.assert_allclose(param, value, rtol=1e-6, atol=1e-7)
+
+
+@pytest.mark.parametrize("accum_steps", [1, 2])
+def test_grad_accum_dtype(accum_steps):
+    _, expected = _train(accum_steps=accum_steps, dtype=ms.float16)
+    train_step, params = _train(
+        grad_bucket_size=2**20, grad_accum_dtype=ms.float32, accum_steps=accum_steps, dtype=ms.float16
+    )
+    # the gradients are bucketed and reduced in their own dtype, only the accumulation buckets are float32
+    assert train_step.grad_bucket_dtypes == (ms.float16, ms.float32)
+    if accum_steps > 1:
+        assert [grad.dtype for grad in train_step.accumulated_grads] == [ms.float32, ms.float32]
+    for param, value in zip(params, expected):
+        np.testing.assert_allclose(param, value, rtol=1e-3, atol=1e-3)
@@ -0,0 +1,171 @@
+import numpy as np
+import pytest
+from transformers import PretrainedConfig
+
+import mindspore as ms
+
+from mindone.transformers.cache_utils import (
+    DynamicCache,
+    NativeQuantizedLayer,
+    QuantizedCache,
+    StaticQuantizedLayer,
+    _dequantize_kv,
+    _quantize_kv,
+)
+
+NUM_LAYERS, BATCH_SIZE, NUM_HEADS, HEAD_DIM = 4, 3, 2, 8
+
+
+def _states(rng, batch_size, seq_len):
+    shape = (batch_size, NUM_HEADS, seq_len, HEAD_DIM)
+    return [tuple(ms.tensor(rng.standard_normal(shape), ms.float32) for _ in range(2)) for _ in range(NUM_LAYERS)]
+
+
+def _fill(cache, steps, seed=0, batch_size=BATCH_SIZE):
+    # a prompt of 5 tokens, then one token per step, returns the states seen by the attention of every layer
+    rng = np.random.default_rng(seed)
+    outputs = []
+    for seq_len in [5] + [1] * (steps - 1):
+        for layer_idx, (key_states, value_states) in enumerate(_states(rng, batch_size, seq_len)):
+            keys, values = cache.update(key_states, value_states, layer_idx)
+            outputs.append((keys.asnumpy(), values.asnumpy()))
+    return outputs
+
+
+def _assert_same_layers(cache, expected):
+    assert len(cache.layers) == len(expected.layers)
+    for layer, expected_layer in zip(cache.layers, expected.layers):
+        np.testing.assert_array_equal(layer.keys.asnumpy(), expected_layer.keys.asnumpy())
+        np.testing.assert_array_equal(layer.values.asnumpy(), expected_layer.values.asnumpy())
+
+
+def test_offloaded_update():
+    cache, expected = DynamicCache(offloading=True), DynamicCache()
+    for (keys, values), (expected_keys, expected_values) in zip(_fill(cache, 3), _fill(expected, 3)):
+        np.testing.assert_array_equal(keys, expected_keys)
+        np.testing.assert_array_equal(values, expected_values)
+
+    # only the first layer, prefetched by the last one, is resident
+    assert [layer.is_offloaded for layer in cache.layers] == [False] + [True] * (NUM_LAYERS - 1)
+    assert cache.get_seq_length() == 7
+    stats = cache.offload_stats
+    # the layers of the first step are created on device, the other steps wait for the prefetch of every layer
+    assert stats["num_prefetches"] == 2 * NUM_LAYERS
+    assert 0.0 <= stats["overlap_efficiency"] <= 1.0
+    _assert_same_layers(cache, expected)
+
+
+@pytest.mark.parametrize(
+    "method, args",
+    [
+        ("reorder_cache", (ms.tensor([2, 0, 1], ms.int32),)),
+        ("crop", (4,)),
+        ("crop", (-2,)),
+        ("batch_select_indices", (ms.tensor([0, 2], ms.int32),)),
+        ("batch_repeat_interleave", (2,)),
+        ("reset", ()),
+    ],
+)
+def test_offloaded_layer_methods(method, args):
+    cache, expected = DynamicCache(offloading=True), DynamicCache()
+    _fill(cache, 2)
+    _fill(expected, 2)
+    is_offloaded = [layer.is_offloaded for layer in cache.layers]
+
+    getattr(cache, method)(*args)
+    getattr(expected, method)(*args)
+    _assert_same_layers(cache, expected)
+    # the layers that were on host are offloaded again
+    assert [layer.is_offloaded for layer in cache.layers] == is_offloaded
+
+    # and the cache keeps working
+    batch_size = expected.layers[0].keys.shape[0]
+    outputs, expected_outputs = _fill(cache, 2, 1, batch_size), _fill(expected, 2, 1, batch_size)
+    for (keys, values), (expected_keys, expected_values) in zip(outputs, expected_outputs):
+        np.testing.assert_array_equal(keys, expected_keys)
+        np.testing.assert_array_equal(values, expected_values)
+
+
+def _absmax_scales(states, nbits, axis, q_group_size):
+    # the scales expected from `_quantize_kv`, broadcast to the shape of `states`
+    qmax = 2 ** (nbits - 1) - 1
+    if axis == 0:
+        groups = states.reshape(*states.shape[:-1], -1, q_group_size)
+        scales = np.broadcast_to(np.abs(groups).max(axis=-1, keepdims=True), groups.shape).reshape(states.shape)
+    else:
+        scales = np.broadcast_to(np.abs(states).max(axis=-2, keepdims=True), states.shape)
+    return scales / qmax
+
+
+@pytest.mark.parametrize("nbits", [8, 4])
+@pytest.mark.parametrize("axis", [0, -1])
+def test_quantize_round_trip(nbits, axis):
+    states = np.random.default_rng(0).standard_normal((2, 2, 16, 64)).astype(np.float32)
+    quantized, scales = _quantize_kv(ms.tensor(states), nbits, axis, q_group_size=32)
+    assert quantized.dtype == (ms.int8 if nbits == 8 else ms.uint8)
+    assert quantized.shape == (2, 2, 16, 64 if nbits == 8 else 32)
+
+    dequantized = _dequantize_kv(quantized, scales, nbits, axis).asnumpy()
+    assert dequantized.shape == states.shape
+    # rounding to the nearest level is off by at most half a scale
+    error = np.abs(dequantized - states)
+    assert np.all(error <= _absmax_scales(states, nbits, axis, 32) / 2 + 1e-6)
+
+
+@pytest.mark.parametrize("axis", [0, -1])
+def test_quantized_residual_window(axis):
+    layer = NativeQuantizedLayer(nbits=8, axis_key=axis, axis_value=axis, q_group_size=HEAD_DIM, residual_length=4)
+    rng = np.random.default_rng(0)
+    states = rng.standard_normal((BATCH_SIZE, NUM_HEADS, 10, HEAD_DIM)).astype(np.float32)
+
+    def update(start, end):
+        chunk = ms.tensor(states[:, :, start:end])
+        keys, values = layer.update(chunk, chunk)
+        return keys.asnumpy(), values.asnumpy()
+
+    # the prompt stays in full precision
+    keys, _ = update(0, 3)
+    np.testing.assert_array_equal(keys, states[:, :, :3])
+    assert len(layer._quantized_keys) == 0 and layer.keys.shape[-2] == 3
+
+    # the full window is returned in full precision, then flushed into a quantized chunk
+    keys, _ = update(3, 4)
+    np.testing.assert_array_equal(keys, states[:, :, :4])
+    assert len(layer._quantized_keys) == 1 and layer.keys is None
+
+    # later tokens see the dequantized chunk followed by the new full-precision residual
+    keys, values = update(4, 6)
+    assert keys.shape[-2] == 6
+    bound = _absmax_scales(states[:, :, :4], 8, axis, HEAD_DIM) / 2 + 1e-6
+    assert np.all(np.abs(keys[:, :, :4] - states[:, :, :4]) <= bound)
+    np.testing.assert_array_equal(keys[:, :, 4:], states[:, :, 4:6])
+    np.testing.assert_array_equal(values, keys)
+
+    # the chunks quantized before are kept as they are
+    first_chunk = layer._quantized_keys[0][0].asnumpy()
+    keys, _ = update(6, 10)
+    assert len(layer._quantized_keys) == 2 and layer.keys is None
+    np.testing.assert_array_equal(layer._quantized_keys[0][0].asnumpy(), first_chunk)
+    assert keys.shape[-2] == 10 and layer.get_seq_length() == 10
+
+
+@pytest.mark.parametrize("nbits", [8, 4])
+def test_static_quantized_cache(nbits):
+    config = PretrainedConfig(num_hidden_layers=2)
+    cache = QuantizedCache("native", config, nbits=nbits, q_group_size=HEAD_DIM, max_cache_len=8)
+    assert all(isinstance(layer, StaticQuantizedLayer) for layer in cache.layers)
+    assert cache.get_seq_length() == 0
+
+    states = np.random.default_rng(0).standard_normal((BATCH_SIZE, NUM_HEADS, 8, HEAD_DIM)).astype(np.float32)
+    for positions in ([0, 1, 2], [3], [4]):
+        chunk = ms.tensor(states[:, :, positions])
+        for layer_idx in range(2):
+            keys, _ = cache.update(chunk, chunk, layer_idx, {"cache_position": ms.tensor(positions, ms.int32)})
+    assert int(cache.get_seq_length()) == 5
+    assert keys.shape == (BATCH_SIZE, NUM_HEADS, 8, HEAD_DIM)
+
+    keys = keys.asnumpy()
+    bound = _absmax_scales(states[:, :, :5], nbits, 0, HEAD_DIM) / 2 + 1e-6
+    assert np.all(np.abs(keys[:, :, :5] - states[:, :, :5]) <= bound)
+    # the free slots are empty
+    np.testing.assert_array_equal(keys[:, :, 5:], 0)
@@ -0,0 +1,145 @@
+import numpy as np
+import pytest
+
+from mindone.transformers.mindspore_adapter.paged_attention_block_tables import BlockTables
+from mindone.transformers.mindspore_adapter.paged_attention_cache_engine import BlockMemPool
+
+NUM_BLOCKS, BLOCK_SIZE, SEQ_LENGTH = 64, 4, 32
+
+
+class LegacyBlockMemPool:
+    # the previous list based pool
+    def __init__(self, num_blocks):
+        self.free_blocks = list(range(num_blocks))
+        self.used_blocks = []
+
+    def allocate_block(self, num_new_block):
+        if len(self.free_blocks) < num_new_block:
+            raise RuntimeError("block pool is out of memory")
+        new_blocks = self.free_blocks[0:num_new_block]
+        self.used_blocks += new_blocks
+        self.free_blocks = self.free_blocks[num_new_block:]
+        return new_blocks
+
+
+class LegacyCacheEngine:
+    def __init__(self, pool):
+        self.pool = pool
+        self.num_token = 0
+        self.block_table = []
+
+    def prepare_cache(self, num_new_token):
+        remained_token = len(self.block_table) * BLOCK_SIZE - self.num_token
+        if remained_token < num_new_token:
+            num_new_block = (num_new_token - remained_token + BLOCK_SIZE - 1) // BLOCK_SIZE
+            self.block_table += self.pool.allocate_block(num_new_block)
+        self.num_token += num_new_token
+
+
+class LegacyBlockTables:
+    # the previous per-sequence loops of `BlockTables`
+    def __init__(self, batch_size):
+        self.max_num_blocks_per_seq = SEQ_LENGTH // BLOCK_SIZE
+        pool = LegacyBlockMemPool(NUM_BLOCKS)
+        self.cache_engines = [LegacyCacheEngine(pool) for _ in range(batch_size)]
+
+    def _padded_tables(self):
+        return np.array(
+            [e.block_table + [-1] * (self.max_num_blocks_per_seq - len(e.block_table)) for e in self.cache_engines],
+            dtype=np.int32,
+        )
+
+    def assemble_pa_full_inputs(self, max_input_length, batch_valid_length, is_finished):
+        bs = batch_valid_length.shape[0]
+        for i in range(bs):
+            if not is_finished[i]:
+                self.cache_engines[i].prepare_cache(batch_valid_length[i])
+        block_tables = self._padded_tables()
+        slot_mapping = []
+        for i in range(bs):
+            for pos in range(max_input_length):
+                if pos < batch_valid_length[i]:
+                    slot_mapping.append(block_tables[i, pos // BLOCK_SIZE] * BLOCK_SIZE + pos % BLOCK_SIZE)
+                else:
+                    slot_mapping.append(None)  # padding
+        return block_tables, slot_mapping
+
+    def assemble_pa_inc_inputs(self, batch_valid_length, is_finished):
+        slot_mapping = []
+        for i in range(batch_valid_length.shape[0]):
+            if not is_finished[i]:
+                self.cache_engines[i].prepare_cache(1)
+            block_table = self.cache_engines[i].block_table
+            current_idx = batch_valid_length[i] - 1
+            index = min(current_idx // BLOCK_SIZE, len(block_table) - 1)
+            slot_mapping.append(block_table[index] * BLOCK_SIZE + current_idx % BLOCK_SIZE)
+        return self._padded_tables(), np.array(slot_mapping, dtype=np.int32)
+
+
+@pytest.mark.parametrize("prompt_lengths", [[5, 1, 8, 3], [4, 4, 4, 4], [1]])
+def test_matches_legacy(prompt_lengths):
+    batch_size = len(prompt_lengths)
+    block_tables = BlockTables(NUM_BLOCKS, BLOCK_SIZE, SEQ_LENGTH)
+    block_tables.init_cache_engine(batch_size)
+    legacy = LegacyBlockTables(batch_size)
+
+    valid_length = np.array(prompt_lengths, dtype=np.int32)
+    is_finished = [False] * batch_size
+    max_input_length = max(prompt_lengths) + 2
+    tables, slots = block_tables.assemble_pa_full_inputs(max_input_length, valid_length, is_finished)
+    expected_tables, expected_slots = legacy.assemble_pa_full_inputs(max_input_length, valid_length, is_finished)
+    np.testing.assert_array_equal(tables, expected_tables)
+    assert slots.dtype == np.int32 and slots.shape == (batch_size * max_input_length,)
+    # padding tokens are not written to the cache
+    np.testing.assert_array_equal(slots, [-1 if s is None else s for s in expected_slots])
+
+    rng = np.random.default_rng(0)
+    for _ in range(SEQ_LENGTH - max(prompt_lengths)):
+        # some sequences finish early and stop growing
+        is_finished = [f or bool(rng.random() < 0.1) for f in is_finished]
+        valid_length = valid_length + np.logical_not(is_finished)
+        tables, slots = block_tables.assemble_pa_inc_inputs(valid_length, is_finished)
+        expected_tables, expected_slots = legacy.assemble_pa_inc_inputs(valid_length, is_finished)
+        np.testing.assert_array_equal(tables, expected_tables)
+        np.testing.assert_array_equal(slots, expected_slots)
+
+
+def test_release_and_reuse():
+    block_tables = BlockTables(NUM_BLOCKS, BLOCK_SIZE, SEQ_LENGTH)
+    block_tables.init_cache_engine(2)
+    block_tables.assemble_pa_full_inputs(8, np.array([8, 3]), [False, False])
+    assert block_tables.block_mem_pool.num_free == NUM_BLOCKS - 3
+
+    block_tables.release([1])
+    assert block_tables.block_mem_pool.num_free == NUM_BLOCKS - 2
+    np.testing.assert_array_equal(block_tables.block_tables[1], -1)
+
+    # re-initialising returns all blocks to the pool
+    block_tables.init_cache_engine(4)
+    assert block_tables.block_mem_pool.num_free == NUM_BLOCKS
+    assert block_tables.block_tables.shape == (4, SEQ_LENGTH // BLOCK_SIZE)
+
+
+def test_sequence_too_long():
+    block_tables = BlockTables(NUM_BLOCKS, BLOCK_SIZE, SEQ_LENGTH)
+    block_tables.init_cache_engine(1)
+    with pytest.raises(RuntimeError, match="maximum length"):
+        block_tables.assemble_pa_full_inputs(SEQ_LENGTH + 1, np.array([SEQ_LENGTH + 1]), [False])
+
+
+def test_block_mem_pool():
+    pool = BlockMemPool(8, BLOCK_SIZE)
+    blocks = pool.allocate(3)
+    assert blocks.tolist() == [0, 1, 2] and pool.used_blocks == [0, 1, 2]
+    assert pool.allocate_block(2) == [3, 4]
+    pool.free(blocks[1:])
+    assert pool.num_free == 5 and sorted(pool.free_blocks) == [1, 2, 5, 6, 7]
+    # freed blocks are reused first
+    assert sorted(pool.allocate(2).tolist()) == [1, 2]
+
+    with pytest.raises(RuntimeError, match="bad block idx"):
+        pool.free_block([7])
+    with pytest.raises(RuntimeError, match="bad block idx"):
+        pool.free([0, 0])
+    with pytest.raises(RuntimeError, match="out of memory"):
+        pool.allocate(pool.num_free + 1)
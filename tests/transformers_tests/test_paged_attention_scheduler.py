@@ -0,0 +1,174 @@
+import numpy as np
+import pytest
+
+import mindspore as ms
+
+from mindone.transformers.generation import utils as generation_utils
+from mindone.transformers.generation.utils import GenerationMixin
+from mindone.transformers.mindspore_adapter.paged_attention_block_tables import BlockTables
+from mindone.transformers.mindspore_adapter.paged_attention_scheduler import ContinuousBatchingScheduler
+
+BLOCK_SIZE, SEQ_LENGTH, VOCAB_SIZE = 4, 32, 50
+
+
+def _scheduler(num_blocks=64, max_batch_size=2, max_num_batched_tokens=8):
+    return ContinuousBatchingScheduler(
+        BlockTables(num_blocks, BLOCK_SIZE, SEQ_LENGTH), max_batch_size, max_num_batched_tokens
+    )
+
+
+def _assert_consistent(scheduler, batch):
+    # every token is written to the cache slot of its position in the block table of its sequence
+    rows = np.repeat(np.arange(len(batch.requests)), batch.q_seq_lens)
+    expected_slots = batch.block_tables[rows, batch.positions // BLOCK_SIZE] * BLOCK_SIZE + batch.positions % BLOCK_SIZE
+    np.testing.assert_array_equal(batch.slot_mapping, expected_slots)
+    assert (batch.slot_mapping >= 0).all() and np.unique(batch.slot_mapping).size == batch.slot_mapping.size
+    np.testing.assert_array_equal(batch.logits_indices, np.cumsum(batch.q_seq_lens) - 1)
+    assert batch.q_seq_lens.sum() == batch.input_ids.size <= scheduler.max_num_batched_tokens
+    for request, valid_length, n, end in zip(
+        batch.requests, batch.batch_valid_length, batch.q_seq_lens, np.cumsum(batch.q_seq_lens)
+    ):
+        np.testing.assert_array_equal(batch.input_ids[end - n : end], request.all_ids[valid_length - n : valid_length])
+
+
+def test_admit_and_mix_prefill_with_decode():
+    scheduler = _scheduler()
+    for i, prompt_length in enumerate([6, 3, 5]):
+        scheduler.add_request(str(i), list(range(1, prompt_length + 1)), max_new_tokens=2)
+
+    # the first prompt is prefilled whole, the second one gets the rest of the budget and the third one no slot
+    batch = scheduler.schedule()
+    _assert_consistent(scheduler, batch)
+    assert [r.request_id for r in batch.requests] == ["0", "1"] and batch.q_seq_lens.tolist() == [6, 2]
+    assert batch.num_prefill_tokens == 8 and [r.request_id for r in scheduler.waiting] == ["2"]
+    # a partially prefilled sequence gets no token
+    scheduler.update(batch, [7, 8])
+    assert scheduler.requests["0"].output_ids == [7] and scheduler.requests["1"].output_ids == []
+
+    # the decode token of the first sequence is batched with the last prefill chunk of the second one
+    batch = scheduler.schedule()
+    _assert_consistent(scheduler, batch)
+    assert batch.q_seq_lens.tolist() == [1, 1] and batch.batch_valid_length.tolist() == [7, 3]
+    assert batch.positions.tolist() == [6, 2]
+    finished = scheduler.update(batch, [9, 10])
+    assert [r.request_id for r in finished] == ["0"] and finished[0].output_ids == [7, 9]
+
+    # the finished sequence is evicted, its blocks are returned and its slot is given to the waiting one
+    assert scheduler.block_tables.block_mem_pool.num_free == 64 - 1
+    batch = scheduler.schedule()
+    _assert_consistent(scheduler, batch)
+    assert [r.request_id for r in batch.requests] == ["1", "2"] and batch.q_seq_lens.tolist() == [1, 5]
+    assert batch.num_prefill_tokens == 5
+
+
+def test_eos_finishes_request():
+    scheduler = _scheduler()
+    scheduler.add_request("0", [1, 2, 3], max_new_tokens=10, eos_token_id=0)
+    batch = scheduler.schedule()
+    assert [r.request_id for r in scheduler.update(batch, [0])] == ["0"]
+    assert not scheduler.has_unfinished_requests() and scheduler.block_tables.block_mem_pool.num_free == 64
+
+
+def test_preempt_and_recompute():
+    # 4 blocks hold the two prompts of 7 tokens, the 9th token of a sequence needs a third block
+    scheduler = _scheduler(num_blocks=4, max_num_batched_tokens=16)
+    scheduler.add_request("0", list(range(1, 8)), max_new_tokens=3)
+    scheduler.add_request("1", list(range(11, 18)), max_new_tokens=3)
+
+    batch = scheduler.schedule()
+    assert batch.q_seq_lens.tolist() == [7, 7] and scheduler.block_tables.block_mem_pool.num_free == 0
+    scheduler.update(batch, [20, 30])
+    batch = scheduler.schedule()
+    assert batch.q_seq_lens.tolist() == [1, 1]
+    scheduler.update(batch, [21, 31])
+
+    # the latest admitted sequence is preempted to grow the first one
+    batch = scheduler.schedule()
+    _assert_consistent(scheduler, batch)
+    assert [r.request_id for r in batch.requests] == ["0"]
+    preempted = scheduler.requests["1"]
+    assert preempted.num_preemptions == 1 and preempted.num_computed_tokens == 0 and preempted.slot is None
+    assert list(scheduler.waiting) == [preempted]
+    assert [r.request_id for r in scheduler.update(batch, [22])] == ["0"]
+
+    # it is recomputed with its generated tokens once blocks are free again
+    batch = scheduler.schedule()
+    _assert_consistent(scheduler, batch)
+    assert batch.q_seq_lens.tolist() == [9] and batch.input_ids.tolist() == list(range(11, 18)) + [30, 31]
+    assert [r.output_ids for r in scheduler.update(batch, [32])] == [[30, 31, 32]]
+
+
+def test_out_of_blocks():
+    scheduler = _scheduler(num_blocks=1)
+    scheduler.add_request("0", list(range(1, 8)), max_new_tokens=1)
+    with pytest.raises(RuntimeError, match="out of memory"):
+        scheduler.schedule()
+
+    with pytest.raises(ValueError, match="already exists"):
+        scheduler.add_request("0", [1], max_new_tokens=1)
+    with pytest.raises(ValueError, match="maximum sequence length"):
+        scheduler.add_request("1", [1] * SEQ_LENGTH, max_new_tokens=1)
+
+
+def _next_token(ids):
+    return int(sum(ids) % VOCAB_SIZE)
+
+
+class PagedCacheModel(GenerationMixin):
+    """Writes the tokens to a paged cache and predicts the next token of each sequence from the cache only."""
+
+    def __init__(self):
+        self.config = type("Config", (), {"_attn_implementation": "paged", "max_position_embeddings": SEQ_LENGTH})
+        self.generation_config = type("GenerationConfig", (), {"eos_token_id": [0]})
+        self.cache = np.full(64 * BLOCK_SIZE, -1)
+        self.flags = []
+        self.num_steps = 0
+
+    def _add_flags_custom(self, is_first_iteration):
+        self.flags.append(is_first_iteration)
+
+    def __call__(self, input_ids, position_ids, block_tables, slot_mapping, batch_valid_length, q_seq_lens, **kwargs):
+        self.num_steps += 1
+        assert input_ids.shape == position_ids.shape == (1, slot_mapping.shape[0])
+        self.cache[slot_mapping.asnumpy()] = input_ids.asnumpy()[0]
+
+        positions = np.arange(SEQ_LENGTH)
+        logits = np.zeros((1, q_seq_lens.shape[0], VOCAB_SIZE), np.float32)
+        for i, (table, valid_length) in enumerate(zip(block_tables.asnumpy(), batch_valid_length.asnumpy())):
+            slots = table[positions[:valid_length] // BLOCK_SIZE] * BLOCK_SIZE + positions[:valid_length] % BLOCK_SIZE
+            logits[0, i, _next_token(self.cache[slots])] = 1
+        assert kwargs["logits_to_keep"].shape == q_seq_lens.shape
+        return (ms.tensor(logits),)
+
+
+def test_generate_continuous_batching(monkeypatch):
+    # a small cache to preempt sequences
+    monkeypatch.setattr(
+        generation_utils,
+        "BlockTables",
+        lambda num_blocks, block_size, seq_length: BlockTables(6, BLOCK_SIZE, seq_length),
+    )
+    preempted = []
+    preempt = ContinuousBatchingScheduler._preempt
+    monkeypatch.setattr(
+        ContinuousBatchingScheduler,
+        "_preempt",
+        lambda self, request: (preempted.append(request), preempt(self, request)),
+    )
+    rng = np.random.default_rng(0)
+    prompts = [rng.integers(1, VOCAB_SIZE, size=n).tolist() for n in [9, 3, 6, 12, 1, 5]]
+    max_new_tokens = 8
+
+    expected = []
+    for prompt_ids in prompts:
+        ids = list(prompt_ids)
+        while len(ids) < len(prompt_ids) + max_new_tokens and (len(ids) == len(prompt_ids) or ids[-1] != 0):
+            ids.append(_next_token(ids))
+        expected.append(ids[len(prompt_ids) :])
+
+    model = PagedCacheModel()
+    outputs = model.generate_continuous_batching(prompts, max_new_tokens, max_batch_size=3, max_num_batched_tokens=8)
+    assert outputs == expected
+    assert model.flags == [False, True] and preempted
+    # the batch is refilled as sequences finish
+    assert model.num_steps < sum(len(ids) for ids in expected)